@@ -82,12 +82,12 @@ def _extract_dsl_metadata(script: str | None) -> tuple[dict | None, dict]:
         (parameters, dsl_meta) — parameters는 슬라이더용, dsl_meta는 정식 파싱 결과.
     """
     empty_meta = {"parse_status": "error", "is_v2": False, "constants": [],
-                  "custom_functions": [], "rules": [], "errors": []}
+                  "custom_functions": [], "rules": [], "dependencies": None, "errors": []}
     if not script:
         return None, {**empty_meta, "parse_status": "ok"}
 
     try:
-        from sv_core.parsing import parse_v2, DSLError
+        from sv_core.parsing import analyze, parse_v2, DSLError
         from sv_core.parsing.ast_nodes import NumberLit, StringLit
         ast = parse_v2(script)
 
@@ -118,6 +118,8 @@ def _extract_dsl_metadata(script: str | None) -> tuple[dict | None, dict]:
             "rules": [{"index": i, "condition": str(r.condition), "side": r.action.side,
                         "qty": f"{r.action.qty_value}{'%' if r.action.qty_type == 'percent' else ''}"}
                       for i, r in enumerate(ast.rules)],
+            # 필요 지표/TF/이력 길이 — 로컬 서버가 조회·계산 범위를 정하는 데 사용
+            "dependencies": analyze(ast).to_dict(),
             "errors": [],
         }
         return params if params else None, dsl_meta
@@ -56,6 +56,7 @@ class TradingRule(Base):
     dsl_meta = Column(JSON, nullable=True)
     # Expected format:
     # {"constants": [...], "custom_functions": [...], "rules": [...],
+    #  "dependencies": {"indicators": [...], "timeframes": [...], "history_depth": 20, ...},
     #  "parse_status": "ok"|"error", "is_v2": true, "errors": []}
 
     # 상태
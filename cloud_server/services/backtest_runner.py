@@ -15,19 +15,23 @@ import pandas as pd
 from sqlalchemy.orm import Session
 
 from sv_core.indicators.calculator import (
-    calc_all_indicators,
-    calc_rsi,
-    calc_sma,
-    calc_ema,
-    calc_bollinger,
-    calc_avg_volume,
+    calc_all_indicators_series,
+    calc_indicators_series,
+    calc_rsi_series,
+    calc_sma_series,
+    calc_ema_series,
+    calc_bollinger_series,
 )
-from sv_core.parsing.evaluator import evaluate as dsl_evaluate
+from sv_core.parsing.analysis import ScriptDependencies
+from sv_core.parsing.ast_nodes import ScriptV2
+from sv_core.parsing.compiler import CompiledScriptV2, compile_script_v2
+from sv_core.parsing.evaluator import PAST_CONTEXT
 from sv_core.parsing.parser import parse_v2
+from sv_core.parsing.vectorized import evaluate_series
 
 logger = logging.getLogger(__name__)
 
-# 지표 계산에 필요한 최소 lookback 바 수
+# 지표 계산에 필요한 최소 lookback 바 수 (의존성을 정적으로 알 수 없을 때의 기본값)
 INDICATOR_LOOKBACK = 60
 
 
@@ -75,6 +79,107 @@ class BacktestConfig:
     max_position_pct: float = 0.95      # 최대 투입 비율
 
 
+class _IndicatorCache:
+    """백테스트 1회 실행 동안의 지표 시계열 캐시.
+
+    키: (지표, 기간, 타임프레임). 미리 계산된 시계열(precomputed)이 있으면 그대로 쓰고,
+    없으면 처음 요청될 때 전체 시계열을 한 번 벡터 계산하고,
+    이후에는 현재 바 인덱스(cursor)로 조회만 한다 → 바당 비용이 이력 길이와 무관.
+    현재는 실행 TF 바만 로드하므로 다른 TF 인자도 같은 바로 계산한다 (기존 동작 유지).
+    """
+
+    def __init__(
+        self,
+        closes: pd.Series,
+        volumes: pd.Series,
+        timeframe: str,
+        precomputed: dict[str, np.ndarray] | None = None,
+    ) -> None:
+        self._closes = closes.reset_index(drop=True).astype(float)
+        self._volumes = volumes.reset_index(drop=True).astype(float)
+        self._timeframe = timeframe
+        self._precomputed = precomputed or {}
+        self._series: dict[tuple[str, int, str], np.ndarray] = {}
+        self.cursor = 0
+
+    def get(
+        self, name: str, period: Any, tf: str | None = None, offset: int = 0,
+    ) -> float | None:
+        """현재 바(- offset) 시점의 지표 값. 데이터 부족 시 None."""
+        return _value_at(self.column(name, period, tf), self.cursor - offset)
+
+    def column(self, name: str, period: Any, tf: str | None = None) -> np.ndarray:
+        """지표 전체 시계열 (NaN = 데이터 부족)."""
+        key = (name, int(period), tf or self._timeframe)
+        col = self._series.get(key)
+        if col is None:
+            col = self._precomputed.get(f"{name}_{key[1]}")
+            if col is None:
+                col = self._compute(name, key[1])
+            self._series[key] = col
+        return col
+
+    def precomputed(self, key: str, offset: int = 0) -> float | None:
+        """미리 계산된 지표 (MACD 등)."""
+        col = self._precomputed.get(key)
+        return _value_at(col, self.cursor - offset) if col is not None else None
+
+    def funcs(self, offset: int = 0) -> dict[str, Any]:
+        """DSL 지표 함수 — offset봉 전 값을 조회 (expr[N]은 배열 오프셋으로 처리)."""
+        return {
+            "RSI": lambda p, tf=None: self.get("rsi", p, tf, offset),
+            "MA": lambda p, tf=None: self.get("ma", p, tf, offset),
+            "EMA": lambda p, tf=None: self.get("ema", p, tf, offset),
+            "MACD": lambda tf=None: self.precomputed("macd", offset),
+            "MACD_SIGNAL": lambda tf=None: self.precomputed("macd_signal", offset),
+            "볼린저_상단": lambda p, tf=None: self.get("bb_upper", p, tf, offset),
+            "볼린저_하단": lambda p, tf=None: self.get("bb_lower", p, tf, offset),
+            "평균거래량": lambda p, tf=None: self.get("avg_volume", p, tf, offset),
+        }
+
+    def series_funcs(self) -> dict[str, Any]:
+        """벡터화 평가용 지표 함수 — 바 하나가 아니라 전체 시계열을 돌려준다."""
+        return {
+            "RSI": lambda p, tf=None: self.column("rsi", p, tf),
+            "MA": lambda p, tf=None: self.column("ma", p, tf),
+            "EMA": lambda p, tf=None: self.column("ema", p, tf),
+            "MACD": lambda tf=None: self._precomputed.get("macd"),
+            "MACD_SIGNAL": lambda tf=None: self._precomputed.get("macd_signal"),
+            "볼린저_상단": lambda p, tf=None: self.column("bb_upper", p, tf),
+            "볼린저_하단": lambda p, tf=None: self.column("bb_lower", p, tf),
+            "평균거래량": lambda p, tf=None: self.column("avg_volume", p, tf),
+        }
+
+    def _compute(self, name: str, period: int) -> np.ndarray:
+        if name == "rsi":
+            return calc_rsi_series(self._closes, period)
+        if name == "ma":
+            return calc_sma_series(self._closes, period)
+        if name == "ema":
+            return calc_ema_series(self._closes, period)
+        if name == "bb_upper":
+            return calc_bollinger_series(self._closes, period)[0]
+        if name == "bb_lower":
+            return calc_bollinger_series(self._closes, period)[1]
+        if name == "avg_volume":
+            return calc_sma_series(self._volumes, period)
+        raise ValueError(f"지원하지 않는 지표: {name}")
+
+
+def _value_at(col: np.ndarray, i: int) -> float | None:
+    if i < 0 or i >= len(col):
+        return None
+    v = col[i]
+    return None if np.isnan(v) else float(v)
+
+
+def _warmup_bars(deps: ScriptDependencies) -> int:
+    """평가 시작 전 건너뛸 바 수 — 스크립트 지표가 모두 값을 갖기 시작하는 지점."""
+    if deps.dynamic:
+        return INDICATOR_LOOKBACK
+    return max(deps.history_depth, 1)
+
+
 class BacktestRunner:
     """백테스트 실행기."""
 
@@ -104,22 +209,28 @@ class BacktestRunner:
         """
         cfg = config or BacktestConfig()
 
-        # 1. DSL 파싱
+        # 1. DSL 파싱 + 컴파일 (정적 의존성 포함)
         ast = parse_v2(script)
+        compiled = compile_script_v2(ast)
+        deps = compiled.dependencies
+        warmup = _warmup_bars(deps)
 
         # 2. 바 데이터 로드
         bars = self._load_bars(symbol, start_date, end_date, timeframe)
-        if len(bars) < INDICATOR_LOOKBACK:
-            logger.warning("데이터 부족: %s %d bars (최소 %d)", symbol, len(bars), INDICATOR_LOOKBACK)
+        if len(bars) < warmup:
+            logger.warning("데이터 부족: %s %d bars (최소 %d)", symbol, len(bars), warmup)
             return BacktestResult()
 
-        # 3. 지표 사전 계산 (벡터화)
+        # 3. 지표 사전 계산 (벡터화) — 스크립트가 쓰는 키만
         closes = pd.Series([b["close"] for b in bars], dtype=float)
         volumes = pd.Series([b["volume"] for b in bars], dtype=float)
-        all_indicators = self._precompute_indicators(closes, volumes)
+        keys = None if deps.dynamic else deps.keys() | deps.keys(timeframe)
+        all_indicators = self._precompute_indicators(closes, volumes, keys)
 
         # 4. 시뮬레이션 루프
-        return self._simulate(ast, bars, all_indicators, cfg, closes, volumes)
+        return self._simulate(
+            compiled, bars, all_indicators, cfg, closes, volumes, timeframe, warmup, ast,
+        )
 
     def _load_bars(
         self, symbol: str, start: date, end: date, timeframe: str,
@@ -215,32 +326,35 @@ class BacktestRunner:
         return result
 
     def _precompute_indicators(
-        self, closes: pd.Series, volumes: pd.Series,
-    ) -> list[dict]:
+        self, closes: pd.Series, volumes: pd.Series, keys: set[str] | None = None,
+    ) -> dict[str, np.ndarray]:
         """각 바 시점의 지표를 사전 계산 (look-ahead bias 방지).
 
         i번째 바의 지표는 0~i까지의 데이터만 사용.
+        전체 시계열을 한 번에 벡터 계산하고, 바 i는 indicators_at(…, i)로 조회한다.
+        keys가 주어지면 그 지표만 계산한다 (None → 전체 지표 세트).
         """
-        results = []
-        for i in range(len(closes)):
-            if i < INDICATOR_LOOKBACK - 1:
-                results.append({})
-                continue
-            window_close = closes.iloc[: i + 1]
-            window_vol = volumes.iloc[: i + 1]
-            results.append(calc_all_indicators(window_close, window_vol))
-        return results
+        if keys is None:
+            return calc_all_indicators_series(closes, volumes)
+        return calc_indicators_series(closes, volumes, keys)
 
     def _simulate(
         self,
-        ast,
+        compiled: CompiledScriptV2,
         bars: list[dict],
-        indicators: list[dict],
+        indicators: dict[str, np.ndarray],
         cfg: BacktestConfig,
         closes: pd.Series | None = None,
         volumes: pd.Series | None = None,
+        timeframe: str = "1d",
+        warmup: int = INDICATOR_LOOKBACK,
+        ast: ScriptV2 | None = None,
     ) -> BacktestResult:
-        """바 루프 시뮬레이션."""
+        """바 루프 시뮬레이션. warmup-1번째 바부터 평가한다.
+
+        ast가 주어지면 규칙 조건을 전체 시계열로 한 번에 평가하고(evaluate_series),
+        벡터화하지 못한 부분(수익률/보유수량 등 포지션 필드, 다이버전스)만 바마다 평가한다.
+        """
         cash = cfg.initial_cash
         position: dict | None = None  # {"entry_price", "qty", "entry_idx", "entry_date"}
         trades: list[Trade] = []
@@ -248,6 +362,46 @@ class BacktestRunner:
 
         eval_state: dict[str, Any] = {}
 
+        # 지표 함수 — 임의 기간 지원. 요청된 (지표, 기간, TF)마다 한 번만 계산
+        cache = _IndicatorCache(
+            closes if closes is not None else pd.Series(dtype=float),
+            volumes if volumes is not None else pd.Series(dtype=float),
+            timeframe,
+            indicators,
+        )
+        indicator_funcs = cache.funcs()
+
+        plan = None
+        if ast is not None:
+            plan = evaluate_series(
+                ast,
+                {
+                    "현재가": np.array([b["close"] for b in bars], dtype=float),
+                    "거래량": np.array([b["volume"] for b in bars], dtype=float),
+                },
+                cache.series_funcs(),
+                start=max(warmup - 1, 0),
+                scalar_fields=("수익률", "보유수량"),
+            )
+            if plan.remainder is not None:
+                compiled = compile_script_v2(plan.remainder)
+
+        # 바별 포지션 필드 — expr[N]이 N봉 전 수익률/보유수량을 배열 오프셋으로 조회
+        returns: list[float] = []
+        holdings: list[int] = []
+
+        def past(n: int) -> dict[str, Any] | None:
+            j = cache.cursor - n
+            if j < 0:
+                return None
+            return {
+                "현재가": bars[j]["close"],
+                "거래량": bars[j]["volume"],
+                "수익률": returns[j],
+                "보유수량": holdings[j],
+                **cache.funcs(n),
+            }
+
         for i, bar in enumerate(bars):
             price = bar["close"]
             volume = bar["volume"]
@@ -258,35 +412,33 @@ class BacktestRunner:
             else:
                 equity = cash
             equity_curve.append(equity)
+            returns.append(((price / position["entry_price"]) - 1) * 100 if position else 0.0)
+            holdings.append(position["qty"] if position else 0)
 
             # 지표 부족 → skip
-            if not indicators[i]:
+            if i < warmup - 1:
                 continue
+            cache.cursor = i
 
-            # DSL context 구성
-            context = {
-                "현재가": price,
-                "거래량": volume,
-                "수익률": ((price / position["entry_price"]) - 1) * 100 if position else 0.0,
-                "보유수량": position["qty"] if position else 0,
-            }
-            # 지표 함수 — 임의 기간 지원 (closes[:i+1] 윈도우에서 직접 계산)
-            _c = closes.iloc[: i + 1] if closes is not None else pd.Series(dtype=float)
-            _v = volumes.iloc[: i + 1] if volumes is not None else pd.Series(dtype=float)
-            context["RSI"] = lambda p, tf=None, _w=_c: calc_rsi(_w, int(p))
-            context["MA"] = lambda p, tf=None, _w=_c: calc_sma(_w, int(p))
-            context["EMA"] = lambda p, tf=None, _w=_c: calc_ema(_w, int(p))
-            context["MACD"] = lambda tf=None, _i=indicators[i]: _i.get("macd")
-            context["MACD_SIGNAL"] = lambda tf=None, _i=indicators[i]: _i.get("macd_signal")
-            context["볼린저_상단"] = lambda p, tf=None, _w=_c: calc_bollinger(_w, int(p))[0]
-            context["볼린저_하단"] = lambda p, tf=None, _w=_c: calc_bollinger(_w, int(p))[1]
-            context["평균거래량"] = lambda p, tf=None, _w=_v: calc_avg_volume(_w, int(p))
-
-            # DSL 평가
-            try:
-                buy_signal, sell_signal = dsl_evaluate(ast, context, eval_state)
-            except Exception:
-                continue
+            # DSL 평가 — 벡터화된 바는 조회만
+            if plan is not None and not plan.needs_scalar(i):
+                action = plan.action_at(i)
+            else:
+                context = {
+                    "현재가": price,
+                    "거래량": volume,
+                    "수익률": returns[i],
+                    "보유수량": holdings[i],
+                    **indicator_funcs,
+                    PAST_CONTEXT: past,
+                }
+                try:
+                    result = compiled.evaluate(context, eval_state, details=False)
+                except Exception:
+                    continue
+                action = result.action if plan is None else plan.action_at(i, result)
+            buy_signal = action is not None and action.side == "매수"
+            sell_signal = action is not None and action.side == "매도"
 
             # 매수
             if buy_signal and position is None and price > 0:
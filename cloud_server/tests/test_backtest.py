@@ -1,7 +1,7 @@
 """백테스트 엔진 유닛 테스트."""
 import pytest
 
-from cloud_server.services.backtest_runner import BacktestResult, BacktestRunner
+from cloud_server.services.backtest_runner import BacktestConfig, BacktestResult, BacktestRunner
 from cloud_server.tests.conftest import _make_user, _auth_header
 
 
@@ -204,3 +204,99 @@ def test_backtest_tf_arg_in_dsl(client, db, _seed_daily_bars):
 
     # TF 데이터 없어도 에러 없이 실행 (None 폴백)
     assert resp.status_code == 200
+
+
+def test_indicator_cache_matches_window_calc():
+    """임의 기간 지표 캐시 — 바 i 값이 closes[:i+1] 직접 계산과 동일, 키당 1회 계산."""
+    import pandas as pd
+    from sv_core.indicators.calculator import calc_bollinger, calc_rsi, calc_sma
+    from cloud_server.services.backtest_runner import _IndicatorCache
+
+    closes = pd.Series([70000 + (i * 37) % 900 - i * 5 for i in range(120)], dtype=float)
+    volumes = pd.Series([1000 + i for i in range(120)], dtype=float)
+    cache = _IndicatorCache(closes, volumes, "1d")
+    for i in range(len(closes)):
+        cache.cursor = i
+        window = closes.iloc[: i + 1]
+        assert cache.get("rsi", 9) == calc_rsi(window, 9)
+        assert cache.get("ma", 37.0) == calc_sma(window, 37)
+        assert cache.get("bb_lower", 20) == calc_bollinger(window, 20)[1]
+    assert set(cache._series) == {("rsi", 9, "1d"), ("ma", 37, "1d"), ("bb_lower", 20, "1d")}
+
+
+def test_index_access_uses_bar_offsets():
+    """현재가[N]/RSI(14)[N]은 배열 오프셋 — 평가 시작 바부터 바로 N봉 전 값을 본다."""
+    import pandas as pd
+    from cloud_server.services.backtest_runner import (
+        INDICATOR_LOOKBACK, BacktestConfig, _IndicatorCache,
+    )
+    from sv_core.parsing import compile_script_v2, parse_v2
+
+    closes = [1000.0 + (i % 7) * 10 for i in range(80)]
+    bars = [
+        {"timestamp": str(i), "open": c, "high": c, "low": c, "close": c, "volume": 100.0}
+        for i, c in enumerate(closes)
+    ]
+    series = pd.Series(closes)
+    compiled = compile_script_v2(parse_v2(
+        "현재가 > 현재가[1] AND 현재가[1] > 현재가[2] AND RSI(14)[1] > 0 → 매수 100%\n"
+        "현재가 < 현재가[1] → 매도 전량"
+    ))
+    runner = BacktestRunner(db=None)
+    result = runner._simulate(
+        compiled, bars, {}, BacktestConfig(), series, pd.Series([100.0] * 80),
+    )
+
+    start = INDICATOR_LOOKBACK - 1
+    first_buy = next(
+        i for i in range(start, len(closes))
+        if closes[i] > closes[i - 1] > closes[i - 2]
+    )
+    first_sell = next(i for i in range(first_buy + 1, len(closes)) if closes[i] < closes[i - 1])
+    assert first_buy == start  # 워밍업 없이 첫 평가 바부터 오프셋 조회
+    assert result.trades[0].entry_date == str(first_buy)
+    assert result.trades[0].exit_date == str(first_sell)
+    assert _IndicatorCache(series, series, "1d").get("rsi", 14, offset=1) is None  # cursor 0 - 1
+
+
+def test_precompute_only_required_indicators():
+    """스크립트가 쓰는 지표만 미리 계산, 워밍업은 정적 의존성 기준."""
+    import pandas as pd
+    from cloud_server.services.backtest_runner import _warmup_bars
+    from sv_core.parsing import compile_script_v2, parse_v2
+
+    compiled = compile_script_v2(parse_v2("MACD() > MACD_SIGNAL() AND RSI(9) < 70 → 매수 100%"))
+    deps = compiled.dependencies
+    closes = pd.Series([1000.0 + i for i in range(50)])
+    series = BacktestRunner(db=None)._precompute_indicators(closes, closes, deps.keys())
+    assert set(series) == {"macd", "macd_signal", "rsi_9"}
+    assert _warmup_bars(deps) == 35
+    assert _warmup_bars(compile_script_v2(parse_v2("현재가 > 0 → 매수 100%")).dependencies) == 1
+
+
+def test_vectorized_simulation_matches_scalar():
+    """전체 시계열 평가(ast 전달) = 바 단위 평가 — 거래/자산 곡선 동일."""
+    import math
+
+    import pandas as pd
+    from sv_core.parsing import compile_script_v2, parse_v2
+
+    closes = [10000 + 800 * math.sin(i / 9) + 300 * math.sin(i / 2.3) for i in range(400)]
+    bars = [
+        {"timestamp": str(i), "open": c, "high": c, "low": c, "close": c, "volume": 100.0 + i % 13}
+        for i, c in enumerate(closes)
+    ]
+    runner = BacktestRunner(db=None)
+    for script in (
+        "상향돌파(MA(5), MA(20)) AND 횟수(RSI(14) < 45, 10) >= 1 → 매수 100%\n"
+        "하향돌파(MA(5), MA(20)) OR 연속(현재가 < 현재가[1]) >= 4 → 매도 전량",
+        "RSI(14) < 40 AND 보유수량 == 0 → 매수 100%\n수익률 >= 2 OR 수익률 <= -2 → 매도 전량",
+        "강세다이버전스(RSI(14), 20) → 매수 100%\nRSI(14) > 60 → 매도 전량",
+    ):
+        ast = parse_v2(script)
+        args = (bars, {}, BacktestConfig(), pd.Series(closes), pd.Series([b["volume"] for b in bars]))
+        scalar = runner._simulate(compile_script_v2(ast), *args, "1d", 21)
+        vector = runner._simulate(compile_script_v2(ast), *args, "1d", 21, ast)
+        assert scalar.trades, script
+        assert vector.trades == scalar.trades
+        assert vector.equity_curve == scalar.equity_curve
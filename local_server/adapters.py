@@ -9,14 +9,22 @@ import logging
 from decimal import Decimal
 from typing import Any
 
+from local_server.storage.log_buffer import LogBuffer
+
 logger = logging.getLogger(__name__)
 
 
 class LogDbAdapter:
-    """LogPort 구현 — LogDB를 감싸는 래퍼."""
+    """LogPort 구현 — LogDB를 감싸는 래퍼.
+
+    write()는 LogBuffer에 쌓고 백그라운드에서 한 트랜잭션으로 기록한다
+    (flush_interval=0이면 건별 기록). 당일 집계는 기록된 집계에 아직 기록 안 된 로그를
+    더해 답한다 (조회 때문에 루프에서 기록하지 않는다).
+    """
 
-    def __init__(self, log_db: Any) -> None:
+    def __init__(self, log_db: Any, flush_interval: float = 0.2) -> None:
         self._db = log_db
+        self._buffer = LogBuffer(log_db, flush_interval) if flush_interval > 0 else None
 
     async def write(
         self,
@@ -27,15 +35,26 @@ class LogDbAdapter:
         meta: dict[str, Any] | None = None,
         intent_id: str | None = None,
     ) -> None:
+        if self._buffer is not None:
+            self._buffer.add(log_type, message, symbol=symbol, meta=meta, intent_id=intent_id)
+            return
         await self._db.async_write(
             log_type, message,
             symbol=symbol, meta=meta, intent_id=intent_id,
         )
 
+    async def flush(self) -> None:
+        if self._buffer is not None:
+            await self._buffer.close()
+
     def today_realized_pnl(self) -> float:
+        if self._buffer is not None:
+            return self._buffer.today_totals()[0]
         return self._db.today_realized_pnl()
 
     def today_executed_amount(self) -> Decimal:
+        if self._buffer is not None:
+            return self._buffer.today_totals()[1]
         return self._db.today_executed_amount()
 
 
@@ -72,6 +91,11 @@ class MinuteBarStoreAdapter:
         if self._store is not None:
             self._store.save_bars(symbol, bars)
 
+    def load_bars(self, symbol: str, since: str) -> list[dict]:
+        if self._store is None:
+            return []
+        return self._store.get_bars(symbol, start=since)
+
 
 class StockMasterAdapter:
     """ReferenceDataPort 구현 — StockMasterCache를 감싸는 래퍼."""
@@ -24,7 +24,7 @@ from local_server.broker.kis.idempotency import IdempotencyGuard
 from local_server.broker.kis.order import KisOrder
 from local_server.broker.kis.quote import KisQuote
 from local_server.broker.kis.rate_limiter import MultiEndpointRateLimiter
-from local_server.broker.kis.reconciler import Reconciler
+from local_server.broker.kis.reconciler import ReconcileEvent, Reconciler
 from local_server.broker.kis.reconnect import ReconnectManager
 from local_server.broker.kis.state_machine import (
     ConnectionState,
@@ -177,6 +177,7 @@ class KisAdapter(BrokerAdapter):
 
     async def unsubscribe_quotes(self, symbols: list[str]) -> None:
         """실시간 시세 구독을 해제한다."""
+        self._subscribed_symbols.difference_update(symbols)
         await self._ws.unsubscribe(symbols)
 
     # ──────────────────────────────────────────
@@ -246,6 +247,10 @@ class KisAdapter(BrokerAdapter):
         await self._rate_limiter.acquire("order")
         return await self._order_client.get_open_orders()
 
+    def on_reconcile(self, callback: Callable[[ReconcileEvent], None]) -> None:
+        """대사 불일치 이벤트 콜백 등록 (엔진 계좌 캐시 무효화용)."""
+        self._reconciler.on_event(callback)
+
     # ──────────────────────────────────────────
     # 내부 유틸
     # ──────────────────────────────────────────
@@ -98,7 +98,8 @@ class KisWS:
         Args:
             callback: QuoteEvent를 인자로 받는 동기 함수
         """
-        self._callbacks.append(callback)
+        if callback not in self._callbacks:  # 구독 추가 시 같은 콜백 중복 등록 방지
+            self._callbacks.append(callback)
 
     async def subscribe(self, symbols: list[str]) -> None:
         """종목 실시간 시세 구독을 시작한다.
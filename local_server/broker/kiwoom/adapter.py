@@ -29,7 +29,7 @@ from local_server.broker.kiwoom.ws import KiwoomWS
 # 제네릭 모듈은 kis에서 재사용
 from local_server.broker.kis.idempotency import IdempotencyGuard
 from local_server.broker.kis.rate_limiter import MultiEndpointRateLimiter
-from local_server.broker.kis.reconciler import Reconciler
+from local_server.broker.kis.reconciler import ReconcileEvent, Reconciler
 from local_server.broker.kis.reconnect import ReconnectManager
 from local_server.broker.kis.state_machine import ConnectionState, StateMachine
 
@@ -149,7 +149,8 @@ class KiwoomAdapter(BrokerAdapter):
             await self._ws.subscribe(symbols)
         else:
             # REST 폴링 폴백
-            self._rest_poll_callbacks.append(callback)
+            if callback not in self._rest_poll_callbacks:
+                self._rest_poll_callbacks.append(callback)
             self._rest_poll_symbols = list(set(self._rest_poll_symbols + symbols))
             if self._rest_poll_task is None:
                 self._rest_poll_task = asyncio.create_task(self._rest_poll_loop())
@@ -235,6 +236,10 @@ class KiwoomAdapter(BrokerAdapter):
         await self._rate_limiter.acquire("order")
         return await self._order_client.get_open_orders()
 
+    def on_reconcile(self, callback: Callable[[ReconcileEvent], None]) -> None:
+        """대사 불일치 이벤트 콜백 등록 (엔진 계좌 캐시 무효화용)."""
+        self._reconciler.on_event(callback)
+
     # ── 내부 유틸 ─────────────────────────────────────
 
     def _assert_connected(self) -> None:
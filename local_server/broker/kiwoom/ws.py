@@ -92,7 +92,8 @@ class KiwoomWS:
         logger.info("WebSocket 연결 종료")
 
     def add_callback(self, callback: Callable[[QuoteEvent], None]) -> None:
-        self._callbacks.append(callback)
+        if callback not in self._callbacks:  # 구독 추가 시 같은 콜백 중복 등록 방지
+            self._callbacks.append(callback)
 
     async def subscribe(self, symbols: list[str]) -> None:
         """종목 실시간 시세 구독을 시작한다."""
@@ -141,7 +141,8 @@ class MockAdapter(BrokerAdapter):
     ) -> None:
         """모의 구독 (콜백 등록만, 실시간 이벤트 없음)."""
         self._assert_connected()
-        self._quote_callbacks.append(callback)
+        if callback not in self._quote_callbacks:
+            self._quote_callbacks.append(callback)
         self._subscribed.update(symbols)
         logger.debug("MockAdapter 구독: %s", symbols)
 
@@ -7,6 +7,7 @@ from __future__ import annotations
 from local_server.engine.bar_builder import BarBuilder
 from local_server.engine.context_cache import ContextCache
 from local_server.engine.engine import StrategyEngine
+from local_server.engine.event_trigger import EventTrigger
 from local_server.engine.evaluator import RuleEvaluator
 from local_server.engine.executor import ExecutionResult, ExecutionStatus, OrderExecutor
 from local_server.engine.limit_checker import LimitChecker
@@ -19,6 +20,7 @@ __all__ = [
     "BarBuilder",
     "ContextCache",
     "EngineScheduler",
+    "EventTrigger",
     "ExecutionResult",
     "ExecutionStatus",
     "LimitChecker",
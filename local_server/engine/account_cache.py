@@ -0,0 +1,112 @@
+"""AccountCache — 브로커 잔고/미체결 캐시.
+
+매 사이클 get_balance()/get_open_orders() REST 대신 캐시를 쓰고, 다음 경우에만 REST:
+- 캐시가 max_age초보다 오래됨
+- 주문 제출/취소/대사 이벤트로 무효화됨 (on_order_submitted / on_order_cancelled / invalidate)
+- 제출한 주문의 체결이 미확인 — 미체결 목록은 confirm_interval초마다 다시 조회하고,
+  목록에서 사라지면(체결/취소) 잔고도 무효화해 포지션을 다시 읽는다.
+KIS/키움 REST는 초당 호출 한도를 시세 검증·주문과 공유하므로 조회를 줄이는 것이 목적.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from sv_core.broker.base import BrokerAdapter
+    from sv_core.broker.models import BalanceResult, OrderResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AccountCacheStats:
+    """REST 조회(miss) / 캐시 사용(hit) 횟수."""
+
+    balance_hits: int = 0
+    balance_misses: int = 0
+    orders_hits: int = 0
+    orders_misses: int = 0
+
+
+class AccountCache:
+    """잔고/미체결 캐시 (staleness 상한 + 이벤트 무효화)."""
+
+    def __init__(
+        self,
+        broker: BrokerAdapter,
+        max_age: float = 30.0,
+        confirm_interval: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._broker = broker
+        self._max_age = max_age
+        self._confirm_interval = confirm_interval
+        self._clock = clock
+        self._balance: BalanceResult | None = None
+        self._balance_at = 0.0
+        self._orders: list[OrderResult] | None = None
+        self._orders_at = 0.0
+        self._unconfirmed: set[str] = set()  # 제출 후 체결 미확인 주문 ID
+        self.stats = AccountCacheStats()
+
+    async def balance(self, *, force: bool = False) -> BalanceResult:
+        """잔고 — 캐시가 유효하면 REST 생략."""
+        if not force and self._balance is not None and self._age(self._balance_at) < self._max_age:
+            self.stats.balance_hits += 1
+            return self._balance
+        self.stats.balance_misses += 1
+        self._balance = await self._broker.get_balance()
+        self._balance_at = self._clock()
+        return self._balance
+
+    async def open_orders(self, *, force: bool = False) -> list[OrderResult]:
+        """미체결 주문 — 캐시가 유효하고 체결 미확인 주문이 없으면 REST 생략."""
+        max_age = self._confirm_interval if self._unconfirmed else self._max_age
+        if not force and self._orders is not None and self._age(self._orders_at) < max_age:
+            self.stats.orders_hits += 1
+            return list(self._orders)
+        self.stats.orders_misses += 1
+        orders = await self._broker.get_open_orders()
+        self._orders = list(orders)
+        self._orders_at = self._clock()
+        if self._unconfirmed:
+            open_ids = {o.order_id for o in orders}
+            resolved = self._unconfirmed - open_ids
+            if resolved:
+                # 미체결에서 사라짐 = 체결(또는 취소) 확정 → 포지션/현금 다시 읽기
+                self._unconfirmed -= resolved
+                self._balance = None
+                logger.debug("주문 확정 %s — 잔고 캐시 무효화", sorted(resolved))
+        return list(orders)
+
+    def on_order_submitted(self, order_id: str | None) -> None:
+        """주문 제출 — 잔고/미체결 무효화, 체결 확인 대상 등록."""
+        if order_id:
+            self._unconfirmed.add(order_id)
+        self.invalidate()
+
+    def on_order_cancelled(self, order_id: str) -> None:
+        """주문 취소 — 캐시된 미체결에서 빼고 잔고(주문가능 현금)는 무효화."""
+        self._unconfirmed.discard(order_id)
+        if self._orders is not None:
+            self._orders = [o for o in self._orders if o.order_id != order_id]
+        self._balance = None
+
+    def on_reconcile_event(self, event: Any) -> None:
+        """브로커 대사 불일치 이벤트 — 서버와 어긋났으므로 전부 다시 읽는다."""
+        logger.debug("대사 이벤트 %s — 계좌 캐시 무효화", event)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._balance = None
+        self._orders = None
+
+    @property
+    def unconfirmed(self) -> frozenset[str]:
+        return frozenset(self._unconfirmed)
+
+    def _age(self, at: float) -> float:
+        return self._clock() - at
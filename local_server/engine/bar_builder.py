@@ -1,7 +1,7 @@
 """BarBuilder — WS 시세로 1분 OHLCV 분봉 구성.
 
 subscribe_quotes 콜백에서 on_quote()를 호출하면
-종목별로 1분 OHLCV를 구성한다.
+종목별로 1분 OHLCV를 구성한다. 분봉이 완성되면 on_bar_complete 콜백(있으면)을 호출한다.
 """
 from __future__ import annotations
 
@@ -9,7 +9,7 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Callable, Optional
 
 from local_server.engine.ports import BarStorePort
 
@@ -27,11 +27,26 @@ class Bar:
     close: Decimal
     volume: int
 
+    def as_record(self) -> dict:
+        """MinuteBarStore / MinuteHistory 형식 dict."""
+        return {
+            "time": self.timestamp.isoformat(),
+            "open": float(self.open),
+            "high": float(self.high),
+            "low": float(self.low),
+            "close": float(self.close),
+            "volume": self.volume,
+        }
+
 
 class BarBuilder:
     """WS 시세로 1분 OHLCV 구성."""
 
-    def __init__(self, bar_store: BarStorePort | None = None) -> None:
+    def __init__(
+        self,
+        bar_store: BarStorePort | None = None,
+        on_bar_complete: Callable[[str, Bar], None] | None = None,
+    ) -> None:
         # symbol → 현재 구성 중인 분봉 데이터
         self._current: dict[str, dict] = {}
         # symbol → 직전 완성 분봉
@@ -39,6 +54,11 @@ class BarBuilder:
         # symbol → 최근 시세 (price, volume)
         self._latest: dict[str, dict] = {}
         self._bar_store = bar_store
+        self._on_bar_complete = on_bar_complete
+
+    def set_on_bar_complete(self, callback: Callable[[str, Bar], None] | None) -> None:
+        """분봉 완성 콜백 등록 (symbol, 완성 분봉)."""
+        self._on_bar_complete = callback
 
     def on_quote(
         self,
@@ -80,19 +100,18 @@ class BarBuilder:
             # MinuteBarStore에 완성 분봉 저장
             if self._bar_store is not None:
                 try:
-                    self._bar_store.save_bars(symbol, [{
-                        "time": completed.timestamp.isoformat(),
-                        "open": float(completed.open),
-                        "high": float(completed.high),
-                        "low": float(completed.low),
-                        "close": float(completed.close),
-                        "volume": completed.volume,
-                    }])
+                    self._bar_store.save_bars(symbol, [completed.as_record()])
                 except Exception as e:
                     logger.warning("분봉 저장 실패 (%s): %s", symbol, e)
 
             self._current[symbol] = self._new_bar(minute_key, price, volume)
 
+            if self._on_bar_complete is not None:
+                try:
+                    self._on_bar_complete(symbol, completed)
+                except Exception:
+                    logger.exception("분봉 완성 콜백 오류 (%s)", symbol)
+
     def get_latest(self, symbol: str) -> Optional[dict]:
         """종목의 최신 시세 조회 (evaluate_all에서 사용)."""
         return self._latest.get(symbol)
@@ -111,6 +130,11 @@ class BarBuilder:
             volume=data["volume"],
         )
 
+    def current_record(self, symbol: str) -> Optional[dict]:
+        """현재 구성 중인 분봉 (MinuteHistory 형식 dict)."""
+        bar = self.get_current_bar(symbol)
+        return bar.as_record() if bar is not None else None
+
     def get_completed_bar(self, symbol: str) -> Optional[Bar]:
         """직전 완성 분봉."""
         return self._completed.get(symbol)
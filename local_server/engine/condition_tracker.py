@@ -2,17 +2,51 @@
 
 매 사이클 각 규칙의 조건 평가 결과를 기록하고, 트리거 이력을 추적.
 조건 상태 API에서 이 데이터를 읽어 프론트에 전달.
+
+세부 값(details) 기록은 보는 사람이 있을 때만:
+- 조건 상태 API 조회가 watch()로 구독을 갱신하면 watch_ttl 동안 매 사이클 기록
+- 구독이 없으면 sample_interval마다 한 번만 기록 (나머지 사이클은 경량 평가)
+행동(action)은 체결 시 실행횟수 기록에 필요하므로 경량 사이클에도 record_action()으로 남긴다.
 """
 from __future__ import annotations
+import time
 from collections import deque
-from typing import Any
+from typing import Any, Callable
+
+# 전체 규칙 구독 키
+_ALL = None
 
 
 class ConditionTracker:
-    def __init__(self, max_triggers: int = 100) -> None:
+    def __init__(self, max_triggers: int = 100, watch_ttl: float = 10.0,
+                 sample_interval: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
         self._latest: dict[int, dict[str, Any]] = {}  # rule_id → latest snapshot
         self._triggers: dict[int, deque[dict]] = {}     # rule_id → trigger history
+        self._actions: dict[int, dict | None] = {}      # rule_id → 최근 사이클 action
         self._max = max_triggers
+        self._watch_ttl = watch_ttl
+        self._sample_interval = sample_interval
+        self._clock = clock
+        self._watchers: dict[int | None, float] = {}    # rule_id(None=전체) → 구독 만료 시각
+        self._last_tracked: dict[int, float] = {}       # rule_id → 마지막 details 기록 시각
+
+    def watch(self, rule_id: int | None = None) -> None:
+        """구독 갱신 (조건 상태 API 조회 시). rule_id=None이면 전체 규칙."""
+        self._watchers[rule_id] = self._clock() + self._watch_ttl
+
+    def wants_details(self, rule_id: int) -> bool:
+        """이번 사이클에 세부 값을 기록할지 — 구독 중이거나 샘플 주기가 됐으면 True."""
+        now = self._clock()
+        if self._watchers:
+            for key in (rule_id, _ALL):
+                expires = self._watchers.get(key)
+                if expires is not None:
+                    if now < expires:
+                        return True
+                    del self._watchers[key]
+        last = self._last_tracked.get(rule_id)
+        return last is None or now - last >= self._sample_interval
 
     def record(self, rule_id: int, cycle: str,
                conditions: list[dict], position: dict,
@@ -23,6 +57,16 @@ class ConditionTracker:
             "conditions": conditions, "position": position,
             "action": action,
         }
+        self._actions[rule_id] = action
+        self._last_tracked[rule_id] = self._clock()
+
+    def record_action(self, rule_id: int, action: dict | None) -> None:
+        """경량 사이클 — 조건 세부 없이 행동만 기록."""
+        self._actions[rule_id] = action
+
+    def latest_action(self, rule_id: int) -> dict | None:
+        """최근 사이클 행동 (경량 사이클 포함)."""
+        return self._actions.get(rule_id)
 
     def record_trigger(self, rule_id: int, at: str,
                        index: int, action: str) -> None:
@@ -2,36 +2,47 @@
 
 EngineScheduler가 1분마다 evaluate_all()을 호출하면
 활성 규칙을 순회하며 조건 평가 → SystemTrader 판단 → 주문 실행을 수행한다.
+
+이벤트 모드(기본): BarBuilder 분봉 완성/시세 이벤트가 EventTrigger를 거쳐
+evaluate_symbols()로 그 종목 규칙만 즉시 평가한다. 상태 함수를 쓰는 규칙은 분당 1회
+(분봉 완성 또는 cron 중 먼저 온 쪽), cron은 이번 분에 평가되지 않은 종목만 맡는 안전망.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
-import re as _re
 import uuid
 from datetime import datetime
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any, Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
 
+from local_server.engine.account_cache import AccountCache
 from local_server.engine.alert_monitor import AlertMonitor
 from local_server.engine.ports import (
     BarDataPort, BarStorePort, LogPort, ReferenceDataPort,
     LOG_TYPE_ERROR, LOG_TYPE_STRATEGY,
 )
-from local_server.engine.bar_builder import BarBuilder
+from local_server.engine.bar_builder import Bar, BarBuilder
 from local_server.engine.condition_tracker import ConditionTracker
 from local_server.engine.context_cache import ContextCache
+from local_server.engine.eval_cache import EvalCycleCache
+from local_server.engine.eval_pool import EvalPool
+from local_server.engine.event_trigger import EventTrigger
 from local_server.engine.evaluator import RuleEvaluator
 from local_server.engine.indicator_provider import IndicatorProvider
 from local_server.engine.executor import ExecutionResult, ExecutionStatus, OrderExecutor
 from local_server.engine.limit_checker import LimitChecker
+from local_server.engine.minute_history import MinuteHistory
 from local_server.engine.position_state import PositionState
 from local_server.engine.price_verifier import PriceVerifier
 from local_server.engine.safeguard import KillSwitchLevel, Safeguard
-from local_server.engine.scheduler import EngineScheduler
+from local_server.engine.scheduler import EngineScheduler, is_market_hours
 from local_server.engine.signal_manager import SignalManager
 from local_server.engine.result_store import ResultStatus, record_result
+from local_server.engine.rule_plan import MINUTE_TFS, PlannedRule, RulePlan
 from local_server.engine.system_trader import SystemTrader
 from local_server.engine.trader_models import CandidateSignal
+from sv_core.parsing import EvalV2Result, ScriptDependencies, analyze_script
 
 if TYPE_CHECKING:
     from sv_core.broker.base import BrokerAdapter
@@ -60,8 +71,22 @@ class StrategyEngine:
 
         # 서브 모듈
         self._evaluator = RuleEvaluator()
+        # 잔고/미체결 캐시 — REST는 오래됐거나(account_max_age초) 주문 체결 미확인일 때만
+        self._account = AccountCache(
+            broker,
+            max_age=float(cfg.get("account_max_age", 30.0)),
+            confirm_interval=float(cfg.get("account_confirm_interval", 2.0)),
+        )
+        # 사이클 단위 종목별 평가 캐시 (규칙 간 컨텍스트/지표 호출 공유)
+        self._eval_cache = EvalCycleCache()
         self._signal_manager = SignalManager()
-        self._price_verifier = PriceVerifier(broker)
+        # 주문 전 가격 검증 — max_age초 이내 WS 시세면 그대로, 아니면 REST (사이클당 종목 1회)
+        self._price_verifier = PriceVerifier(
+            broker,
+            quote_source=lambda symbol: self._bar_builder.get_latest(symbol),
+            max_quote_age=float(cfg.get("price_quote_max_age", 1.0)),
+            concurrency=int(cfg.get("price_verify_concurrency", 4)),
+        )
         self._limit_checker = LimitChecker(
             budget_ratio=Decimal(str(cfg.get("budget_ratio", "0.1"))),
             max_positions=int(cfg.get("max_positions", 5)),
@@ -81,16 +106,46 @@ class StrategyEngine:
         self._context_cache = ContextCache(
             ttl_seconds=int(cfg.get("context_ttl", 3600)),
         )
-        self._bar_builder = BarBuilder(bar_store=bar_store)
-        self._indicator_provider = IndicatorProvider(bar_data=bar_data)
+        self._bar_store = bar_store
+        self._bar_builder = BarBuilder(bar_store=bar_store, on_bar_complete=self._on_bar_complete)
+        # 1분봉 링버퍼 + 롤업 — 분봉 지표는 로컬 우선, 네트워크는 공백 보충만
+        self._minute_history = MinuteHistory()
+        self._indicator_provider = IndicatorProvider(
+            bar_data=bar_data, history=self._minute_history,
+            current_bar=self._bar_builder.current_record,
+        )
         self._system_trader = SystemTrader(
             max_positions=int(cfg.get("max_positions", 5)),
             budget_ratio=Decimal(str(cfg.get("budget_ratio", "0.1"))),
         )
         self._scheduler = EngineScheduler(self.evaluate_all)
 
-        # 규칙 캐시 (외부에서 set)
+        # 이벤트 평가 (분봉 완성 + 선택적 시세 스로틀). quote_trigger_interval=0이면 시세 트리거 끔
+        self._event_trigger: EventTrigger | None = None
+        if cfg.get("event_driven", True):
+            self._event_trigger = EventTrigger(
+                self.evaluate_symbols,
+                debounce=float(cfg.get("event_debounce", 1.0)),
+                quote_interval=float(cfg.get("quote_trigger_interval", 0.0)),
+            )
+        # 분봉 지표 갱신 — 종목 병렬 수 / 사이클 마감 (초과 시 남은 갱신 건너뜀)
+        self._refresh_concurrency = int(cfg.get("minute_refresh_concurrency", 8))
+        self._refresh_timeout = float(cfg.get("minute_refresh_timeout", 15.0))
+        # 규칙 평가 워커 풀 (opt-in) — eval_workers > 0이면 종목 샤드별 프로세스에서 평가
+        workers = int(cfg.get("eval_workers", 0))
+        self._eval_pool: EvalPool | None = EvalPool(workers) if workers > 0 else None
+        # 평가 사이클 직렬화 (cron / 이벤트 동시 진입 방지)
+        self._eval_lock = asyncio.Lock()
+        # 이벤트 모드: 종목별 마지막 전체 평가 분 (상태 함수 분당 1회 보장)
+        self._evaluated_minute: dict[str, datetime] = {}
+
+        # 규칙 캐시 (외부에서 set) + 활성 규칙 실행 계획 (set_rules에서만 재구성)
         self._rules: list[dict] = []
+        self._plan = RulePlan()
+        # hot-reload diff 기준: 규칙 ID → (script, symbol) 해시 / 시세 구독 중인 종목
+        self._script_hashes: dict[int, int] = {}
+        self._subscribed: set[str] = set()
+        self._symbol_sync_task: asyncio.Task | None = None
 
         # 콜백 (실행 결과 알림, WS 등)
         self._on_execution: Optional[Callable[[ExecutionResult], Any]] = None
@@ -117,14 +172,21 @@ class StrategyEngine:
         # LimitChecker 당일 금액 복원 (재시작 시)
         self._limit_checker.restore_from_db(self._log)
         # 활성 규칙 종목들
-        symbols = list({r.get("symbol", "") for r in self._rules if r.get("is_active")})
+        symbols = list(self._plan.symbols)
         # 일봉 지표 계산 (yfinance)
         if symbols:
             market_map = await self._resolve_markets(symbols)
             await self._indicator_provider.refresh(symbols, market_map)
+            # 분봉 히스토리 seed (MinuteBarStore, 부족하면 cloud)
+            await self._indicator_provider.seed_history(symbols, self._bar_store)
         # 시세 구독
         if symbols:
             await self._broker.subscribe_quotes(symbols, self._on_quote)
+        self._subscribed = set(symbols)
+        # 브로커 대사 불일치 → 계좌 캐시 무효화 (지원하는 어댑터만)
+        on_reconcile = getattr(self._broker, "on_reconcile", None)
+        if callable(on_reconcile):
+            on_reconcile(self._account.on_reconcile_event)
         await self._scheduler.start()
         # 포지션 동기화 (시작 시 1회)
         await self._sync_positions()
@@ -133,7 +195,21 @@ class StrategyEngine:
     async def stop(self) -> None:
         """엔진 중지."""
         self._running = False
+        if self._event_trigger is not None:
+            self._event_trigger.cancel()
+        if self._symbol_sync_task is not None and not self._symbol_sync_task.done():
+            self._symbol_sync_task.cancel()
+        self._symbol_sync_task = None
         await self._scheduler.stop()
+        if self._eval_pool is not None:
+            # 워커 종료 — 재시작 대비 새 풀 (프로세스는 첫 평가 때 뜨고 state는 초기화)
+            self._eval_pool.shutdown()
+            self._eval_pool = EvalPool(self._eval_pool.workers)
+            self._eval_pool.set_rules(p.rule for p in self._plan.ordered)
+        try:
+            await self._log.flush()
+        except Exception:
+            logger.exception("엔진 중지: 로그 flush 실패")
         logger.info("StrategyEngine 중지")
 
     @property
@@ -143,8 +219,74 @@ class StrategyEngine:
     # ── 외부 설정 ──
 
     def set_rules(self, rules: list[dict]) -> None:
-        """규칙 캐시 갱신."""
+        """규칙 캐시 갱신 (hot-reload) — 이전 규칙과 diff해 바뀐 부분만 반영.
+
+        - script/종목이 바뀌었거나 사라진 규칙만 컴파일 캐시와 평가 state를 버린다
+          (나머지 규칙의 상향돌파/횟수/expr[N] state는 유지)
+        - 실행 계획 재구성, v2 스크립트 사전 컴파일, 지표 요구사항 반영
+        - 실행 중이면 새 종목 시세 구독 + 지표 준비, 빠진 종목 구독 해제 (백그라운드)
+        """
+        hashes = {r.get("id", 0): hash((r.get("script") or "", r.get("symbol", ""))) for r in rules}
+        changed = [rid for rid, h in self._script_hashes.items() if hashes.get(rid) != h]
+        for rule_id in changed:
+            self._evaluator.invalidate_cache(rule_id)
+        self._script_hashes = hashes
+
         self._rules = rules
+        # script가 그대로인 규칙은 이전 계획의 파싱 결과 재사용 — 새/바뀐 규칙만 파싱
+        self._plan = RulePlan.build(rules, previous=self._plan)
+        if self._eval_pool is not None:
+            # 평가 state는 샤드 워커에 — 워커가 받은 목록을 diff해 바뀐 규칙만 버린다
+            self._eval_pool.set_rules(p.rule for p in self._plan.ordered)
+        else:
+            for planned in self._plan.ordered:
+                if planned.ast is not None:
+                    self._evaluator.prepare_v2(planned.rule_id, planned.rule["script"], planned.ast)
+        self._indicator_provider.set_requirements(self._plan.indicator_needs())
+        if changed:
+            logger.info("규칙 변경 %d개 — 컴파일 캐시/state 무효화", len(changed))
+        if self._running and set(self._plan.symbols) != self._subscribed:
+            self._schedule_symbol_sync()
+
+    def _schedule_symbol_sync(self) -> None:
+        """종목 구독 동기화 예약 — 진행 중이면 그 작업이 최신 계획까지 맞춘다."""
+        if self._symbol_sync_task is not None and not self._symbol_sync_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # 이벤트 루프 밖 — 다음 set_rules/재시작에서 맞춘다
+        self._symbol_sync_task = loop.create_task(self._sync_symbols())
+
+    async def _sync_symbols(self) -> None:
+        """실행 계획 종목 ↔ 시세 구독 종목 맞추기 (바뀐 종목만 subscribe/unsubscribe)."""
+        while self._running:
+            desired = set(self._plan.symbols)
+            added = sorted(desired - self._subscribed)
+            removed = sorted(self._subscribed - desired)
+            if not added and not removed:
+                return
+            try:
+                if removed:
+                    await self._broker.unsubscribe_quotes(removed)
+                    self._subscribed.difference_update(removed)
+                    for sym in removed:
+                        self._evaluated_minute.pop(sym, None)
+                if added:
+                    await self._broker.subscribe_quotes(added, self._on_quote)
+                    self._subscribed.update(added)
+                logger.info("규칙 변경 종목 반영 — 구독 +%d, 해제 -%d", len(added), len(removed))
+            except Exception:
+                logger.exception("규칙 변경 종목 구독 갱신 실패")
+                return
+            if added:
+                # 새 종목 일봉 지표 + 분봉 히스토리 (start()와 같은 준비)
+                try:
+                    market_map = await self._resolve_markets(added)
+                    await self._indicator_provider.refresh(added, market_map)
+                    await self._indicator_provider.seed_history(added, self._bar_store)
+                except Exception:
+                    logger.exception("새 종목 지표 준비 실패 (%s)", ", ".join(added))
 
     def update_context(self, context: dict) -> None:
         """AI 컨텍스트 갱신."""
@@ -188,37 +330,121 @@ class StrategyEngine:
     def condition_tracker(self) -> ConditionTracker:
         return self._condition_tracker
 
+    @property
+    def evaluator(self) -> RuleEvaluator:
+        return self._evaluator
+
+    @property
+    def rule_plan(self) -> RulePlan:
+        return self._plan
+
+    @property
+    def account_cache(self) -> AccountCache:
+        return self._account
+
+    @property
+    def minute_history(self) -> MinuteHistory:
+        return self._minute_history
+
+    @property
+    def eval_cache(self) -> EvalCycleCache:
+        return self._eval_cache
+
+    @property
+    def event_trigger(self) -> EventTrigger | None:
+        return self._event_trigger
+
     # ── 메인 루프 ──
 
     async def evaluate_all(self) -> None:
-        """1분마다 호출되는 메인 루프.
+        """1분마다 호출되는 메인 루프 (cron).
 
         v3: 후보 수집 → SystemTrader 판단 → 선택된 후보만 실행.
+        이벤트 모드에서는 이번 분에 아직 평가되지 않은 종목만 평가한다 (안전망).
         """
         if not self._running:
             return
+        async with self._eval_lock:
+            await self._run_cycle(None, frozenset())
 
+    async def evaluate_symbols(
+        self, symbols: Iterable[str], quote_symbols: Iterable[str] = (),
+    ) -> None:
+        """이벤트 평가 — symbols는 전체 규칙, quote_symbols는 상태 없는 규칙만.
+
+        장 시간 가드(is_market_hours)는 evaluate_all과 같다. 장외 이벤트는 락 없이 무시.
+        """
+        if not self._running:
+            return
+        if not is_market_hours(datetime.now()):
+            return
+        async with self._eval_lock:
+            await self._run_cycle(set(symbols), set(quote_symbols))
+
+    def _select_rules(
+        self,
+        symbols: set[str] | None,
+        quote_symbols: set[str],
+        minute: datetime,
+        plan: RulePlan | None = None,
+    ) -> tuple[list[PlannedRule], set[str]]:
+        """이번 사이클 평가 규칙 (priority 내림차순) + 전체 평가 종목.
+
+        symbols=None은 cron — 이벤트 모드면 이번 분에 이미 평가된 종목은 건너뛴다.
+        quote_symbols 종목은 상태 없는 규칙만 (이번 분 전체 평가 여부와 무관).
+        실행 계획에서 해당 종목만 꺼내므로 이벤트 평가는 전체 규칙 수와 무관하다.
+        plan: 사이클 시작 시점 계획 (None이면 현재 계획)
+        """
+        if plan is None:
+            plan = self._plan
+        event_mode = self._event_trigger is not None
+        targets = plan.symbols.keys() if symbols is None else symbols | quote_symbols
+        rules: list[PlannedRule] = []
+        full: set[str] = set()
+        for sym in targets:
+            symbol_plan = plan.symbols.get(sym)
+            if symbol_plan is None:
+                continue
+            if (symbols is None or sym in symbols) and not (
+                event_mode and self._evaluated_minute.get(sym) == minute
+            ):
+                full.add(sym)
+                rules.extend(symbol_plan.rules)
+            elif sym in quote_symbols:
+                rules.extend(symbol_plan.stateless)
+        if len(rules) == len(plan.ordered):
+            rules = list(plan.ordered)  # cron 전체 평가 — 이미 정렬됨
+        else:
+            rules.sort(key=lambda p: p.rank)
+        if event_mode:
+            for sym in full:
+                self._evaluated_minute[sym] = minute
+        return rules, full
+
+    async def _run_cycle(self, symbols: set[str] | None, quote_symbols: set[str]) -> None:
+        """평가 사이클 본체 (_eval_lock 안에서 호출)."""
         try:
             now = datetime.now()
 
             # TS-5: 날짜 경계 감지 → 일일 누적 자동 리셋
             self._limit_checker.check_date_boundary()
 
+            # 장외 (주말, 09:00 이전, 15:30~) 평가 차단 — cron/이벤트 공통
+            if not is_market_hours(now):
+                logger.debug("장외 — 평가 중단")
+                return
+
             # 장 시작 직후 SYNCING (09:00~09:02)
             if now.hour == 9 and now.minute < 2:
                 logger.debug("SYNCING 상태 — 평가 보류")
                 return
 
-            # 장 마감 이후 (15:30~) 평가 차단
-            if now.hour == 15 and now.minute >= 30:
-                logger.debug("장 마감 — 평가 중단")
-                return
+            # 사이클 동안 쓸 계획 스냅샷 — 중간 await 사이에 set_rules(hot-reload)가 와도 일관
+            plan = self._plan
 
-            # 활성 규칙 (priority 내림차순)
-            active_rules = sorted(
-                [r for r in self._rules if r.get("is_active", False)],
-                key=lambda r: r.get("priority", 0),
-                reverse=True,
+            # 활성 규칙 (priority 내림차순) — 이벤트면 해당 종목만
+            active_rules, full_symbols = self._select_rules(
+                symbols, quote_symbols, now.replace(second=0, microsecond=0), plan,
             )
             if not active_rules:
                 return
@@ -230,10 +456,10 @@ class StrategyEngine:
                 await self._sync_positions()
                 self._last_sync_ts = _now_ts
 
-            # 잔고 / 미체결 조회 + 당일 손익 (AlertMonitor에 필요, 무조건 조회)
-            balance = await self._broker.get_balance()
+            # 잔고 / 미체결 + 당일 손익 (AlertMonitor에 필요, 무조건 — REST는 캐시가 낡았을 때만)
+            balance = await self._account.balance()
             holding_symbols = {p.symbol for p in balance.positions}
-            open_orders = await self._broker.get_open_orders()
+            open_orders = await self._account.open_orders()
             today_pnl = self._log.today_realized_pnl()
 
             # AlertMonitor 경고 평가 (trading_enabled 여부와 무관하게 실행)
@@ -251,26 +477,43 @@ class StrategyEngine:
             if not trading_enabled:
                 return
 
-            # ── 분봉 지표 갱신 ──
-            active_tfs: dict[str, set[str]] = {}
-            for rule in active_rules:
-                sym = rule.get("symbol", "")
-                for tf in _extract_rule_tfs(rule):
-                    active_tfs.setdefault(sym, set()).add(tf)
-
-            for sym, tfs in active_tfs.items():
-                for tf in tfs:
-                    await self._indicator_provider.refresh_minute(sym, tf)
+            # ── 분봉 지표 갱신 ── 종목 병렬, 종목당 1m 조회 최대 1회
+            # (시세 트리거만 받은 종목은 분 안에서 봉이 그대로라 생략)
+            await self._indicator_provider.refresh_minutes(
+                {sym: set(plan.symbols[sym].tfs) for sym in full_symbols if plan.symbols[sym].tfs},
+                concurrency=self._refresh_concurrency,
+                timeout=self._refresh_timeout,
+            )
 
             # ── 후보 수집 ──
             cycle_id = uuid.uuid4().hex[:12]
             candidates: list[CandidateSignal] = []
             market_data_map: dict[str, dict[str, Any]] = {}
-
-            for rule in active_rules:
-                for candidate, market_data in self._collect_candidates(rule, cycle_id):
+            # 보유봉/고점은 전체 평가(봉 마감/cron) 종목만, 종목당 한 번 갱신 — 시세 트리거는 읽기만
+            advance = set(full_symbols)
+            self._eval_cache.begin_cycle(cycle_id)
+            try:
+                if self._eval_pool is not None:
+                    collected = await self._collect_candidates_pooled(active_rules, cycle_id, advance)
+                else:
+                    collected = [
+                        pair
+                        for planned in active_rules
+                        for pair in self._collect_candidates(
+                            planned.rule, cycle_id, planned.tfs, advance,
+                        )
+                    ]
+                for candidate, market_data in collected:
                     candidates.append(candidate)
                     market_data_map[candidate.signal_id] = market_data
+            finally:
+                self._eval_cache.end_cycle()
+
+            stats = self._eval_cache.cycle_stats
+            logger.debug(
+                "[Cycle %s] 평가 캐시 — 컨텍스트 %.0f%%, 지표 호출 %.0f%% 적중",
+                cycle_id, stats.context_hit_rate * 100, stats.call_hit_rate * 100,
+            )
 
             if not candidates:
                 return
@@ -306,251 +549,352 @@ class StrategyEngine:
                 )
 
             # ── 선택된 후보 실행 ──
-            for candidate in batch.selected:
-                md = market_data_map[candidate.signal_id]
-                # PROPOSED 로그 (전략 평가 통과)
-                await self._log.write(
-                    LOG_TYPE_STRATEGY,
-                    f"{candidate.reason}: {candidate.symbol} {candidate.side}",
-                    symbol=candidate.symbol,
-                    meta={"rule_id": candidate.rule_id, "side": candidate.side,
-                          "qty": candidate.desired_qty, "price": candidate.latest_price},
-                    intent_id=candidate.intent_id,
-                )
-                result = await self._executor.execute(
-                    candidate.raw_rule, candidate.side, md, balance,
-                    intent_id=candidate.intent_id,
-                )
-                result.cycle_id = cycle_id
-                result.signal_id = candidate.signal_id
-                logger.info(
-                    "[Cycle %s] Rule %d %s: %s — %s",
-                    cycle_id, candidate.rule_id, candidate.side,
-                    result.status.value, result.message,
-                )
-
-                # v2 PositionState 갱신 (체결 성공 시)
-                if result.status == ExecutionStatus.SUCCESS:
-                    self._update_position_state_on_fill(candidate)
-
-                # result_store 기록
-                if result.status == ExecutionStatus.SUCCESS:
-                    record_result(candidate.rule_id, ResultStatus.SUCCESS, result.message)
-                elif result.status == ExecutionStatus.REJECTED:
-                    record_result(candidate.rule_id, ResultStatus.BLOCKED, result.message)
-                else:
-                    record_result(candidate.rule_id, ResultStatus.FAILED, result.message)
-                if self._on_execution:
-                    self._on_execution(result)
+            # 가격 검증: WS 시세가 오래된 종목만 REST로, 종목당 1회·동시 조회 제한
+            self._price_verifier.begin_cycle()
+            try:
+                await self._price_verifier.prefetch(c.symbol for c in batch.selected)
+                for candidate in batch.selected:
+                    md = market_data_map[candidate.signal_id]
+                    # PROPOSED 로그 (전략 평가 통과)
+                    await self._log.write(
+                        LOG_TYPE_STRATEGY,
+                        f"{candidate.reason}: {candidate.symbol} {candidate.side}",
+                        symbol=candidate.symbol,
+                        meta={"rule_id": candidate.rule_id, "side": candidate.side,
+                              "qty": candidate.desired_qty, "price": candidate.latest_price},
+                        intent_id=candidate.intent_id,
+                    )
+                    result = await self._executor.execute(
+                        candidate.raw_rule, candidate.side, md, balance,
+                        intent_id=candidate.intent_id,
+                    )
+                    result.cycle_id = cycle_id
+                    result.signal_id = candidate.signal_id
+                    if result.status != ExecutionStatus.REJECTED:
+                        # 제출(또는 제출 결과 불명) — 체결 확인 전까지 계좌 캐시를 믿지 않는다
+                        self._account.on_order_submitted(result.order_id)
+                    logger.info(
+                        "[Cycle %s] Rule %d %s: %s — %s",
+                        cycle_id, candidate.rule_id, candidate.side,
+                        result.status.value, result.message,
+                    )
+
+                    # v2 PositionState 갱신 (체결 성공 시)
+                    if result.status == ExecutionStatus.SUCCESS:
+                        self._update_position_state_on_fill(candidate)
+
+                    # result_store 기록
+                    if result.status == ExecutionStatus.SUCCESS:
+                        record_result(candidate.rule_id, ResultStatus.SUCCESS, result.message)
+                    elif result.status == ExecutionStatus.REJECTED:
+                        record_result(candidate.rule_id, ResultStatus.BLOCKED, result.message)
+                    else:
+                        record_result(candidate.rule_id, ResultStatus.FAILED, result.message)
+                    if self._on_execution:
+                        self._on_execution(result)
+            finally:
+                self._price_verifier.end_cycle()
 
             # 마지막 evaluate 시각 갱신 (HealthWatchdog 하트비트용)
             self._last_evaluate_ts = datetime.now()
 
         except Exception:
-            logger.exception("evaluate_all 오류")
+            logger.exception("평가 사이클 오류")
 
     def _collect_candidates(
         self,
         rule: dict,
         cycle_id: str,
+        tfs: Iterable[str] | None = None,
+        advance: set[str] | None = None,
     ) -> list[tuple[CandidateSignal, dict[str, Any]]]:
-        """개별 규칙 평가 → CandidateSignal 리스트. 양방향 규칙은 BUY+SELL 동시 생성."""
+        """개별 규칙 평가 → CandidateSignal 리스트. 양방향 규칙은 BUY+SELL 동시 생성.
+
+        tfs: 이 종목의 활성 규칙 전체가 쓰는 분봉 TF. 지표 dict는 종목당 한 번만 만들어
+        같은 사이클의 규칙끼리 공유하므로 합집합을 넘긴다 (None이면 규칙 자신의 TF).
+        advance: PositionState를 갱신할 종목 (_prepare_v2 참고, None이면 항상 갱신).
+        """
         rule_id = rule.get("id", 0)
-        symbol = rule.get("symbol", "")
-        results: list[tuple[CandidateSignal, dict[str, Any]]] = []
 
         try:
-            # 시세 조회
-            latest = self._bar_builder.get_latest(symbol)
-            if not latest:
-                logger.debug("Rule %d (%s): 시세 미수신", rule_id, symbol)
-                return results
-
-            # TF별 기술적 지표 주입: {tf: indicators_dict}
-            indicators_by_tf: dict[str, dict] = {}
-            daily_ind = self._indicator_provider.get(symbol, "1d")
-            indicators_by_tf["1d"] = daily_ind
-            for tf in _extract_rule_tfs(rule):
-                minute_ind = self._indicator_provider.get(symbol, tf)
-                if minute_ind is not None:
-                    indicators_by_tf[tf] = minute_ind
-            latest["indicators"] = indicators_by_tf
+            latest = self._market_snapshot(rule, tfs)
+            if latest is None:
+                return []
 
             # v2 분기: script에 → / -> / 매수: / 매도: 가 있으면 v2 경로
             script = rule.get("script") or ""
             if RuleEvaluator.is_v2_script(script):
-                return self._collect_candidates_v2(rule, cycle_id, latest)
+                return self._collect_candidates_v2(rule, cycle_id, latest, advance)
 
             # ── v1 경로 (기존 코드) ──
             context = self._context_cache.get()
-            buy_result, sell_result = self._evaluator.evaluate(rule, latest, context)
-
-            priority = rule.get("priority", 0)
-            execution = rule.get("execution") or {}
-            qty = int(execution.get("qty_value", rule.get("qty", 1)))
-            price = float(latest.get("price", 0))
-
-            if buy_result:
-                signal = CandidateSignal(
-                    signal_id=uuid.uuid4().hex[:12],
-                    cycle_id=cycle_id,
-                    rule_id=rule_id,
-                    symbol=symbol,
-                    side="BUY",
-                    priority=priority,
-                    desired_qty=qty,
-                    detected_at=datetime.now(),
-                    latest_price=price,
-                    reason="매수 조건 충족",
-                    raw_rule=rule,
-                    intent_id=uuid.uuid4().hex[:12],
-                )
-                results.append((signal, latest))
-
-            if sell_result:
-                signal = CandidateSignal(
-                    signal_id=uuid.uuid4().hex[:12],
-                    cycle_id=cycle_id,
-                    rule_id=rule_id,
-                    symbol=symbol,
-                    side="SELL",
-                    priority=priority,
-                    desired_qty=qty,
-                    detected_at=datetime.now(),
-                    latest_price=price,
-                    reason="매도 조건 충족",
-                    raw_rule=rule,
-                    intent_id=uuid.uuid4().hex[:12],
-                )
-                results.append((signal, latest))
+            buy_result, sell_result = self._evaluator.evaluate(
+                rule, latest, context, cache=self._eval_cache,
+            )
+            return self._v1_candidates(rule, cycle_id, latest, buy_result, sell_result)
 
         except Exception:
             logger.exception("Rule %d 후보 수집 오류", rule_id)
+            return []
 
+    def _market_snapshot(self, rule: dict, tfs: Iterable[str] | None) -> dict[str, Any] | None:
+        """규칙 종목의 최신 시세 + TF별 기술적 지표 {tf: indicators_dict} (종목당 사이클 1회)."""
+        symbol = rule.get("symbol", "")
+        latest = self._bar_builder.get_latest(symbol)
+        if not latest:
+            logger.debug("Rule %d (%s): 시세 미수신", rule.get("id", 0), symbol)
+            return None
+        if tfs is None:
+            tfs = set(_extract_rule_tfs(rule))
+        latest["indicators"] = self._eval_cache.indicators(
+            symbol, lambda: self._load_indicators(symbol, tfs),
+        )
+        return latest
+
+    def _v1_candidates(
+        self,
+        rule: dict,
+        cycle_id: str,
+        latest: dict[str, Any],
+        buy_result: bool,
+        sell_result: bool,
+        reason_suffix: str = "",
+    ) -> list[tuple[CandidateSignal, dict[str, Any]]]:
+        """v1 평가 결과(매수/매도) → CandidateSignal 리스트."""
+        execution = rule.get("execution") or {}
+        qty = int(execution.get("qty_value", rule.get("qty", 1)))
+        price = float(latest.get("price", 0))
+        results: list[tuple[CandidateSignal, dict[str, Any]]] = []
+        for fired, side, reason in (
+            (buy_result, "BUY", "매수 조건 충족"),
+            (sell_result, "SELL", "매도 조건 충족"),
+        ):
+            if not fired:
+                continue
+            signal = CandidateSignal(
+                signal_id=uuid.uuid4().hex[:12],
+                cycle_id=cycle_id,
+                rule_id=rule.get("id", 0),
+                symbol=rule.get("symbol", ""),
+                side=side,
+                priority=rule.get("priority", 0),
+                desired_qty=qty,
+                detected_at=datetime.now(),
+                latest_price=price,
+                reason=reason + reason_suffix,
+                raw_rule=rule,
+                intent_id=uuid.uuid4().hex[:12],
+            )
+            results.append((signal, latest))
         return results
 
+    def _load_indicators(self, symbol: str, tfs: Iterable[str]) -> dict[str, dict]:
+        """종목의 일봉 + 분봉 TF별 지표 dict."""
+        indicators_by_tf: dict[str, dict] = {}
+        indicators_by_tf["1d"] = self._indicator_provider.get(symbol, "1d")
+        for tf in sorted(tfs):
+            minute_ind = self._indicator_provider.get(symbol, tf)
+            if minute_ind is not None:
+                indicators_by_tf[tf] = minute_ind
+        return indicators_by_tf
+
     def _collect_candidates_v2(
         self,
         rule: dict,
         cycle_id: str,
         latest: dict[str, Any],
+        advance: set[str] | None = None,
     ) -> list[tuple[CandidateSignal, dict[str, Any]]]:
         """v2 DSL 규칙 평가 → CandidateSignal 리스트."""
-        rule_id = rule.get("id", 0)
+        try:
+            ps, context, track = self._prepare_v2(rule, latest, advance)
+            # v2 평가 — 조건 상태 구독/샘플 주기가 아니면 세부 값 없이 경량 평가
+            result = self._evaluator.evaluate_v2(
+                rule, latest, context, cache=self._eval_cache, track=track,
+            )
+            return self._v2_candidates(rule, cycle_id, latest, ps, context, track, result)
+        except Exception:
+            logger.exception("Rule %d v2 후보 수집 오류 — v1 폴백 시도", rule.get("id", 0))
+            return self._v1_fallback(rule, cycle_id, latest)
+
+    def _prepare_v2(
+        self, rule: dict, latest: dict[str, Any], advance: set[str] | None = None,
+    ) -> tuple[PositionState, dict[str, Any], bool]:
+        """v2 평가 입력 — (종목 PositionState, 컨텍스트, 조건 세부 기록 여부).
+
+        advance: 이번 사이클에 보유봉/고점을 갱신할 종목 — 갱신하면 빼서 종목당 한 번만.
+        여기 없는 종목(시세 트리거 평가)은 상태를 바꾸지 않고 컨텍스트만 만든다.
+        """
         symbol = rule.get("symbol", "")
         price = float(latest.get("price", 0))
-        results: list[tuple[CandidateSignal, dict[str, Any]]] = []
 
-        try:
-            # PositionState: 종목별 (per-symbol)
-            ps = self._position_states.get(symbol)
-            if ps is None:
-                ps = PositionState(symbol=symbol)
-                self._position_states[symbol] = ps
+        # PositionState: 종목별 (per-symbol)
+        ps = self._position_states.get(symbol)
+        if ps is None:
+            ps = PositionState(symbol=symbol)
+            self._position_states[symbol] = ps
 
+        if advance is None:
+            ps.update_cycle(price)
+        elif symbol in advance:
+            advance.discard(symbol)
             ps.update_cycle(price)
 
-            # context = 포지션 상태 + 실행횟수
-            context = ps.to_context(price)
-            for idx, cnt in ps.execution_counts.items():
-                context[f"실행횟수_{idx}"] = cnt
+        # context = 포지션 상태 + 실행횟수
+        context = ps.to_context(price)
+        for idx, cnt in ps.execution_counts.items():
+            context[f"실행횟수_{idx}"] = cnt
 
-            # v2 평가
-            result = self._evaluator.evaluate_v2(rule, latest, context)
+        return ps, context, self._condition_tracker.wants_details(rule.get("id", 0))
 
-            # ConditionTracker 기록 (매 사이클)
+    def _v2_candidates(
+        self,
+        rule: dict,
+        cycle_id: str,
+        latest: dict[str, Any],
+        ps: PositionState,
+        context: dict[str, Any],
+        track: bool,
+        result: EvalV2Result,
+    ) -> list[tuple[CandidateSignal, dict[str, Any]]]:
+        """v2 평가 결과 → 조건 추적 기록 + CandidateSignal 리스트."""
+        rule_id = rule.get("id", 0)
+        symbol = rule.get("symbol", "")
+        price = float(latest.get("price", 0))
+        results: list[tuple[CandidateSignal, dict[str, Any]]] = []
+
+        tracker = self._condition_tracker
+        action_dict = None
+        if result.action:
+            action_dict = {
+                "side": result.action.side,
+                "qty_type": result.action.qty_type,
+                "qty_value": result.action.qty_value,
+                "rule_index": result.action.rule_index,
+            }
+        if track:
             conditions = [
                 {"index": s.rule_index, "result": s.result, "details": s.details}
                 for s in result.snapshots
             ]
-            action_dict = None
-            if result.action:
-                action_dict = {
-                    "side": result.action.side,
-                    "qty_type": result.action.qty_type,
-                    "qty_value": result.action.qty_value,
-                    "rule_index": result.action.rule_index,
-                }
-            self._condition_tracker.record(
+            tracker.record(
                 rule_id=rule_id, cycle=cycle_id,
                 conditions=conditions, position=context, action=action_dict,
             )
+        else:
+            tracker.record_action(rule_id, action_dict)
+
+        if result.action is None:
+            return results
+
+        action = result.action
+        side = "BUY" if action.side == "매수" else "SELL"
+
+        # 수량 계산
+        qty = self._calc_v2_qty(action, side, ps, price, rule)
+
+        if qty <= 0:
+            logger.debug("Rule %d v2: qty=0, 스킵", rule_id)
+            return results
+
+        # raw_rule에 execution.qty_value를 오버라이드한 사본 전달
+        rule_copy = {**rule, "execution": {
+            **(rule.get("execution") or {}),
+            "qty_value": qty,
+        }}
+
+        signal = CandidateSignal(
+            signal_id=uuid.uuid4().hex[:12],
+            cycle_id=cycle_id,
+            rule_id=rule_id,
+            symbol=symbol,
+            side=side,
+            priority=rule.get("priority", 0),
+            desired_qty=qty,
+            detected_at=datetime.now(),
+            latest_price=price,
+            reason=action.expr_text or f"v2 규칙 #{action.rule_index} 충족",
+            raw_rule=rule_copy,
+            intent_id=uuid.uuid4().hex[:12],
+        )
+        results.append((signal, latest))
+
+        # ConditionTracker 트리거 기록
+        self._condition_tracker.record_trigger(
+            rule_id=rule_id,
+            at=datetime.now().isoformat(),
+            index=action.rule_index,
+            action=f"{side} {qty}",
+        )
+        return results
 
-            if result.action is None:
-                return results
-
-            action = result.action
-            side = "BUY" if action.side == "매수" else "SELL"
-
-            # 수량 계산
-            qty = self._calc_v2_qty(action, side, ps, price, rule)
-
-            if qty <= 0:
-                logger.debug("Rule %d v2: qty=0, 스킵", rule_id)
-                return results
-
-            # raw_rule에 execution.qty_value를 오버라이드한 사본 전달
-            rule_copy = {**rule, "execution": {
-                **(rule.get("execution") or {}),
-                "qty_value": qty,
-            }}
-
-            signal = CandidateSignal(
-                signal_id=uuid.uuid4().hex[:12],
-                cycle_id=cycle_id,
-                rule_id=rule_id,
-                symbol=symbol,
-                side=side,
-                priority=rule.get("priority", 0),
-                desired_qty=qty,
-                detected_at=datetime.now(),
-                latest_price=price,
-                reason=action.expr_text or f"v2 규칙 #{action.rule_index} 충족",
-                raw_rule=rule_copy,
-                intent_id=uuid.uuid4().hex[:12],
+    def _v1_fallback(
+        self, rule: dict, cycle_id: str, latest: dict[str, Any],
+    ) -> list[tuple[CandidateSignal, dict[str, Any]]]:
+        """v2 실패 시 v1 평가로 후보 생성."""
+        try:
+            context = self._context_cache.get()
+            buy_result, sell_result = self._evaluator.evaluate(
+                rule, latest, context, cache=self._eval_cache,
             )
-            results.append((signal, latest))
-
-            # ConditionTracker 트리거 기록
-            self._condition_tracker.record_trigger(
-                rule_id=rule_id,
-                at=datetime.now().isoformat(),
-                index=action.rule_index,
-                action=f"{side} {qty}",
+            return self._v1_candidates(
+                rule, cycle_id, latest, buy_result, sell_result, reason_suffix=" (v1 폴백)",
             )
-
         except Exception:
-            logger.exception("Rule %d v2 후보 수집 오류 — v1 폴백 시도", rule_id)
-            # v2 실패 시 v1 폴백
+            logger.exception("Rule %d v1 폴백도 실패", rule.get("id", 0))
+            return []
+
+    async def _collect_candidates_pooled(
+        self, active_rules: list[PlannedRule], cycle_id: str, advance: set[str] | None = None,
+    ) -> list[tuple[CandidateSignal, dict[str, Any]]]:
+        """워커 풀 후보 수집 — 스냅샷/컨텍스트는 여기서, 평가는 샤드 워커, 후보 생성은 다시 여기서.
+
+        결과는 active_rules 순서(priority 내림차순)로 합쳐 단일 루프 모드와 같은 후보 목록을 만든다.
+        """
+        snapshots: dict[str, dict[str, Any]] = {}
+        jobs: dict[str, list] = {}
+        prepared: dict[int, tuple] = {}
+        for planned in active_rules:
+            rule = planned.rule
             try:
-                context = self._context_cache.get()
-                buy_result, sell_result = self._evaluator.evaluate(rule, latest, context)
-                execution = rule.get("execution") or {}
-                qty = int(execution.get("qty_value", rule.get("qty", 1)))
-                priority = rule.get("priority", 0)
-
-                if buy_result:
-                    results.append((CandidateSignal(
-                        signal_id=uuid.uuid4().hex[:12], cycle_id=cycle_id,
-                        rule_id=rule_id, symbol=symbol, side="BUY",
-                        priority=priority, desired_qty=qty,
-                        detected_at=datetime.now(), latest_price=price,
-                        reason="매수 조건 충족 (v1 폴백)", raw_rule=rule,
-                        intent_id=uuid.uuid4().hex[:12],
-                    ), latest))
-                if sell_result:
-                    results.append((CandidateSignal(
-                        signal_id=uuid.uuid4().hex[:12], cycle_id=cycle_id,
-                        rule_id=rule_id, symbol=symbol, side="SELL",
-                        priority=priority, desired_qty=qty,
-                        detected_at=datetime.now(), latest_price=price,
-                        reason="매도 조건 충족 (v1 폴백)", raw_rule=rule,
-                        intent_id=uuid.uuid4().hex[:12],
-                    ), latest))
+                latest = snapshots.get(planned.symbol)
+                if latest is None:
+                    latest = self._market_snapshot(rule, planned.tfs)
+                    if latest is None:
+                        continue
+                    snapshots[planned.symbol] = latest
+                if RuleEvaluator.is_v2_script(rule.get("script") or ""):
+                    ps, context, track = self._prepare_v2(rule, latest, advance)
+                    job = (planned.rule_id, "v2", context, track)
+                else:
+                    ps, context, track = None, self._context_cache.get(), False
+                    job = (planned.rule_id, "v1", context, False)
             except Exception:
-                logger.exception("Rule %d v1 폴백도 실패", rule_id)
-
-        return results
+                logger.exception("Rule %d 후보 수집 오류", planned.rule_id)
+                continue
+            jobs.setdefault(planned.symbol, []).append(job)
+            prepared[planned.rule_id] = (planned, latest, ps, context, track)
+
+        results = await self._eval_pool.evaluate(cycle_id, snapshots, jobs)
+
+        collected: list[tuple[CandidateSignal, dict[str, Any]]] = []
+        for rule_id, (planned, latest, ps, context, track) in prepared.items():
+            outcome = results.get(rule_id)
+            if outcome is None:
+                continue
+            kind, value = outcome
+            rule = planned.rule
+            if kind == "v2":
+                try:
+                    collected.extend(
+                        self._v2_candidates(rule, cycle_id, latest, ps, context, track, value),
+                    )
+                except Exception:
+                    logger.exception("Rule %d v2 후보 수집 오류 — v1 폴백 시도", rule_id)
+                    collected.extend(self._v1_fallback(rule, cycle_id, latest))
+            else:
+                collected.extend(self._v1_candidates(rule, cycle_id, latest, *value))
+        return collected
 
     def _calc_v2_qty(
         self,
@@ -597,9 +941,9 @@ class StrategyEngine:
             ps.record_sell(qty)
 
         # raw_rule에서 v2 action의 rule_index를 추출하여 실행횟수 기록
-        action_dict = self._condition_tracker.get_latest(candidate.rule_id)
-        if action_dict and action_dict.get("action"):
-            rule_index = action_dict["action"].get("rule_index", 0)
+        action_dict = self._condition_tracker.latest_action(candidate.rule_id)
+        if action_dict:
+            rule_index = action_dict.get("rule_index", 0)
             ps.record_execution(rule_index)
 
     # ── 포지션 동기화 ──
@@ -611,7 +955,7 @@ class StrategyEngine:
         if not self._broker or not self._broker.is_connected:
             return
         try:
-            balance = await self._broker.get_balance()
+            balance = await self._account.balance()
         except Exception:
             logger.debug("포지션 동기화: 잔고 조회 실패 (스킵)")
             return
@@ -634,13 +978,14 @@ class StrategyEngine:
     # ── 손실 제한 처리 ──
 
     async def _cancel_open_orders(self) -> int:
-        """손실 제한 발동 시 미체결 주문을 전량 취소한다."""
+        """손실 제한 발동 시 미체결 주문을 전량 취소한다 (캐시 대신 브로커에서 새로 조회)."""
         cancelled = 0
         try:
-            open_orders = await self._broker.get_open_orders()
+            open_orders = await self._account.open_orders(force=True)
             for order in open_orders:
                 try:
                     await self._broker.cancel_order(order.order_id)
+                    self._account.on_order_cancelled(order.order_id)
                     cancelled += 1
                 except Exception as e:
                     logger.error("미체결 취소 실패 (order_id=%s): %s", order.order_id, e)
@@ -713,27 +1058,40 @@ class StrategyEngine:
     # ── WS 콜백 ──
 
     def _on_quote(self, event: QuoteEvent) -> None:
-        """subscribe_quotes 콜백."""
+        """subscribe_quotes 콜백. 분봉 완성 시 BarBuilder가 이벤트 평가를 예약한다."""
         self._bar_builder.on_quote(
             symbol=event.symbol,
             price=event.price,
             volume=event.volume,
             timestamp=event.timestamp,
         )
+        if self._event_trigger is not None:
+            self._event_trigger.on_quote(event.symbol)
+
+    def _on_bar_complete(self, symbol: str, bar: Bar) -> None:
+        """BarBuilder 분봉 완성 콜백 — 히스토리 반영 후 이벤트 평가 예약."""
+        self._minute_history.append(symbol, bar.as_record())
+        if self._event_trigger is not None:
+            self._event_trigger.on_bar_complete(symbol)
 
 
 # ── 모듈 레벨 헬퍼 ──
 
-_TF_PATTERN = _re.compile(r'"(1m|5m|15m|1h)"')
+def _rule_dependencies(rule: dict) -> ScriptDependencies | None:
+    """규칙 script의 정적 의존성 (소스 단위 캐시). script 없음/파싱 실패 시 None."""
+    script = rule.get("script") or ""
+    if not script:
+        return None
+    return analyze_script(script)
 
 
 def _extract_rule_tfs(rule: dict) -> list[str]:
     """규칙 script에서 사용된 분봉 TF 목록을 추출한다.
 
-    DSL script에서 "5m" 형태 문자열을 파싱하여 중복 없이 반환.
+    DSL 정적 분석으로 지표 함수의 TF 인자(상수 참조 포함)를 모은다.
     script가 없거나 파싱 실패 시 빈 리스트 반환.
     """
-    script = rule.get("script") or ""
-    if not script:
+    deps = _rule_dependencies(rule)
+    if deps is None:
         return []
-    return list(dict.fromkeys(_TF_PATTERN.findall(script)))
+    return [tf for tf in deps.timeframes if tf in MINUTE_TFS]
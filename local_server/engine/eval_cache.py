@@ -0,0 +1,139 @@
+"""EvalCycleCache — 사이클 단위 종목별 평가 캐시.
+
+같은 사이클에서 같은 종목을 보는 규칙들은 시세·지표가 동일하다.
+종목당 한 번만 지표 dict와 DSL 공통 컨텍스트(시세/시간 필드 + 지표 함수)를 만들고,
+지표 함수 호출 결과(RSI(14), MA(20, "5m") 등)는 (함수명, 인자) 키로 규칙 간에 공유한다.
+지표 함수는 순수(같은 사이클·같은 인자 → 같은 값)하다고 가정한다.
+
+evaluate_all이 후보 수집 구간을 begin_cycle()/end_cycle()로 감싼다.
+사이클 밖에서의 호출(단독 평가, 테스트)은 캐시 없이 매번 새로 만든다.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class EvalCacheStats:
+    """캐시 적중 카운터."""
+
+    context_hits: int = 0
+    context_misses: int = 0
+    call_hits: int = 0
+    call_misses: int = 0
+
+    @property
+    def context_hit_rate(self) -> float:
+        return _rate(self.context_hits, self.context_misses)
+
+    @property
+    def call_hit_rate(self) -> float:
+        return _rate(self.call_hits, self.call_misses)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "context_hit_rate": self.context_hit_rate,
+            "call_hit_rate": self.call_hit_rate,
+        }
+
+
+def _rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return round(hits / total, 4) if total else 0.0
+
+
+class EvalCycleCache:
+    """사이클 단위 종목별 평가 캐시 + 적중률 지표."""
+
+    def __init__(self) -> None:
+        self._cycle_id: Optional[str] = None
+        self._active = False
+        # {symbol: {tf: indicators_dict}}
+        self._indicators: dict[str, dict[str, dict]] = {}
+        # {symbol: 공통 DSL 컨텍스트 (지표 함수는 메모이즈 래핑)}
+        self._contexts: dict[str, dict[str, Any]] = {}
+        # {symbol: {(함수명, 인자): 결과}}
+        self._calls: dict[str, dict[tuple, Any]] = {}
+        self._cycle = EvalCacheStats()
+        self._total = EvalCacheStats()
+
+    def begin_cycle(self, cycle_id: str) -> None:
+        """새 사이클 시작 — 이전 사이클 캐시 폐기, 사이클 카운터 초기화."""
+        self._clear()
+        self._cycle_id = cycle_id
+        self._active = True
+        self._cycle = EvalCacheStats()
+
+    def end_cycle(self) -> None:
+        """사이클 종료 — 캐시 폐기 (카운터는 stats() 조회용으로 유지)."""
+        self._clear()
+        self._active = False
+
+    def _clear(self) -> None:
+        self._indicators.clear()
+        self._contexts.clear()
+        self._calls.clear()
+
+    def indicators(self, symbol: str, build: Callable[[], dict[str, dict]]) -> dict[str, dict]:
+        """종목의 TF별 지표 dict. 사이클 내 첫 요청에서만 build()."""
+        if not self._active:
+            return build()
+        cached = self._indicators.get(symbol)
+        if cached is None:
+            cached = self._indicators[symbol] = build()
+        return cached
+
+    def market_context(self, symbol: str, build: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        """종목 공통 DSL 컨텍스트. 호출자는 복사해서 규칙별 필드를 덧붙인다."""
+        if not self._active:
+            return build()
+        cached = self._contexts.get(symbol)
+        if cached is not None:
+            self._cycle.context_hits += 1
+            self._total.context_hits += 1
+            return cached
+
+        self._cycle.context_misses += 1
+        self._total.context_misses += 1
+        ctx = build()
+        calls = self._calls.setdefault(symbol, {})
+        for name, value in ctx.items():
+            if callable(value):
+                ctx[name] = self._memoize(name, value, calls)
+        self._contexts[symbol] = ctx
+        return ctx
+
+    def _memoize(self, name: str, func: Callable, calls: dict[tuple, Any]) -> Callable:
+        def cached(*args):
+            key = (name, args)
+            try:
+                if key in calls:
+                    self._cycle.call_hits += 1
+                    self._total.call_hits += 1
+                    return calls[key]
+            except TypeError:  # 해시 불가 인자 — 캐시 없이 호출
+                return func(*args)
+            self._cycle.call_misses += 1
+            self._total.call_misses += 1
+            value = calls[key] = func(*args)
+            return value
+        return cached
+
+    @property
+    def cycle_stats(self) -> EvalCacheStats:
+        return self._cycle
+
+    @property
+    def total_stats(self) -> EvalCacheStats:
+        return self._total
+
+    def stats(self) -> dict[str, Any]:
+        """직전(진행 중) 사이클 + 누적 적중률."""
+        return {
+            "cycle_id": self._cycle_id,
+            "symbols": len(self._contexts),
+            "cycle": self._cycle.to_dict(),
+            "total": self._total.to_dict(),
+        }
@@ -0,0 +1,160 @@
+"""EvalPool — 종목 샤드별 워커 프로세스에서 규칙 평가 (opt-in).
+
+DSL 평가는 CPU 작업이라 규칙이 수천 개면 이벤트 루프(WS 시세, 로컬 API)를 막는다.
+eval_workers > 0이면 종목을 해시로 샤드에 고정하고, 샤드마다 워커 프로세스 1개가
+자기 종목 규칙의 RuleEvaluator(컴파일 캐시 + 상향돌파/횟수/expr[N] state)를 사이클 간에 들고 있는다.
+
+- 부모: 사이클마다 종목별 시세·지표 스냅샷 + 규칙별 컨텍스트(포지션 상태)를 샤드별로 보냄
+- 워커: 평가 결과(v2: action/스냅샷, v1: 매수/매도)만 돌려줌
+- 후보 생성·SystemTrader 선택·주문은 부모에서 기존 로직 그대로
+
+규칙 목록은 set_rules 후 해당 샤드의 다음 평가 요청에 한 번 실어 보낸다 (워커가 diff해
+script/종목이 바뀐 규칙만 state를 버린다). 워커가 죽으면 그 샤드는 새 프로세스로 다시 띄우고
+state는 초기화된다 (그 사이클의 해당 샤드 결과는 없음).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable
+
+from local_server.engine.eval_cache import EvalCycleCache
+from local_server.engine.evaluator import RuleEvaluator
+from sv_core.parsing import EvalV2Result
+from sv_core.parsing.evaluator import ConditionSnapshot
+
+logger = logging.getLogger(__name__)
+
+# 평가 요청 1건: (rule_id, "v2"|"v1", 컨텍스트, 조건 세부 기록 여부)
+EvalJob = tuple[int, str, dict, bool]
+
+
+class EvalPool:
+    """종목 샤드 → 워커 프로세스 (샤드당 1개, state 고정)."""
+
+    def __init__(self, workers: int) -> None:
+        self._ctx = multiprocessing.get_context("spawn")
+        self._pools = [self._new_pool() for _ in range(workers)]
+        self._rules: list[dict[int, dict]] = [{} for _ in range(workers)]
+        self._dirty: set[int] = set()  # 규칙 목록을 아직 받지 못한 샤드
+
+    @property
+    def workers(self) -> int:
+        return len(self._pools)
+
+    def shard_of(self, symbol: str) -> int:
+        """종목 → 샤드 (프로세스 재시작과 무관하게 고정)."""
+        return zlib.crc32(symbol.encode()) % len(self._pools)
+
+    def set_rules(self, rules: Iterable[dict]) -> None:
+        """샤드별 규칙 목록 갱신 — 다음 평가 요청에 실어 보낸다."""
+        by_shard: list[dict[int, dict]] = [{} for _ in self._pools]
+        for rule in rules:
+            by_shard[self.shard_of(rule.get("symbol", ""))][rule.get("id", 0)] = rule
+        self._dirty.update(i for i, shard in enumerate(by_shard) if shard != self._rules[i])
+        self._rules = by_shard
+
+    async def evaluate(
+        self,
+        cycle_id: str,
+        snapshots: dict[str, dict],
+        jobs: dict[str, list[EvalJob]],
+    ) -> dict[int, tuple[str, Any]]:
+        """종목별 스냅샷/평가 요청 → {rule_id: ("v2", EvalV2Result) | ("v1", (매수, 매도))}.
+
+        샤드들은 동시에 평가하고, 이벤트 루프는 결과를 기다리는 동안 다른 일을 한다.
+        """
+        shard_snaps: dict[int, dict[str, dict]] = {}
+        shard_jobs: dict[int, list[tuple[str, EvalJob]]] = {}
+        for symbol, symbol_jobs in jobs.items():
+            shard = self.shard_of(symbol)
+            shard_snaps.setdefault(shard, {})[symbol] = snapshots[symbol]
+            shard_jobs.setdefault(shard, []).extend((symbol, job) for job in symbol_jobs)
+
+        loop = asyncio.get_running_loop()
+        shards = sorted(shard_jobs)
+        futures = []
+        for shard in shards:
+            rules = self._rules[shard] if shard in self._dirty else None
+            self._dirty.discard(shard)
+            futures.append(loop.run_in_executor(
+                self._pools[shard], _evaluate_batch,
+                cycle_id, rules, shard_snaps[shard], shard_jobs[shard],
+            ))
+
+        merged: dict[int, tuple[str, Any]] = {}
+        for shard, outcome in zip(shards, await asyncio.gather(*futures, return_exceptions=True)):
+            if isinstance(outcome, BaseException):
+                logger.error("평가 워커 %d 실패 — 재시작 (state 초기화): %r", shard, outcome)
+                self._restart(shard)
+                continue
+            merged.update(outcome)
+        return merged
+
+    def shutdown(self) -> None:
+        for pool in self._pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=1, mp_context=self._ctx, initializer=_init_worker)
+
+    def _restart(self, shard: int) -> None:
+        self._pools[shard].shutdown(wait=False, cancel_futures=True)
+        self._pools[shard] = self._new_pool()
+        self._dirty.add(shard)
+
+
+# ── 워커 프로세스 ──
+
+_evaluator: RuleEvaluator | None = None
+_rules: dict[int, dict] = {}
+_cache = EvalCycleCache()
+
+
+def _init_worker() -> None:
+    global _evaluator
+    _evaluator = RuleEvaluator()
+
+
+def _sync_rules(rules: dict[int, dict]) -> None:
+    """규칙 목록 교체 — script/종목이 바뀌었거나 사라진 규칙만 컴파일 캐시와 state를 버린다."""
+    global _rules
+    for rule_id, old in _rules.items():
+        new = rules.get(rule_id)
+        if new is None or (new.get("script"), new.get("symbol")) != (old.get("script"), old.get("symbol")):
+            _evaluator.invalidate_cache(rule_id)
+    _rules = rules
+
+
+def _evaluate_batch(
+    cycle_id: str,
+    rules: dict[int, dict] | None,
+    snapshots: dict[str, dict],
+    jobs: list[tuple[str, EvalJob]],
+) -> dict[int, tuple[str, Any]]:
+    """샤드 1개의 사이클 평가 (워커 프로세스에서 실행)."""
+    if rules is not None:
+        _sync_rules(rules)
+    results: dict[int, tuple[str, Any]] = {}
+    _cache.begin_cycle(cycle_id)
+    try:
+        for symbol, (rule_id, kind, context, track) in jobs:
+            rule = _rules.get(rule_id)
+            if rule is None:
+                continue
+            latest = snapshots[symbol]
+            if kind == "v2":
+                result = _evaluator.evaluate_v2(rule, latest, context, cache=_cache, track=track)
+                # 경량 평가의 details(읽기 전용 공유 매핑)는 pickle되지 않으므로 세부 기록 시에만 복사
+                snapshots_out = [
+                    ConditionSnapshot(s.rule_index, s.result, dict(s.details)) for s in result.snapshots
+                ] if track else []
+                results[rule_id] = ("v2", EvalV2Result(result.action, snapshots_out))
+            else:
+                results[rule_id] = ("v1", _evaluator.evaluate(rule, latest, context, cache=_cache))
+    finally:
+        _cache.end_cycle()
+    return results
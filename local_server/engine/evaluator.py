@@ -1,19 +1,25 @@
 """RuleEvaluator — 규칙 조건 평가.
 
-v2: DSL script → sv_core.parsing.evaluate → (buy, sell)
+v2: DSL script → 컴파일(클로저 트리, 규칙별 캐시 — 파싱은 sv_core 전역 캐시) → (buy, sell)
 v1: JSON conditions → 기존 AND/OR 평가 → (buy, sell) 폴백
+
+프로파일링(set_profiling)을 켜면 v2 규칙을 계측 컴파일본으로 평가해 규칙별로
+내장 함수/조건 줄/노드 타입 시간을 누적한다 (v1 경로는 규칙 전체 시간만).
 """
 from __future__ import annotations
 
-import hashlib
 import logging
 from datetime import datetime
+from time import perf_counter
 from decimal import Decimal, InvalidOperation
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from sv_core.parsing import parse, parse_v2, EvalProfile, EvalV2Result
+from sv_core.parsing import compile_script, compile_script_v2, CompiledScript, CompiledScriptV2
 
-from sv_core.parsing import parse, evaluate as dsl_evaluate
-from sv_core.parsing import parse_v2, evaluate_v2 as _eval_v2, EvalV2Result
-from sv_core.parsing.ast_nodes import Script, ScriptV2
+if TYPE_CHECKING:
+    from sv_core.parsing.ast_nodes import ScriptV2
+    from local_server.engine.eval_cache import EvalCycleCache
 
 logger = logging.getLogger(__name__)
 
@@ -22,49 +28,129 @@ class RuleEvaluator:
     """규칙 조건을 현재 데이터로 평가."""
 
     def __init__(self) -> None:
-        # AST 캐시: {rule_id: (script_hash, ast)}
-        self._ast_cache: dict[int, tuple[str, Script]] = {}
-        # v2 AST 캐시: {rule_id: (script_hash, ast)}
-        self._v2_ast_cache: dict[int, tuple[str, ScriptV2]] = {}
+        # 컴파일 캐시: {rule_id: (script, compiled)}
+        self._ast_cache: dict[int, tuple[str, CompiledScript]] = {}
+        # v2 컴파일 캐시: {rule_id: (script, compiled)}
+        self._v2_ast_cache: dict[int, tuple[str, CompiledScriptV2]] = {}
         # 상향돌파/하향돌파 state: {rule_id: state_dict}
         self._cross_states: dict[int, dict] = {}
         # v2 평가 state: {rule_id: state_dict}
         self._v2_states: dict[int, dict] = {}
+        # 프로파일링 (opt-in): 계측 컴파일 캐시 / 규칙별 프로파일 / 규칙별 [평가 수, 누적 초]
+        self._profiling = False
+        self._profiled_cache: dict[int, tuple[str, CompiledScriptV2]] = {}
+        self._profiles: dict[int, EvalProfile] = {}
+        self._rule_times: dict[int, list] = {}
 
-    def evaluate(self, rule: dict, market_data: dict, context: dict) -> tuple[bool, bool]:
+    def evaluate(
+        self, rule: dict, market_data: dict, context: dict,
+        cache: EvalCycleCache | None = None,
+    ) -> tuple[bool, bool]:
         """규칙 평가 → (매수 결과, 매도 결과).
 
         script가 있으면 DSL 경로, 없으면 v1 JSON 폴백.
+        cache가 주어지면 같은 종목 규칙끼리 DSL 컨텍스트·지표 호출 결과를 공유한다.
         """
+        if self._profiling:
+            start = perf_counter()
+            try:
+                return self._evaluate(rule, market_data, context, cache)
+            finally:
+                self._add_rule_time(rule.get("id", 0), perf_counter() - start)
+        return self._evaluate(rule, market_data, context, cache)
+
+    def _evaluate(
+        self, rule: dict, market_data: dict, context: dict,
+        cache: EvalCycleCache | None,
+    ) -> tuple[bool, bool]:
         script = rule.get("script")
         if script is not None:
-            return self._eval_dsl(rule, market_data, context)
+            return self._eval_dsl(rule, market_data, context, cache)
         return self._eval_json(rule, market_data, context)
 
     def evaluate_v2(
         self, rule: dict, market_data: dict, context: dict,
+        cache: EvalCycleCache | None = None, *, track: bool = True,
     ) -> EvalV2Result:
         """v2 DSL 평가 → EvalV2Result.
 
-        v2 script를 파싱하고 evaluate_v2를 호출한다.
+        v2 script를 파싱·컴파일(캐시)하고 평가한다.
         v1 스크립트(매수:/매도:)도 parse_v2가 호환 처리한다.
+        track=False면 조건별 세부 값을 기록하지 않는다 (ConditionTracker 미조회 시).
         """
         rule_id = rule.get("id", 0)
         script = rule.get("script", "")
+        start = perf_counter() if self._profiling else 0.0
 
         try:
-            ast = self._get_or_parse_v2(rule_id, script)
-            eval_ctx = self._build_dsl_context(market_data, context)
+            if self._profiling:
+                compiled = self._get_or_compile_profiled(rule_id, script)
+            else:
+                compiled = self._get_or_compile_v2(rule_id, script)
+            eval_ctx = self._dsl_context(rule, market_data, context, cache)
             state = self._v2_states.setdefault(rule_id, {})
-            return _eval_v2(ast, eval_ctx, state)
+            return compiled.evaluate(eval_ctx, state, details=track)
         except Exception:
             logger.exception("Rule %d v2 평가 오류", rule_id)
             return EvalV2Result(action=None)
+        finally:
+            if self._profiling:
+                self._add_rule_time(rule_id, perf_counter() - start)
+
+    # ── 프로파일링 ──
+
+    @property
+    def profiling(self) -> bool:
+        return self._profiling
+
+    def set_profiling(self, enabled: bool) -> None:
+        """프로파일링 켜기/끄기. 끄면 계측 컴파일본만 버리고 누적 결과는 남긴다."""
+        self._profiling = enabled
+        if not enabled:
+            self._profiled_cache.clear()
+
+    def reset_profile(self) -> None:
+        """누적 프로파일 초기화."""
+        self._profiles.clear()
+        self._rule_times.clear()
+
+    def profile_report(self) -> dict[str, Any]:
+        """규칙별(누적 시간 내림차순) + 전체 내장 함수/노드 타입 프로파일."""
+        total = EvalProfile()
+        rules = []
+        for rule_id, (calls, elapsed) in sorted(
+            self._rule_times.items(), key=lambda kv: kv[1][1], reverse=True,
+        ):
+            entry: dict[str, Any] = {
+                "rule_id": rule_id, "calls": calls,
+                "total_ms": round(elapsed * 1e3, 3),
+                "avg_us": round(elapsed / calls * 1e6, 2),
+            }
+            profile = self._profiles.get(rule_id)
+            if profile is not None:
+                total.merge(profile)
+                report = profile.report()
+                entry.update(funcs=report["func"], lines=report["rule"], nodes=report["node"])
+            rules.append(entry)
+        report = total.report()
+        return {
+            "enabled": self._profiling, "rules": rules,
+            "funcs": report["func"], "nodes": report["node"],
+        }
+
+    def _add_rule_time(self, rule_id: int, elapsed: float) -> None:
+        entry = self._rule_times.get(rule_id)
+        if entry is None:
+            self._rule_times[rule_id] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
 
     def invalidate_cache(self, rule_id: int) -> None:
-        """규칙 업데이트 시 AST 캐시 무효화."""
+        """규칙 업데이트 시 컴파일 캐시 무효화."""
         self._ast_cache.pop(rule_id, None)
         self._v2_ast_cache.pop(rule_id, None)
+        self._profiled_cache.pop(rule_id, None)
         self._cross_states.pop(rule_id, None)
         self._v2_states.pop(rule_id, None)
 
@@ -72,46 +158,72 @@ class RuleEvaluator:
         """전체 캐시 초기화."""
         self._ast_cache.clear()
         self._v2_ast_cache.clear()
+        self._profiled_cache.clear()
         self._cross_states.clear()
         self._v2_states.clear()
 
     # ── DSL 경로 ──
 
-    def _eval_dsl(self, rule: dict, market_data: dict, context: dict) -> tuple[bool, bool]:
-        """DSL script → AST → evaluate."""
+    def _eval_dsl(
+        self, rule: dict, market_data: dict, context: dict,
+        cache: EvalCycleCache | None = None,
+    ) -> tuple[bool, bool]:
+        """DSL script → 컴파일된 스크립트 → evaluate."""
         rule_id = rule.get("id", 0)
         script = rule["script"]
 
         try:
-            ast = self._get_or_parse(rule_id, script)
-            eval_ctx = self._build_dsl_context(market_data, context)
+            compiled = self._get_or_compile(rule_id, script)
+            eval_ctx = self._dsl_context(rule, market_data, context, cache)
             state = self._cross_states.setdefault(rule_id, {})
-            return dsl_evaluate(ast, eval_ctx, state)
+            return compiled.evaluate(eval_ctx, state)
         except Exception:
             logger.exception("Rule %d DSL 평가 오류", rule_id)
             return (False, False)
 
-    def _get_or_parse(self, rule_id: int, script: str) -> Script:
-        """AST 캐시 조회, 미스 시 파싱."""
-        script_hash = hashlib.md5(script.encode()).hexdigest()
+    def _get_or_compile(self, rule_id: int, script: str) -> CompiledScript:
+        """컴파일 캐시 조회, 미스 시 파싱 + 컴파일.
+
+        소스 문자열 비교 — 같은 규칙 dict면 동일 객체라 매 사이클 해시 계산 없이 끝난다.
+        """
         cached = self._ast_cache.get(rule_id)
-        if cached and cached[0] == script_hash:
+        if cached and cached[0] == script:
             return cached[1]
 
-        ast = parse(script)
-        self._ast_cache[rule_id] = (script_hash, ast)
-        return ast
+        compiled = compile_script(parse(script))
+        self._ast_cache[rule_id] = (script, compiled)
+        return compiled
 
-    def _get_or_parse_v2(self, rule_id: int, script: str) -> ScriptV2:
-        """v2 AST 캐시 조회, 미스 시 파싱."""
-        script_hash = hashlib.md5(script.encode()).hexdigest()
+    def _get_or_compile_v2(self, rule_id: int, script: str) -> CompiledScriptV2:
+        """v2 컴파일 캐시 조회, 미스 시 파싱 + 컴파일 (소스 문자열 비교)."""
         cached = self._v2_ast_cache.get(rule_id)
-        if cached and cached[0] == script_hash:
+        if cached and cached[0] == script:
             return cached[1]
 
-        ast = parse_v2(script)
-        self._v2_ast_cache[rule_id] = (script_hash, ast)
-        return ast
+        compiled = compile_script_v2(parse_v2(script))
+        self._v2_ast_cache[rule_id] = (script, compiled)
+        return compiled
+
+    def prepare_v2(self, rule_id: int, script: str, ast: ScriptV2) -> None:
+        """v2 컴파일 캐시 선적재 (규칙 설정 시) — 첫 평가 사이클에서 파싱/컴파일하지 않는다."""
+        cached = self._v2_ast_cache.get(rule_id)
+        if cached and cached[0] == script:
+            return
+        try:
+            self._v2_ast_cache[rule_id] = (script, compile_script_v2(ast))
+        except Exception:
+            logger.debug("Rule %d 사전 컴파일 실패 — 평가 시 다시 시도", rule_id)
+
+    def _get_or_compile_profiled(self, rule_id: int, script: str) -> CompiledScriptV2:
+        """계측 컴파일 캐시 — 규칙별 EvalProfile에 기록 (state는 일반 컴파일본과 공유)."""
+        cached = self._profiled_cache.get(rule_id)
+        if cached and cached[0] == script:
+            return cached[1]
+
+        profile = self._profiles.setdefault(rule_id, EvalProfile())
+        compiled = compile_script_v2(parse_v2(script), profile=profile)
+        self._profiled_cache[rule_id] = (script, compiled)
+        return compiled
 
     @staticmethod
     def is_v2_script(script: str) -> bool:
@@ -130,12 +242,47 @@ class RuleEvaluator:
             return True
         return False
 
-    @staticmethod
-    def _build_dsl_context(market_data: dict, context: dict) -> dict[str, Any]:
+    def _dsl_context(
+        self, rule: dict, market_data: dict, context: dict,
+        cache: EvalCycleCache | None,
+    ) -> dict[str, Any]:
+        """DSL 평가 컨텍스트. cache가 있으면 종목 공유분을 재사용."""
+        if cache is None:
+            return self._build_dsl_context(market_data, context)
+        base = cache.market_context(
+            rule.get("symbol", ""), lambda: self._build_market_context(market_data),
+        )
+        ctx = dict(base)
+        self._apply_position_fields(ctx, context)
+        return ctx
+
+    @classmethod
+    def _build_dsl_context(cls, market_data: dict, context: dict) -> dict[str, Any]:
         """market_data + context → DSL evaluator context dict.
 
         내장 필드 매핑 + 내장 함수 callable 제공.
         """
+        ctx = cls._build_market_context(market_data)
+        cls._apply_position_fields(ctx, context)
+        return ctx
+
+    @staticmethod
+    def _apply_position_fields(ctx: dict[str, Any], context: dict) -> None:
+        """규칙별 포지션 필드(수익률, 보유수량 등)를 ctx에 채운다."""
+        ctx["수익률"] = context.get("수익률")
+        ctx["보유수량"] = context.get("보유수량", 0)
+
+        # v2 포지션 필드 (PositionState.to_context() 호환)
+        for key in ("고점 대비", "수익률고점", "진입가", "보유일", "보유봉"):
+            if key in context:
+                ctx[key] = context[key]
+
+    @staticmethod
+    def _build_market_context(market_data: dict) -> dict[str, Any]:
+        """market_data → 종목 공통 DSL 컨텍스트 (시세·시간 필드 + 지표 함수).
+
+        포지션과 무관하므로 같은 사이클·같은 종목의 규칙끼리 공유할 수 있다.
+        """
         price = market_data.get("price")
         volume = market_data.get("volume")
         indicators = market_data.get("indicators", {})
@@ -145,13 +292,6 @@ class RuleEvaluator:
         # 내장 필드
         ctx["현재가"] = float(price) if price is not None else None
         ctx["거래량"] = int(volume) if volume is not None else None
-        ctx["수익률"] = context.get("수익률")
-        ctx["보유수량"] = context.get("보유수량", 0)
-
-        # v2 포지션 필드 (PositionState.to_context() 호환)
-        for key in ("고점 대비", "수익률고점", "진입가", "보유일", "보유봉"):
-            if key in context:
-                ctx[key] = context[key]
 
         # 시간 필드 — 현재 시각 기반
         now = datetime.now()
@@ -181,6 +321,10 @@ class RuleEvaluator:
         ctx["평균거래량"] = make_indicator_func("avg_volume")
         ctx["볼린저_상단"] = make_indicator_func("bb_upper")
         ctx["볼린저_하단"] = make_indicator_func("bb_lower")
+        ctx["ATR"] = make_indicator_func("atr")
+        ctx["최고가"] = make_indicator_func("highest")
+        ctx["최저가"] = make_indicator_func("lowest")
+        ctx["이격도"] = make_indicator_func("disparity")
 
         def _macd(tf=None):
             resolved_tf = tf or "1d"
@@ -0,0 +1,106 @@
+"""EventTrigger — 분봉 완성/시세 이벤트로 해당 종목 규칙만 평가 예약.
+
+EngineScheduler의 1분 cron은 안전망으로 남고, 이 트리거가 이벤트 직후
+그 종목의 규칙만 평가하게 한다.
+
+- 분봉 완성 (on_bar_complete): 그 종목의 전체 규칙 평가
+- 시세 (on_quote): quote_interval > 0일 때만, 종목별 quote_interval마다 최대 1회.
+  상태 없는 규칙만 평가 (상향돌파/횟수/expr[N] 등은 평가 주기가 의미에 들어가므로 분 단위 유지)
+- 종목별 디바운스: 한 종목은 debounce초에 한 번만 평가, 그 사이 이벤트는 합쳐서 한 번
+- 대기 중인 종목은 한 번에 묶어 evaluate_fn(bar_symbols, quote_symbols) 호출
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Coroutine
+
+logger = logging.getLogger(__name__)
+
+# 대기 종류 — 분봉 완성이 시세보다 우선 (전체 규칙 평가)
+_BAR = "bar"
+_QUOTE = "quote"
+
+
+class EventTrigger:
+    """종목 이벤트 → 종목별 디바운스 → 묶음 평가."""
+
+    def __init__(
+        self,
+        evaluate_fn: Callable[[set[str], set[str]], Coroutine[Any, Any, None]],
+        debounce: float = 1.0,
+        quote_interval: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._evaluate_fn = evaluate_fn
+        self._debounce = debounce
+        self._quote_interval = quote_interval
+        self._clock = clock
+        self._pending: dict[str, tuple[float, str]] = {}  # symbol → (평가 예정 시각, 종류)
+        self._last_fired: dict[str, float] = {}           # symbol → 마지막 평가 시각
+        self._last_quote: dict[str, float] = {}           # symbol → 마지막 시세 트리거 시각
+        self._task: asyncio.Task | None = None
+
+    def on_bar_complete(self, symbol: str) -> None:
+        """분봉 완성 — 그 종목 전체 규칙 평가 예약."""
+        self._request(symbol, _BAR)
+
+    def on_quote(self, symbol: str) -> None:
+        """시세 수신 — 종목별 quote_interval 스로틀 후 상태 없는 규칙 평가 예약."""
+        if self._quote_interval <= 0:
+            return
+        now = self._clock()
+        last = self._last_quote.get(symbol)
+        if last is not None and now - last < self._quote_interval:
+            return
+        self._last_quote[symbol] = now
+        self._request(symbol, _QUOTE)
+
+    @property
+    def pending(self) -> dict[str, str]:
+        """대기 중인 종목 → 종류 (bar/quote)."""
+        return {symbol: kind for symbol, (_, kind) in self._pending.items()}
+
+    def cancel(self) -> None:
+        """대기 중인 평가 취소 (엔진 중지 시)."""
+        self._pending.clear()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def _request(self, symbol: str, kind: str) -> None:
+        last = self._last_fired.get(symbol)
+        due = self._clock() if last is None else max(self._clock(), last + self._debounce)
+        queued = self._pending.get(symbol)
+        if queued is not None:
+            due = min(due, queued[0])
+            if queued[1] == _BAR:
+                kind = _BAR
+        self._pending[symbol] = (due, kind)
+
+        if self._task is None or self._task.done():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # 이벤트 루프 밖 — cron 안전망에 맡긴다
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._pending:
+            now = self._clock()
+            due = [s for s, (at, _) in self._pending.items() if at <= now]
+            if not due:
+                await asyncio.sleep(min(at for at, _ in self._pending.values()) - now)
+                continue
+
+            bars: set[str] = set()
+            quotes: set[str] = set()
+            for symbol in due:
+                _, kind = self._pending.pop(symbol)
+                (bars if kind == _BAR else quotes).add(symbol)
+                self._last_fired[symbol] = now
+            try:
+                await self._evaluate_fn(bars, quotes)
+            except Exception:
+                logger.exception("이벤트 평가 오류 (%s)", ", ".join(sorted(bars | quotes)))
@@ -176,12 +176,13 @@ class OrderExecutor:
         if not verify_result.ok:
             msg = (
                 f"가격 검증 실패 (WS={ws_price}, "
-                f"REST={verify_result.actual_price}, "
+                f"{verify_result.source}={verify_result.actual_price}, "
                 f"괴리={verify_result.diff_pct:.2f}%)"
             )
             await self._log.write(LOG_TYPE_ERROR, msg, symbol=symbol,
                                  meta={"rule_id": rule_id, "side": side, "check": "price_verify",
-                                        "ws_price": float(ws_price), "rest_price": float(verify_result.actual_price)},
+                                        "ws_price": float(ws_price), "rest_price": float(verify_result.actual_price),
+                                        "price_source": verify_result.source},
                                  intent_id=intent_id)
             return ExecutionResult(
                 status=ExecutionStatus.REJECTED,
@@ -1,9 +1,21 @@
 """IndicatorProvider — 종목별 일봉/분봉 기반 기술적 지표 제공.
 
-일봉: yfinance에서 80일 일봉을 배치 조회, 캐시 1일 유효.
-분봉: cloud_server MinuteBar API에서 조회, 캐시 1분 유효.
-      캐시 만료 시 None 반환 (평가 건너뜀).
+일봉: yfinance에서 일봉을 배치 조회 (기본 80일), 캐시 1일 유효.
+분봉: 로컬 MinuteHistory(BarBuilder 1분봉 링버퍼 + 5m/15m/1h 롤업)에서 읽는다.
+      필요한 봉 수가 모자라거나 공백(최근 분봉 없음)이면 cloud_server MinuteBar API로 보충.
+      캐시 1분 유효, 만료 시 None 반환 (평가 건너뜀).
       엔진 루프(evaluate_all)가 매 사이클마다 refresh_minute()를 호출하여 갱신.
+      (종목, TF)별 IncrementalIndicators를 유지하여 새로 확정된 봉만 O(1)로 반영.
+      엔진 시작 시 seed_history()로 MinuteBarStore(부족하면 cloud 1분봉)에서 한 번 채운다.
+      로컬 분봉에는 BarBuilder가 구성 중인 1분봉(current_bar)을 마지막 봉으로 더한다 —
+      cloud 조회 결과처럼 진행 중인 분까지 preview로 반영.
+      사이클 갱신은 refresh_minutes()로 — 종목별 병렬(동시 수 제한, 마감 시각 초과 시 중단),
+      종목당 1분봉 조회 최대 1회 후 모든 TF를 로컬 롤업으로 계산.
+
+요구사항:
+    엔진이 활성 규칙의 정적 의존성(sv_core.parsing.analyze)으로 종목·TF별 필요 지표 키와
+    이력 길이를 set_requirements()로 넘긴다. 요구사항이 있으면 그 키만 계산하고
+    조회 기간도 필요한 만큼만 잡는다. 요구사항이 없는 종목은 전체 지표 세트 (기존 동작).
 
 종목 시장 구분:
     market_map을 통해 KOSPI(.KS) / KOSDAQ(.KQ)를 구분한다.
@@ -13,33 +25,95 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from typing import Any
+from typing import Any, Callable
 
 import pandas as pd
 import yfinance as yf
 
-from sv_core.indicators import calc_all_indicators
+from sv_core.indicators import IncrementalIndicators, calc_all_indicators, calc_indicators
 
-from local_server.engine.ports import BarDataPort
+from local_server.engine.minute_history import TF_MINUTES, MinuteHistory
+from local_server.engine.ports import BarDataPort, BarStorePort
 
 logger = logging.getLogger(__name__)
 
 _LOOKBACK_DAYS = 80  # 60일 + 여유
+_MIN_LOOKBACK_DAYS = 30  # 요구사항 기반 조회 하한 (15봉 이상 확보)
 _MINUTE_LOOKBACK = 200  # 분봉 최대 조회 건수
+_MIN_MINUTE_BARS = 15  # 분봉 지표 계산 최소 건수
 _MINUTE_CACHE_TTL = timedelta(minutes=1)  # 분봉 캐시 유효기간
+_TRADING_MINUTES = 390  # 하루 정규장 분 (09:00~15:30)
+_MAX_SEED_DAYS = 30  # MinuteBarStore 보관 기간
+_MAX_1M_FETCH = 5000  # cloud 분봉 API limit 상한
 _EMPTY: dict[str, Any] = {}
 
+# 종목 → 구성 중인 1분봉 {"time", "open", "high", "low", "close", "volume"} (BarBuilder)
+CurrentBarSource = Callable[[str], "dict | None"]
+# ewm(adjust=True) 기반 지표 — 값이 조회 이력 길이에 따라 달라지므로 기본 조회 기간 유지
+_RECURSIVE_PREFIXES = ("ema_", "macd")
+
+
+@dataclass(frozen=True)
+class IndicatorNeeds:
+    """종목·TF별 필요 지표. keys=None → 전체 지표 세트 (정적으로 알 수 없음)."""
+
+    keys: frozenset[str] | None = None
+    depth: int = 0  # 필요한 최대 봉 수
+
+    def merge(self, other: IndicatorNeeds) -> IndicatorNeeds:
+        keys = None if self.keys is None or other.keys is None else self.keys | other.keys
+        return IndicatorNeeds(keys, max(self.depth, other.depth))
+
+    @property
+    def recursive(self) -> bool:
+        """EMA/MACD 포함 — depth만큼만 조회하면 워밍업 이력이 줄어 값이 달라진다."""
+        return self.keys is not None and any(k.startswith(_RECURSIVE_PREFIXES) for k in self.keys)
+
+
+@dataclass
+class _MinuteStream:
+    """(종목, TF)별 증분 지표 상태. last_ts = 마지막으로 확정 반영한 봉 시각."""
+
+    indicators: IncrementalIndicators
+    last_ts: str | None = None
+
 
 class IndicatorProvider:
     """종목별 일봉/분봉 기반 기술적 지표 제공."""
 
-    def __init__(self, bar_data: BarDataPort | None = None) -> None:
+    def __init__(
+        self,
+        bar_data: BarDataPort | None = None,
+        history: MinuteHistory | None = None,
+        current_bar: CurrentBarSource | None = None,
+    ) -> None:
         # 일봉 캐시: {symbol: {"date": date, "indicators": dict}}
         self._daily_cache: dict[str, dict] = {}
         # 분봉 캐시: {symbol: {tf: {"expires": datetime, "indicators": dict}}}
         self._minute_cache: dict[str, dict[str, dict]] = {}
+        # 증분 지표 상태: {(symbol, tf): _MinuteStream}
+        self._minute_streams: dict[tuple[str, str], _MinuteStream] = {}
+        # 요구사항: {symbol: {tf: IndicatorNeeds}} — 없으면 전체 지표 세트
+        self._needs: dict[str, dict[str, IndicatorNeeds]] = {}
         self._bar_data = bar_data
+        self._history = history
+        self._current_bar = current_bar
+        # 네트워크 조회도 limit봉에 못 미친 (종목, TF) → 받은 봉 수 (로컬이 이만큼이면 충분)
+        self._short: dict[tuple[str, str], int] = {}
+
+    @property
+    def history(self) -> MinuteHistory | None:
+        return self._history
+
+    def set_requirements(self, needs: dict[str, dict[str, IndicatorNeeds]]) -> None:
+        """활성 규칙 기준 종목·TF별 필요 지표 교체. 다음 refresh부터 반영."""
+        self._needs = needs
+
+    def needs(self, symbol: str, tf: str = "1d") -> IndicatorNeeds | None:
+        return self._needs.get(symbol, {}).get(tf)
 
     async def refresh(
         self,
@@ -60,46 +134,189 @@ class IndicatorProvider:
 
         _market_map = market_map or {}
         logger.info("지표 계산 시작: %s", stale)
-        results = await asyncio.to_thread(self._fetch_and_calc_batch, stale, _market_map)
+        results = await asyncio.to_thread(
+            self._fetch_and_calc_batch, stale, _market_map, self._daily_lookback_days(stale),
+        )
         for sym, indicators in results.items():
             self._daily_cache[sym] = {"date": today, "indicators": indicators}
         logger.info("지표 계산 완료: %d종목 성공", len(results))
 
-    async def refresh_minute(self, symbol: str, tf: str) -> None:
-        """분봉 지표를 계산하여 캐시.
-
-        cloud_server MinuteBar API에서 분봉을 조회하고
-        calc_all_indicators로 지표를 계산한다.
-        CloudClient가 없거나 조회 실패 시 캐시를 갱신하지 않는다.
+    async def seed_history(self, symbols: list[str], store: BarStorePort | None = None) -> None:
+        """분봉 규칙이 있는 종목의 MinuteHistory를 MinuteBarStore로 채운다 (시작 시 1회).
 
-        Args:
-            symbol: 종목코드
-            tf: 타임프레임 ("1m", "5m", "15m", "1h")
+        저장소 분봉이 모자라면 cloud 1분봉으로 채운다 (마지막 봉은 구성 중이라 제외).
         """
-        if self._bar_data is None:
-            logger.debug("BarDataPort 없음 — 분봉 지표 갱신 생략 [%s %s]", symbol, tf)
+        if self._history is None:
             return
+        for sym in symbols:
+            days = self._history_days(sym)
+            if days is None:
+                continue
+            bars: list[dict] = []
+            if store is not None:
+                since = (datetime.now() - timedelta(days=days)).replace(
+                    hour=0, minute=0, second=0, microsecond=0,
+                ).isoformat()
+                try:
+                    bars = await asyncio.to_thread(store.load_bars, sym, since)
+                except Exception:
+                    logger.warning("로컬 분봉 로드 실패 [%s]", sym)
+            if len(bars) < _MIN_MINUTE_BARS and self._bar_data is not None:
+                try:
+                    bars = (await self._bar_data.fetch_minute_bars(sym, "1m", _MINUTE_LOOKBACK))[:-1]
+                except Exception:
+                    logger.warning("분봉 seed 조회 실패 [%s]", sym)
+            n = self._history.seed(sym, bars)
+            logger.info("분봉 히스토리 seed [%s]: %d봉", sym, n)
+
+    def _history_days(self, symbol: str) -> int | None:
+        """분봉 TF 요구사항을 채우는 데 필요한 달력일. 분봉 규칙이 없으면 None."""
+        minutes = [
+            _history_bars(need) * TF_MINUTES[tf]
+            for tf, need in self._needs.get(symbol, {}).items() if tf in TF_MINUTES
+        ]
+        if not minutes:
+            return None
+        # 영업일 → 달력일 (주말 + 공휴일 여유)
+        return min(_MAX_SEED_DAYS, math.ceil(max(minutes) / _TRADING_MINUTES * 7 / 5) + 2)
+
+    def _local_bars(self, symbol: str, tf: str, limit: int) -> list[dict] | None:
+        """MinuteHistory에서 limit봉. 모자라거나 공백이면 None (네트워크 보충)."""
+        if self._history is None or tf not in TF_MINUTES or not self._history.is_fresh(symbol):
+            return None
+        # limit은 구성 중인 봉 1개를 포함한 조회 건수 — 구성 중인 1분봉이 있으면 합쳐서 limit봉,
+        # 없으면 확정 봉 limit-1개 (마지막 봉을 preview로)
+        current = self._current_bar(symbol) if self._current_bar is not None else None
+        bars = self._history.bars(symbol, tf, current)
+        need = max(_MIN_MINUTE_BARS, min(limit, self._short.get((symbol, tf), limit)) - 1)
+        if len(bars) < need:
+            return None
+        return bars[-limit:] if current is not None else bars[-(limit - 1):]
 
+    async def refresh_minutes(
+        self,
+        plan: dict[str, set[str]],
+        *,
+        concurrency: int = 8,
+        timeout: float | None = None,
+    ) -> int:
+        """사이클 분봉 지표 갱신 — {symbol: {tf}}를 종목 단위로 병렬 실행.
+
+        동시 실행은 concurrency개로 제한. timeout(초)을 넘기면 남은 갱신을 취소하고 반환한다
+        (갱신 못 한 종목은 기존 캐시, 만료됐으면 None → 그 지표 조건은 거짓). 완료 종목 수 반환.
+        """
+        plan = {sym: tfs for sym, tfs in plan.items() if tfs}
+        if not plan:
+            return 0
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(sym: str, tfs: set[str]) -> None:
+            async with sem:
+                await self.refresh_symbol_minutes(sym, tfs)
+
+        tasks = [asyncio.ensure_future(_one(sym, tfs)) for sym, tfs in plan.items()]
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning("분봉 갱신 마감 초과 — %d/%d종목 미완료", len(pending), len(tasks))
+        for task in done:
+            if task.exception() is not None:
+                logger.error("분봉 갱신 오류", exc_info=task.exception())
+        return sum(1 for task in done if task.exception() is None)
+
+    async def refresh_symbol_minutes(self, symbol: str, tfs: set[str]) -> None:
+        """한 종목의 분봉 TF들 갱신. 로컬 히스토리가 모자라면 1분봉을 한 번만 조회해 보충한 뒤
+        모든 TF를 로컬 롤업으로 계산한다 (TF별 조회로 되돌아가지 않는다).
+        히스토리가 없으면 TF별 refresh_minute."""
+        local_only = self._history is not None and self._bar_data is not None
+        if local_only:
+            limits = {tf: _minute_limit(self.needs(symbol, tf)) for tf in tfs if tf in TF_MINUTES}
+            missing = [
+                tf for tf, limit in limits.items()
+                if self._local_bars(symbol, tf, limit) is None and not self._synced_short(symbol, tf)
+            ]
+            if missing:
+                await self._backfill_1m(symbol, {tf: limits[tf] for tf in missing})
+        for tf in sorted(tfs):
+            await self.refresh_minute(symbol, tf, local_only=local_only)
+
+    async def _backfill_1m(self, symbol: str, limits: dict[str, int]) -> None:
+        """TF별 필요 봉 수를 채울 만큼 1분봉을 한 번 조회해 히스토리에 반영."""
+        n = min(_MAX_1M_FETCH, max(limit * TF_MINUTES[tf] for tf, limit in limits.items()))
         try:
-            data = await self._bar_data.fetch_minute_bars(symbol, tf, _MINUTE_LOOKBACK)
+            data = await self._bar_data.fetch_minute_bars(symbol, "1m", n)
         except Exception:
-            logger.warning("분봉 조회 실패 [%s %s]", symbol, tf)
+            logger.warning("분봉 조회 실패 [%s 1m]", symbol)
             return
+        self._history.seed(symbol, data[:-1])  # 마지막 봉은 구성 중
+        # 원본과 맞췄다 — 새 봉이 없는 종목도 다음 사이클은 로컬로 (stale_after 뒤 다시 보충)
+        self._history.mark_synced(symbol)
+        for tf, limit in limits.items():
+            count = self._history.count(symbol, tf)
+            if len(data) < n or count + 1 < limit:
+                # cloud도 더 없거나 조회 상한(_MAX_1M_FETCH)에 걸림 — 채운 만큼이면 로컬로 충분
+                self._short[(symbol, tf)] = count + 1
+            else:
+                self._short.pop((symbol, tf), None)
+        logger.debug("분봉 보충 [%s]: 1m %d건 → %s", symbol, len(data), ", ".join(sorted(limits)))
+
+    def _synced_short(self, symbol: str, tf: str) -> bool:
+        """최근 보충에서 cloud도 봉이 모자랐던 (종목, TF) — 다음 보충(stale_after 뒤)까지 재조회 안 함."""
+        return (symbol, tf) in self._short and self._history.is_fresh(symbol)
+
+    async def refresh_minute(self, symbol: str, tf: str, *, local_only: bool = False) -> None:
+        """분봉 지표를 계산하여 캐시.
 
-        if len(data) < 15:
+        로컬 MinuteHistory를 우선 쓰고, 모자라거나 공백이면 cloud_server MinuteBar API에서
+        조회한다 (1m이면 조회 결과로 MinuteHistory도 보충). local_only면 조회하지 않는다
+        (refresh_symbol_minutes가 이미 1분봉으로 보충한 뒤).
+        직전 호출 이후 새로 확정된 봉만 증분 지표에 반영한다.
+        둘 다 없거나 조회 실패 시 캐시를 갱신하지 않는다.
+
+        Args:
+            symbol: 종목코드
+            tf: 타임프레임 ("1m", "5m", "15m", "1h")
+        """
+        needs = self.needs(symbol, tf)
+        limit = _minute_limit(needs)
+        data = self._local_bars(symbol, tf, limit)
+        if data is None:
+            if local_only:
+                logger.debug("로컬 분봉 부족 — 지표 갱신 생략 [%s %s]", symbol, tf)
+                return
+            if self._bar_data is None:
+                logger.debug("BarDataPort 없음 — 분봉 지표 갱신 생략 [%s %s]", symbol, tf)
+                return
+            try:
+                data = await self._bar_data.fetch_minute_bars(symbol, tf, limit)
+            except Exception:
+                logger.warning("분봉 조회 실패 [%s %s]", symbol, tf)
+                return
+            if len(data) < limit:
+                self._short[(symbol, tf)] = len(data)
+            else:
+                self._short.pop((symbol, tf), None)
+            if tf == "1m" and self._history is not None and data:
+                self._history.seed(symbol, data[:-1])  # 마지막 봉은 구성 중
+
+        if len(data) < _MIN_MINUTE_BARS:
             logger.debug("분봉 데이터 부족 [%s %s]: %d건", symbol, tf, len(data))
             return
 
         try:
             valid = [b for b in data if b.get("close") is not None]
-            closes = pd.Series([float(b["close"]) for b in valid])
-            volumes = pd.Series([float(b.get("volume") or 0) for b in valid])
-            highs = pd.Series([float(b.get("high") or b["close"]) for b in valid])
-            lows = pd.Series([float(b.get("low") or b["close"]) for b in valid])
-            if len(closes) < 15:
+            if len(valid) < _MIN_MINUTE_BARS:
                 return
-            indicators = calc_all_indicators(closes, volumes, highs=highs, lows=lows)
+            indicators = self._update_minute_stream(symbol, tf, valid)
+            if needs is not None and needs.keys:
+                # 증분 세트에 없는 키(RSI(9) 등)만 조회 구간으로 직접 계산
+                extra = needs.keys - indicators.keys()
+                if extra:
+                    indicators = {**indicators, **_calc_window(valid, extra)}
         except Exception:
+            self._minute_streams.pop((symbol, tf), None)
             logger.exception("분봉 지표 계산 실패 [%s %s]", symbol, tf)
             return
 
@@ -111,6 +328,35 @@ class IndicatorProvider:
         }
         logger.debug("분봉 지표 캐시 갱신 [%s %s]", symbol, tf)
 
+    def _update_minute_stream(self, symbol: str, tf: str, bars: list[dict]) -> dict:
+        """증분 지표 상태에 새 봉을 반영하고 지표 dict를 반환한다.
+
+        마지막 봉은 아직 구성 중일 수 있으므로 확정하지 않고 preview로만 반영한다.
+        직전 확정 봉이 조회 결과에 없으면(첫 호출, 공백, 시각 정보 없음)
+        조회된 이력으로 다시 seed한다.
+        """
+        *done, current = bars
+        stream = self._minute_streams.get((symbol, tf))
+
+        start: int | None = None
+        if stream is not None and stream.last_ts is not None:
+            for i in range(len(done) - 1, -1, -1):
+                if _bar_time(done[i]) == stream.last_ts:
+                    start = i + 1
+                    break
+
+        if stream is None or start is None:
+            stream = _MinuteStream(indicators=IncrementalIndicators())
+            self._minute_streams[(symbol, tf)] = stream
+            start = 0
+
+        inc = stream.indicators
+        for b in done[start:]:
+            inc.update(*_bar_values(b))
+        if done:
+            stream.last_ts = _bar_time(done[-1])
+        return inc.preview(*_bar_values(current))
+
     def get(self, symbol: str, tf: str = "1d") -> dict | None:
         """evaluator가 기대하는 indicators dict 반환.
 
@@ -137,6 +383,20 @@ class IndicatorProvider:
             return None
         return entry["indicators"]
 
+    def _daily_lookback_days(self, symbols: list[str]) -> int:
+        """일봉 조회 기간 (달력일). 요구사항을 모르는 종목이 있으면 기본 기간."""
+        depth = 0
+        recursive = False
+        for sym in symbols:
+            needs = self.needs(sym)
+            if needs is None or needs.keys is None:
+                return _LOOKBACK_DAYS
+            depth = max(depth, needs.depth)
+            recursive = recursive or needs.recursive
+        # 영업일 → 달력일 (주말 + 공휴일 여유)
+        days = max(_MIN_LOOKBACK_DAYS, math.ceil(depth * 7 / 5) + 10)
+        return max(days, _LOOKBACK_DAYS) if recursive else days
+
     def _is_daily_stale(self, symbol: str, today: date) -> bool:
         entry = self._daily_cache.get(symbol)
         return entry is None or entry["date"] != today
@@ -147,6 +407,7 @@ class IndicatorProvider:
         self,
         symbols: list[str],
         market_map: dict[str, str],
+        days: int = _LOOKBACK_DAYS,
     ) -> dict[str, dict]:
         """여러 종목의 일봉을 배치 조회하고 지표를 계산한다."""
         # 티커 → 종목코드 매핑
@@ -158,7 +419,7 @@ class IndicatorProvider:
 
         # yfinance 배치 조회
         try:
-            df_by_ticker = _download_batch(tickers)
+            df_by_ticker = _download_batch(tickers, days)
         except Exception:
             logger.exception("yfinance 배치 조회 실패")
             return {}
@@ -173,7 +434,7 @@ class IndicatorProvider:
                 try:
                     df_alt = yf.download(
                         alt,
-                        period=f"{_LOOKBACK_DAYS}d",
+                        period=f"{days}d",
                         auto_adjust=True,
                         progress=False,
                     )
@@ -192,7 +453,13 @@ class IndicatorProvider:
                 volumes = df["Volume"].squeeze()
                 highs = df["High"].squeeze() if "High" in df.columns else None
                 lows = df["Low"].squeeze() if "Low" in df.columns else None
-                indicators = calc_all_indicators(closes, volumes, highs=highs, lows=lows)
+                needs = self.needs(sym)
+                if needs is None or needs.keys is None:
+                    indicators = calc_all_indicators(closes, volumes, highs=highs, lows=lows)
+                else:
+                    indicators = calc_indicators(
+                        closes, volumes, needs.keys, highs=highs, lows=lows,
+                    )
                 if indicators:
                     results[sym] = indicators
             except Exception:
@@ -201,6 +468,53 @@ class IndicatorProvider:
         return results
 
 
+# ── 분봉 헬퍼 ──
+
+
+def _bar_time(bar: dict) -> str | None:
+    """분봉 시각 (cloud API는 "timestamp", 로컬 저장소는 "time")."""
+    ts = bar.get("timestamp") or bar.get("time")
+    return str(ts) if ts is not None else None
+
+
+def _bar_values(bar: dict) -> tuple[float, float, float, float]:
+    """분봉 dict → (close, volume, high, low). high/low 없으면 종가로 대체."""
+    close = float(bar["close"])
+    return (
+        close,
+        float(bar.get("volume") or 0),
+        float(bar.get("high") or close),
+        float(bar.get("low") or close),
+    )
+
+
+def _minute_limit(needs: IndicatorNeeds | None) -> int:
+    """분봉 조회 건수 — 필요한 봉 수 + 구성 중인 봉 1개, [15, 200] 범위.
+
+    EMA/MACD는 워밍업 이력이 값에 영향을 주므로 기본 조회 건수(200)를 유지한다.
+    """
+    if needs is None or needs.keys is None or needs.recursive:
+        return _MINUTE_LOOKBACK
+    return min(_MINUTE_LOOKBACK, max(_MIN_MINUTE_BARS, needs.depth + 1))
+
+
+def _history_bars(needs: IndicatorNeeds) -> int:
+    """MinuteHistory에 채울 봉 수 — 필요한 봉 수 (전체 세트·EMA/MACD는 최소 기본 조회 건수)."""
+    if needs.keys is None or needs.recursive:
+        return max(needs.depth, _MINUTE_LOOKBACK)
+    return needs.depth or _MINUTE_LOOKBACK
+
+
+def _calc_window(bars: list[dict], keys: frozenset[str] | set[str]) -> dict:
+    """조회된 분봉 구간 전체로 지정 키만 계산."""
+    values = [_bar_values(b) for b in bars]
+    closes = pd.Series([v[0] for v in values], dtype=float)
+    volumes = pd.Series([v[1] for v in values], dtype=float)
+    highs = pd.Series([v[2] for v in values], dtype=float)
+    lows = pd.Series([v[3] for v in values], dtype=float)
+    return calc_indicators(closes, volumes, keys, highs=highs, lows=lows)
+
+
 # ── 티커 변환 ──
 
 
@@ -217,12 +531,12 @@ def _to_yf_ticker(symbol: str, market: str = "") -> str:
     return f"{symbol}.KS"
 
 
-def _download_batch(tickers: list[str]) -> dict[str, pd.DataFrame]:
+def _download_batch(tickers: list[str], days: int = _LOOKBACK_DAYS) -> dict[str, pd.DataFrame]:
     """yfinance 배치 다운로드. 티커 → DataFrame 반환."""
     if not tickers:
         return {}
 
-    period = f"{_LOOKBACK_DAYS}d"
+    period = f"{days}d"
 
     if len(tickers) == 1:
         df = yf.download(tickers[0], period=period, auto_adjust=True, progress=False)
@@ -0,0 +1,147 @@
+"""MinuteHistory — 종목별 1분봉 링버퍼 + 5m/15m/1h 롤업.
+
+BarBuilder가 분봉을 완성할 때 append()로 쌓고, 엔진 시작 시 MinuteBarStore(부족하면 cloud)로
+한 번 seed()한다. IndicatorProvider는 여기서 분봉을 읽고 네트워크는 공백 보충에만 쓴다.
+
+롤업은 1분봉이 들어올 때 마지막 구간에 합치거나 새 구간을 여는 증분 방식이다.
+마지막 구간은 아직 구성 중일 수 있다 (IndicatorProvider가 마지막 봉을 preview로만 반영).
+bars(current=...)는 BarBuilder가 구성 중인 1분봉을 확정하지 않고 마지막 구간에 합쳐 돌려준다
+(cloud 분봉 API처럼 진행 중인 분까지 포함).
+구간 경계와 봉 dict 형식은 MinuteBarStore.aggregate_bars와 같다
+({"time": ISO, "open", "high", "low", "close", "volume"}).
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Iterable
+
+# 롤업 TF → 분
+TF_MINUTES = {"1m": 1, "5m": 5, "15m": 15, "1h": 60}
+_MAX_BARS = 200  # TF별 보관 봉 수 (IndicatorProvider 최대 조회 건수)
+_STALE_AFTER = 300.0  # 마지막 분봉 이후 이 시간(초)이 지나면 공백으로 본다
+
+
+class MinuteHistory:
+    """종목별 1분봉 링버퍼와 TF별 롤업."""
+
+    def __init__(
+        self,
+        max_bars: int = _MAX_BARS,
+        stale_after: float = _STALE_AFTER,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max = max_bars
+        self._stale_after = stale_after
+        self._clock = clock
+        self._bars: dict[tuple[str, str], deque[dict]] = {}  # (symbol, tf) → 봉
+        self._last: dict[str, datetime] = {}                 # symbol → 마지막 1분봉 시각
+        self._updated: dict[str, float] = {}                 # symbol → 마지막 반영 시각 (clock)
+
+    def append(self, symbol: str, bar: dict) -> bool:
+        """완성 1분봉 추가. 시각이 없거나 마지막 봉보다 이르면 무시 (False)."""
+        dt = _bar_datetime(bar)
+        if dt is None:
+            return False
+        last = self._last.get(symbol)
+        if last is not None and dt <= last:
+            return False
+        self._last[symbol] = dt
+        self._updated[symbol] = self._clock()
+
+        for tf, minutes in TF_MINUTES.items():
+            buf = self._bars.get((symbol, tf))
+            if buf is None:
+                buf = self._bars[(symbol, tf)] = deque(maxlen=self._max)
+            start = _bucket_start(dt, minutes)
+            if buf and buf[-1]["time"] == start:
+                _merge(buf[-1], bar)
+            else:
+                buf.append(_new_bucket(start, bar))
+        return True
+
+    def seed(self, symbol: str, bars: Iterable[dict]) -> int:
+        """과거 1분봉 일괄 반영 (시각순). 반영된 건수."""
+        ordered = sorted(
+            (b for b in bars if b.get("close") is not None and _bar_datetime(b) is not None),
+            key=_bar_datetime,
+        )
+        return sum(self.append(symbol, b) for b in ordered)
+
+    def bars(self, symbol: str, tf: str = "1m", current: dict | None = None) -> list[dict]:
+        """TF 봉 목록 (오래된 → 최신). 마지막 롤업 봉은 구성 중일 수 있다.
+
+        current: 구성 중인 1분봉 — 저장하지 않고 마지막 구간에 합치거나 새 구간으로 붙인다.
+        마지막 1분봉보다 이르거나 시각이 없으면 무시.
+        """
+        bars = list(self._bars.get((symbol, tf), ()))
+        dt = _bar_datetime(current) if current is not None and tf in TF_MINUTES else None
+        last = self._last.get(symbol)
+        if dt is None or (last is not None and dt <= last):
+            return bars
+        start = _bucket_start(dt, TF_MINUTES[tf])
+        if bars and bars[-1]["time"] == start:
+            bars[-1] = _merge(dict(bars[-1]), current)
+        else:
+            bars.append(_new_bucket(start, current))
+        return bars
+
+    def count(self, symbol: str, tf: str = "1m") -> int:
+        return len(self._bars.get((symbol, tf), ()))
+
+    def mark_synced(self, symbol: str) -> None:
+        """네트워크 보충으로 원본과 맞췄다고 표시 — 새 봉이 없어도(거래 없는 종목) fresh."""
+        self._updated[symbol] = self._clock()
+
+    def is_fresh(self, symbol: str) -> bool:
+        """최근 stale_after초 안에 분봉이 들어왔거나 보충했는지 (아니면 공백 — 네트워크 보충 대상)."""
+        updated = self._updated.get(symbol)
+        return updated is not None and self._clock() - updated < self._stale_after
+
+    def clear(self, symbol: str | None = None) -> None:
+        if symbol is None:
+            self._bars.clear()
+            self._last.clear()
+            self._updated.clear()
+            return
+        for tf in TF_MINUTES:
+            self._bars.pop((symbol, tf), None)
+        self._last.pop(symbol, None)
+        self._updated.pop(symbol, None)
+
+
+def _bar_datetime(bar: dict) -> datetime | None:
+    """분봉 시각 (로컬 저장소 "time", cloud API "timestamp")."""
+    ts = bar.get("time") or bar.get("timestamp")
+    if isinstance(ts, datetime):
+        return ts.replace(tzinfo=None)
+    try:
+        return datetime.fromisoformat(str(ts)).replace(tzinfo=None)
+    except (TypeError, ValueError):
+        return None
+
+
+def _new_bucket(start: str, bar: dict) -> dict:
+    close = float(bar["close"])
+    return {
+        "time": start, "open": float(bar.get("open") or close),
+        "high": float(bar.get("high") or close), "low": float(bar.get("low") or close),
+        "close": close, "volume": int(bar.get("volume") or 0),
+    }
+
+
+def _merge(agg: dict, bar: dict) -> dict:
+    """1분봉을 구간 봉에 합친다 (agg 갱신 후 반환)."""
+    close = float(bar["close"])
+    agg["high"] = max(agg["high"], float(bar.get("high") or close))
+    agg["low"] = min(agg["low"], float(bar.get("low") or close))
+    agg["close"] = close
+    agg["volume"] += int(bar.get("volume") or 0)
+    return agg
+
+
+def _bucket_start(dt: datetime, minutes: int) -> str:
+    """구간 시작 시각 ISO — 하루 중 분을 minutes로 내림 (aggregate_bars와 같다)."""
+    start = (dt.hour * 60 + dt.minute) // minutes * minutes
+    return dt.replace(hour=start // 60, minute=start % 60, second=0, microsecond=0).isoformat()
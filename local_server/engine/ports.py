@@ -36,6 +36,10 @@ class LogPort(Protocol):
         intent_id: str | None = None,
     ) -> None: ...
 
+    async def flush(self) -> None:
+        """쌓아 둔 로그를 모두 기록 (엔진 중지 시)."""
+        ...
+
     def today_realized_pnl(self) -> float: ...
 
     def today_executed_amount(self) -> Decimal: ...
@@ -54,6 +58,8 @@ class BarStorePort(Protocol):
 
     def save_bars(self, symbol: str, bars: list[dict]) -> None: ...
 
+    def load_bars(self, symbol: str, since: str) -> list[dict]: ...
+
 
 class ReferenceDataPort(Protocol):
     """종목 메타(시장 구분) 조회 포트."""
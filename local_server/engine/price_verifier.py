@@ -1,20 +1,31 @@
 """PriceVerifier — 주문 전 가격 검증.
 
-WS로 수신한 가격과 REST로 재조회한 가격의 괴리를 체크한다.
+평가 시점 가격(WS)과 주문 직전 현재가의 괴리를 체크한다.
 괴리 > 임계값(기본 1%)이면 주문을 거부한다.
+
+- 현재가는 메모리의 최신 WS 시세가 max_quote_age초 이내면 그 값 (REST 호출 없음)
+- 오래됐거나 없으면 BrokerAdapter.get_quote() (REST)
+- 사이클 안(begin_cycle ~ end_cycle)에서는 REST 조회를 종목당 1회로 합치고,
+  prefetch()로 선택된 후보 종목을 최대 concurrency개씩 동시에 미리 조회한다
 """
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
 from dataclasses import dataclass
+from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 
 if TYPE_CHECKING:
     from sv_core.broker.base import BrokerAdapter
 
 logger = logging.getLogger(__name__)
 
+# 종목 → 최신 WS 시세 {"price", "timestamp", ...} (BarBuilder.get_latest)
+QuoteSource = Callable[[str], "dict[str, Any] | None"]
+
 
 @dataclass
 class VerifyResult:
@@ -24,22 +35,58 @@ class VerifyResult:
     actual_price: Decimal
     expected_price: Decimal
     diff_pct: Decimal
+    source: str = "REST"  # actual_price 출처 ("WS" | "REST")
 
 
 class PriceVerifier:
-    """주문 전 BrokerAdapter.get_quote()로 현재가를 재확인."""
+    """주문 전 현재가 재확인 (신선한 WS 시세 우선, 아니면 REST)."""
 
     TOLERANCE_PCT = Decimal("1.0")  # 1% 괴리 허용
 
-    def __init__(self, broker: BrokerAdapter) -> None:
+    def __init__(
+        self,
+        broker: BrokerAdapter,
+        quote_source: QuoteSource | None = None,
+        max_quote_age: float = 1.0,
+        concurrency: int = 4,
+    ) -> None:
         self._broker = broker
+        self._quote_source = quote_source
+        self._max_age = timedelta(seconds=max_quote_age)
+        self._concurrency = max(1, concurrency)
+        # 사이클 중에만: 종목 → REST 조회 태스크 (중복 제거) / 동시 조회 제한
+        self._rest: dict[str, asyncio.Task] | None = None
+        self._sem: asyncio.Semaphore | None = None
+        self.ws_hits = 0     # WS 시세로 검증한 횟수
+        self.rest_calls = 0  # REST get_quote 호출 수
+
+    def begin_cycle(self) -> None:
+        """사이클 시작 — 이후 REST 조회는 종목당 1회."""
+        self.end_cycle()
+        self._rest = {}
+        self._sem = asyncio.Semaphore(self._concurrency)
+
+    def end_cycle(self) -> None:
+        """사이클 종료 — 조회 결과를 버린다 (다음 사이클은 다시 조회)."""
+        for task in (self._rest or {}).values():
+            task.cancel()
+        self._rest = None
+        self._sem = None
+
+    async def prefetch(self, symbols: Iterable[str]) -> None:
+        """WS 시세가 오래된 종목만 REST로 미리 조회 (사이클 중, 동시 조회 제한)."""
+        if self._rest is None:
+            return
+        stale = [s for s in dict.fromkeys(symbols) if self._fresh_price(s) is None]
+        if stale:
+            await asyncio.gather(*(self._rest_price(s) for s in stale), return_exceptions=True)
 
     async def verify(self, symbol: str, expected_price: Decimal) -> VerifyResult:
         """가격 검증.
 
         Args:
             symbol: 종목 코드
-            expected_price: WS에서 수신한 가격
+            expected_price: 평가 시점 WS 가격
 
         Returns:
             VerifyResult (ok=True면 통과)
@@ -52,25 +99,30 @@ class PriceVerifier:
                 diff_pct=Decimal("999"),
             )
 
-        try:
-            quote = await self._broker.get_quote(symbol)
-            actual_price = quote.price
-        except Exception:
-            logger.exception("가격 조회 실패: %s", symbol)
-            return VerifyResult(
-                ok=False,
-                actual_price=Decimal(0),
-                expected_price=expected_price,
-                diff_pct=Decimal("999"),
-            )
+        source = "WS"
+        actual_price = self._fresh_price(symbol)
+        if actual_price is not None:
+            self.ws_hits += 1
+        else:
+            source = "REST"
+            try:
+                actual_price = await self._rest_price(symbol)
+            except Exception:
+                logger.exception("가격 조회 실패: %s", symbol)
+                return VerifyResult(
+                    ok=False,
+                    actual_price=Decimal(0),
+                    expected_price=expected_price,
+                    diff_pct=Decimal("999"),
+                )
 
         diff_pct = abs(actual_price - expected_price) / expected_price * 100
         ok = diff_pct <= self.TOLERANCE_PCT
 
         if not ok:
             logger.warning(
-                "가격 괴리 초과: %s (WS=%s, REST=%s, 괴리=%.2f%%)",
-                symbol, expected_price, actual_price, diff_pct,
+                "가격 괴리 초과: %s (WS=%s, %s=%s, 괴리=%.2f%%)",
+                symbol, expected_price, source, actual_price, diff_pct,
             )
 
         return VerifyResult(
@@ -78,4 +130,32 @@ class PriceVerifier:
             actual_price=actual_price,
             expected_price=expected_price,
             diff_pct=diff_pct,
+            source=source,
         )
+
+    def _fresh_price(self, symbol: str) -> Decimal | None:
+        """max_quote_age초 이내에 받은 WS 시세 가격 (없거나 오래됐으면 None)."""
+        if self._quote_source is None or self._max_age <= timedelta(0):
+            return None
+        quote = self._quote_source(symbol)
+        if not quote:
+            return None
+        ts = quote.get("timestamp")
+        if ts is None or datetime.now() - ts > self._max_age:
+            return None
+        price = Decimal(str(quote.get("price", 0)))
+        return price if price > 0 else None
+
+    async def _rest_price(self, symbol: str) -> Decimal:
+        if self._rest is None:
+            return await self._fetch(symbol)
+        task = self._rest.get(symbol)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(symbol))
+            self._rest[symbol] = task
+        return await asyncio.shield(task)
+
+    async def _fetch(self, symbol: str) -> Decimal:
+        async with self._sem or contextlib.nullcontext():
+            self.rest_calls += 1
+            return (await self._broker.get_quote(symbol)).price
@@ -0,0 +1,157 @@
+"""RulePlan — set_rules 시점에 만드는 불변 실행 계획.
+
+매 사이클 규칙 목록을 거르고(is_active) 정렬하고(priority) 스크립트를 분석(TF/상태 여부)하던
+일을 규칙이 바뀔 때 한 번만 한다. 사이클은 계획을 순회하기만 한다.
+
+- 활성 규칙을 종목별로 묶고, 종목 안과 전체 모두 priority 내림차순 (동률은 입력 순)
+- 규칙마다 파싱된 AST(v2 스크립트), 정적 의존성, 상태 없음 여부를 붙인다
+- 종목마다 활성 규칙 전체의 분봉 TF 합집합 (지표 dict를 종목 단위로 공유하므로)
+- 이전 계획을 넘기면 script가 그대로인 규칙은 파싱/분석 결과를 재사용 (새/바뀐 규칙만 파싱)
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Iterable, Mapping
+
+from local_server.engine.evaluator import RuleEvaluator
+from local_server.engine.indicator_provider import IndicatorNeeds
+from sv_core.parsing import ScriptDependencies, analyze, parse_v2
+from sv_core.parsing.ast_nodes import ScriptV2
+
+MINUTE_TFS = ("1m", "5m", "15m", "1h")
+
+
+@dataclass(frozen=True, slots=True)
+class PlannedRule:
+    """계획에 올라간 활성 규칙 1건.
+
+    rank: 전체 평가 순서 (priority 내림차순, 동률은 입력 순)
+    ast: v2 스크립트의 AST (v1 JSON/v1 DSL은 None)
+    deps: 스크립트 정적 의존성 (script 없음/파싱 실패 시 None)
+    tfs: 같은 종목 활성 규칙 전체의 분봉 TF 합집합
+    """
+
+    rule: dict
+    rule_id: int
+    symbol: str
+    priority: int
+    rank: int
+    ast: ScriptV2 | None
+    deps: ScriptDependencies | None
+    tfs: frozenset[str]
+
+    @property
+    def stateless(self) -> bool:
+        """평가마다 전진하는 state가 없는 스크립트 규칙 — 분 안에서 여러 번 평가해도 된다."""
+        return self.deps is not None and not self.deps.stateful
+
+
+@dataclass(frozen=True, slots=True)
+class SymbolPlan:
+    """종목 1개의 활성 규칙 (priority 내림차순)."""
+
+    symbol: str
+    rules: tuple[PlannedRule, ...]
+    stateless: tuple[PlannedRule, ...]
+    tfs: frozenset[str]
+
+
+@dataclass(frozen=True, slots=True)
+class RulePlan:
+    """활성 규칙 실행 계획 — ordered는 전체, symbols는 종목별."""
+
+    ordered: tuple[PlannedRule, ...] = ()
+    symbols: Mapping[str, SymbolPlan] = field(default_factory=lambda: MappingProxyType({}))
+
+    @classmethod
+    def build(cls, rules: Iterable[dict], previous: RulePlan | None = None) -> RulePlan:
+        active = [r for r in rules if r.get("is_active", False)]
+        # reverse 정렬도 안정 정렬 — 동률 priority는 입력 순 유지
+        active.sort(key=lambda r: r.get("priority", 0), reverse=True)
+
+        reusable = {p.rule_id: p for p in previous.ordered} if previous is not None else {}
+        parsed = [_reuse_or_parse(rule, reusable.get(rule.get("id", 0))) for rule in active]
+        tfs_by_symbol: dict[str, set[str]] = {}
+        for rule, (_, deps) in zip(active, parsed):
+            tfs = tfs_by_symbol.setdefault(rule.get("symbol", ""), set())
+            if deps is not None:
+                tfs.update(tf for tf in deps.timeframes if tf in MINUTE_TFS)
+        frozen_tfs = {sym: frozenset(tfs) for sym, tfs in tfs_by_symbol.items()}
+
+        ordered = tuple(
+            PlannedRule(
+                rule=rule,
+                rule_id=rule.get("id", 0),
+                symbol=rule.get("symbol", ""),
+                priority=rule.get("priority", 0),
+                rank=rank,
+                ast=ast,
+                deps=deps,
+                tfs=frozen_tfs[rule.get("symbol", "")],
+            )
+            for rank, (rule, (ast, deps)) in enumerate(zip(active, parsed))
+        )
+        grouped: dict[str, list[PlannedRule]] = {}
+        for planned in ordered:
+            grouped.setdefault(planned.symbol, []).append(planned)
+        symbols = {
+            sym: SymbolPlan(
+                symbol=sym,
+                rules=tuple(planned),
+                stateless=tuple(p for p in planned if p.stateless),
+                tfs=frozen_tfs[sym],
+            )
+            for sym, planned in grouped.items()
+        }
+        return cls(ordered=ordered, symbols=MappingProxyType(symbols))
+
+    def indicator_needs(self) -> dict[str, dict[str, IndicatorNeeds]]:
+        """활성 규칙 → {symbol: {tf: IndicatorNeeds}}.
+
+        script가 없는 규칙(v1 JSON)은 indicators를 쓰지 않으므로 건너뛴다.
+        파싱 실패/동적 인자 규칙은 전체 지표 세트(keys=None)로 둔다.
+        """
+        needs: dict[str, dict[str, IndicatorNeeds]] = {}
+        for planned in self.ordered:
+            if not planned.rule.get("script"):
+                continue
+            by_tf = needs.setdefault(planned.symbol, {})
+            deps = planned.deps
+            if deps is None:
+                rule_needs = {"1d": IndicatorNeeds()}
+            else:
+                rule_needs = {
+                    tf or "1d": IndicatorNeeds(
+                        None if deps.dynamic else frozenset(deps.keys(tf)), deps.depth(tf),
+                    )
+                    for tf in (None, *deps.timeframes)
+                }
+            for tf, need in rule_needs.items():
+                by_tf[tf] = by_tf[tf].merge(need) if tf in by_tf else need
+        return needs
+
+    def __len__(self) -> int:
+        return len(self.ordered)
+
+
+def _reuse_or_parse(
+    rule: dict, previous: PlannedRule | None,
+) -> tuple[ScriptV2 | None, ScriptDependencies | None]:
+    """이전 계획의 같은 규칙이 같은 script면 그 파싱 결과, 아니면 새로 파싱."""
+    if previous is not None and (previous.rule.get("script") or "") == (rule.get("script") or ""):
+        return previous.ast, previous.deps
+    return _parse(rule)
+
+
+def _parse(rule: dict) -> tuple[ScriptV2 | None, ScriptDependencies | None]:
+    """규칙 script → (v2 AST, 의존성). 분석은 v1 DSL도 parse_v2로 한다 (analyze_script와 같다)."""
+    script = rule.get("script") or ""
+    if not script:
+        return None, None
+    try:
+        ast = parse_v2(script)
+        deps = analyze(ast)
+    except Exception:
+        return None, None
+    return (ast if RuleEvaluator.is_v2_script(script) else None), deps
@@ -2,10 +2,12 @@
 
 APScheduler의 AsyncIOScheduler를 사용하여
 월~금 09:00~15:30 KST 동안 매 분 evaluate_all()을 호출한다.
+이벤트 모드(EventTrigger)에서는 이벤트로 평가되지 않은 종목을 맡는 안전망이다.
 """
 from __future__ import annotations
 
 import logging
+from datetime import datetime
 from typing import TYPE_CHECKING, Callable, Coroutine, Any
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -15,6 +17,18 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+MARKET_OPEN = (9, 0)    # 09:00
+MARKET_CLOSE = (15, 30)  # 15:30 (미포함)
+
+
+def is_market_hours(now: datetime) -> bool:
+    """평가 가능한 장 시간 여부 — 월~금 09:00 이상 15:30 미만.
+
+    cron(hour="9-15")은 15:30~15:59도 호출하고 이벤트 경로는 시각 제한이 없으므로
+    두 경로 모두 평가 직전에 이 검사를 거친다.
+    """
+    return now.weekday() < 5 and MARKET_OPEN <= (now.hour, now.minute) < MARKET_CLOSE
+
 
 class EngineScheduler:
     """장 시간 1분 주기로 규칙 평가 실행."""
@@ -21,6 +21,7 @@ from local_server.routers import account, alerts as alerts_router, auth, config
 from local_server.routers import quote as quote_router, broker as broker_router
 from local_server.routers.bars import router as bars_router
 from local_server.routers.condition_status import router as condition_router
+from local_server.routers.eval_profile import router as eval_profile_router
 
 logger = logging.getLogger(__name__)
 
@@ -189,9 +190,10 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     from local_server.storage.log_db import get_log_db
     from decimal import Decimal
 
+    app.state.alert_log = LogDbAdapter(get_log_db())
     app.state.alert_monitor = AlertMonitor(
         config=cfg.get("alerts"),
-        log=LogDbAdapter(get_log_db()),
+        log=app.state.alert_log,
         max_loss_pct=Decimal(str(cfg.get("max_loss_pct", "5.0"))),
     )
     watchdog = HealthWatchdog(alert_monitor=app.state.alert_monitor)
@@ -245,6 +247,15 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # --- 종료 훅 ---
     logger.info("로컬 서버 종료 중...")
 
+    # 전략 엔진 중지 (버퍼링된 실행 로그 기록 포함)
+    engine = getattr(app.state, "engine", None)
+    if engine is not None and engine.is_running:
+        try:
+            await engine.stop()
+            logger.info("전략 엔진 중지")
+        except Exception as e:
+            logger.warning("전략 엔진 중지 실패: %s", e)
+
     # 브로커 연결 해제
     broker = getattr(app.state, "broker", None)
     if broker:
@@ -259,6 +270,9 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     if wd:
         await wd.stop()
         logger.info("HealthWatchdog 중지")
+    alert_log = getattr(app.state, "alert_log", None)
+    if alert_log is not None:
+        await alert_log.flush()
 
     # WS 릴레이 클라이언트 종료
     from local_server.cloud.ws_relay_client import get_ws_relay_client
@@ -348,6 +362,7 @@ def create_app() -> FastAPI:
     app.include_router(broker_router.router, prefix="/api/broker", tags=["브로커"])
     app.include_router(bars_router, tags=["분봉"])
     app.include_router(condition_router)
+    app.include_router(eval_profile_router)
     app.include_router(ws.router, tags=["WebSocket"])
 
     from local_server.routers import devices as devices_router
@@ -132,6 +132,11 @@ async def cancel_order(
             detail=f"주문 취소 실패: {e}",
         ) from e
 
+    engine = getattr(request.app.state, "engine", None)
+    if engine is not None:
+        # 엔진 계좌 캐시에서 빼고 잔고(주문가능 현금)는 다시 읽게
+        engine.account_cache.on_order_cancelled(order_id)
+
     return {
         "success": True,
         "data": {"order_id": order_id, "result": result},
@@ -1,32 +1,40 @@
-"""조건 상태 API — spec §3.6 T5."""
+"""조건 상태 API — spec §3.6 T5.
+
+조회할 때마다 ConditionTracker 구독(watch)을 갱신한다 — 폴링이 이어지는 동안에만
+엔진이 조건별 세부 값을 매 사이클 기록한다.
+"""
 from __future__ import annotations
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+
+from local_server.engine.condition_tracker import ConditionTracker
 
 router = APIRouter(prefix="/api/conditions", tags=["conditions"])
 
 
+def _get_tracker(request: Request) -> ConditionTracker | None:
+    """app.state 엔진의 ConditionTracker (엔진 미생성 시 None)."""
+    engine = getattr(request.app.state, "engine", None)
+    if engine is None:
+        return None
+    return getattr(engine, "condition_tracker", None)
+
+
 @router.get("/status")
-async def get_all_status():
+async def get_all_status(request: Request):
     """모든 규칙의 최신 조건 상태."""
-    from local_server.engine import get_engine
-    engine = get_engine()
-    if engine is None:
-        return {"success": True, "data": {}, "count": 0}
-    tracker = getattr(engine, "_condition_tracker", None)
+    tracker = _get_tracker(request)
     if tracker is None:
         return {"success": True, "data": {}, "count": 0}
+    tracker.watch()
     data = tracker.get_all_latest()
     return {"success": True, "data": data, "count": len(data)}
 
 
 @router.get("/status/{rule_id}")
-async def get_rule_status(rule_id: int):
+async def get_rule_status(rule_id: int, request: Request):
     """특정 규칙의 조건 상태."""
-    from local_server.engine import get_engine
-    engine = get_engine()
-    if engine is None:
-        return {"success": True, "data": None}
-    tracker = getattr(engine, "_condition_tracker", None)
+    tracker = _get_tracker(request)
     if tracker is None:
         return {"success": True, "data": None}
+    tracker.watch(rule_id)
     return {"success": True, "data": tracker.get_latest(rule_id)}
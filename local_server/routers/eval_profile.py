@@ -0,0 +1,61 @@
+"""DSL 평가 프로파일 API — 규칙별 내장 함수/조건 줄/노드 타입 호출 수·누적 시간.
+
+기본은 꺼져 있다 (계측 없는 컴파일본으로 평가). POST로 켜면 다음 사이클부터 누적.
+"""
+from __future__ import annotations
+from typing import Any
+
+from fastapi import APIRouter, Depends, Request
+from pydantic import BaseModel
+
+from local_server.core.local_auth import require_local_secret
+from local_server.engine.evaluator import RuleEvaluator
+
+router = APIRouter(prefix="/api/conditions", tags=["conditions"])
+
+
+class ProfileToggleRequest(BaseModel):
+    enabled: bool
+
+
+def _get_evaluator(request: Request) -> RuleEvaluator | None:
+    """app.state 엔진의 RuleEvaluator (엔진 미생성 시 None)."""
+    engine = getattr(request.app.state, "engine", None)
+    if engine is None:
+        return None
+    return getattr(engine, "evaluator", None)
+
+
+@router.get("/profile")
+async def get_profile(request: Request) -> dict[str, Any]:
+    """누적 평가 프로파일 (규칙별 누적 시간 내림차순)."""
+    evaluator = _get_evaluator(request)
+    if evaluator is None:
+        return {"success": True, "data": None}
+    return {"success": True, "data": evaluator.profile_report()}
+
+
+@router.post("/profile")
+async def set_profile(
+    body: ProfileToggleRequest,
+    request: Request,
+    _: None = Depends(require_local_secret),
+) -> dict[str, Any]:
+    """프로파일링 켜기/끄기 (꺼도 누적 결과는 유지)."""
+    evaluator = _get_evaluator(request)
+    if evaluator is None:
+        return {"success": False, "enabled": False}
+    evaluator.set_profiling(body.enabled)
+    return {"success": True, "enabled": evaluator.profiling}
+
+
+@router.delete("/profile")
+async def reset_profile(
+    request: Request,
+    _: None = Depends(require_local_secret),
+) -> dict[str, Any]:
+    """누적 프로파일 초기화."""
+    evaluator = _get_evaluator(request)
+    if evaluator is not None:
+        evaluator.reset_profile()
+    return {"success": True}
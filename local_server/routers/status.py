@@ -43,6 +43,7 @@ async def get_status(request: Request) -> dict[str, Any]:
             "kill_switch": sg.kill_switch != KillSwitchLevel.OFF,
             "loss_lock": sg.loss_lock,
             "trading_enabled": engine.safeguard.is_trading_enabled(),
+            "eval_cache": engine.eval_cache.stats(),
         }
 
     # is_mock 판단: 브로커 인스턴스 > config 순서
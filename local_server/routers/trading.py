@@ -140,6 +140,8 @@ async def start_strategy(request: Request, _: None = Depends(require_local_secre
         ref_data=StockMasterAdapter(get_stock_master_cache()),
     )
     engine.set_rules(get_rules_cache().get_rules())
+    # 규칙 동기화(수동/하트비트) → 재시작 없이 엔진에 반영
+    get_rules_cache().set_on_sync(engine.set_rules)
     engine.set_on_execution(_on_execution)
     request.app.state.engine = engine
 
@@ -172,6 +174,7 @@ async def stop_strategy(request: Request, _: None = Depends(require_local_secret
         )
 
     await engine.stop()
+    get_rules_cache().set_on_sync(None)
 
     # 브로커는 유지 (lifespan 종료까지 연결 유지)
     request.app.state.engine = None
@@ -311,6 +314,10 @@ async def place_order(
             detail=f"주문 실행 실패: {e}",
         ) from e
 
+    if engine is not None:
+        # 엔진 계좌 캐시 무효화 — 다음 사이클/손실 제한 취소가 이 주문을 본다
+        engine.account_cache.on_order_submitted(result.order_id)
+
     log_db = get_log_db()
     await log_db.async_write(
         LOG_TYPE_ORDER,
@@ -0,0 +1,158 @@
+"""LogBuffer — 실행 로그 일괄 기록 버퍼.
+
+LogDB.write()는 건마다 연결을 열고 커밋(fsync)한다. 매매 사이클 한 번에 후보마다
+전략/주문/체결/에러 로그가 여러 건 나오므로, add()는 행을 메모리에 쌓기만 하고
+백그라운드 태스크가 flush_interval초마다(또는 max_pending건이 차면) 한 트랜잭션으로 기록한다.
+
+- ts는 add() 시각 — 기록이 늦어져도 발생 시각과 순서가 남는다
+- flush_sync(): 대기 중인 행을 즉시 기록 (이벤트 루프 밖 / 종료 시)
+- today_totals(): 기록된 당일 집계 + 아직 기록 안 된 행 — 읽기 때문에 기록하지 않는다
+- close(): 백그라운드 태스크를 멈추고 남은 행을 모두 기록
+- 기록 실패 시 다음 flush에서 다시 시도, max_retries번 연속 실패하면 그 행들을 버린다
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from local_server.storage.log_db import LogDB
+
+logger = logging.getLogger(__name__)
+
+
+class LogBuffer:
+    """LogDB 앞단 쓰기 버퍼 (한 트랜잭션 일괄 기록)."""
+
+    def __init__(
+        self,
+        log_db: LogDB,
+        flush_interval: float = 0.2,
+        max_pending: int = 200,
+        max_retries: int = 3,
+    ) -> None:
+        self._db = log_db
+        self._interval = flush_interval
+        self._max_pending = max_pending
+        self._max_retries = max_retries
+        self._pending: list[tuple] = []
+        self._retry: list[tuple] = []    # 기록 실패 — 다음 flush에서 먼저 기록
+        self._failures = 0               # 연속 기록 실패 횟수
+        # 기록 중인 일괄 (토큰 → 행) — 커밋 전까지 today_totals()가 직접 더한다
+        # 토큰은 LogDB가 발급 — 같은 DB를 쓰는 다른 버퍼와 겹치지 않는다
+        self._inflight: dict[int, list[tuple]] = {}
+        # DB 기록 직렬화 — 백그라운드 flush(스레드)와 flush_sync가 순서대로 기록
+        self._lock = threading.Lock()
+        # 행 이동(대기 → 기록 중 → 커밋/재시도) 보호 — 잠깐만 잡는다 (sqlite 작업 없음)
+        self._state = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self.batches = 0   # 기록한 트랜잭션 수
+        self.written = 0   # 기록한 행 수
+
+    def add(
+        self,
+        log_type: str,
+        message: str,
+        symbol: str | None = None,
+        meta: dict[str, Any] | None = None,
+        intent_id: str | None = None,
+    ) -> None:
+        """로그 1건 적재. 이벤트 루프 밖이면 바로 기록한다."""
+        self._pending.append(
+            self._db.make_row(log_type, message, symbol=symbol, meta=meta, intent_id=intent_id),
+        )
+        if self._task is None or self._task.done():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush_sync()
+                return
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        if len(self._pending) >= self._max_pending and self._wakeup is not None:
+            self._wakeup.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending) + len(self._retry)
+
+    def today_totals(self) -> tuple[Decimal, Decimal]:
+        """당일 (실현손익, 실행 금액) — 커밋된 집계 + 대기/재시도/기록 중인 행.
+
+        sqlite 기록도, 백그라운드 기록 대기도 없다 (이벤트 루프에서 매 사이클 호출).
+        """
+        with self._state:
+            totals = self._db.totals_snapshot()
+            rows = [*self._retry, *self._pending]
+            for token, batch in self._inflight.items():
+                if token not in totals.committed:  # 커밋됐으면 이미 스냅샷에 반영
+                    rows.extend(batch)
+        pnl, amount = self._db.row_totals(rows, totals.day)
+        return totals.realized_pnl + pnl, totals.executed_amount + amount
+
+    async def flush(self) -> None:
+        """대기 중인 행을 스레드 풀에서 한 트랜잭션으로 기록."""
+        if self._pending or self._retry:
+            await asyncio.to_thread(self._write_pending)
+
+    def flush_sync(self) -> None:
+        """대기 중인 행을 지금 기록 (진행 중인 백그라운드 기록이 있으면 끝난 뒤)."""
+        if self._pending or self._retry:
+            self._write_pending()
+
+    async def close(self) -> None:
+        """백그라운드 태스크 중지 + 남은 행 기록 (종료 시 유실 방지)."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    async def _run(self) -> None:
+        # 재시도 대기 행만 남아도 계속 — 새 add()가 없어도 interval 뒤 다시 기록
+        while self._pending or self._retry:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _write_pending(self) -> None:
+        with self._lock:
+            # 교체는 lock 안에서 — 먼저 잡은 쪽이 먼저 쌓인 행을 기록 (id 순서 = 발생 순서)
+            with self._state:
+                rows, self._pending = [*self._retry, *self._pending], []
+                self._retry = []
+                if not rows:
+                    return
+                token = self._db.next_token()
+                self._inflight[token] = rows
+            try:
+                self._db.write_many(rows, token=token)
+            except Exception:
+                self._failures += 1
+                with self._state:
+                    del self._inflight[token]
+                    if self._failures < self._max_retries:
+                        self._retry = rows
+                if self._failures < self._max_retries:
+                    logger.exception("로그 일괄 기록 실패 (%d건) — 다음 flush에서 재시도", len(rows))
+                else:
+                    logger.exception(
+                        "로그 일괄 기록 %d회 연속 실패 — %d건 폐기", self._failures, len(rows),
+                    )
+                    self._failures = 0
+                return
+            with self._state:
+                del self._inflight[token]
+            self._failures = 0
+            self.batches += 1
+            self.written += len(rows)
@@ -1,17 +1,24 @@
 """체결/에러 로그 SQLite 저장소.
 
 SQLite(logs.db)에 구조화된 로그를 저장하고 조회한다.
+당일 실현손익/실행 금액은 daily_totals 요약 테이블과 메모리 카운터로 유지한다 —
+FILL/ORDER 기록 시 같은 트랜잭션에서 더하고, 시작/날짜 변경 시에만 로그 전체에서 재구성한다.
+커밋 후 카운터를 불변 스냅샷(DailyTotals)으로 공개한다 — 이벤트 루프는 lock 없이 읽는다.
 비동기 I/O를 위해 aiosqlite를 사용한다.
 """
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import itertools
 import json
 import logging
 import sqlite3
-from datetime import datetime, timezone
+import threading
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 logger = logging.getLogger(__name__)
 
@@ -40,14 +47,44 @@ CREATE TABLE IF NOT EXISTS logs (
 
 CREATE INDEX IF NOT EXISTS idx_logs_ts ON logs(ts);
 CREATE INDEX IF NOT EXISTS idx_logs_type ON logs(log_type);
+
+CREATE TABLE IF NOT EXISTS daily_totals (
+    day             TEXT PRIMARY KEY,
+    realized_pnl    TEXT NOT NULL DEFAULT '0',
+    executed_amount TEXT NOT NULL DEFAULT '0'
+);
 """
 
+_MAX_COMMITTED_TOKENS = 64  # 스냅샷에 남기는 최근 일괄 기록 토큰 수
+
+
+class DailyTotals(NamedTuple):
+    """커밋된 당일 집계 스냅샷. committed = 반영된 최근 write_many 토큰 (LogBuffer 중복 계산 방지)."""
+
+    day: str
+    realized_pnl: Decimal
+    executed_amount: Decimal
+    committed: frozenset[int] = frozenset()
+
+
+_INSERT_SQL = (
+    "INSERT INTO logs (ts, log_type, symbol, message, meta, intent_id) VALUES (?, ?, ?, ?, ?, ?)"
+)
+
 
 class LogDB:
     """SQLite 로그 저장소 (동기 버전)."""
 
     def __init__(self, db_path: Path | None = None) -> None:
         self._path = db_path or DEFAULT_LOG_DB_PATH
+        # 당일 집계 카운터 (UTC 날짜) — 기록 시 갱신, 시작/날짜 변경 시에만 로그에서 재구성
+        self._lock = threading.Lock()
+        self._day = ""
+        self._realized_pnl = Decimal("0")
+        self._executed_amount = Decimal("0")
+        self._totals = DailyTotals("", Decimal("0"), Decimal("0"))
+        # write_many 토큰 — 이 DB에 쓰는 모든 LogBuffer가 공유 (committed가 DB 단위이므로)
+        self._tokens = itertools.count(1)
         self._init_db()
 
     def _init_db(self) -> None:
@@ -61,6 +98,8 @@ class LogDB:
                 conn.execute("ALTER TABLE logs ADD COLUMN intent_id TEXT")
                 logger.info("로그 DB 마이그레이션: intent_id 컬럼 추가")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_intent ON logs(intent_id)")
+            self._load_day(conn, _utc_day())
+        self._publish()
         logger.debug("로그 DB 초기화: %s", self._path)
 
     def write(
@@ -83,15 +122,62 @@ class LogDB:
         Returns:
             생성된 로그 레코드 ID
         """
+        row = self.make_row(log_type, message, symbol=symbol, meta=meta, intent_id=intent_id)
+        with self._lock:
+            with self._rollback_totals(), sqlite3.connect(str(self._path)) as conn:
+                self._add_totals(conn, [row])
+                cursor = conn.execute(_INSERT_SQL, row)
+            self._publish()
+            return cursor.lastrowid  # type: ignore[return-value]
+
+    def write_many(self, rows: list[tuple], token: int | None = None) -> None:
+        """make_row()로 만든 행들을 한 트랜잭션으로 기록한다 (LogBuffer 일괄 flush).
+
+        token: 커밋 후 스냅샷 committed에 남길 일괄 기록 번호 (next_token()으로 받는다).
+        """
+        if not rows:
+            return
+        with self._lock:
+            with self._rollback_totals(), sqlite3.connect(str(self._path)) as conn:
+                self._add_totals(conn, rows)
+                conn.executemany(_INSERT_SQL, rows)
+            self._publish(token)
+
+    def next_token(self) -> int:
+        """일괄 기록 토큰 발급 (lock 없음 — count의 next는 GIL 아래 원자적)."""
+        return next(self._tokens)
+
+    def totals_snapshot(self) -> DailyTotals:
+        """마지막 커밋 기준 당일 집계 (lock 없음 — 날짜가 바뀐 첫 호출만 재구성)."""
+        totals = self._totals
+        if totals.day != _utc_day():
+            self._today()
+            totals = self._totals
+        return totals
+
+    @staticmethod
+    def row_totals(rows: list[tuple], day: str) -> tuple[Decimal, Decimal]:
+        """make_row() 행들 중 day 날짜분의 (실현손익, 실행 금액) 합계 (미기록 행 집계용)."""
+        pnl = amount = Decimal("0")
+        for ts, log_type, _, _, meta_json, _ in rows:
+            if log_type in (LOG_TYPE_FILL, LOG_TYPE_ORDER) and ts[:10] == day:
+                row_pnl, row_amount = _row_amounts(log_type, meta_json)
+                pnl += row_pnl
+                amount += row_amount
+        return pnl, amount
+
+    @staticmethod
+    def make_row(
+        log_type: str,
+        message: str,
+        symbol: str | None = None,
+        meta: dict[str, Any] | None = None,
+        intent_id: str | None = None,
+    ) -> tuple:
+        """INSERT 행 (ts는 호출 시각 — 버퍼링돼도 발생 시각이 남는다)."""
         ts = datetime.now(timezone.utc).isoformat()
         meta_json = json.dumps(meta or {}, ensure_ascii=False)
-
-        with sqlite3.connect(str(self._path)) as conn:
-            cursor = conn.execute(
-                "INSERT INTO logs (ts, log_type, symbol, message, meta, intent_id) VALUES (?, ?, ?, ?, ?, ?)",
-                (ts, log_type, symbol, message, meta_json, intent_id),
-            )
-            return cursor.lastrowid  # type: ignore[return-value]
+        return (ts, log_type, symbol, message, meta_json, intent_id)
 
     async def async_write(self, *args, **kwargs) -> int:
         """비동기 컨텍스트에서 write()를 스레드 풀로 오프로드한다."""
@@ -181,46 +267,120 @@ class LogDB:
             result[log_type] = count
         return result
 
-    def today_executed_amount(self) -> "Decimal":
-        """당일 ORDER 로그의 실행 금액(price × qty)을 합산한다."""
-        from decimal import Decimal
-
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        with sqlite3.connect(str(self._path)) as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute(
-                "SELECT meta FROM logs WHERE log_type = ? AND ts >= ?",
-                (LOG_TYPE_ORDER, today),
-            ).fetchall()
-
-        total = Decimal("0")
-        for row in rows:
-            meta = json.loads(row["meta"] or "{}")
-            price = meta.get("price")
-            qty = meta.get("qty")
-            if price and qty:
-                total += Decimal(str(price)) * Decimal(str(qty))
-        return total
-
-    def today_realized_pnl(self) -> "Decimal":
-        """당일 FILL 로그의 실현손익(realized_pnl)을 합산한다."""
-        from decimal import Decimal
-
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        with sqlite3.connect(str(self._path)) as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute(
-                "SELECT meta FROM logs WHERE log_type = ? AND ts >= ?",
-                (LOG_TYPE_FILL, today),
-            ).fetchall()
-
-        total = Decimal("0")
-        for row in rows:
-            meta = json.loads(row["meta"] or "{}")
-            pnl = meta.get("realized_pnl")
-            if pnl:
-                total += Decimal(str(pnl))
-        return total
+    def today_executed_amount(self) -> Decimal:
+        """당일 ORDER 로그의 실행 금액(price × qty) 합계 (집계 카운터, O(1))."""
+        return self._today()[1]
+
+    def today_realized_pnl(self) -> Decimal:
+        """당일 FILL 로그의 실현손익(realized_pnl) 합계 (집계 카운터, O(1))."""
+        return self._today()[0]
+
+    # ── 당일 집계 카운터 ──
+
+    def _today(self) -> tuple[Decimal, Decimal]:
+        today = _utc_day()
+        with self._lock:
+            if self._day != today:
+                # 날짜 변경 — 새 날짜 집계를 로그에서 재구성
+                with sqlite3.connect(str(self._path)) as conn:
+                    self._load_day(conn, today)
+                self._publish()
+            return self._realized_pnl, self._executed_amount
+
+    def _publish(self, token: int | None = None) -> None:
+        """커밋된 카운터를 스냅샷으로 공개 (self._lock 안, 커밋 후)."""
+        committed = self._totals.committed
+        if token is not None:
+            committed = frozenset(sorted(committed | {token})[-_MAX_COMMITTED_TOKENS:])
+        self._totals = DailyTotals(self._day, self._realized_pnl, self._executed_amount, committed)
+
+    @contextlib.contextmanager
+    def _rollback_totals(self):
+        """기록 실패(커밋 전 예외) 시 메모리 카운터를 되돌린다 (self._lock 안)."""
+        saved = (self._day, self._realized_pnl, self._executed_amount)
+        try:
+            yield
+        except BaseException:
+            self._day, self._realized_pnl, self._executed_amount = saved
+            raise
+
+    def _load_day(self, conn: sqlite3.Connection, day: str) -> None:
+        """day 집계를 로그에서 다시 계산해 카운터와 daily_totals에 반영 (시작/날짜 변경 시)."""
+        pnl, amount = self._scan_day(conn, day)
+        self._store_totals(conn, day, pnl, amount)
+        self._day, self._realized_pnl, self._executed_amount = day, pnl, amount
+
+    @staticmethod
+    def _scan_day(conn: sqlite3.Connection, day: str) -> tuple[Decimal, Decimal]:
+        """해당 날짜 FILL/ORDER 로그 전체를 읽어 (실현손익, 실행 금액) 합산."""
+        next_day = (datetime.fromisoformat(day) + timedelta(days=1)).strftime("%Y-%m-%d")
+        rows = conn.execute(
+            "SELECT log_type, meta FROM logs WHERE log_type IN (?, ?) AND ts >= ? AND ts < ?",
+            (LOG_TYPE_FILL, LOG_TYPE_ORDER, day, next_day),
+        ).fetchall()
+        pnl = amount = Decimal("0")
+        for log_type, meta_json in rows:
+            row_pnl, row_amount = _row_amounts(log_type, meta_json)
+            pnl += row_pnl
+            amount += row_amount
+        return pnl, amount
+
+    @staticmethod
+    def _store_totals(conn: sqlite3.Connection, day: str, pnl: Decimal, amount: Decimal) -> None:
+        conn.execute(
+            "INSERT INTO daily_totals (day, realized_pnl, executed_amount) VALUES (?, ?, ?) "
+            "ON CONFLICT(day) DO UPDATE SET "
+            "realized_pnl = excluded.realized_pnl, executed_amount = excluded.executed_amount",
+            (day, str(pnl), str(amount)),
+        )
+
+    def _add_totals(self, conn: sqlite3.Connection, rows: list[tuple]) -> None:
+        """기록할 행의 금액을 같은 트랜잭션에서 집계에 더한다 (행 INSERT 전, self._lock 안)."""
+        deltas: dict[str, list[Decimal]] = {}
+        for ts, log_type, _, _, meta_json, _ in rows:
+            if log_type not in (LOG_TYPE_FILL, LOG_TYPE_ORDER):
+                continue
+            pnl, amount = _row_amounts(log_type, meta_json)
+            if pnl or amount:
+                delta = deltas.setdefault(ts[:10], [Decimal("0"), Decimal("0")])
+                delta[0] += pnl
+                delta[1] += amount
+        for day, (pnl, amount) in deltas.items():
+            if day == self._day:
+                self._realized_pnl += pnl
+                self._executed_amount += amount
+                self._store_totals(conn, day, self._realized_pnl, self._executed_amount)
+            elif day > self._day:
+                # 날짜 변경 후 첫 기록 — 이 행들은 아직 INSERT 전이라 재구성에 포함되지 않는다
+                self._load_day(conn, day)
+                self._realized_pnl += pnl
+                self._executed_amount += amount
+                self._store_totals(conn, day, self._realized_pnl, self._executed_amount)
+            else:
+                # 자정 직전 발생 후 늦게 기록된 행 — 지난 날짜 요약만 갱신
+                row = conn.execute(
+                    "SELECT realized_pnl, executed_amount FROM daily_totals WHERE day = ?", (day,),
+                ).fetchone()
+                base = (Decimal(row[0]), Decimal(row[1])) if row else self._scan_day(conn, day)
+                self._store_totals(conn, day, base[0] + pnl, base[1] + amount)
+
+
+def _utc_day() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def _row_amounts(log_type: str, meta_json: str | None) -> tuple[Decimal, Decimal]:
+    """로그 1행의 (실현손익, 실행 금액) — FILL은 meta.realized_pnl, ORDER는 price × qty."""
+    meta = json.loads(meta_json or "{}")
+    if log_type == LOG_TYPE_FILL:
+        pnl = meta.get("realized_pnl")
+        return (Decimal(str(pnl)) if pnl else Decimal("0")), Decimal("0")
+    if log_type == LOG_TYPE_ORDER:
+        price = meta.get("price")
+        qty = meta.get("qty")
+        if price and qty:
+            return Decimal("0"), Decimal(str(price)) * Decimal(str(qty))
+    return Decimal("0"), Decimal("0")
 
 
 # 전역 싱글턴
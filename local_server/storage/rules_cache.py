@@ -8,7 +8,7 @@ from __future__ import annotations
 import json
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +22,7 @@ class RulesCache:
     def __init__(self, rules_path: Path | None = None) -> None:
         self._path = rules_path or DEFAULT_RULES_PATH
         self._rules: list[dict[str, Any]] = []
+        self._on_sync: Callable[[list[dict[str, Any]]], None] | None = None
         self._load()
 
     def _load(self) -> None:
@@ -54,6 +55,15 @@ class RulesCache:
         self._rules = list(rules)
         self._save()
         logger.info("규칙 캐시 동기화 완료: %d개", len(self._rules))
+        if self._on_sync is not None:
+            try:
+                self._on_sync(self.get_rules())
+            except Exception:
+                logger.exception("규칙 동기화 콜백 실패")
+
+    def set_on_sync(self, callback: Callable[[list[dict[str, Any]]], None] | None) -> None:
+        """동기화 직후 호출할 콜백 (실행 중인 전략 엔진 hot-reload). None이면 해제."""
+        self._on_sync = callback
 
     def count(self) -> int:
         """캐시된 규칙 수를 반환한다."""
@@ -0,0 +1,133 @@
+"""AccountCache 테스트 — staleness 상한, 주문 이벤트 무효화, 체결 확인 폴링."""
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+from local_server.engine.account_cache import AccountCache
+from sv_core.broker.models import (
+    BalanceResult,
+    OrderResult,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _order(order_id: str) -> OrderResult:
+    return OrderResult(
+        order_id=order_id, client_order_id=f"c-{order_id}", symbol="005930",
+        side=OrderSide.BUY, order_type=OrderType.MARKET, qty=1,
+        limit_price=None, status=OrderStatus.SUBMITTED,
+    )
+
+
+def _cache(orders: list[OrderResult] | None = None) -> tuple[AccountCache, MagicMock, _Clock]:
+    broker = MagicMock()
+    broker.get_balance = AsyncMock(return_value=BalanceResult(cash=Decimal("1000"), total_eval=Decimal("1000")))
+    broker.get_open_orders = AsyncMock(return_value=orders or [])
+    clock = _Clock()
+    return AccountCache(broker, max_age=30.0, confirm_interval=2.0, clock=clock), broker, clock
+
+
+class TestAccountCache:
+    def test_hit_until_stale(self):
+        cache, broker, clock = _cache()
+
+        async def run() -> None:
+            await cache.balance()
+            await cache.open_orders()
+            clock.now += 29
+            await cache.balance()
+            await cache.open_orders()
+            assert broker.get_balance.await_count == 1
+            assert broker.get_open_orders.await_count == 1
+            clock.now += 2
+            await cache.balance()
+            await cache.open_orders()
+
+        asyncio.run(run())
+        assert broker.get_balance.await_count == 2
+        assert broker.get_open_orders.await_count == 2
+        assert cache.stats.balance_hits == 1 and cache.stats.balance_misses == 2
+
+    def test_force(self):
+        cache, broker, _ = _cache()
+
+        async def run() -> None:
+            await cache.balance()
+            await cache.balance(force=True)
+
+        asyncio.run(run())
+        assert broker.get_balance.await_count == 2
+
+    def test_submitted_order_polled_until_resolved(self):
+        """제출 주문은 confirm_interval마다 미체결 재조회, 목록에서 사라지면 잔고 무효화."""
+        cache, broker, clock = _cache([_order("1")])
+
+        async def run() -> None:
+            await cache.balance()
+            cache.on_order_submitted("1")
+            assert cache.unconfirmed == {"1"}
+            await cache.balance()
+            await cache.open_orders()
+            assert broker.get_balance.await_count == 2
+
+            clock.now += 1
+            await cache.open_orders()
+            assert broker.get_open_orders.await_count == 1
+            clock.now += 2
+            await cache.open_orders()
+            assert broker.get_open_orders.await_count == 2
+            await cache.balance()
+            assert broker.get_balance.await_count == 2  # 아직 미체결 — 잔고 유지
+
+            broker.get_open_orders.return_value = []
+            clock.now += 2
+            assert await cache.open_orders() == []
+            assert cache.unconfirmed == frozenset()
+            await cache.balance()
+            assert broker.get_balance.await_count == 3
+
+            clock.now += 10  # 확인 완료 후에는 max_age로 복귀
+            await cache.open_orders()
+            assert broker.get_open_orders.await_count == 3
+
+        asyncio.run(run())
+
+    def test_cancel_updates_cached_orders(self):
+        cache, broker, _ = _cache([_order("1"), _order("2")])
+
+        async def run() -> None:
+            await cache.balance()
+            await cache.open_orders()
+            cache.on_order_cancelled("1")
+            assert [o.order_id for o in await cache.open_orders()] == ["2"]
+            await cache.balance()
+
+        asyncio.run(run())
+        assert broker.get_open_orders.await_count == 1
+        assert broker.get_balance.await_count == 2
+
+    def test_reconcile_event_invalidates(self):
+        cache, broker, _ = _cache()
+
+        async def run() -> None:
+            await cache.balance()
+            await cache.open_orders()
+            cache.on_reconcile_event(object())
+            await cache.balance()
+            await cache.open_orders()
+
+        asyncio.run(run())
+        assert broker.get_balance.await_count == 2
+        assert broker.get_open_orders.await_count == 2
@@ -43,3 +43,44 @@ class TestConditionTracker:
     def test_get_nonexistent(self):
         ct = ConditionTracker()
         assert ct.get_latest(999) is None
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDetailCapture:
+    """세부 값 기록 — 구독 중이거나 샘플 주기에만."""
+
+    def test_sampled_without_watchers(self):
+        clock = _Clock()
+        ct = ConditionTracker(sample_interval=60, clock=clock)
+        assert ct.wants_details(1)  # 첫 사이클
+        ct.record(1, "t1", [], {}, None)
+        clock.now = 30
+        assert not ct.wants_details(1)
+        clock.now = 60
+        assert ct.wants_details(1)
+
+    def test_watch_rule_and_all(self):
+        clock = _Clock()
+        ct = ConditionTracker(watch_ttl=10, sample_interval=60, clock=clock)
+        ct.record(1, "t1", [], {}, None)
+        ct.record(2, "t1", [], {}, None)
+        ct.watch(1)
+        assert ct.wants_details(1) and not ct.wants_details(2)
+        ct.watch()
+        assert ct.wants_details(2)
+        clock.now = 11  # 구독 만료
+        assert not ct.wants_details(1) and not ct.wants_details(2)
+
+    def test_action_kept_on_lean_cycles(self):
+        ct = ConditionTracker()
+        ct.record(1, "t1", [{"index": 0, "result": False, "details": {}}], {}, None)
+        ct.record_action(1, {"side": "매수", "rule_index": 0})
+        assert ct.latest_action(1) == {"side": "매수", "rule_index": 0}
+        assert ct.get_latest(1)["cycle"] == "t1"  # 조건 스냅샷은 마지막 기록 사이클
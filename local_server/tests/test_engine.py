@@ -333,6 +333,52 @@ class TestPriceVerifier:
         result = asyncio.run(pv.verify("005930", Decimal("0")))
         assert result.ok is False
 
+    def test_fresh_ws_quote_skips_rest(self) -> None:
+        broker = MockBrokerAdapter(quote_price=Decimal("99999"))
+        broker.get_quote = AsyncMock(wraps=broker.get_quote)
+        bb = BarBuilder()
+        bb.on_quote("005930", Decimal("50100"), 10, datetime.now())
+        bb.on_quote("000660", Decimal("50000"), 10, datetime(2000, 1, 1))  # 오래된 시세
+        pv = PriceVerifier(broker, quote_source=bb.get_latest, max_quote_age=5.0)
+
+        fresh = asyncio.run(pv.verify("005930", Decimal("50000")))
+        assert fresh.ok is True and fresh.source == "WS" and fresh.actual_price == Decimal("50100")
+        stale = asyncio.run(pv.verify("000660", Decimal("50000")))
+        assert stale.ok is False and stale.source == "REST"
+        assert broker.get_quote.await_count == 1 and pv.ws_hits == 1
+
+    def test_cycle_dedups_and_bounds_rest_calls(self) -> None:
+        broker = MockBrokerAdapter()
+        active = peak = 0
+
+        async def slow_quote(symbol: str) -> QuoteEvent:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return QuoteEvent(symbol=symbol, price=Decimal("50000"), volume=0)
+
+        broker.get_quote = AsyncMock(side_effect=slow_quote)
+        pv = PriceVerifier(broker, concurrency=2)
+
+        async def run() -> list[VerifyResult]:
+            pv.begin_cycle()
+            try:
+                symbols = ["A", "B", "C", "A", "D", "B"]
+                await pv.prefetch(symbols)
+                return [await pv.verify(s, Decimal("50000")) for s in symbols]
+            finally:
+                pv.end_cycle()
+
+        results = asyncio.run(run())
+        assert all(r.ok for r in results)
+        assert broker.get_quote.await_count == 4 and pv.rest_calls == 4
+        assert peak == 2
+        # 사이클 밖에서는 매번 조회 (캐시 유지 안 함)
+        asyncio.run(pv.verify("A", Decimal("50000")))
+        assert pv.rest_calls == 5
+
 
 # ═══════════════════════════════════════
 # ContextCache 테스트
@@ -537,6 +583,22 @@ class TestLossLockCancelOrders:
         broker.cancel_order.assert_any_call("ORD-1")
         broker.cancel_order.assert_any_call("ORD-2")
 
+    def test_loss_lock_ignores_cached_open_orders(self) -> None:
+        """캐시가 유효해도 손실 제한 취소는 브로커 미체결을 새로 조회한다."""
+        engine, broker = self._make_engine(open_orders=[])
+
+        async def run() -> int:
+            await engine.account_cache.open_orders()  # 빈 목록 캐시
+            broker.get_open_orders.return_value = [
+                OrderResult(order_id="ORD-NEW", client_order_id="c", symbol="005930",
+                            side=OrderSide.BUY, order_type=OrderType.MARKET,
+                            qty=1, limit_price=None, status=OrderStatus.SUBMITTED),
+            ]
+            return await engine._cancel_open_orders()
+
+        assert asyncio.run(run()) == 1
+        broker.cancel_order.assert_awaited_once_with("ORD-NEW")
+
     def test_loss_lock_notifies_via_callback(self) -> None:
         """손실 제한 발동 시 AlertMonitor.fire()로 알림이 전달된다."""
         from unittest.mock import AsyncMock, patch
@@ -605,6 +605,70 @@ class TestFillLoopIntegration:
         assert len(latest["conditions"]) == 1
         assert latest["conditions"][0]["result"] is True
 
+    def test_position_advances_on_full_evaluation_only(self):
+        """보유봉/고점은 전체 평가 종목만 종목당 한 번 — 시세 트리거 평가는 읽기만."""
+        engine = _make_engine()
+        rules = [
+            {**_rule("보유봉 >= 5 -> 매도 전량", 1), "symbol": "005930"},
+            {**_rule("수익률 >= 10 -> 매도 전량", 2), "symbol": "005930"},
+        ]
+        engine._collect_candidates_v2(rules[0], "cycle-0", _market(price=50000), set())
+        ps = engine._position_states["005930"]
+        ps.record_buy(50000, 10)
+
+        for i in range(3):  # 시세 트리거 (quote_symbols)
+            for rule in rules:
+                engine._collect_candidates_v2(rule, f"q-{i}", _market(price=60000), set())
+        assert ps.bars_held == 1 and ps.highest_price == 50000
+
+        advance = {"005930"}  # 봉 마감/cron 전체 평가
+        for rule in rules:
+            engine._collect_candidates_v2(rule, "cycle-1", _market(price=55000), advance)
+        assert ps.bars_held == 2 and ps.highest_price == 55000
+
+    def test_lean_cycles_skip_details(self):
+        """구독이 없으면 샘플 주기 사이의 사이클은 세부 값 없이 평가하되 행동은 남긴다."""
+        engine = _make_engine()
+        rule = {**_rule("RSI(14) < 30 AND 보유수량 == 0 -> 매수 100%"), "symbol": "005930"}
+
+        engine._collect_candidates_v2(rule, "cycle-1", _market(price=50000, rsi_14=45))
+        results = engine._collect_candidates_v2(rule, "cycle-2", _market(price=50000, rsi_14=25))
+        assert len(results) == 1
+
+        tracker = engine._condition_tracker
+        assert tracker.get_latest(1)["cycle"] == "cycle-1"
+        assert tracker.latest_action(1)["rule_index"] == 0
+
+        engine._update_position_state_on_fill(results[0][0])
+        assert engine._position_states["005930"].execution_counts[0] == 1
+
+        tracker.watch(1)
+        engine._collect_candidates_v2(rule, "cycle-3", _market(price=50000, rsi_14=25))
+        assert tracker.get_latest(1)["conditions"][0]["details"]["RSI(14)"] == 25
+
+    def test_profiling_aggregates_per_rule(self):
+        """프로파일링을 켜면 규칙별로 누적되고, 꺼도 결과는 남는다."""
+        engine = _make_engine()
+        rule = {**_rule("RSI(14) < 30 AND 보유수량 == 0 -> 매수 100%"), "symbol": "005930"}
+        evaluator = engine.evaluator
+
+        engine._collect_candidates_v2(rule, "cycle-1", _market(price=50000, rsi_14=45))
+        assert evaluator.profile_report()["rules"] == []
+
+        evaluator.set_profiling(True)
+        for i in range(3):
+            engine._collect_candidates_v2(rule, f"cycle-{i + 2}", _market(price=50000, rsi_14=25))
+        evaluator.set_profiling(False)
+        engine._collect_candidates_v2(rule, "cycle-5", _market(price=50000, rsi_14=25))
+
+        report = evaluator.profile_report()
+        assert report["enabled"] is False
+        (entry,) = report["rules"]
+        assert entry["rule_id"] == 1 and entry["calls"] == 3
+        assert {e["name"]: e["calls"] for e in report["funcs"]}["RSI"] == 3
+        evaluator.reset_profile()
+        assert evaluator.profile_report()["rules"] == []
+
     def test_execution_count_increments(self):
         """체결 시 실행횟수가 PositionState에 기록된다."""
         engine = _make_engine()
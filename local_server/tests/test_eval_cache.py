@@ -0,0 +1,99 @@
+"""EvalCycleCache 단위 테스트 — 사이클 내 종목별 컨텍스트/지표 호출 공유."""
+from __future__ import annotations
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+from local_server.engine.engine import StrategyEngine
+from local_server.engine.eval_cache import EvalCycleCache
+from local_server.engine.evaluator import RuleEvaluator
+
+
+def _market(rsi: float = 25) -> dict:
+    return {
+        "price": 50000, "volume": 1000,
+        "indicators": {"1d": {"rsi_14": rsi, "ma_20": 49000}, "5m": {"ma_20": 50500}},
+    }
+
+
+def _rule(rule_id: int, script: str, symbol: str = "005930") -> dict:
+    return {"id": rule_id, "symbol": symbol, "script": script}
+
+
+RULES = [
+    _rule(1, "RSI(14) < 30 AND 보유수량 == 0 -> 매수 100%"),
+    _rule(2, 'RSI(14) > 70 OR MA(20, "5m") < 현재가 -> 매도 전량'),
+    _rule(3, '매수: MA(20, "5m") > MA(20)\n매도: RSI(14) > 80'),
+]
+
+
+class TestEvalCycleCache:
+    def test_shared_within_cycle(self):
+        ev = RuleEvaluator()
+        cache = EvalCycleCache()
+        cache.begin_cycle("c1")
+        ev.evaluate_v2(RULES[0], _market(), {"보유수량": 0}, cache=cache)
+        ev.evaluate_v2(RULES[1], _market(), {"보유수량": 0}, cache=cache)
+        ev.evaluate(RULES[2], _market(), {}, cache=cache)
+
+        stats = cache.cycle_stats
+        assert (stats.context_misses, stats.context_hits) == (1, 2)
+        # RSI(14), MA(20,"5m"), MA(20) 각 1회 계산 → 나머지는 적중
+        assert stats.call_misses == 3
+        assert stats.call_hits == 3
+        assert cache.stats()["cycle"]["call_hit_rate"] == 0.5
+
+    def test_matches_uncached(self):
+        """결과는 캐시 유무와 무관 — 포지션 필드는 규칙별."""
+        cached_ev, plain_ev = RuleEvaluator(), RuleEvaluator()
+        cache = EvalCycleCache()
+        cache.begin_cycle("c1")
+        for qty in (0, 10):
+            ctx = {"보유수량": qty}
+            got = cached_ev.evaluate_v2(RULES[0], _market(), ctx, cache=cache)
+            expected = plain_ev.evaluate_v2(RULES[0], _market(), ctx)
+            assert got == expected
+        assert got.action is None  # 보유수량 10 — 앞 규칙 값이 새지 않음
+
+    def test_new_cycle_drops_values(self):
+        ev = RuleEvaluator()
+        cache = EvalCycleCache()
+        cache.begin_cycle("c1")
+        assert ev.evaluate_v2(RULES[0], _market(rsi=25), {}, cache=cache).action is not None
+        cache.end_cycle()
+        cache.begin_cycle("c2")
+        assert ev.evaluate_v2(RULES[0], _market(rsi=50), {}, cache=cache).action is None
+        assert cache.total_stats.context_misses == 2
+
+    def test_inactive_outside_cycle(self):
+        ev = RuleEvaluator()
+        cache = EvalCycleCache()
+        assert ev.evaluate_v2(RULES[0], _market(rsi=25), {}, cache=cache).action is not None
+        assert ev.evaluate_v2(RULES[0], _market(rsi=50), {}, cache=cache).action is None
+        assert cache.total_stats.context_misses == 0
+
+
+class TestEngineSharedIndicators:
+    def test_indicators_loaded_once_per_symbol(self):
+        log = MagicMock()
+        log.write = AsyncMock()
+        log.today_executed_amount = MagicMock(return_value=Decimal(0))
+        engine = StrategyEngine(
+            broker=MagicMock(), log=log, bar_data=MagicMock(),
+            bar_store=MagicMock(), ref_data=MagicMock(),
+        )
+        market = _market()
+        engine._bar_builder.get_latest = MagicMock(return_value={"price": 50000, "volume": 1000})
+        engine._indicator_provider = MagicMock()
+        engine._indicator_provider.get = MagicMock(
+            side_effect=lambda symbol, tf: market["indicators"].get(tf),
+        )
+
+        engine.eval_cache.begin_cycle("c1")
+        for rule in RULES:
+            engine._collect_candidates(rule, "c1", {"5m"})
+        engine.eval_cache.end_cycle()
+
+        tfs = [call.args[1] for call in engine._indicator_provider.get.call_args_list]
+        assert sorted(tfs) == ["1d", "5m"]
+        assert engine.eval_cache.stats()["cycle"]["context_hits"] == 2
@@ -0,0 +1,109 @@
+"""EvalPool 테스트 — 종목 샤드 고정, 워커 state 유지, 단일 루프와 같은 후보."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+from local_server.engine.engine import StrategyEngine
+from local_server.engine.eval_pool import EvalPool
+from local_server.engine.evaluator import RuleEvaluator
+
+CROSS = "상향돌파(현재가, 105) -> 매수 100%"
+RULES = [
+    {"id": 1, "symbol": "A", "is_active": True, "priority": 1, "script": CROSS},
+    {"id": 2, "symbol": "B", "is_active": True, "priority": 5, "script": CROSS},
+    {"id": 3, "symbol": "C", "is_active": True, "priority": 3, "script": "현재가 > 100 -> 매도 전량"},
+]
+
+
+def _market(price: float) -> dict:
+    return {"price": price, "volume": 1000, "indicators": {"1d": {}}}
+
+
+def _ctx() -> dict:
+    return {"수익률": 0, "보유수량": 10, "고점 대비": 0, "수익률고점": 0, "진입가": 100,
+            "보유일": 0, "보유봉": 0}
+
+
+def _jobs(rules: list[dict]) -> dict[str, list]:
+    return {r["symbol"]: [(r["id"], "v2", _ctx(), False)] for r in rules}
+
+
+def _actions(results: dict) -> dict[int, str | None]:
+    return {rid: (v.action.side if v.action else None) for rid, (_, v) in results.items()}
+
+
+class TestEvalPool:
+    def test_shard_stable(self):
+        pool = EvalPool(3)
+        try:
+            shards = {s: pool.shard_of(s) for s in ("005930", "000660", "035720")}
+            assert shards == {s: EvalPool(3).shard_of(s) for s in shards}
+            assert all(0 <= v < 3 for v in shards.values())
+        finally:
+            pool.shutdown()
+
+    def test_state_kept_across_cycles_and_reset_on_change(self):
+        pool = EvalPool(2)
+        local = RuleEvaluator()
+
+        async def cycle(cycle_id: str, price: float) -> dict:
+            snaps = {r["symbol"]: _market(price) for r in RULES}
+            return _actions(await pool.evaluate(cycle_id, snaps, _jobs(RULES)))
+
+        def expected(price: float) -> dict:
+            return {
+                r["id"]: (lambda a: a.side if a else None)(
+                    local.evaluate_v2(r, _market(price), _ctx()).action)
+                for r in RULES
+            }
+
+        async def run() -> None:
+            pool.set_rules(RULES)
+            assert await cycle("c1", 100) == expected(100)
+            # 상향돌파는 이전 사이클 값(워커 state)이 있어야 발화
+            got = await cycle("c2", 110)
+            assert got == expected(110) and got[1] == got[2] == "매수"
+            # 규칙 2 script 변경 → 그 규칙 state만 초기화
+            pool.set_rules([RULES[0], {**RULES[1], "script": CROSS + " "}, RULES[2]])
+            await cycle("c3", 100)
+            got = await cycle("c4", 110)
+            assert got[1] == got[2] == "매수"
+
+        try:
+            asyncio.run(run())
+        finally:
+            pool.shutdown()
+
+
+class TestEnginePooled:
+    def test_same_candidates_as_single_loop(self):
+        engines = [
+            StrategyEngine(broker=MagicMock(), log=MagicMock(), bar_data=MagicMock(),
+                           bar_store=MagicMock(), ref_data=MagicMock(), config=cfg)
+            for cfg in ({}, {"eval_workers": 2})
+        ]
+        single, pooled = engines
+
+        def candidates(engine: StrategyEngine, cycle_id: str) -> list[tuple]:
+            active = list(engine.rule_plan.ordered)
+            if engine is pooled:
+                got = asyncio.run(engine._collect_candidates_pooled(active, cycle_id))
+            else:
+                got = [c for p in active
+                       for c in engine._collect_candidates_v2(p.rule, cycle_id, _market(price))]
+            return [(s.rule_id, s.side, s.desired_qty) for s, _ in got]
+
+        try:
+            for engine in engines:
+                engine.set_rules(RULES)
+                engine._market_snapshot = lambda rule, tfs: _market(price)  # type: ignore[method-assign]
+            fired = []
+            for i, price in enumerate((100, 110, 120)):
+                got = candidates(pooled, f"c{i}")
+                assert got == candidates(single, f"c{i}")
+                fired.append([rid for rid, *_ in got])
+            # 상향돌파는 110에서만, priority 내림차순 (보유 없음 → 매도 규칙 3은 후보 없음)
+            assert fired == [[], [2, 1], []]
+        finally:
+            pooled._eval_pool.shutdown()
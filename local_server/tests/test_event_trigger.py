@@ -0,0 +1,191 @@
+"""EventTrigger / 이벤트 평가 테스트 — 분봉 완성·시세 → 종목별 디바운스 → 해당 종목 규칙만 평가."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from local_server.engine.bar_builder import BarBuilder
+from local_server.engine.engine import StrategyEngine
+from local_server.engine.event_trigger import EventTrigger
+from local_server.engine.scheduler import is_market_hours
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _recorder() -> tuple[list, Callable]:
+    calls: list[tuple[set[str], set[str]]] = []
+
+    async def evaluate(bars: set[str], quotes: set[str]) -> None:
+        calls.append((bars, quotes))
+
+    return calls, evaluate
+
+
+class TestEventTrigger:
+    def test_quote_throttle_and_bar_priority(self):
+        """시세는 종목별 스로틀, 같은 종목에 분봉 완성이 오면 전체 평가로 승격."""
+        clock = _Clock()
+        trigger = EventTrigger(_recorder()[1], quote_interval=1.0, clock=clock)
+        trigger.on_quote("A")
+        trigger.on_quote("B")
+        assert trigger.pending == {"A": "quote", "B": "quote"}
+        trigger.on_bar_complete("A")
+        assert trigger.pending == {"A": "bar", "B": "quote"}
+
+    def test_quotes_ignored_when_disabled(self):
+        trigger = EventTrigger(_recorder()[1])
+        trigger.on_quote("A")
+        assert trigger.pending == {}
+
+    def test_coalesced_batch(self):
+        """같은 틱에 들어온 이벤트는 한 번에 묶어 평가."""
+        calls, evaluate = _recorder()
+
+        async def run() -> None:
+            trigger = EventTrigger(evaluate, quote_interval=0.5)
+            trigger.on_bar_complete("A")
+            trigger.on_bar_complete("A")
+            trigger.on_quote("B")
+            await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+        assert calls == [({"A"}, {"B"})]
+
+    def test_debounce_per_symbol(self):
+        """평가 직후 같은 종목 이벤트는 debounce 뒤로 미뤄져 한 번만, 다른 종목은 바로."""
+        calls, evaluate = _recorder()
+
+        async def run() -> None:
+            trigger = EventTrigger(evaluate, debounce=0.05)
+            trigger.on_bar_complete("A")
+            await asyncio.sleep(0.001)
+            trigger.on_bar_complete("A")
+            trigger.on_bar_complete("A")
+            trigger.on_bar_complete("B")
+            await asyncio.sleep(0.01)
+            assert calls == [({"A"}, set()), ({"B"}, set())]
+            await asyncio.sleep(0.08)
+
+        asyncio.run(run())
+        assert calls == [({"A"}, set()), ({"B"}, set()), ({"A"}, set())]
+
+    def test_no_loop_leaves_cron(self):
+        """이벤트 루프 밖에서 들어온 이벤트는 대기만 (cron 안전망)."""
+        calls, evaluate = _recorder()
+        trigger = EventTrigger(evaluate)
+        trigger.on_bar_complete("A")
+        assert trigger.pending == {"A": "bar"} and calls == []
+
+
+class TestBarCompleteCallback:
+    def test_called_on_minute_boundary(self):
+        completed: list = []
+        builder = BarBuilder(on_bar_complete=lambda symbol, bar: completed.append((symbol, bar.close)))
+        builder.on_quote("A", Decimal("100"), 1, datetime(2026, 3, 2, 9, 31, 5))
+        builder.on_quote("A", Decimal("101"), 1, datetime(2026, 3, 2, 9, 31, 40))
+        assert completed == []
+        builder.on_quote("A", Decimal("102"), 1, datetime(2026, 3, 2, 9, 32, 0))
+        assert completed == [("A", Decimal("101"))]
+
+
+def _engine(**cfg) -> StrategyEngine:
+    return StrategyEngine(
+        broker=MagicMock(), log=MagicMock(), bar_data=MagicMock(),
+        bar_store=MagicMock(), ref_data=MagicMock(), config=cfg,
+    )
+
+
+RULES = [
+    {"id": 1, "symbol": "A", "is_active": True, "priority": 1,
+     "script": "RSI(14) < 30 -> 매수 100%"},
+    {"id": 2, "symbol": "A", "is_active": True, "priority": 5,
+     "script": "상향돌파(현재가, MA(20)) -> 매수 100%"},
+    {"id": 3, "symbol": "B", "is_active": True, "script": "현재가 > 0 -> 매도 전량"},
+    {"id": 4, "symbol": "B", "is_active": False, "script": "현재가 > 0 -> 매도 전량"},
+]
+
+
+class TestEngineEventSelection:
+    def test_bar_events_wired(self):
+        engine = _engine()
+        engine.bar_builder.on_quote("A", Decimal("100"), 1, datetime(2026, 3, 2, 9, 31, 5))
+        engine.bar_builder.on_quote("A", Decimal("100"), 1, datetime(2026, 3, 2, 9, 32, 0))
+        assert engine.event_trigger.pending == {"A": "bar"}
+
+    def test_completed_bars_feed_history(self):
+        engine = _engine()
+        engine.bar_builder.on_quote("A", Decimal("100"), 1, datetime(2026, 3, 2, 9, 31, 5))
+        engine.bar_builder.on_quote("A", Decimal("101"), 1, datetime(2026, 3, 2, 9, 32, 0))
+        assert engine.minute_history.bars("A") == [{
+            "time": "2026-03-02T09:31:00", "open": 100.0, "high": 100.0,
+            "low": 100.0, "close": 100.0, "volume": 1,
+        }]
+
+    def test_symbol_rules_once_per_minute(self):
+        """이벤트 평가는 해당 종목만, 같은 분 cron은 남은 종목만 (상태 함수 분당 1회)."""
+        engine = _engine()
+        engine.set_rules(RULES)
+        minute = datetime(2026, 3, 2, 9, 32)
+
+        rules, full = engine._select_rules({"A"}, set(), minute)
+        assert [r.rule_id for r in rules] == [2, 1] and full == {"A"}
+        rules, full = engine._select_rules(None, set(), minute)
+        assert [r.rule_id for r in rules] == [3] and full == {"B"}
+        assert engine._select_rules(None, set(), minute) == ([], set())
+
+        rules, _ = engine._select_rules(None, set(), datetime(2026, 3, 2, 9, 33))
+        assert [r.rule_id for r in rules] == [2, 1, 3]
+
+    def test_quote_events_stateless_only(self):
+        """시세 트리거는 상태 없는 규칙만 — 이번 분에 전체 평가했어도 다시 평가."""
+        engine = _engine()
+        engine.set_rules(RULES)
+        minute = datetime(2026, 3, 2, 9, 32)
+        engine._select_rules({"A"}, set(), minute)
+
+        rules, full = engine._select_rules(set(), {"A"}, minute)
+        assert [r.rule_id for r in rules] == [1] and full == set()
+
+    def test_cron_only_mode(self):
+        """event_driven=False — 트리거 없음, cron은 매번 전체 평가."""
+        engine = _engine(event_driven=False)
+        engine.set_rules(RULES)
+        assert engine.event_trigger is None
+        minute = datetime(2026, 3, 2, 9, 32)
+        for _ in range(2):
+            rules, _ = engine._select_rules(None, set(), minute)
+            assert [r.rule_id for r in rules] == [2, 1, 3]
+
+    def test_after_close_event_not_evaluated(self):
+        """16:05 장외 시세/봉 이벤트 — 사이클 진입 없음 (주문 불가)."""
+        engine = _engine()
+        engine.set_rules(RULES)
+        engine._running = True
+        engine._select_rules = MagicMock(return_value=([], set()))
+        engine._account.balance = AsyncMock()
+
+        with patch("local_server.engine.engine.datetime") as mock_dt:
+            mock_dt.now.return_value = datetime(2026, 3, 2, 16, 5)
+            asyncio.run(engine.evaluate_symbols({"A"}, {"B"}))
+            asyncio.run(engine._run_cycle(None, set()))  # cron 경로도 같은 검사
+
+        engine._select_rules.assert_not_called()
+        engine._account.balance.assert_not_awaited()
+
+
+def test_market_hours_window():
+    assert is_market_hours(datetime(2026, 3, 2, 9, 0))
+    assert is_market_hours(datetime(2026, 3, 2, 15, 29))
+    assert not is_market_hours(datetime(2026, 3, 2, 8, 59))
+    assert not is_market_hours(datetime(2026, 3, 2, 15, 30))
+    assert not is_market_hours(datetime(2026, 3, 2, 16, 5))
+    assert not is_market_hours(datetime(2026, 3, 7, 10, 0))  # 토요일
@@ -105,6 +105,309 @@ class TestIndicatorProviderMinute:
         assert self.provider.get("005930", "1m") is None
 
 
+class _FakeBarData:
+    """BarDataPort 테스트 더블 — 주어진 분봉 리스트를 그대로 반환."""
+
+    def __init__(self, bars: list[dict]) -> None:
+        self.bars = bars
+
+    async def fetch_minute_bars(self, symbol: str, tf: str, limit: int) -> list[dict]:
+        return self.bars[-limit:]
+
+
+def _minute_bars(n: int, start: int = 0) -> list[dict]:
+    base = datetime(2026, 3, 2, 9, 0)
+    return [
+        {
+            "timestamp": (base + timedelta(minutes=i)).isoformat(),
+            "open": 50000 + (i * 37) % 500,
+            "high": 50200 + (i * 37) % 500,
+            "low": 49800 + (i * 37) % 500,
+            "close": 50000 + (i * 53) % 700,
+            "volume": 1000 + i,
+        }
+        for i in range(start, start + n)
+    ]
+
+
+class TestIndicatorProviderMinuteRefresh:
+    """refresh_minute 증분 갱신이 전체 재계산과 일치하는지 검증."""
+
+    @staticmethod
+    def _expected(bars: list[dict]) -> dict:
+        import pandas as pd
+        from sv_core.indicators import calc_all_indicators
+        return calc_all_indicators(
+            pd.Series([float(b["close"]) for b in bars]),
+            pd.Series([float(b["volume"]) for b in bars]),
+            highs=pd.Series([float(b["high"]) for b in bars]),
+            lows=pd.Series([float(b["low"]) for b in bars]),
+        )
+
+    def test_incremental_matches_full_recompute(self) -> None:
+        import asyncio
+        bars = _minute_bars(80)
+        port = _FakeBarData(bars[:70])
+        provider = IndicatorProvider(bar_data=port)
+
+        asyncio.run(provider.refresh_minute("005930", "1m"))
+        assert provider.get("005930", "1m") == self._expected(bars[:70])
+
+        # 구성 중이던 마지막 봉 갱신 + 새 봉 도착
+        revised = dict(bars[69], close=51234, high=51300)
+        port.bars = bars[:69] + [revised] + bars[70:]
+        asyncio.run(provider.refresh_minute("005930", "1m"))
+        assert provider.get("005930", "1m") == self._expected(port.bars)
+        assert provider._minute_streams[("005930", "1m")].last_ts == bars[78]["timestamp"]
+
+    def test_gap_reseeds(self) -> None:
+        """직전 확정 봉이 조회 결과에 없으면 다시 seed."""
+        import asyncio
+        port = _FakeBarData(_minute_bars(40))
+        provider = IndicatorProvider(bar_data=port)
+        asyncio.run(provider.refresh_minute("005930", "5m"))
+
+        port.bars = _minute_bars(40, start=100)
+        asyncio.run(provider.refresh_minute("005930", "5m"))
+        assert provider.get("005930", "5m") == self._expected(port.bars)
+
+    def test_requirements_limit_fetch_and_add_keys(self) -> None:
+        """요구사항이 있으면 필요한 봉 수만 조회하고, 증분 세트 밖의 키는 직접 계산."""
+        import asyncio
+        import pandas as pd
+        from local_server.engine.indicator_provider import IndicatorNeeds
+        from sv_core.indicators import calc_rsi
+
+        port = _FakeBarData(_minute_bars(120))
+        provider = IndicatorProvider(bar_data=port)
+        limits: list[int] = []
+        fetch = port.fetch_minute_bars
+
+        async def _spy(symbol: str, tf: str, limit: int) -> list[dict]:
+            limits.append(limit)
+            return await fetch(symbol, tf, limit)
+
+        port.fetch_minute_bars = _spy
+        provider.set_requirements({
+            "005930": {"5m": IndicatorNeeds(frozenset({"rsi_9", "ma_20"}), depth=30)},
+        })
+        asyncio.run(provider.refresh_minute("005930", "5m"))
+        asyncio.run(provider.refresh_minute("005930", "1m"))  # 요구사항 없음 → 기본 건수
+
+        assert limits == [31, 200]
+        got = provider.get("005930", "5m")
+        closes = pd.Series([float(b["close"]) for b in port.bars[-31:]])
+        assert got["rsi_9"] == calc_rsi(closes, 9)
+        assert got["ma_20"] == self._expected(port.bars[-31:])["ma_20"]
+
+
+class TestIndicatorProviderLocalHistory:
+    """MinuteHistory 우선 — 네트워크는 공백/부족 시에만."""
+
+    @staticmethod
+    def _spy_port(bars: list[dict]) -> tuple[_FakeBarData, list]:
+        port = _FakeBarData(bars)
+        calls: list = []
+        fetch = port.fetch_minute_bars
+
+        async def _spy(symbol: str, tf: str, limit: int) -> list[dict]:
+            calls.append((tf, limit))
+            return await fetch(symbol, tf, limit)
+
+        port.fetch_minute_bars = _spy
+        return port, calls
+
+    def test_local_rollup_without_network(self) -> None:
+        import asyncio
+        from local_server.engine.indicator_provider import IndicatorNeeds
+        from local_server.engine.minute_history import MinuteHistory
+        from local_server.storage.minute_bar import aggregate_bars
+
+        bars = [dict(b, time=b.pop("timestamp")) for b in _minute_bars(200)]
+        history = MinuteHistory()
+        history.seed("005930", bars)
+        port, calls = self._spy_port([])
+        provider = IndicatorProvider(bar_data=port, history=history)
+        provider.set_requirements({"005930": {"5m": IndicatorNeeds(frozenset({"ma_20"}), depth=20)}})
+
+        asyncio.run(provider.refresh_minute("005930", "5m"))
+        assert calls == []
+        rolled = aggregate_bars(bars, "5m")[-20:]
+        assert provider.get("005930", "5m")["ma_20"] == (
+            TestIndicatorProviderMinuteRefresh._expected(rolled)["ma_20"]
+        )
+
+    def test_current_minute_included_like_cloud(self) -> None:
+        """구성 중인 1분봉(BarBuilder)을 마지막 봉으로 합친다 — cloud 조회 결과와 같은 지표."""
+        import asyncio
+        from local_server.engine.indicator_provider import IndicatorNeeds
+        from local_server.engine.minute_history import MinuteHistory
+        from local_server.storage.minute_bar import aggregate_bars
+
+        bars = [dict(b, time=b.pop("timestamp")) for b in _minute_bars(203)]
+        *done, current = bars
+        history = MinuteHistory()
+        history.seed("A", done)
+        port, calls = self._spy_port([])
+        ma20 = IndicatorNeeds(frozenset({"ma_20"}), 20)
+        needs = {"1m": ma20, "5m": ma20}
+        local = IndicatorProvider(bar_data=port, history=history, current_bar=lambda s: current)
+        local.set_requirements({"A": needs})
+        asyncio.run(local.refresh_minute("A", "1m"))
+        asyncio.run(local.refresh_minute("A", "5m"))
+        assert calls == []
+
+        cloud = IndicatorProvider(bar_data=_FakeBarData(bars))
+        cloud.set_requirements({"A": needs})
+        asyncio.run(cloud.refresh_minute("A", "1m"))
+        assert local.get("A", "1m") == cloud.get("A", "1m")
+        rolled = aggregate_bars(bars, "5m")
+        assert rolled[-1]["time"] == "2026-03-02T12:20:00" and rolled[-1]["close"] == current["close"]
+        expected = TestIndicatorProviderMinuteRefresh._expected(rolled[-21:])["ma_20"]
+        assert local.get("A", "5m")["ma_20"] == expected
+
+    def test_gap_backfills_and_seeds(self) -> None:
+        """로컬이 비어 있으면 cloud 1분봉으로 보충하고 히스토리도 채운다."""
+        import asyncio
+        from local_server.engine.minute_history import MinuteHistory
+
+        port, calls = self._spy_port(_minute_bars(250))
+        history = MinuteHistory()
+        provider = IndicatorProvider(bar_data=port, history=history)
+
+        asyncio.run(provider.refresh_minute("005930", "1m"))
+        assert calls == [("1m", 200)]
+        assert history.count("005930") == 199  # 구성 중인 마지막 봉 제외
+
+        provider._minute_cache.clear()
+        asyncio.run(provider.refresh_minute("005930", "1m"))
+        assert calls == [("1m", 200)]  # 두 번째는 로컬 (확정 봉만)
+        expected = TestIndicatorProviderMinuteRefresh._expected(port.bars[-200:-1])
+        assert provider.get("005930", "1m") == expected
+
+    def test_seed_history_from_store(self) -> None:
+        import asyncio
+        from local_server.engine.indicator_provider import IndicatorNeeds
+        from local_server.engine.minute_history import MinuteHistory
+
+        class _Store:
+            def __init__(self) -> None:
+                self.since: list[str] = []
+
+            def load_bars(self, symbol: str, since: str) -> list[dict]:
+                self.since.append(since)
+                return [dict(b, time=b.pop("timestamp")) for b in _minute_bars(100)]
+
+        store = _Store()
+        port, calls = self._spy_port([])
+        history = MinuteHistory()
+        provider = IndicatorProvider(bar_data=port, history=history)
+        provider.set_requirements({
+            "A": {"1d": IndicatorNeeds(), "1h": IndicatorNeeds(frozenset({"ma_20"}), 20)},
+            "B": {"1d": IndicatorNeeds()},
+        })
+        asyncio.run(provider.seed_history(["A", "B"], store))
+        assert history.count("A") == 100 and history.count("B") == 0
+        assert len(store.since) == 1 and calls == []
+        assert provider._history_days("A") == 7  # 20시간 ≈ 3.1영업일 → 달력일 + 여유
+
+
+class TestRefreshMinutesPlan:
+    """사이클 단위 갱신 — 종목 병렬, 종목당 1m 조회 1회, 마감 초과 시 soft fail."""
+
+    def test_single_1m_fetch_per_symbol(self) -> None:
+        import asyncio
+        from local_server.engine.indicator_provider import IndicatorNeeds
+        from local_server.engine.minute_history import MinuteHistory
+        from local_server.storage.minute_bar import aggregate_bars
+
+        port, calls = TestIndicatorProviderLocalHistory._spy_port(_minute_bars(2000))
+        provider = IndicatorProvider(bar_data=port, history=MinuteHistory())
+        need = IndicatorNeeds(frozenset({"ma_20"}), depth=20)
+        provider.set_requirements({s: {"1m": need, "5m": need, "15m": need} for s in ("A", "B")})
+
+        done = asyncio.run(provider.refresh_minutes({"A": {"1m", "5m", "15m"}, "B": {"5m"}}))
+        assert done == 2
+        assert sorted(calls) == [("1m", 105), ("1m", 315)]  # 종목당 1회 (A: 15m × 21봉, B: 5m × 21봉)
+
+        bars = [dict(b, time=b.pop("timestamp")) for b in port.bars[:-1]]
+        for tf in ("1m", "5m", "15m"):
+            rolled = aggregate_bars(bars, tf)[-20:]
+            assert provider.get("A", tf)["ma_20"] == (
+                TestIndicatorProviderMinuteRefresh._expected(rolled)["ma_20"]
+            ), tf
+
+        calls.clear()
+        provider._minute_cache.clear()
+        asyncio.run(provider.refresh_minutes({"A": {"1m", "5m", "15m"}}))
+        assert calls == []
+
+    def test_stale_symbol_synced_once(self) -> None:
+        """새 봉이 없는 종목 / 조회 상한을 넘는 요구도 보충은 1회 — 다음 사이클은 로컬 롤업만."""
+        import asyncio
+        from local_server.engine.indicator_provider import IndicatorNeeds
+        from local_server.engine.minute_history import MinuteHistory
+
+        now = [0.0]
+        history = MinuteHistory(clock=lambda: now[0])
+        port, calls = TestIndicatorProviderLocalHistory._spy_port(_minute_bars(6000))
+        history.seed("A", [dict(b, time=b["timestamp"]) for b in port.bars[-300:-1]])
+        now[0] = 1000.0  # 마지막 분봉 이후 거래 없음 → 공백
+        provider = IndicatorProvider(bar_data=port, history=history)
+        provider.set_requirements({
+            "A": {"5m": IndicatorNeeds(frozenset({"ma_20"}), depth=20)},
+            "B": {"1h": IndicatorNeeds(frozenset({"ma_20"}), depth=150)},  # 151h > 1m 조회 상한
+        })
+        plan = {"A": {"5m"}, "B": {"1h"}}
+
+        asyncio.run(provider.refresh_minutes(plan))
+        assert sorted(calls) == [("1m", 105), ("1m", 5000)]
+        assert provider.get("A", "5m") is not None and provider.get("B", "1h") is not None
+
+        calls.clear()
+        provider._minute_cache.clear()
+        asyncio.run(provider.refresh_minutes(plan))
+        assert calls == []
+        assert provider.get("A", "5m") is not None and provider.get("B", "1h") is not None
+
+    def test_bounded_concurrency(self) -> None:
+        import asyncio
+
+        active = peak = 0
+
+        class _SlowPort:
+            async def fetch_minute_bars(self, symbol: str, tf: str, limit: int) -> list[dict]:
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                return _minute_bars(40)
+
+        provider = IndicatorProvider(bar_data=_SlowPort())
+        plan = {f"S{i}": {"1m", "5m"} for i in range(10)}
+        assert asyncio.run(provider.refresh_minutes(plan, concurrency=3)) == 10
+        assert peak == 3
+        assert all(provider.get(f"S{i}", "5m") is not None for i in range(10))
+
+    def test_deadline_fails_soft(self) -> None:
+        import asyncio
+
+        class _HangingPort:
+            async def fetch_minute_bars(self, symbol: str, tf: str, limit: int) -> list[dict]:
+                if symbol == "SLOW":
+                    await asyncio.sleep(10)
+                return _minute_bars(40)
+
+        provider = IndicatorProvider(bar_data=_HangingPort())
+        done = asyncio.run(provider.refresh_minutes(
+            {"FAST": {"1m"}, "SLOW": {"1m"}}, timeout=0.05,
+        ))
+        assert done == 1
+        assert provider.get("FAST", "1m") is not None
+        assert provider.get("SLOW", "1m") is None
+
+
 # ═══════════════════════════════════════
 # RuleEvaluator tf 분기 테스트
 # ═══════════════════════════════════════
@@ -160,6 +463,19 @@ class TestEvaluatorTfBranch:
         buy, _ = self.evaluator.evaluate(rule, md, {})
         assert buy is True
 
+    def test_v2_indicator_funcs(self) -> None:
+        """ATR/최고가/최저가/이격도는 atr_N/highest_N/lowest_N/disparity_N 키를 읽는다."""
+        md = self._make_market_data({
+            "1d": {"atr_14": 900.0, "highest_20": 52000.0, "lowest_20": 48000.0},
+            "5m": {"disparity_20": -6.0},
+        })
+        rule = self._make_rule(
+            "매수: ATR(14) > 800 AND 최고가(20) > 51000 AND 최저가(20) < 49000"
+            ' AND 이격도(20, "5m") < -5\n매도: false',
+        )
+        buy, _ = self.evaluator.evaluate(rule, md, {})
+        assert buy is True
+
 
 # ═══════════════════════════════════════
 # _extract_rule_tfs 테스트
@@ -174,26 +490,65 @@ class TestExtractRuleTfs:
 
     def test_no_minute_tf(self) -> None:
         from local_server.engine.engine import _extract_rule_tfs
-        rule = {"script": "if RSI(14) > 50: buy"}
+        rule = {"script": 'RSI(14) > 50 AND MA(20, "1d") > 0 → 매수 100%'}
         assert _extract_rule_tfs(rule) == []
 
     def test_single_tf(self) -> None:
         from local_server.engine.engine import _extract_rule_tfs
-        rule = {"script": 'if RSI(14, "5m") > 50: buy'}
+        rule = {"script": 'RSI(14, "5m") > 50 → 매수 100%'}
         assert _extract_rule_tfs(rule) == ["5m"]
 
     def test_multiple_tfs(self) -> None:
         from local_server.engine.engine import _extract_rule_tfs
-        rule = {"script": 'if RSI(14, "5m") > 50 and MA(20, "1m") > 100: buy'}
+        rule = {"script": 'RSI(14, "5m") > 50 AND MA(20, "1m") > 100 → 매수 100%'}
         result = _extract_rule_tfs(rule)
         assert "5m" in result
         assert "1m" in result
 
     def test_deduplicates_tfs(self) -> None:
         from local_server.engine.engine import _extract_rule_tfs
-        rule = {"script": 'if RSI(14, "5m") > 50 and MA(20, "5m") > 100: buy'}
+        rule = {"script": 'RSI(14, "5m") > 50 AND MA(20, "5m") > 100 → 매수 100%'}
         assert _extract_rule_tfs(rule) == ["5m"]
 
+    def test_tf_from_constant(self) -> None:
+        """상수로 지정한 TF도 정적 분석으로 찾는다."""
+        from local_server.engine.engine import _extract_rule_tfs
+        rule = {"script": '분봉 = "15m"\nMA(20, 분봉) > 100 → 매수 100%'}
+        assert _extract_rule_tfs(rule) == ["15m"]
+
+    def test_ignores_strings_outside_indicators(self) -> None:
+        """주석 등 지표 인자가 아닌 "5m" 문자열은 무시, 파싱 실패 시 빈 리스트."""
+        from local_server.engine.engine import _extract_rule_tfs
+        assert _extract_rule_tfs({"script": '-- "5m"\nRSI(14) > 50 → 매수 100%'}) == []
+        assert _extract_rule_tfs({"script": 'RSI(14, "5m") >'}) == []
+
+
+
+class TestIndicatorProviderLookback:
+    """요구사항 기반 조회 기간."""
+
+    def test_daily_lookback_days(self) -> None:
+        from local_server.engine.indicator_provider import IndicatorNeeds
+        provider = IndicatorProvider()
+        provider.set_requirements({"A": {"1d": IndicatorNeeds(frozenset({"ma_120"}), 120)}})
+        assert provider._daily_lookback_days(["A"]) == 178
+        assert provider._daily_lookback_days(["A", "B"]) == 80  # B 요구사항 미상
+
+    def test_recursive_keeps_default_lookback(self) -> None:
+        """EMA/MACD는 depth만큼만 조회하면 ewm 워밍업이 줄어 값이 달라진다 → 기본 조회 기간 유지."""
+        from local_server.engine.indicator_provider import IndicatorNeeds, _minute_limit
+        provider = IndicatorProvider()
+        ema = IndicatorNeeds(frozenset({"ema_12"}), 12)
+        provider.set_requirements({
+            "A": {"1d": ema, "5m": ema},
+            "B": {"1d": IndicatorNeeds(frozenset({"ma_5"}), 5)},
+        })
+        assert provider._daily_lookback_days(["A"]) == 80
+        assert provider._daily_lookback_days(["B"]) == 30
+        assert _minute_limit(ema) == 200
+        assert _minute_limit(IndicatorNeeds(frozenset({"macd_signal"}), 35)) == 200
+        assert _minute_limit(IndicatorNeeds(frozenset({"ma_5"}), 5)) == 15
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
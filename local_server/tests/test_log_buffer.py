@@ -0,0 +1,182 @@
+"""LogBuffer / LogDbAdapter 테스트 — 일괄 기록, 기록 없는 당일 집계, 재시도 제한, 종료 시 유실 없음."""
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import patch
+
+from local_server.adapters import LogDbAdapter
+from local_server.storage.log_buffer import LogBuffer
+from local_server.storage.log_db import LOG_TYPE_FILL, LOG_TYPE_ORDER, LogDB
+
+
+class TestLogBuffer:
+    def test_batched_in_one_transaction(self, tmp_path: Path) -> None:
+        db = LogDB(db_path=tmp_path / "logs.db")
+        buffer = LogBuffer(db, flush_interval=0.01)
+
+        async def run() -> None:
+            for i in range(5):
+                buffer.add(LOG_TYPE_ORDER, f"주문 {i}", symbol="005930")
+            assert db.query()[1] == 0
+            await asyncio.sleep(0.05)
+
+        asyncio.run(run())
+        items, total = db.query()
+        assert total == 5 and buffer.batches == 1
+        assert [i["message"] for i in items] == [f"주문 {i}" for i in range(4, -1, -1)]
+
+    def test_max_pending_flushes_early(self, tmp_path: Path) -> None:
+        db = LogDB(db_path=tmp_path / "logs.db")
+        buffer = LogBuffer(db, flush_interval=10.0, max_pending=3)
+
+        async def run() -> None:
+            for i in range(3):
+                buffer.add(LOG_TYPE_ORDER, f"주문 {i}")
+            await asyncio.sleep(0.05)
+            assert db.query()[1] == 3
+            await buffer.close()
+
+        asyncio.run(run())
+
+    def test_close_writes_pending(self, tmp_path: Path) -> None:
+        db = LogDB(db_path=tmp_path / "logs.db")
+        buffer = LogBuffer(db, flush_interval=10.0)
+
+        async def run() -> None:
+            buffer.add(LOG_TYPE_ORDER, "주문")
+            await buffer.close()
+
+        asyncio.run(run())
+        assert db.query()[1] == 1 and buffer.pending == 0
+
+    def test_outside_loop_writes_immediately(self, tmp_path: Path) -> None:
+        db = LogDB(db_path=tmp_path / "logs.db")
+        LogBuffer(db).add(LOG_TYPE_ORDER, "주문")
+        assert db.query()[1] == 1
+
+    def test_failed_write_retried(self, tmp_path: Path) -> None:
+        db = LogDB(db_path=tmp_path / "logs.db")
+        buffer = LogBuffer(db)
+
+        async def run() -> None:
+            buffer.add(LOG_TYPE_ORDER, "주문 1")
+            with patch.object(db, "write_many", side_effect=OSError("disk")):
+                buffer.flush_sync()
+            assert buffer.pending == 1
+            buffer.add(LOG_TYPE_ORDER, "주문 2")
+            await buffer.close()
+
+        asyncio.run(run())
+        assert [i["message"] for i in db.query()[0]] == ["주문 2", "주문 1"]
+
+    def test_background_retry_without_new_rows(self, tmp_path: Path) -> None:
+        db = LogDB(db_path=tmp_path / "logs.db")
+        buffer = LogBuffer(db, flush_interval=0.01)
+        write_many = db.write_many
+        calls: list[int] = []
+
+        def fail_once(rows, token=None):
+            calls.append(len(rows))
+            if len(calls) == 1:
+                raise OSError("disk")
+            write_many(rows, token=token)
+
+        async def run() -> None:
+            with patch.object(db, "write_many", side_effect=fail_once):
+                buffer.add(LOG_TYPE_ORDER, "주문")
+                await asyncio.sleep(0.1)
+            assert buffer.pending == 0
+
+        asyncio.run(run())
+        assert calls == [1, 1] and db.query()[1] == 1
+
+    def test_failed_batch_dropped_after_max_retries(self, tmp_path: Path) -> None:
+        db = LogDB(db_path=tmp_path / "logs.db")
+        buffer = LogBuffer(db, max_retries=3)
+
+        async def run() -> None:
+            buffer.add(LOG_TYPE_ORDER, "주문 1")
+            with patch.object(db, "write_many", side_effect=OSError("disk")) as write_many:
+                for _ in range(3):
+                    buffer.flush_sync()
+            assert write_many.call_count == 3 and buffer.pending == 0
+            buffer.add(LOG_TYPE_ORDER, "주문 2")
+            await buffer.close()
+
+        asyncio.run(run())
+        assert [i["message"] for i in db.query()[0]] == ["주문 2"]
+
+
+class TestLogDbAdapter:
+    def test_reads_see_buffered_writes(self, tmp_path: Path) -> None:
+        db = LogDB(db_path=tmp_path / "logs.db")
+        adapter = LogDbAdapter(db, flush_interval=10.0)
+
+        async def run() -> None:
+            await adapter.write(LOG_TYPE_FILL, "체결", meta={"realized_pnl": "1500"})
+            await adapter.write(LOG_TYPE_ORDER, "주문", meta={"price": 100, "qty": 3})
+            with patch.object(db, "write_many", side_effect=AssertionError("읽기 중 기록")):
+                assert adapter.today_realized_pnl() == Decimal("1500")
+                assert adapter.today_executed_amount() == Decimal("300")
+            assert db.query()[1] == 0
+            await adapter.flush()
+            # 기록 후에도 같은 값 (스냅샷 + 미기록 행 이중 계산 없음)
+            assert adapter.today_realized_pnl() == Decimal("1500")
+            assert adapter.today_executed_amount() == Decimal("300")
+
+        asyncio.run(run())
+
+    def test_inflight_batch_counted_once(self, tmp_path: Path) -> None:
+        db = LogDB(db_path=tmp_path / "logs.db")
+        buffer = LogBuffer(db, flush_interval=10.0)
+        seen: list[Decimal] = []
+        write_many = db.write_many
+
+        def write_and_read(rows, token=None):
+            seen.append(buffer.today_totals()[1])  # 커밋 전 (기록 중)
+            write_many(rows, token=token)
+            seen.append(buffer.today_totals()[1])  # 커밋 후, 기록 중 목록에서 빠지기 전
+
+        async def run() -> None:
+            buffer.add(LOG_TYPE_ORDER, "주문", meta={"price": 100, "qty": 2})
+            with patch.object(db, "write_many", side_effect=write_and_read):
+                buffer.flush_sync()
+            seen.append(buffer.today_totals()[1])
+            await buffer.close()
+
+        asyncio.run(run())
+        assert seen == [Decimal("200")] * 3
+
+    def test_tokens_shared_across_buffers(self, tmp_path: Path) -> None:
+        """같은 LogDB의 다른 버퍼(알림 로그)가 먼저 커밋해도 기록 중 일괄은 계속 더한다."""
+        db = LogDB(db_path=tmp_path / "logs.db")
+        engine = LogBuffer(db, flush_interval=10.0)
+        alert = LogBuffer(db, flush_interval=10.0)
+        seen: list[Decimal] = []
+        write_many = db.write_many
+
+        def write_and_read(rows, token=None):
+            if alert.pending:
+                alert.flush_sync()  # 엔진 일괄이 기록 중일 때 알림 일괄이 먼저 커밋
+            seen.append(engine.today_totals()[0])
+            write_many(rows, token=token)
+
+        async def run() -> None:
+            engine.add(LOG_TYPE_FILL, "체결", meta={"realized_pnl": "-1000"})
+            alert.add(LOG_TYPE_ORDER, "알림")
+            with patch.object(db, "write_many", side_effect=write_and_read):
+                engine.flush_sync()
+            seen.append(engine.today_totals()[0])
+            await engine.close()
+            await alert.close()
+
+        asyncio.run(run())
+        assert seen == [Decimal("-1000")] * 3
+
+    def test_unbuffered(self, tmp_path: Path) -> None:
+        db = LogDB(db_path=tmp_path / "logs.db")
+        adapter = LogDbAdapter(db, flush_interval=0)
+        asyncio.run(adapter.write(LOG_TYPE_ORDER, "주문"))
+        assert db.query()[1] == 1
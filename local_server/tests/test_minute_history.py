@@ -0,0 +1,75 @@
+"""MinuteHistory 단위 테스트 — 1분봉 링버퍼 + 5m/15m/1h 증분 롤업."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from local_server.engine.minute_history import MinuteHistory
+from local_server.storage.minute_bar import aggregate_bars
+
+
+def _bars(n: int, start: datetime = datetime(2026, 3, 2, 9, 0)) -> list[dict]:
+    return [
+        {
+            "time": (start + timedelta(minutes=i)).isoformat(),
+            "open": 100.0 + i % 7, "high": 110.0 + i % 13, "low": 90.0 - i % 5,
+            "close": 100.0 + (i * 3) % 11, "volume": 10 + i,
+        }
+        for i in range(n)
+    ]
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rollups_match_aggregate_bars():
+    """증분 롤업 == MinuteBarStore.aggregate_bars (마지막 구간은 구성 중)."""
+    bars = _bars(137)
+    history = MinuteHistory()
+    for bar in bars:
+        history.append("A", bar)
+    assert history.bars("A", "1m") == bars
+    for tf in ("5m", "15m", "1h"):
+        assert history.bars("A", tf) == aggregate_bars(bars, tf)
+
+
+def test_ring_buffer_keeps_latest():
+    history = MinuteHistory(max_bars=50)
+    history.seed("A", _bars(300))
+    assert history.count("A", "1m") == 50
+    assert history.bars("A", "1m")[-1]["time"] == "2026-03-02T13:59:00"
+    assert history.count("A", "5m") == 50
+    assert history.bars("A", "5m")[-1] == aggregate_bars(_bars(300), "5m")[-1]
+
+
+def test_ignores_duplicates_and_out_of_order():
+    history = MinuteHistory()
+    bars = _bars(3)
+    assert history.append("A", bars[1])
+    assert not history.append("A", bars[0])
+    assert not history.append("A", bars[1])
+    assert not history.append("A", {"close": 1.0})
+    assert history.count("A") == 1
+
+
+def test_seed_sorts_and_accepts_cloud_format():
+    """seed는 시각순 정렬, cloud 형식("timestamp")도 받는다."""
+    bars = [{"timestamp": b["time"], **{k: v for k, v in b.items() if k != "time"}} for b in _bars(20)]
+    history = MinuteHistory()
+    assert history.seed("A", reversed(bars)) == 20
+    assert [b["time"] for b in history.bars("A")] == [b["timestamp"] for b in bars]
+
+
+def test_freshness():
+    clock = _Clock()
+    history = MinuteHistory(stale_after=300, clock=clock)
+    assert not history.is_fresh("A")
+    history.append("A", _bars(1)[0])
+    clock.now = 299
+    assert history.is_fresh("A")
+    clock.now = 301
+    assert not history.is_fresh("A")
@@ -130,6 +130,35 @@ class TestTradingRouter:
         # 엔진 미실행 상태이므로 400 또는 409
         assert resp.status_code in (400, 409)
 
+    def test_manual_order_and_cancel_invalidate_account_cache(
+        self, client: TestClient, sh: dict,
+    ) -> None:
+        """수동 주문/취소 후 엔진 계좌 캐시가 무효화된다."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        broker = MagicMock(is_connected=True)
+        broker.place_order = AsyncMock(return_value=MagicMock(order_id="ORD-1"))
+        broker.cancel_order = AsyncMock(return_value=True)
+        engine = MagicMock()
+        engine.safeguard.is_trading_enabled.return_value = True
+        client.app.state.broker = broker
+        client.app.state.engine = engine
+        try:
+            resp = client.post(
+                "/api/trading/order",
+                json={"symbol": "005930", "side": "BUY", "qty": 1, "order_type": "MARKET"},
+                headers=sh,
+            )
+            assert resp.status_code == 200, resp.text
+            engine.account_cache.on_order_submitted.assert_called_once_with("ORD-1")
+
+            resp = client.post("/api/account/orders/ORD-1/cancel", headers=sh)
+            assert resp.status_code == 200, resp.text
+            engine.account_cache.on_order_cancelled.assert_called_once_with("ORD-1")
+        finally:
+            client.app.state.broker = None
+            client.app.state.engine = None
+
     def test_limit_order_without_price_returns_422(self, client: TestClient, sh: dict) -> None:
         """지정가 주문 시 limit_price 없으면 422를 반환한다."""
         with patch("keyring.get_password", return_value="exists"):
@@ -201,6 +230,66 @@ class TestLogsRouter:
         assert body["data"]["total"] >= 1
 
 
+# ──────────────────────────────────────────────────────
+# 조건 상태 라우터
+# ──────────────────────────────────────────────────────
+
+class TestConditionStatusRouter:
+    def test_status_without_engine(self, client: TestClient) -> None:
+        """엔진이 없으면 빈 데이터를 반환한다."""
+        client.app.state.engine = None
+        resp = client.get("/api/conditions/status")
+        assert resp.status_code == 200
+        assert resp.json() == {"success": True, "data": {}, "count": 0}
+
+    def test_status_renews_watch(self, client: TestClient) -> None:
+        """조회하면 ConditionTracker 구독이 갱신되어 세부 값 기록이 켜진다."""
+        from types import SimpleNamespace
+        from local_server.engine.condition_tracker import ConditionTracker
+
+        tracker = ConditionTracker()
+        tracker.record(7, "t1", [{"index": 0, "result": True, "details": {}}], {}, None)
+        client.app.state.engine = SimpleNamespace(condition_tracker=tracker)
+        try:
+            assert not tracker.wants_details(7)  # 방금 기록 — 샘플 주기 전
+            resp = client.get("/api/conditions/status/7")
+            assert resp.json()["data"]["rule_id"] == 7
+            assert tracker.wants_details(7)
+            assert client.get("/api/conditions/status").json()["count"] == 1
+        finally:
+            client.app.state.engine = None
+
+
+class TestEvalProfileRouter:
+    def test_profile_without_engine(self, client: TestClient) -> None:
+        client.app.state.engine = None
+        assert client.get("/api/conditions/profile").json() == {"success": True, "data": None}
+
+    def test_toggle_and_reset(self, client: TestClient, sh: dict) -> None:
+        """POST로 켜고 끄며, DELETE로 초기화한다 (보호 엔드포인트)."""
+        from types import SimpleNamespace
+        from local_server.engine.evaluator import RuleEvaluator
+
+        evaluator = RuleEvaluator()
+        client.app.state.engine = SimpleNamespace(evaluator=evaluator)
+        try:
+            assert client.post("/api/conditions/profile", json={"enabled": True}).status_code in (401, 403)
+            resp = client.post("/api/conditions/profile", json={"enabled": True}, headers=sh)
+            assert resp.json() == {"success": True, "enabled": True}
+            assert evaluator.profiling
+
+            rule = {"id": 3, "script": "현재가 > 100 → 매수 100%"}
+            evaluator.evaluate_v2(rule, {"price": 150}, {})
+            data = client.get("/api/conditions/profile").json()["data"]
+            assert data["enabled"] is True
+            assert data["rules"][0]["rule_id"] == 3
+
+            assert client.delete("/api/conditions/profile", headers=sh).json()["success"]
+            assert client.get("/api/conditions/profile").json()["data"]["rules"] == []
+        finally:
+            client.app.state.engine = None
+
+
 # ──────────────────────────────────────────────────────
 # ConnectionManager 테스트
 # ──────────────────────────────────────────────────────
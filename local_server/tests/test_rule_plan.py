@@ -0,0 +1,184 @@
+"""RulePlan / hot-reload 테스트 — 불변 실행 계획, 바뀐 규칙·종목만 반영."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from local_server.engine.engine import StrategyEngine
+from local_server.engine.rule_plan import RulePlan
+
+RULES = [
+    {"id": 1, "symbol": "A", "is_active": True, "priority": 1,
+     "script": 'RSI(14, "5m") < 30 -> 매수 100%'},
+    {"id": 2, "symbol": "B", "is_active": True, "priority": 5,
+     "script": "상향돌파(현재가, MA(20)) -> 매수 100%"},
+    {"id": 3, "symbol": "A", "is_active": True, "priority": 5,
+     "script": 'MA(20, "15m") > 0 -> 매도 전량'},
+    {"id": 4, "symbol": "A", "is_active": False, "priority": 9,
+     "script": 'MA(20, "1h") > 0 -> 매도 전량'},
+    {"id": 5, "symbol": "C", "is_active": True, "buy_conditions": {}},
+]
+
+
+class TestRulePlan:
+    def test_grouped_and_sorted(self):
+        plan = RulePlan.build(RULES)
+        assert [p.rule_id for p in plan.ordered] == [2, 3, 1, 5]
+        assert [p.rank for p in plan.ordered] == [0, 1, 2, 3]
+        assert list(plan.symbols) == ["B", "A", "C"]
+        assert [p.rule_id for p in plan.symbols["A"].rules] == [3, 1]
+
+    def test_analysis_attached(self):
+        plan = RulePlan.build(RULES)
+        a = plan.symbols["A"]
+        assert a.tfs == frozenset({"5m", "15m"})  # 비활성 규칙의 1h 제외
+        assert all(p.tfs is a.tfs for p in a.rules)
+        assert [p.rule_id for p in a.stateless] == [3, 1]
+        assert plan.symbols["B"].stateless == ()
+        c = plan.symbols["C"].rules[0]
+        assert c.ast is None and c.deps is None and not c.stateless
+        assert plan.symbols["B"].rules[0].ast is not None
+
+    def test_indicator_needs_merged_per_symbol(self):
+        from local_server.engine.indicator_provider import IndicatorNeeds
+        rules = [
+            {"id": 1, "is_active": True, "symbol": "A",
+             "script": 'RSI(9) < 30 AND MA(20, "5m")[2] > 0 → 매수 100%'},
+            {"id": 2, "is_active": True, "symbol": "A", "script": "골든크로스 → 매수 100%"},
+            {"id": 3, "is_active": False, "symbol": "A", "script": "MA(120) > 0 → 매수 100%"},
+            {"id": 4, "is_active": True, "symbol": "B", "script": "RSI(보유일) > 50 → 매도 전량"},
+            {"id": 5, "is_active": True, "symbol": "C", "buy_conditions": {}},
+        ]
+        assert RulePlan.build(rules).indicator_needs() == {
+            "A": {
+                "1d": IndicatorNeeds(frozenset({"rsi_9", "ma_5", "ma_20"}), 20),
+                "5m": IndicatorNeeds(frozenset({"ma_20"}), 22),
+            },
+            "B": {"1d": IndicatorNeeds(None, 0)},  # 동적 인자 → 전체 세트
+        }
+
+    def test_rebuild_reuses_unchanged_rules(self):
+        plan = RulePlan.build(RULES)
+        updated = [{**RULES[0], "script": 'RSI(14, "5m") < 25 -> 매수 100%'}, *RULES[1:]]
+        rebuilt = RulePlan.build(updated, previous=plan)
+        old = {p.rule_id: p for p in plan.ordered}
+        new = {p.rule_id: p for p in rebuilt.ordered}
+        assert new[2].ast is old[2].ast and new[3].deps is old[3].deps
+        assert new[1].ast is not old[1].ast and new[1].rule is updated[0]
+        assert [p.rule_id for p in rebuilt.ordered] == [2, 3, 1, 5]
+
+    def test_immutable(self):
+        plan = RulePlan.build(RULES)
+        try:
+            plan.symbols["D"] = plan.symbols["A"]  # type: ignore[index]
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("symbols는 읽기 전용이어야 한다")
+
+
+class TestEnginePlan:
+    def test_set_rules_rebuilds_and_precompiles(self):
+        engine = StrategyEngine(
+            broker=MagicMock(), log=MagicMock(), bar_data=MagicMock(),
+            bar_store=MagicMock(), ref_data=MagicMock(), config={},
+        )
+        engine.set_rules(RULES)
+        plan = engine.rule_plan
+        assert len(plan) == 4
+        assert set(engine.evaluator._v2_ast_cache) == {1, 2, 3}
+        # 같은 규칙 목록이 다시 와도 계획은 새로, 컴파일본은 재사용
+        compiled = engine.evaluator._v2_ast_cache[1][1]
+        engine.set_rules(RULES)
+        assert engine.rule_plan is not plan
+        assert engine.evaluator._v2_ast_cache[1][1] is compiled
+
+
+def _running_engine() -> tuple[StrategyEngine, MagicMock]:
+    broker = MagicMock()
+    broker.subscribe_quotes = AsyncMock()
+    broker.unsubscribe_quotes = AsyncMock()
+    engine = StrategyEngine(
+        broker=broker, log=MagicMock(), bar_data=MagicMock(),
+        bar_store=MagicMock(), ref_data=MagicMock(), config={},
+    )
+    engine._indicator_provider.refresh = AsyncMock()
+    engine._indicator_provider.seed_history = AsyncMock()
+    engine._ref_data.get_market_map.return_value = {}
+    engine._broker.get_quote = AsyncMock(side_effect=RuntimeError)
+    return engine, broker
+
+
+class TestHotReload:
+    def test_only_changed_rules_lose_state(self):
+        engine, _ = _running_engine()
+        engine.set_rules(RULES)
+        engine.evaluator._v2_states.update({1: {"x": 1}, 2: {"x": 2}, 3: {"x": 3}})
+        updated = [
+            {**RULES[0], "script": 'RSI(14, "5m") < 25 -> 매수 100%'},  # script 변경
+            RULES[1],
+            {**RULES[3]},
+            RULES[4],
+        ]  # 규칙 3 삭제
+        engine.set_rules(updated)
+        assert set(engine.evaluator._v2_states) == {2}
+        assert engine.evaluator._v2_ast_cache[1][0] == updated[0]["script"]
+
+    def test_symbol_diff_subscribes_changed_only(self):
+        engine, broker = _running_engine()
+
+        async def run() -> None:
+            engine.set_rules(RULES)
+            engine._running = True
+            engine._subscribed = {"A", "B", "C"}
+            engine.set_rules([
+                RULES[0],
+                {**RULES[1], "symbol": "D"},
+                RULES[4],
+            ])
+            await engine._symbol_sync_task
+
+        asyncio.run(run())
+        broker.unsubscribe_quotes.assert_awaited_once_with(["B"])
+        broker.subscribe_quotes.assert_awaited_once_with(["D"], engine._on_quote)
+        engine._indicator_provider.refresh.assert_awaited_once()
+        assert engine._indicator_provider.refresh.await_args.args[0] == ["D"]
+        assert engine._subscribed == {"A", "C", "D"}
+
+    def test_not_running_no_subscription(self):
+        engine, broker = _running_engine()
+
+        async def run() -> None:
+            engine.set_rules(RULES)
+            engine.set_rules(RULES[:1])
+
+        asyncio.run(run())
+        assert engine._symbol_sync_task is None
+        broker.subscribe_quotes.assert_not_called()
+
+    def test_cycle_uses_plan_snapshot(self):
+        """사이클 중간 await에 hot-reload로 종목이 빠져도 그 사이클은 시작 시점 계획으로 끝까지."""
+        engine, _ = _running_engine()
+        engine.set_rules(RULES)
+
+        async def reload_during_cycle():
+            engine.set_rules([RULES[1], RULES[4]])  # 종목 A 제거
+            return MagicMock(positions=[], cash=Decimal(0), total_eval=Decimal(0))
+
+        engine._sync_positions = AsyncMock()
+        engine._account.balance = AsyncMock(side_effect=reload_during_cycle)
+        engine._account.open_orders = AsyncMock(return_value=[])
+        engine._log.today_realized_pnl.return_value = Decimal(0)
+        engine._alert_monitor.check_all = AsyncMock()
+        engine._indicator_provider.refresh_minutes = AsyncMock()
+        engine._bar_builder.get_latest = MagicMock(return_value=None)
+
+        with patch("local_server.engine.engine.datetime") as mock_dt:
+            mock_dt.now.return_value = datetime(2026, 3, 2, 10, 0)
+            asyncio.run(engine._run_cycle(None, set()))
+
+        engine._indicator_provider.refresh_minutes.assert_awaited_once()
+        assert engine._indicator_provider.refresh_minutes.await_args.args[0] == {"A": {"5m", "15m"}}
+        assert "A" not in engine.rule_plan.symbols
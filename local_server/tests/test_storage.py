@@ -110,6 +110,18 @@ class TestRulesCache:
         assert cache.count() == 2
         assert cache.get_rules()[0]["id"] == 2
 
+    def test_on_sync_callback(self, tmp_path: Path) -> None:
+        """sync() 직후 콜백(엔진 hot-reload) 호출, None이면 해제."""
+        from local_server.storage.rules_cache import RulesCache
+
+        received: list = []
+        cache = RulesCache(rules_path=tmp_path / "rules.json")
+        cache.set_on_sync(received.append)
+        cache.sync([{"id": 1}])
+        cache.set_on_sync(None)
+        cache.sync([{"id": 2}])
+        assert received == [[{"id": 1}]]
+
 
 # ──────────────────────────────────────────────────────
 # LogDB 테스트
@@ -168,6 +180,58 @@ class TestLogDB:
         items, _ = db.query()
         assert items[0]["meta"] == meta
 
+    def test_daily_totals_incremental(self, tmp_path: Path) -> None:
+        """당일 집계는 기록 시 갱신 — 조회 때 로그를 다시 읽지 않는다."""
+        from decimal import Decimal
+        from local_server.storage.log_db import LogDB, LOG_TYPE_FILL, LOG_TYPE_ORDER
+
+        db = LogDB(db_path=tmp_path / "logs.db")
+        db.write(LOG_TYPE_ORDER, "주문", meta={"price": 1000, "qty": 3})
+        db.write_many([
+            db.make_row(LOG_TYPE_FILL, "체결", meta={"realized_pnl": "-250.5"}),
+            db.make_row(LOG_TYPE_FILL, "체결", meta={"realized_pnl": 100}),
+            db.make_row(LOG_TYPE_FILL, "체결 (손익 없음)", meta={"price": 1000, "qty": 3}),
+        ])
+        with patch.object(LogDB, "_scan_day", side_effect=AssertionError("재계산 금지")):
+            assert db.today_realized_pnl() == Decimal("-150.5")
+            assert db.today_executed_amount() == Decimal("3000")
+
+    def test_daily_totals_rebuilt_at_startup(self, tmp_path: Path) -> None:
+        """시작 시 로그에서 재구성 — 요약 테이블이 없던 DB도 같은 값."""
+        import sqlite3
+        from decimal import Decimal
+        from local_server.storage.log_db import LogDB, LOG_TYPE_FILL
+
+        path = tmp_path / "logs.db"
+        LogDB(db_path=path).write(LOG_TYPE_FILL, "체결", meta={"realized_pnl": 500})
+        with sqlite3.connect(str(path)) as conn:
+            conn.execute("DROP TABLE daily_totals")
+        db = LogDB(db_path=path)
+        assert db.today_realized_pnl() == Decimal("500")
+        with sqlite3.connect(str(path)) as conn:
+            assert conn.execute("SELECT realized_pnl FROM daily_totals").fetchone() == ("500",)
+
+    def test_daily_totals_day_rollover(self, tmp_path: Path) -> None:
+        """날짜가 바뀌면 새 날짜 집계로 시작, 늦게 기록된 전날 행은 전날 요약에만."""
+        import sqlite3
+        from decimal import Decimal
+        from local_server.storage import log_db as log_db_mod
+        from local_server.storage.log_db import LogDB, LOG_TYPE_FILL
+
+        db = LogDB(db_path=tmp_path / "logs.db")
+        db.write(LOG_TYPE_FILL, "체결", meta={"realized_pnl": 500})
+        today = log_db_mod._utc_day()
+        yesterday_row = ("2000-01-01T23:59:59+00:00", LOG_TYPE_FILL, None, "늦은 체결",
+                         '{"realized_pnl": 7}', None)
+        db.write_many([yesterday_row])
+        assert db.today_realized_pnl() == Decimal("500")
+
+        with patch.object(log_db_mod, "_utc_day", return_value="2999-01-01"):
+            assert db.today_realized_pnl() == Decimal("0")
+        with sqlite3.connect(str(tmp_path / "logs.db")) as conn:
+            totals = dict(conn.execute("SELECT day, realized_pnl FROM daily_totals").fetchall())
+        assert totals == {today: "500", "2000-01-01": "7", "2999-01-01": "0"}
+
 
 # ──────────────────────────────────────────────────────
 # Credential 테스트 (keyring mock)
@@ -0,0 +1,85 @@
+"""백테스트 시뮬레이션 벤치마크 — 바 단위 평가 vs 전체 시계열 벡터화 평가.
+
+합성 1분봉(기본 1년 ≈ 250일 × 390봉)으로 BacktestRunner._simulate를 두 경로로 실행해
+소요 시간과 거래 일치 여부를 비교한다. 지표 사전 계산 시간은 양쪽 모두 포함한다.
+
+사용:
+    python scripts/bench_backtest_vectorized.py [--bars 97500] [--skip-scalar]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+import pandas as pd
+
+from cloud_server.services.backtest_runner import BacktestConfig, BacktestRunner, _warmup_bars
+from sv_core.parsing import compile_script_v2, parse_v2
+
+SCRIPTS = [
+    "RSI(14) <= 30 → 매수 100%\nRSI(14) >= 70 → 매도 전량",
+    "상향돌파(MA(5), MA(20)) AND 거래량 > 평균거래량(20) → 매수 100%\n하향돌파(MA(5), MA(20)) → 매도 전량",
+    "횟수(RSI(14) < 40, 10) >= 3 AND 연속(현재가 > 현재가[1]) >= 2 → 매수 100%\n"
+    "연속(현재가 < EMA(20)) >= 5 → 매도 전량",
+    "RSI(14) < 35 AND 보유수량 == 0 → 매수 100%\n수익률 >= 1.5 → 매도 50%\n수익률 <= -1 → 매도 전량",
+]
+
+
+def _bars(n: int) -> list[dict]:
+    rng = np.random.default_rng(7)
+    closes = 50000 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    volumes = rng.integers(100, 5000, n).astype(float)
+    return [
+        {"timestamp": str(i), "open": c, "high": c, "low": c, "close": c, "volume": v}
+        for i, (c, v) in enumerate(zip(closes.tolist(), volumes.tolist()))
+    ]
+
+
+def _run(runner: BacktestRunner, script: str, bars: list[dict], vectorized: bool):
+    """run()과 같은 순서: 파싱/컴파일 → 지표 사전 계산 → 시뮬레이션. (초, 결과)"""
+    start = time.perf_counter()
+    ast = parse_v2(script)
+    compiled = compile_script_v2(ast)
+    deps = compiled.dependencies
+    closes = pd.Series([b["close"] for b in bars], dtype=float)
+    volumes = pd.Series([b["volume"] for b in bars], dtype=float)
+    indicators = runner._precompute_indicators(closes, volumes, deps.keys() | deps.keys("1m"))
+    result = runner._simulate(
+        compiled, bars, indicators, BacktestConfig(), closes, volumes, "1m",
+        _warmup_bars(deps), ast if vectorized else None,
+    )
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--bars", type=int, default=250 * 390, help="1분봉 수")
+    ap.add_argument("--skip-scalar", action="store_true", help="바 단위 평가 생략")
+    args = ap.parse_args()
+
+    bars = _bars(args.bars)
+    runner = BacktestRunner(db=None)
+
+    print(f"bars={args.bars}")
+    print(f"{'script':<48} {'scalar(s)':>10} {'vector(s)':>10} {'speedup':>8} {'trades':>7}")
+    for src in SCRIPTS:
+        vec_t, vec = _run(runner, src, bars, vectorized=True)
+        label = src.replace("\n", " | ")[:46]
+        if args.skip_scalar:
+            print(f"{label:<48} {'-':>10} {vec_t:>10.3f} {'-':>8} {vec.trade_count:>7}")
+            continue
+        sc_t, sc = _run(runner, src, bars, vectorized=False)
+        same = "" if sc.trades == vec.trades else "  MISMATCH"
+        print(f"{label:<48} {sc_t:>10.3f} {vec_t:>10.3f} {sc_t / vec_t:>7.1f}x "
+              f"{vec.trade_count:>7}{same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""DSL 평가 마이크로 벤치마크 — 트리 순회 평가기 vs 컴파일된 클로저.
+
+v1/v2 샘플 스크립트(상태 함수·패턴·커스텀 함수·이전 봉 참조 포함)를 사이클마다 평가하여
+평가 1회당 소요 시간을 비교한다.
+
+사용:
+    python scripts/bench_dsl_compile.py [--cycles 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sv_core.parsing import (
+    compile_script,
+    compile_script_v2,
+    evaluate,
+    evaluate_v2,
+    parse,
+    parse_v2,
+)
+
+
+def _ctx(step: int) -> dict:
+    """사이클마다 값이 변하는 컨텍스트 (돌파/다이버전스/횟수가 실제로 발생하도록)."""
+    price = 50000 + 3000 * math.sin(step / 3) - 40 * step
+    rsi = 50 + 25 * math.sin(step / 2)
+    return {
+        "현재가": price, "거래량": 1000 + step * 10, "수익률": (step % 9) - 4,
+        "보유수량": step % 2, "고점 대비": -(step % 5), "등락률": (step % 7) - 3,
+        "장시작후": step, "시간": 900 + step, "요일": 1,
+        "RSI": lambda period, tf=None: rsi if period == 14 else 100 - rsi,
+        "MA": lambda period, tf=None: price + (period - 10) * 30 * math.cos(step / 4),
+        "EMA": lambda period, tf=None: price - period,
+        "MACD": lambda tf=None: math.sin(step / 2),
+        "MACD_SIGNAL": lambda tf=None: math.sin((step - 1) / 2),
+        "MACD_HIST": lambda tf=None: math.sin(step / 2) - math.sin((step - 1) / 2),
+        "볼린저_상단": lambda period, tf=None: 52000,
+        "볼린저_하단": lambda period, tf=None: 48000,
+        "평균거래량": lambda period, tf=None: None if step % 6 == 0 else 900,
+    }
+
+
+V1_SCRIPTS = [
+    "매수: 현재가 > 40000 AND true\n매도: 현재가 / 0 > 1",
+    "매수: 현재가 + 10000 > 55000 OR NOT false\n매도: -수익률 > 2",
+    "매수: 골든크로스() AND RSI과매도()\n매도: 데드크로스() OR RSI과매수()",
+    "매수: 상향돌파(RSI(14), 50)\n매도: 하향돌파(MA(5), MA(20))",
+    "매수: 거래량 > 평균거래량(20) * 1.2\n매도: 볼린저상단돌파()",
+    "과매도() = RSI(14) < 35\n매수: 과매도() AND 상향돌파(현재가, MA(20))\n매도: NOT 과매도()",
+    "매수: 강세다이버전스(RSI(14), 10)\n매도: 약세다이버전스(MACD_HIST())",
+    "매수: MACD골든크로스()\n매도: MACD데드크로스()",
+]
+
+V2_SCRIPTS = [
+    "현재가 > 40000 AND 보유수량 == 0 -> 매수 100%\n수익률 >= 3 -> 매도 50%\n수익률 <= -3 -> 매도 전량",
+    "골든크로스 AND RSI(14) >= 50 AND 보유수량 == 0 → 매수 100%\n데드크로스 AND 보유수량 > 0 → 매도 전량",
+    "기간 = 20\n강세다이버전스(MACD_HIST(), 기간) AND RSI(14) < 50 → 매수 100%\n약세다이버전스(MACD_HIST(), 기간) → 매도 전량",
+    "횟수(RSI(14) < 40, 5) >= 2 → 매수 100%\n연속(현재가 < MA(20)) >= 3 → 매도 전량",
+    "배수 = 1.5\n상향돌파(현재가, 볼린저_상단(20)) AND 거래량 > 평균거래량(20) * 배수 → 매수 100%\n고점 대비 <= -2 → 매도 전량",
+    "단기 = 12\n장기 = 26\n상향돌파(EMA(단기), EMA(장기)) → 매수 100%\n하향돌파(EMA(단기), EMA(장기)) → 매도 전량",
+    "횟수(RSI(14) < 40, 5) + 1 >= 2 → 매수 100%\n연속(현재가 < MA(20)) * 2 >= 4 → 매도 전량",
+    "과열 = RSI(14) > 60 AND 등락률 > 0\n과열 AND 보유수량 > 0 → 매도 전량\nNOT 과열 → 매수 50%",
+    "매수: RSI과매도() OR 볼린저하단돌파()\n매도: RSI과매수()",
+    # 공통 부분식 + 같은 돌파 식 여러 번 (위치별 state 유지)
+    "RSI(14) < 45 AND MA(5) > MA(20) → 매수 100%\nRSI(14) > 55 OR MA(5) < MA(20) → 매도 50%\n"
+    "상향돌파(MA(5), MA(20)) AND 상향돌파(MA(5), MA(20)) → 매도 전량\nRSI과매도 AND RSI(14) <= 30 → 매수 50%",
+    "기간 = 20\n배수 = 2\nRSI(기간 - 6) * 배수 > 기간 * 5 AND 10 / 0 == 1 → 매수 100%\n-기간 < 0 → 매도 전량",
+    # 이전 봉 참조 — 버퍼 공유 / 상태 함수 / 커스텀 함수 안
+    "현재가 > 현재가[1] AND RSI(14)[3] < RSI(14) → 매수 100%\n상향돌파(현재가, MA(20))[1] OR 골든크로스[2] → 매도 전량",
+    "과열 = RSI(14)[2] > 50\n과열 AND 횟수(현재가 > MA(20), 5)[1] >= 1 → 매수 100%\n현재가[5] - 현재가 > 100 → 매도 전량",
+]
+
+
+def _bench(run, contexts) -> float:
+    """평가 1회당 평균 μs."""
+    state: dict = {}
+    start = time.perf_counter()
+    for ctx in contexts:
+        run(ctx, state)
+    return (time.perf_counter() - start) / len(contexts) * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--cycles", type=int, default=2000, help="스크립트당 평가 횟수")
+    args = ap.parse_args()
+
+    contexts = [_ctx(step) for step in range(args.cycles)]
+    cases = [(src, parse(src), True) for src in V1_SCRIPTS]
+    cases += [(src, parse_v2(src), False) for src in V2_SCRIPTS]
+
+    print(f"{'script':<48} {'tree(us)':>10} {'compiled(us)':>13} {'speedup':>8}")
+    total_tree = total_compiled = 0.0
+    for src, ast, is_v1 in cases:
+        if is_v1:
+            compiled = compile_script(ast)
+            tree = _bench(lambda c, s: evaluate(ast, c, s), contexts)
+        else:
+            compiled = compile_script_v2(ast)
+            tree = _bench(lambda c, s: evaluate_v2(ast, c, s), contexts)
+        comp = _bench(compiled.evaluate, contexts)
+        total_tree += tree
+        total_compiled += comp
+        label = src.replace("\n", " | ")[:46]
+        print(f"{label:<48} {tree:>10.1f} {comp:>13.1f} {tree / comp:>7.1f}x")
+
+    print(f"{'TOTAL':<48} {total_tree:>10.1f} {total_compiled:>13.1f} "
+          f"{total_tree / total_compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
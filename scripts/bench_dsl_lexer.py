@@ -0,0 +1,97 @@
+"""DSL 렉서/파싱 벤치마크 — 문자 단위 렉서 vs 정규식 렉서, 파싱 캐시 적중.
+
+아래 규칙 줄(DSL 컴파일러 테스트 스크립트와 같은 구성)을 이어 붙여 큰 스크립트를 만들고
+초당 토큰 수(렉서)와 파싱 1회 시간(캐시 미스 / 적중)을 비교한다.
+
+사용:
+    python scripts/bench_dsl_lexer.py [--repeat 1,10,100] [--rounds 20]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sv_core.parsing import parse_v2
+from sv_core.parsing.lexer import _tokenize_chars, tokenize
+from sv_core.parsing.parser import Parser
+
+
+# 벤치마크 규칙 줄 — 상수(단기/장기/기간/배수)와 커스텀 조건(과열)은 _script()가 맨 위에 정의
+_RULE_LINES = [
+    "현재가 > 40000 AND 보유수량 == 0 -> 매수 100%",
+    "수익률 >= 3 -> 매도 50%",
+    "수익률 <= -3 -> 매도 전량",
+    "골든크로스 AND RSI(14) >= 50 AND 보유수량 == 0 → 매수 100%",
+    "데드크로스 AND 보유수량 > 0 → 매도 전량",
+    "강세다이버전스(MACD_HIST(), 기간) AND RSI(14) < 50 → 매수 100%",
+    "약세다이버전스(MACD_HIST(), 기간) → 매도 전량",
+    "횟수(RSI(14) < 40, 5) >= 2 → 매수 100%",
+    "연속(현재가 < MA(20)) >= 3 → 매도 전량",
+    "상향돌파(현재가, 볼린저_상단(20)) AND 거래량 > 평균거래량(20) * 배수 → 매수 100%",
+    "고점 대비 <= -2 → 매도 전량",
+    "상향돌파(EMA(단기), EMA(장기)) → 매수 100%",
+    "하향돌파(EMA(단기), EMA(장기)) → 매도 전량",
+    "횟수(RSI(14) < 40, 5) + 1 >= 2 → 매수 100%",
+    "연속(현재가 < MA(20)) * 2 >= 4 → 매도 전량",
+    "과열 AND 보유수량 > 0 → 매도 전량",
+    "NOT 과열 → 매수 50%",
+    "RSI(14) < 45 AND MA(5) > MA(20) → 매수 100%",
+    "RSI(14) > 55 OR MA(5) < MA(20) → 매도 50%",
+    "상향돌파(MA(5), MA(20)) AND 상향돌파(MA(5), MA(20)) → 매도 전량",
+    "RSI과매도 AND RSI(14) <= 30 → 매수 50%",
+    "RSI(기간 - 6) * 배수 > 기간 * 5 AND 10 / 0 == 1 → 매수 100%",
+    "-기간 < 0 → 매도 전량",
+    "현재가 > 현재가[1] AND RSI(14)[3] < RSI(14) → 매수 100%",
+    "상향돌파(현재가, MA(20))[1] OR 골든크로스[2] → 매도 전량",
+    "과열 AND 횟수(현재가 > MA(20), 5)[1] >= 1 → 매수 100%",
+    "현재가[5] - 현재가 > 100 → 매도 전량",
+]
+
+
+def _script(repeat: int) -> str:
+    """v2 규칙 줄을 repeat번 이어 붙인 스크립트 (주석 포함, 상수/커스텀 정의는 맨 위에 한 번)."""
+    body = [f"-- 블록 {i}\n" + "\n".join(_RULE_LINES) for i in range(repeat)]
+    header = "단기 = 12\n장기 = 26\n기간 = 20\n배수 = 1.5\n과열 = RSI(14) > 60 AND 등락률 > 0\n"
+    return header + "\n".join(body)
+
+
+def _best(fn, source: str, rounds: int) -> float:
+    """rounds회 중 최소 소요 시간(초)."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(source)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--repeat", default="1,10,100", help="규칙 블록 반복 수 (쉼표 구분)")
+    ap.add_argument("--rounds", type=int, default=20, help="측정 반복 (최솟값 사용)")
+    args = ap.parse_args()
+
+    print(f"{'repeat':>6} {'tokens':>8} {'chars(tok/s)':>13} {'regex(tok/s)':>13} {'speedup':>8} "
+          f"{'parse(ms)':>10} {'cached(us)':>11}")
+    for repeat in (int(r) for r in args.repeat.split(",")):
+        source = _script(repeat)
+        n_tokens = len(tokenize(source))
+        assert n_tokens == len(_tokenize_chars(source))
+
+        chars = _best(_tokenize_chars, source, args.rounds)
+        regex = _best(tokenize, source, args.rounds)
+        cold = _best(lambda s: Parser(tokenize(s)).parse_v2(), source, args.rounds)
+        parse_v2(source)
+        warm = _best(parse_v2, source, args.rounds)
+        print(f"{repeat:>6} {n_tokens:>8} {n_tokens / chars:>13,.0f} {n_tokens / regex:>13,.0f} "
+              f"{chars / regex:>7.1f}x {cold * 1e3:>10.2f} {warm * 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""분봉 지표 갱신 벤치마크 — (종목, TF)별 직렬 조회 vs 종목 병렬 + 종목당 1m 1회 + 로컬 롤업.
+
+지연(latency)을 흉내 낸 가짜 BarDataPort로 한 사이클의 분봉 지표 갱신 시간을 잰다.
+"cold"는 히스토리가 빈 첫 사이클 (1m 보충 조회), "warm"은 다음 사이클 (로컬만).
+
+사용:
+    python scripts/bench_minute_refresh.py [--symbols 10,50] [--latency-ms 30] [--concurrency 8]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from local_server.engine.indicator_provider import IndicatorNeeds, IndicatorProvider
+from local_server.engine.minute_history import MinuteHistory
+from local_server.storage.minute_bar import aggregate_bars
+
+_TFS = ("1m", "5m", "15m")
+
+
+class _LatencyPort:
+    """요청마다 latency초 대기 후 1분봉(또는 집계봉)을 돌려주는 BarDataPort."""
+
+    def __init__(self, latency: float, n_bars: int = 3000) -> None:
+        base = datetime(2026, 3, 2, 9, 0)
+        self._latency = latency
+        self._bars = [
+            {
+                "time": (base + timedelta(minutes=i)).isoformat(),
+                "open": 100 + i % 7, "high": 110 + i % 13, "low": 90 - i % 5,
+                "close": 100 + (i * 3) % 11, "volume": 10 + i,
+            }
+            for i in range(n_bars)
+        ]
+        self._by_tf = {tf: aggregate_bars(self._bars, tf) for tf in _TFS}
+        self.requests = 0
+
+    async def fetch_minute_bars(self, symbol: str, tf: str, limit: int) -> list[dict]:
+        self.requests += 1
+        await asyncio.sleep(self._latency)
+        return self._by_tf[tf][-limit:]
+
+
+def _provider(port: _LatencyPort, symbols: list[str], history: bool) -> IndicatorProvider:
+    provider = IndicatorProvider(bar_data=port, history=MinuteHistory() if history else None)
+    need = IndicatorNeeds(frozenset({"ma_20", "rsi_14"}), depth=20)
+    provider.set_requirements({s: {tf: need for tf in _TFS} for s in symbols})
+    return provider
+
+
+async def _serial(provider: IndicatorProvider, symbols: list[str]) -> None:
+    for sym in symbols:
+        for tf in _TFS:
+            await provider.refresh_minute(sym, tf)
+
+
+async def _timed(coro) -> float:
+    start = time.perf_counter()
+    await coro
+    return time.perf_counter() - start
+
+
+async def _run(n_symbols: int, latency: float, concurrency: int) -> tuple[float, int, float, float, int]:
+    symbols = [f"{i:06d}" for i in range(n_symbols)]
+    port = _LatencyPort(latency)
+    serial = await _timed(_serial(_provider(port, symbols, history=False), symbols))
+    serial_requests, port.requests = port.requests, 0
+
+    provider = _provider(port, symbols, history=True)
+    plan = {s: set(_TFS) for s in symbols}
+    cold = await _timed(provider.refresh_minutes(plan, concurrency=concurrency))
+    provider._minute_cache.clear()
+    warm = await _timed(provider.refresh_minutes(plan, concurrency=concurrency))
+    return serial, serial_requests, cold, warm, port.requests
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--symbols", default="10,50", help="종목 수 (쉼표 구분)")
+    ap.add_argument("--latency-ms", type=float, default=30.0, help="조회 1회 지연 (ms)")
+    ap.add_argument("--concurrency", type=int, default=8, help="동시 종목 수")
+    args = ap.parse_args()
+
+    latency = args.latency_ms / 1e3
+    print(f"{'symbols':>7} {'serial(ms)':>11} {'req':>5} {'cold(ms)':>9} {'warm(ms)':>9} {'req':>5} {'speedup':>8}")
+    for n in (int(s) for s in args.symbols.split(",")):
+        serial, serial_req, cold, warm, req = asyncio.run(_run(n, latency, args.concurrency))
+        print(f"{n:>7} {serial * 1e3:>11.1f} {serial_req:>5} {cold * 1e3:>9.1f} {warm * 1e3:>9.1f} "
+              f"{req:>5} {serial / cold:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""규칙 선택 벤치마크 — 매 사이클 필터/정렬/스크립트 분석 vs set_rules 시점 실행 계획.
+
+규칙 N개(종목 M개)에 대해 한 사이클의 "평가할 규칙 + 종목별 분봉 TF" 준비 시간을 잰다.
+"cron"은 전체 종목, "event"는 종목 1개 (분봉 완성 이벤트). "build"는 계획 생성 1회 비용
+(v2 사전 컴파일 제외), "rebuild"는 규칙 1개만 바뀐 동기화 (이전 계획 재사용). 스크립트 종류가 분석 LRU(1024)보다 많으면 기존 방식은 매 사이클 재분석한다.
+
+사용:
+    python scripts/bench_rule_plan.py [--rules 10000] [--symbols 2000] [--cycles 20]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 path에 추가
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from local_server.engine.rule_plan import MINUTE_TFS, RulePlan
+from sv_core.parsing import analyze_script
+
+_TFS = ("1m", "5m", "15m", "1d")
+
+
+def _rules(n_rules: int, n_symbols: int) -> list[dict]:
+    rules = []
+    for i in range(n_rules):
+        tf = _TFS[i % len(_TFS)]
+        script = (
+            f'RSI({5 + i % 23}, "{tf}") < {20 + i % 17} AND MA({5 + i % 61}) > 0 -> 매수 100%\n'
+            f"현재가 > MA({20 + i % 7}) -> 매도 전량"
+        )
+        if i % 5 == 0:
+            script = f"상향돌파(현재가, MA({10 + i % 31})) -> 매수 100%"
+        rules.append({
+            "id": i, "symbol": f"{i % n_symbols:06d}", "is_active": i % 10 != 9,
+            "priority": i % 7, "script": script,
+        })
+    return rules
+
+
+def _legacy(rules: list[dict], symbols: set[str] | None) -> tuple[list[dict], dict[str, set[str]]]:
+    """기존 사이클: 전체 규칙 순회 + 정렬 + 규칙마다 스크립트 분석."""
+    active = [
+        r for r in rules
+        if r.get("is_active", False) and (symbols is None or r.get("symbol", "") in symbols)
+    ]
+    active.sort(key=lambda r: r.get("priority", 0), reverse=True)
+    tfs: dict[str, set[str]] = {}
+    for rule in active:
+        deps = analyze_script(rule.get("script") or "")
+        for tf in (deps.timeframes if deps else ()):
+            if tf in MINUTE_TFS:
+                tfs.setdefault(rule.get("symbol", ""), set()).add(tf)
+    return active, tfs
+
+
+def _planned(plan: RulePlan, symbols: set[str] | None) -> tuple[list, dict[str, frozenset[str]]]:
+    """계획 사이클: 종목별 묶음에서 꺼내기만."""
+    if symbols is None:
+        return list(plan.ordered), {s: p.tfs for s, p in plan.symbols.items() if p.tfs}
+    selected = []
+    for sym in symbols:
+        symbol_plan = plan.symbols.get(sym)
+        if symbol_plan is not None:
+            selected.extend(symbol_plan.rules)
+    selected.sort(key=lambda p: p.rank)
+    return selected, {s: plan.symbols[s].tfs for s in symbols if s in plan.symbols}
+
+
+def _per_cycle_ms(fn, cycles: int) -> float:
+    start = time.perf_counter()
+    for _ in range(cycles):
+        fn()
+    return (time.perf_counter() - start) / cycles * 1e3
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rules", type=int, default=10000, help="규칙 수")
+    ap.add_argument("--symbols", type=int, default=2000, help="종목 수")
+    ap.add_argument("--cycles", type=int, default=20, help="반복 사이클 수")
+    args = ap.parse_args()
+
+    rules = _rules(args.rules, args.symbols)
+    start = time.perf_counter()
+    plan = RulePlan.build(rules)
+    build = (time.perf_counter() - start) * 1e3
+    changed = [*rules[1:], {**rules[0], "script": "현재가 > 0 -> 매수 100%"}]
+    start = time.perf_counter()
+    RulePlan.build(changed, previous=plan)
+    rebuild = (time.perf_counter() - start) * 1e3
+    one = {f"{args.symbols // 2:06d}"}
+    assert [r["id"] for r in _legacy(rules, None)[0]] == [p.rule_id for p in plan.ordered]
+
+    print(f"rules={args.rules} symbols={args.symbols} active={len(plan)} "
+          f"build={build:.1f}ms rebuild={rebuild:.1f}ms")
+    print(f"{'case':>6} {'legacy(ms)':>11} {'plan(ms)':>9} {'speedup':>8}")
+    for case, symbols in (("cron", None), ("event", one)):
+        legacy = _per_cycle_ms(lambda: _legacy(rules, symbols), args.cycles)
+        planned = _per_cycle_ms(lambda: _planned(plan, symbols), args.cycles)
+        print(f"{case:>6} {legacy:>11.3f} {planned:>9.3f} {legacy / planned:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,15 @@ local_server IndicatorProvider와 cloud_server BacktestRunner가
 """
 from sv_core.indicators.calculator import (
     calc_all_indicators,
+    calc_all_indicators_series,
+    calc_indicators,
+    calc_indicators_series,
+    split_indicator_key,
+    indicators_at,
+    calc_rsi_series,
+    calc_sma_series,
+    calc_ema_series,
+    calc_bollinger_series,
     calc_rsi,
     calc_sma,
     calc_ema,
@@ -12,13 +21,24 @@ from sv_core.indicators.calculator import (
     calc_bollinger,
     calc_avg_volume,
 )
+from sv_core.indicators.incremental import IncrementalIndicators
 
 __all__ = [
     "calc_all_indicators",
+    "calc_all_indicators_series",
+    "calc_indicators",
+    "calc_indicators_series",
+    "split_indicator_key",
+    "indicators_at",
+    "calc_rsi_series",
+    "calc_sma_series",
+    "calc_ema_series",
+    "calc_bollinger_series",
     "calc_rsi",
     "calc_sma",
     "calc_ema",
     "calc_macd",
     "calc_bollinger",
     "calc_avg_volume",
+    "IncrementalIndicators",
 ]
@@ -8,6 +8,9 @@
 """
 from __future__ import annotations
 
+import re
+from typing import Iterable
+
 import numpy as np
 import pandas as pd
 
@@ -63,6 +66,71 @@ def calc_all_indicators(
     }
 
 
+_KEY_PATTERN = re.compile(r"^([a-z_]+?)((?:_\d+)*)$")
+_MACD_KEYS = ("macd", "macd_signal", "macd_hist")
+
+
+def split_indicator_key(key: str) -> tuple[str, tuple[int, ...]] | None:
+    """indicators dict 키 → (지표명, 파라미터). "stoch_d_5_3_3" → ("stoch_d", (5, 3, 3))."""
+    m = _KEY_PATTERN.match(key)
+    if m is None:
+        return None
+    params = tuple(int(p) for p in m.group(2).split("_") if p)
+    return m.group(1), params
+
+
+def calc_indicators(
+    closes: pd.Series,
+    volumes: pd.Series,
+    keys: Iterable[str],
+    highs: pd.Series | None = None,
+    lows: pd.Series | None = None,
+) -> dict:
+    """keys에 있는 지표만 계산한다 (임의 기간 포함: rsi_9, ma_37 등).
+
+    같은 키의 값은 calc_all_indicators와 동일하다. 지원하지 않는 키는 결과에서 빠진다.
+    """
+    result: dict = {}
+    macd: dict | None = None
+    for key in keys:
+        parsed = split_indicator_key(key)
+        if parsed is None:
+            continue
+        name, p = parsed
+        if name in _MACD_KEYS and not p:
+            if macd is None:
+                m, sig = calc_macd(closes)
+                hist = round(m - sig, 2) if m is not None and sig is not None else None
+                macd = {"macd": m, "macd_signal": sig, "macd_hist": hist}
+            result[key] = macd[name]
+        elif len(p) == 1 and name == "rsi":
+            result[key] = calc_rsi(closes, p[0])
+        elif len(p) == 1 and name == "ma":
+            result[key] = calc_sma(closes, p[0])
+        elif len(p) == 1 and name == "ema":
+            result[key] = calc_ema(closes, p[0])
+        elif len(p) == 1 and name in ("bb_upper", "bb_lower"):
+            result[key] = calc_bollinger(closes, p[0])[0 if name == "bb_upper" else 1]
+        elif len(p) == 1 and name == "avg_volume":
+            result[key] = calc_avg_volume(volumes, p[0])
+        elif name in ("stoch_k", "stoch_d") and len(p) == (2 if name == "stoch_k" else 3):
+            if highs is None or lows is None:
+                result[key] = None
+                continue
+            k, d = calc_stochastic(highs, lows, closes, *p)
+            result[key] = k if name == "stoch_k" else d
+        elif len(p) == 1 and name == "atr":
+            has_hl = highs is not None and lows is not None
+            result[key] = calc_atr(highs, lows, closes, p[0]) if has_hl else None
+        elif len(p) == 1 and name == "highest":
+            result[key] = calc_highest(highs if highs is not None else closes, p[0])
+        elif len(p) == 1 and name == "lowest":
+            result[key] = calc_lowest(lows if lows is not None else closes, p[0])
+        elif len(p) == 1 and name == "disparity":
+            result[key] = calc_disparity(closes, p[0])
+    return result
+
+
 def calc_rsi(prices: pd.Series, period: int = 14) -> float | None:
     """RSI (Relative Strength Index)."""
     if len(prices) < period + 1:
@@ -194,3 +262,229 @@ def calc_lowest(prices: pd.Series, period: int) -> float | None:
     if len(prices) < period:
         return None
     return round(float(prices.iloc[-period:].min()), 2)
+
+
+def calc_disparity(prices: pd.Series, period: int) -> float | None:
+    """이격도 — (현재가 - MA) / MA × 100."""
+    if len(prices) < period:
+        return None
+    ma = prices.rolling(period).mean().iloc[-1]
+    if np.isnan(ma) or ma == 0:
+        return None
+    return round(float((prices.iloc[-1] - ma) / ma * 100), 2)
+
+
+# ── 전체 시계열 지표 (백테스트용) ──
+
+
+def calc_all_indicators_series(
+    closes: pd.Series,
+    volumes: pd.Series,
+    highs: pd.Series | None = None,
+    lows: pd.Series | None = None,
+) -> dict[str, np.ndarray]:
+    """calc_all_indicators를 모든 바 시점에 대해 한 번에 계산한다.
+
+    결과[key][i]는 calc_all_indicators(closes[:i+1], ...)[key]와 동일하다.
+    rolling/ewm은 과거 방향으로만 계산되므로 look-ahead가 없다.
+    값이 없는 시점(데이터 부족 등)은 NaN. 바 단위 dict는 indicators_at()으로 꺼낸다.
+
+    Returns:
+        {"rsi_14": ndarray, "ma_5": ndarray, ...} — 각 배열 길이 = len(closes)
+    """
+    closes = closes.reset_index(drop=True).astype(float)
+    volumes = volumes.reset_index(drop=True).astype(float)
+    n = len(closes)
+
+    macd, macd_signal = _macd_series(closes)
+    macd_hist = _round_array(macd - macd_signal)
+    bb_upper, bb_lower = calc_bollinger_series(closes, 20)
+    if highs is not None and lows is not None:
+        stoch_k, stoch_d = _stochastic_series(
+            highs.reset_index(drop=True).astype(float),
+            lows.reset_index(drop=True).astype(float),
+            closes,
+        )
+    else:
+        stoch_k = stoch_d = np.full(n, np.nan)
+
+    return {
+        "rsi_14": calc_rsi_series(closes, 14),
+        "rsi_21": calc_rsi_series(closes, 21),
+        "ma_5": calc_sma_series(closes, 5),
+        "ma_10": calc_sma_series(closes, 10),
+        "ma_20": calc_sma_series(closes, 20),
+        "ma_60": calc_sma_series(closes, 60),
+        "ema_12": calc_ema_series(closes, 12),
+        "ema_20": calc_ema_series(closes, 20),
+        "ema_26": calc_ema_series(closes, 26),
+        "macd": macd,
+        "macd_signal": macd_signal,
+        "macd_hist": macd_hist,
+        "bb_upper_20": bb_upper,
+        "bb_lower_20": bb_lower,
+        "avg_volume_20": calc_sma_series(volumes, 20),
+        "stoch_k_5_3": stoch_k,
+        "stoch_d_5_3_3": stoch_d,
+    }
+
+
+def calc_indicators_series(
+    closes: pd.Series,
+    volumes: pd.Series,
+    keys: Iterable[str],
+    highs: pd.Series | None = None,
+    lows: pd.Series | None = None,
+) -> dict[str, np.ndarray]:
+    """calc_indicators의 전체 시계열 버전 — 요청된 키만 calc_all_indicators_series와 같은 값으로."""
+    closes = closes.reset_index(drop=True).astype(float)
+    volumes = volumes.reset_index(drop=True).astype(float)
+    n = len(closes)
+    if highs is not None:
+        highs = highs.reset_index(drop=True).astype(float)
+    if lows is not None:
+        lows = lows.reset_index(drop=True).astype(float)
+
+    result: dict[str, np.ndarray] = {}
+    macd: dict[str, np.ndarray] | None = None
+    for key in keys:
+        parsed = split_indicator_key(key)
+        if parsed is None:
+            continue
+        name, p = parsed
+        if name in _MACD_KEYS and not p:
+            if macd is None:
+                m, sig = _macd_series(closes)
+                macd = {"macd": m, "macd_signal": sig, "macd_hist": _round_array(m - sig)}
+            result[key] = macd[name]
+        elif len(p) == 1 and name == "rsi":
+            result[key] = calc_rsi_series(closes, p[0])
+        elif len(p) == 1 and name == "ma":
+            result[key] = calc_sma_series(closes, p[0])
+        elif len(p) == 1 and name == "ema":
+            result[key] = calc_ema_series(closes, p[0])
+        elif len(p) == 1 and name in ("bb_upper", "bb_lower"):
+            result[key] = calc_bollinger_series(closes, p[0])[0 if name == "bb_upper" else 1]
+        elif len(p) == 1 and name == "avg_volume":
+            result[key] = calc_sma_series(volumes, p[0])
+        elif name in ("stoch_k", "stoch_d") and len(p) == (2 if name == "stoch_k" else 3):
+            if highs is None or lows is None:
+                result[key] = np.full(n, np.nan)
+                continue
+            k, d = _stochastic_series(highs, lows, closes, *p)
+            result[key] = k if name == "stoch_k" else d
+        elif len(p) == 1 and name == "atr":
+            if highs is None or lows is None:
+                result[key] = np.full(n, np.nan)
+                continue
+            result[key] = _atr_series(highs, lows, closes, p[0])
+        elif len(p) == 1 and name in ("highest", "lowest"):
+            if name == "highest":
+                prices = highs if highs is not None else closes
+                result[key] = _mask_head(_round_array(prices.rolling(p[0]).max()), p[0])
+            else:
+                prices = lows if lows is not None else closes
+                result[key] = _mask_head(_round_array(prices.rolling(p[0]).min()), p[0])
+        elif len(p) == 1 and name == "disparity":
+            result[key] = _disparity_series(closes, p[0])
+    return result
+
+
+def indicators_at(series: dict[str, np.ndarray], i: int) -> dict:
+    """calc_all_indicators_series 결과에서 i번째 바의 indicators dict를 꺼낸다."""
+    return {key: _to_value(col[i]) for key, col in series.items()}
+
+
+def _to_value(v: float) -> float | None:
+    return None if np.isnan(v) else float(v)
+
+
+def _round_array(values: np.ndarray | pd.Series) -> np.ndarray:
+    """round(float(x), 2)와 동일한 결과를 얻기 위해 파이썬 round를 사용."""
+    arr = np.asarray(values, dtype=float)
+    return np.array([round(v, 2) for v in arr.tolist()], dtype=float)
+
+
+def _mask_head(arr: np.ndarray, min_len: int) -> np.ndarray:
+    """min_len개 미만 구간 (단일 시점 함수의 None 반환 구간)을 NaN 처리."""
+    arr[: max(min_len - 1, 0)] = np.nan
+    return arr
+
+
+def calc_rsi_series(prices: pd.Series, period: int = 14) -> np.ndarray:
+    """calc_rsi의 전체 시계열 버전. 결과[i] == calc_rsi(prices[:i+1]) (None → NaN)."""
+    delta = prices.diff()
+    gain = delta.where(delta > 0, 0).rolling(period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(period).mean()
+    rsi = 100 - (100 / (1 + gain / loss.replace(0, np.nan)))
+    return _mask_head(_round_array(rsi), period + 1)
+
+
+def calc_sma_series(prices: pd.Series, period: int) -> np.ndarray:
+    """calc_sma / calc_avg_volume의 전체 시계열 버전."""
+    return _mask_head(_round_array(prices.rolling(period).mean()), period)
+
+
+def calc_ema_series(prices: pd.Series, period: int) -> np.ndarray:
+    """calc_ema의 전체 시계열 버전."""
+    return _mask_head(_round_array(prices.ewm(span=period).mean()), period)
+
+
+def _macd_series(
+    prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9,
+) -> tuple[np.ndarray, np.ndarray]:
+    macd_line = prices.ewm(span=fast).mean() - prices.ewm(span=slow).mean()
+    signal_line = macd_line.ewm(span=signal).mean()
+    m = _mask_head(_round_array(macd_line), slow + signal)
+    s = _mask_head(_round_array(signal_line), slow + signal)
+    missing = np.isnan(m) | np.isnan(s)
+    m[missing] = s[missing] = np.nan
+    return m, s
+
+
+def calc_bollinger_series(
+    prices: pd.Series, period: int = 20, num_std: float = 2.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """calc_bollinger의 전체 시계열 버전. (upper, lower)"""
+    sma = prices.rolling(period).mean()
+    std = prices.rolling(period).std()
+    u = _mask_head(_round_array(sma + num_std * std), period)
+    l = _mask_head(_round_array(sma - num_std * std), period)
+    missing = np.isnan(u) | np.isnan(l)
+    u[missing] = l[missing] = np.nan
+    return u, l
+
+
+def _atr_series(highs: pd.Series, lows: pd.Series, closes: pd.Series, period: int) -> np.ndarray:
+    prev_close = closes.shift(1)
+    tr = pd.concat(
+        [highs - lows, (highs - prev_close).abs(), (lows - prev_close).abs()], axis=1,
+    ).max(axis=1)
+    return _mask_head(_round_array(tr.rolling(period).mean()), period + 1)
+
+
+def _disparity_series(prices: pd.Series, period: int) -> np.ndarray:
+    ma = prices.rolling(period).mean().replace(0, np.nan)
+    return _mask_head(_round_array((prices - ma) / ma * 100), period)
+
+
+def _stochastic_series(
+    highs: pd.Series,
+    lows: pd.Series,
+    closes: pd.Series,
+    k_period: int = 5,
+    slowing: int = 3,
+    d_period: int = 3,
+) -> tuple[np.ndarray, np.ndarray]:
+    lowest_low = lows.rolling(k_period).min()
+    highest_high = highs.rolling(k_period).max()
+    denom = highest_high - lowest_low
+    fast_k = 100 * (closes - lowest_low) / denom.replace(0, np.nan)
+    slow_k = fast_k.rolling(slowing).mean()
+    slow_d = slow_k.rolling(d_period).mean()
+    min_len = k_period + slowing + d_period
+    k = _mask_head(_round_array(slow_k), min_len)
+    d = _mask_head(_round_array(slow_d), min_len)
+    missing = np.isnan(k) | np.isnan(d)
+    k[missing] = d[missing] = np.nan
+    return k, d
@@ -0,0 +1,636 @@
+"""증분(스트리밍) 기술적 지표 — 봉 1개당 O(1) 갱신.
+
+calculator.py의 calc_* 함수와 같은 정의·반올림(소수 2자리)을 따른다.
+이력으로 한 번 seed()한 뒤 update()로 봉을 하나씩 공급하면
+매번 전체 윈도우에 대해 pandas rolling/ewm을 다시 만들 필요가 없다.
+
+EMA 계열(EMA, MACD)은 seed 이후 전체 이력을 반영하므로
+고정 길이 윈도우로 자른 calc_* 결과와는 잘린 꼬리 가중치만큼만 다르다.
+
+구성 중인 봉은 preview()로 — save()한 상태로 update() 1회를 되돌린다 (복사 없이 O(1)).
+"""
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Iterable
+
+_NAN = float("nan")
+
+
+def _round_or_none(val: float) -> float | None:
+    return round(val, 2) if not math.isnan(val) else None
+
+
+# ── 기본 블록 ──
+
+
+class RollingMean:
+    """고정 길이 이동평균 — pandas rolling(n).mean()과 동일.
+
+    윈도우에 NaN이 있거나 값이 n개 미만이면 NaN.
+    누적합 오차는 n회마다 버퍼 재합산으로 제한한다 (분할 상환 O(1)).
+    """
+
+    __slots__ = ("period", "_buf", "_sum", "_nan", "_since_resum")
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self._buf: deque[float] = deque()
+        self._sum = 0.0
+        self._nan = 0
+        self._since_resum = 0
+
+    def update(self, x: float) -> float:
+        if len(self._buf) == self.period:
+            old = self._buf.popleft()
+            if math.isnan(old):
+                self._nan -= 1
+            else:
+                self._sum -= old
+        self._buf.append(x)
+        if math.isnan(x):
+            self._nan += 1
+        else:
+            self._sum += x
+        self._since_resum += 1
+        if self._since_resum >= self.period:
+            self._sum = sum(v for v in self._buf if not math.isnan(v))
+            self._since_resum = 0
+        return self.value
+
+    def save(self) -> tuple:
+        """update() 1회를 되돌리기 위한 상태 — 누적값 + 밀려날 맨 앞 값."""
+        head = self._buf[0] if len(self._buf) == self.period else None
+        return head, self._sum, self._nan, self._since_resum
+
+    def restore(self, state: tuple) -> None:
+        """save() 이후의 update() 1회를 되돌린다."""
+        head, self._sum, self._nan, self._since_resum = state
+        self._buf.pop()
+        if head is not None:
+            self._buf.appendleft(head)
+
+    @property
+    def value(self) -> float:
+        if len(self._buf) < self.period or self._nan:
+            return _NAN
+        return self._sum / self.period
+
+
+class RollingStd:
+    """고정 길이 표본 표준편차 (ddof=1) — pandas rolling(n).std()와 동일.
+
+    기준점 K로 이동한 합/제곱합을 유지하고, n회마다 K를 최신 평균으로
+    옮겨 재계산하여 가격 수준이 커도 상쇄 오차가 누적되지 않게 한다.
+    윈도우 전체가 같은 값이면 pandas처럼 정확히 0을 반환한다.
+    """
+
+    __slots__ = ("period", "_buf", "_k", "_s1", "_s2", "_since_resum", "_run", "_last")
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self._buf: deque[float] = deque()
+        self._k = 0.0
+        self._s1 = 0.0
+        self._s2 = 0.0
+        self._since_resum = 0
+        self._run = 0
+        self._last = _NAN
+
+    def update(self, x: float) -> float:
+        if len(self._buf) == self.period:
+            old = self._buf.popleft() - self._k
+            self._s1 -= old
+            self._s2 -= old * old
+        if not self._buf:
+            self._k = x
+        self._buf.append(x)
+        d = x - self._k
+        self._s1 += d
+        self._s2 += d * d
+        self._run = self._run + 1 if x == self._last else 1
+        self._last = x
+        self._since_resum += 1
+        if self._since_resum >= self.period:
+            self._resum()
+        return self.value
+
+    def save(self) -> tuple:
+        head = self._buf[0] if len(self._buf) == self.period else None
+        return head, self._k, self._s1, self._s2, self._since_resum, self._run, self._last
+
+    def restore(self, state: tuple) -> None:
+        head, self._k, self._s1, self._s2, self._since_resum, self._run, self._last = state
+        self._buf.pop()
+        if head is not None:
+            self._buf.appendleft(head)
+
+    def _resum(self) -> None:
+        n = len(self._buf)
+        self._k = sum(self._buf) / n
+        self._s1 = sum(v - self._k for v in self._buf)
+        self._s2 = sum((v - self._k) ** 2 for v in self._buf)
+        self._since_resum = 0
+
+    @property
+    def value(self) -> float:
+        n = len(self._buf)
+        if n < self.period or n < 2:
+            return _NAN
+        if self._run >= n:
+            return 0.0
+        var = (self._s2 - self._s1 * self._s1 / n) / (n - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+
+class EwmMean:
+    """조정(adjust=True) 지수 가중 평균 — pandas ewm(span=n).mean()과 동일."""
+
+    __slots__ = ("_w", "_num", "_den")
+
+    def __init__(self, span: int) -> None:
+        self._w = 1.0 - 2.0 / (span + 1)
+        self._num = 0.0
+        self._den = 0.0
+
+    def update(self, x: float) -> float:
+        self._num = x + self._w * self._num
+        self._den = 1.0 + self._w * self._den
+        return self._num / self._den
+
+    def save(self) -> tuple:
+        return self._num, self._den
+
+    def restore(self, state: tuple) -> None:
+        self._num, self._den = state
+
+    @property
+    def value(self) -> float:
+        return self._num / self._den if self._den else _NAN
+
+
+class RollingExtreme:
+    """고정 길이 최고/최저 — 단조 덱으로 분할 상환 O(1)."""
+
+    __slots__ = ("period", "_is_max", "_dq", "_i", "_undo")
+
+    def __init__(self, period: int, *, is_max: bool) -> None:
+        self.period = period
+        self._is_max = is_max
+        self._dq: deque[tuple[int, float]] = deque()  # (index, value)
+        self._i = 0
+        # 직전 update()가 뒤에서 뺀 항목 / 앞에서 뺀 항목 (restore용)
+        self._undo: tuple[list, tuple[int, float] | None] = ([], None)
+
+    def update(self, x: float) -> float:
+        dq = self._dq
+        popped = []
+        if self._is_max:
+            while dq and dq[-1][1] <= x:
+                popped.append(dq.pop())
+        else:
+            while dq and dq[-1][1] >= x:
+                popped.append(dq.pop())
+        dq.append((self._i, x))
+        expired = dq.popleft() if dq[0][0] <= self._i - self.period else None
+        self._undo = (popped, expired)
+        self._i += 1
+        return self.value
+
+    def save(self) -> int:
+        return self._i
+
+    def restore(self, state: int) -> None:
+        """직전 update() 1회를 되돌린다 (뺀 항목 수만큼, 분할 상환 O(1))."""
+        if self._i == state:
+            return
+        popped, expired = self._undo
+        if expired is not None:
+            self._dq.appendleft(expired)
+        self._dq.pop()
+        self._dq.extend(reversed(popped))
+        self._i = state
+
+    @property
+    def value(self) -> float:
+        if self._i < self.period:
+            return _NAN
+        return self._dq[0][1]
+
+
+# ── 지표 (calc_* 대응) ──
+
+
+class IncrementalSMA:
+    """calc_sma 증분 버전."""
+
+    def __init__(self, period: int) -> None:
+        self._mean = RollingMean(period)
+
+    def update(self, price: float) -> float | None:
+        self._mean.update(price)
+        return self.value
+
+    def save(self) -> tuple:
+        return self._mean.save()
+
+    def restore(self, state: tuple) -> None:
+        self._mean.restore(state)
+
+    @property
+    def value(self) -> float | None:
+        return _round_or_none(self._mean.value)
+
+
+class IncrementalEMA:
+    """calc_ema 증분 버전. period개 미만이면 None."""
+
+    def __init__(self, period: int) -> None:
+        self._period = period
+        self._ewm = EwmMean(period)
+        self._n = 0
+
+    def update(self, price: float) -> float | None:
+        self._ewm.update(price)
+        self._n += 1
+        return self.value
+
+    def save(self) -> tuple:
+        return self._ewm.save(), self._n
+
+    def restore(self, state: tuple) -> None:
+        ewm, self._n = state
+        self._ewm.restore(ewm)
+
+    @property
+    def value(self) -> float | None:
+        if self._n < self._period:
+            return None
+        return _round_or_none(self._ewm.value)
+
+
+class IncrementalRSI:
+    """calc_rsi 증분 버전 — 상승/하락폭 단순 이동평균 기반."""
+
+    def __init__(self, period: int = 14) -> None:
+        self._period = period
+        self._gain = RollingMean(period)
+        self._loss = RollingMean(period)
+        # 윈도우 내 하락폭 > 0 개수 — 평균이 정확히 0인지 누적합 오차 없이 판정
+        self._loss_flags: deque[bool] = deque()
+        self._loss_nonzero = 0
+        self._prev: float | None = None
+
+    def update(self, price: float) -> float | None:
+        if self._prev is not None:
+            delta = price - self._prev
+            loss = -delta if delta < 0 else 0.0
+            self._gain.update(delta if delta > 0 else 0.0)
+            self._loss.update(loss)
+            if len(self._loss_flags) == self._period:
+                self._loss_nonzero -= self._loss_flags.popleft()
+            self._loss_flags.append(loss > 0)
+            self._loss_nonzero += loss > 0
+        self._prev = price
+        return self.value
+
+    def save(self) -> tuple:
+        if self._prev is None:
+            return (None,)
+        flag = self._loss_flags[0] if len(self._loss_flags) == self._period else None
+        return self._prev, self._gain.save(), self._loss.save(), flag, self._loss_nonzero
+
+    def restore(self, state: tuple) -> None:
+        if state[0] is None:  # 첫 가격 — 이동평균은 갱신되지 않았다
+            self._prev = None
+            return
+        self._prev, gain, loss, flag, self._loss_nonzero = state
+        self._gain.restore(gain)
+        self._loss.restore(loss)
+        self._loss_flags.pop()
+        if flag is not None:
+            self._loss_flags.appendleft(flag)
+
+    @property
+    def value(self) -> float | None:
+        gain, loss = self._gain.value, self._loss.value
+        if math.isnan(gain) or math.isnan(loss) or self._loss_nonzero == 0:
+            return None
+        rs = gain / loss
+        return _round_or_none(100 - (100 / (1 + rs)))
+
+
+class IncrementalMACD:
+    """calc_macd 증분 버전 → (macd_line, signal_line)."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9) -> None:
+        self._min_len = slow + signal
+        self._fast = EwmMean(fast)
+        self._slow = EwmMean(slow)
+        self._signal = EwmMean(signal)
+        self._macd = _NAN
+        self._n = 0
+
+    def update(self, price: float) -> tuple[float | None, float | None]:
+        self._macd = self._fast.update(price) - self._slow.update(price)
+        self._signal.update(self._macd)
+        self._n += 1
+        return self.value
+
+    def save(self) -> tuple:
+        return self._fast.save(), self._slow.save(), self._signal.save(), self._macd, self._n
+
+    def restore(self, state: tuple) -> None:
+        fast, slow, signal, self._macd, self._n = state
+        self._fast.restore(fast)
+        self._slow.restore(slow)
+        self._signal.restore(signal)
+
+    @property
+    def value(self) -> tuple[float | None, float | None]:
+        if self._n < self._min_len:
+            return None, None
+        m, s = self._macd, self._signal.value
+        if math.isnan(m) or math.isnan(s):
+            return None, None
+        return round(m, 2), round(s, 2)
+
+
+class IncrementalBollinger:
+    """calc_bollinger 증분 버전 → (upper, lower)."""
+
+    def __init__(self, period: int = 20, num_std: float = 2.0) -> None:
+        self._num_std = num_std
+        self._mean = RollingMean(period)
+        self._std = RollingStd(period)
+
+    def update(self, price: float) -> tuple[float | None, float | None]:
+        self._mean.update(price)
+        self._std.update(price)
+        return self.value
+
+    def save(self) -> tuple:
+        return self._mean.save(), self._std.save()
+
+    def restore(self, state: tuple) -> None:
+        self._mean.restore(state[0])
+        self._std.restore(state[1])
+
+    @property
+    def value(self) -> tuple[float | None, float | None]:
+        sma, std = self._mean.value, self._std.value
+        if math.isnan(sma) or math.isnan(std):
+            return None, None
+        return round(sma + self._num_std * std, 2), round(sma - self._num_std * std, 2)
+
+
+class IncrementalStochastic:
+    """calc_stochastic 증분 버전 → (slow_k, slow_d)."""
+
+    def __init__(self, k_period: int = 5, slowing: int = 3, d_period: int = 3) -> None:
+        self._min_len = k_period + slowing + d_period
+        self._hh = RollingExtreme(k_period, is_max=True)
+        self._ll = RollingExtreme(k_period, is_max=False)
+        self._slow_k = RollingMean(slowing)
+        self._slow_d = RollingMean(d_period)
+        self._n = 0
+
+    def update(self, high: float, low: float, close: float) -> tuple[float | None, float | None]:
+        hh = self._hh.update(high)
+        ll = self._ll.update(low)
+        denom = hh - ll
+        fast_k = 100 * (close - ll) / denom if denom and not math.isnan(denom) else _NAN
+        self._slow_d.update(self._slow_k.update(fast_k))
+        self._n += 1
+        return self.value
+
+    def save(self) -> tuple:
+        return self._hh.save(), self._ll.save(), self._slow_k.save(), self._slow_d.save(), self._n
+
+    def restore(self, state: tuple) -> None:
+        hh, ll, slow_k, slow_d, n = state
+        if self._n == n:  # 고가/저가 없이 공급 — 갱신되지 않았다
+            return
+        self._hh.restore(hh)
+        self._ll.restore(ll)
+        self._slow_k.restore(slow_k)
+        self._slow_d.restore(slow_d)
+        self._n = n
+
+    @property
+    def value(self) -> tuple[float | None, float | None]:
+        if self._n < self._min_len:
+            return None, None
+        k, d = self._slow_k.value, self._slow_d.value
+        if math.isnan(k) or math.isnan(d):
+            return None, None
+        return round(k, 2), round(d, 2)
+
+
+class IncrementalATR:
+    """calc_atr 증분 버전. period+1개 미만이면 None."""
+
+    def __init__(self, period: int = 14) -> None:
+        self._period = period
+        self._tr = RollingMean(period)
+        self._prev_close: float | None = None
+        self._n = 0
+
+    def update(self, high: float, low: float, close: float) -> float | None:
+        tr = high - low
+        if self._prev_close is not None:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._tr.update(tr)
+        self._prev_close = close
+        self._n += 1
+        return self.value
+
+    @property
+    def value(self) -> float | None:
+        if self._n < self._period + 1:
+            return None
+        return _round_or_none(self._tr.value)
+
+
+class IncrementalHighest:
+    """calc_highest 증분 버전."""
+
+    def __init__(self, period: int) -> None:
+        self._ext = RollingExtreme(period, is_max=True)
+
+    def update(self, price: float) -> float | None:
+        self._ext.update(price)
+        return self.value
+
+    @property
+    def value(self) -> float | None:
+        return _round_or_none(self._ext.value)
+
+
+class IncrementalLowest:
+    """calc_lowest 증분 버전."""
+
+    def __init__(self, period: int) -> None:
+        self._ext = RollingExtreme(period, is_max=False)
+
+    def update(self, price: float) -> float | None:
+        self._ext.update(price)
+        return self.value
+
+    @property
+    def value(self) -> float | None:
+        return _round_or_none(self._ext.value)
+
+
+# ── 전체 지표 세트 (calc_all_indicators 대응) ──
+
+
+class IncrementalIndicators:
+    """calc_all_indicators와 같은 키의 dict를 봉 단위로 증분 갱신.
+
+    사용법:
+        inc = IncrementalIndicators()
+        inc.seed(closes, volumes, highs, lows)   # 이력 1회
+        inc.update(close, volume, high, low)     # 새 봉마다 O(1)
+        inc.snapshot()                           # {"rsi_14": ..., ...}
+
+    seed 시 highs/lows를 주지 않으면 스토캐스틱은 항상 None
+    (calc_all_indicators의 highs=None 동작과 동일).
+    """
+
+    def __init__(self) -> None:
+        self._rsi = {p: IncrementalRSI(p) for p in (14, 21)}
+        self._ma = {p: IncrementalSMA(p) for p in (5, 10, 20, 60)}
+        self._ema = {p: IncrementalEMA(p) for p in (12, 20, 26)}
+        self._macd = IncrementalMACD()
+        self._bb = IncrementalBollinger(20)
+        self._avg_volume = IncrementalSMA(20)
+        self._stoch = IncrementalStochastic()
+        self._has_hl: bool | None = None
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """지금까지 공급된 봉 수."""
+        return self._count
+
+    def seed(
+        self,
+        closes: Iterable[float],
+        volumes: Iterable[float],
+        highs: Iterable[float] | None = None,
+        lows: Iterable[float] | None = None,
+    ) -> None:
+        """이력(오래된 순 → 최근 순)으로 초기 상태를 구성한다."""
+        self._has_hl = highs is not None and lows is not None
+        if self._has_hl:
+            for c, v, h, l in zip(closes, volumes, highs, lows):
+                self.update(float(c), float(v), float(h), float(l))
+        else:
+            for c, v in zip(closes, volumes):
+                self.update(float(c), float(v))
+
+    def update(
+        self,
+        close: float,
+        volume: float,
+        high: float | None = None,
+        low: float | None = None,
+    ) -> dict:
+        """봉 1개를 반영하고 최신 지표 dict를 반환한다."""
+        if self._has_hl is None:
+            self._has_hl = high is not None and low is not None
+        for ind in self._rsi.values():
+            ind.update(close)
+        for ind in self._ma.values():
+            ind.update(close)
+        for ind in self._ema.values():
+            ind.update(close)
+        self._macd.update(close)
+        self._bb.update(close)
+        self._avg_volume.update(volume)
+        if self._has_hl:
+            self._stoch.update(
+                high if high is not None else close,
+                low if low is not None else close,
+                close,
+            )
+        self._count += 1
+        return self.snapshot()
+
+    def preview(
+        self,
+        close: float,
+        volume: float,
+        high: float | None = None,
+        low: float | None = None,
+    ) -> dict:
+        """봉을 확정하지 않고 반영했을 때의 지표 dict (구성 중인 봉용).
+
+        update() 후 save()한 누적 상태로 되돌린다 — 상태 복사 없이 O(1).
+        """
+        state = self._save()
+        result = self.update(close, volume, high, low)
+        self._restore(state)
+        return result
+
+    def _save(self) -> tuple:
+        return (
+            [ind.save() for ind in self._rsi.values()],
+            [ind.save() for ind in self._ma.values()],
+            [ind.save() for ind in self._ema.values()],
+            self._macd.save(),
+            self._bb.save(),
+            self._avg_volume.save(),
+            self._stoch.save(),
+            self._has_hl,
+            self._count,
+        )
+
+    def _restore(self, state: tuple) -> None:
+        rsi, ma, ema, macd, bb, avg_volume, stoch, self._has_hl, self._count = state
+        for ind, st in zip(self._rsi.values(), rsi):
+            ind.restore(st)
+        for ind, st in zip(self._ma.values(), ma):
+            ind.restore(st)
+        for ind, st in zip(self._ema.values(), ema):
+            ind.restore(st)
+        self._macd.restore(macd)
+        self._bb.restore(bb)
+        self._avg_volume.restore(avg_volume)
+        self._stoch.restore(stoch)
+
+    def snapshot(self) -> dict:
+        """현재 상태의 지표 dict — calc_all_indicators와 같은 키."""
+        macd, macd_signal = self._macd.value
+        bb_upper_20, bb_lower_20 = self._bb.value
+        macd_hist = round(macd - macd_signal, 2) if macd is not None and macd_signal is not None else None
+        stoch_k, stoch_d = self._stoch.value if self._has_hl else (None, None)
+
+        return {
+            # RSI
+            "rsi_14": self._rsi[14].value,
+            "rsi_21": self._rsi[21].value,
+            # SMA
+            "ma_5": self._ma[5].value,
+            "ma_10": self._ma[10].value,
+            "ma_20": self._ma[20].value,
+            "ma_60": self._ma[60].value,
+            # EMA
+            "ema_12": self._ema[12].value,
+            "ema_20": self._ema[20].value,
+            "ema_26": self._ema[26].value,
+            # MACD
+            "macd": macd,
+            "macd_signal": macd_signal,
+            "macd_hist": macd_hist,
+            # 볼린저
+            "bb_upper_20": bb_upper_20,
+            "bb_lower_20": bb_lower_20,
+            # 평균 거래량
+            "avg_volume_20": self._avg_volume.value,
+            # 스토캐스틱
+            "stoch_k_5_3": stoch_k,
+            "stoch_d_5_3_3": stoch_d,
+        }
@@ -5,6 +5,10 @@ import pytest
 
 from sv_core.indicators.calculator import (
     calc_all_indicators,
+    calc_all_indicators_series,
+    calc_indicators,
+    calc_indicators_series,
+    indicators_at,
     calc_rsi,
     calc_sma,
     calc_ema,
@@ -171,6 +175,85 @@ class TestCalcStochastic:
         assert k is not None and k > 50
 
 
+class TestCalcAllIndicatorsSeries:
+    def test_matches_per_window(self):
+        """series[key][i] == calc_all_indicators(closes[:i+1])[key] — 모든 바."""
+        closes = _make_rising(90)
+        closes[30:42] = closes[30]  # 보합 구간 (RSI/볼린저 경계)
+        volumes = pd.Series(np.arange(90) * 10 + 1000, dtype=float)
+        highs, lows = closes + 120, closes - 80
+        series = calc_all_indicators_series(closes, volumes, highs=highs, lows=lows)
+        for i in range(len(closes)):
+            expected = calc_all_indicators(
+                closes.iloc[: i + 1], volumes.iloc[: i + 1],
+                highs=highs.iloc[: i + 1], lows=lows.iloc[: i + 1],
+            )
+            assert indicators_at(series, i) == expected, f"bar {i}"
+
+    def test_without_highs(self):
+        closes = _make_falling(40)
+        volumes = pd.Series([1000.0] * 40)
+        series = calc_all_indicators_series(closes, volumes)
+        assert all(len(col) == 40 for col in series.values())
+        assert indicators_at(series, 39) == calc_all_indicators(closes, volumes)
+        assert indicators_at(series, 39)["stoch_k_5_3"] is None
+
+
+class TestCalcIndicators:
+    def test_subset_matches_full_set(self):
+        """요청한 키만 — 값은 calc_all_indicators와 같다."""
+        closes = _make_rising(90)
+        volumes = pd.Series(np.arange(90) * 10 + 1000, dtype=float)
+        highs, lows = closes + 120, closes - 80
+        full = calc_all_indicators(closes, volumes, highs=highs, lows=lows)
+        keys = {"rsi_14", "macd_hist", "bb_lower_20", "stoch_d_5_3_3", "unknown"}
+        got = calc_indicators(closes, volumes, keys, highs=highs, lows=lows)
+        assert got == {k: full[k] for k in keys - {"unknown"}}
+
+    def test_arbitrary_periods(self):
+        closes = _make_falling(60)
+        volumes = pd.Series([1000.0] * 60)
+        got = calc_indicators(closes, volumes, ["rsi_9", "ma_37", "avg_volume_5"])
+        assert got == {
+            "rsi_9": calc_rsi(closes, 9),
+            "ma_37": calc_sma(closes, 37),
+            "avg_volume_5": calc_avg_volume(volumes, 5),
+        }
+
+    def test_series_matches_full_series(self):
+        closes = _make_rising(70)
+        volumes = pd.Series(np.arange(70) * 10 + 1000, dtype=float)
+        full = calc_all_indicators_series(closes, volumes)
+        got = calc_indicators_series(closes, volumes, ["macd", "ema_26", "ma_7"])
+        np.testing.assert_array_equal(got["macd"], full["macd"])
+        np.testing.assert_array_equal(got["ema_26"], full["ema_26"])
+        assert indicators_at(got, 69)["ma_7"] == calc_sma(closes, 7)
+
+    def test_all_dsl_indicator_funcs_supported(self):
+        """DSL 분석이 요청하는 모든 지표 키를 calc_indicators / calc_indicators_series가 만든다."""
+        from sv_core.parsing.analysis import IndicatorRequirement, _INDICATOR_FUNCS
+
+        closes = _make_rising(60)
+        volumes = pd.Series(np.arange(60) * 10 + 1000, dtype=float)
+        highs, lows = closes + 120, closes - 80
+        keys = {
+            IndicatorRequirement(func, defaults or (7,)).key
+            for func, (_, defaults) in _INDICATOR_FUNCS.items()
+        }
+        got = calc_indicators(closes, volumes, keys, highs=highs, lows=lows)
+        series = calc_indicators_series(closes, volumes, keys, highs=highs, lows=lows)
+        assert set(got) == set(series) == keys
+        assert all(got[k] is not None for k in keys)
+        for i in (5, 20, 59):
+            window = calc_indicators(
+                closes[: i + 1], volumes[: i + 1], keys, highs=highs[: i + 1], lows=lows[: i + 1],
+            )
+            assert indicators_at(series, i) == window
+        assert got["disparity_7"] == round(
+            (closes.iloc[-1] - closes.iloc[-7:].mean()) / closes.iloc[-7:].mean() * 100, 2,
+        )
+
+
 class TestPresetsParseV2:
     """모든 프리셋이 parse_v2()를 통과하는지 검증."""
 
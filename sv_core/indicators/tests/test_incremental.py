@@ -0,0 +1,129 @@
+"""sv_core.indicators.incremental 유닛 테스트 — calc_* 결과와 일치 검증."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from sv_core.indicators.calculator import (
+    calc_all_indicators,
+    calc_atr,
+    calc_highest,
+    calc_lowest,
+)
+from sv_core.indicators.incremental import (
+    IncrementalATR,
+    IncrementalHighest,
+    IncrementalIndicators,
+    IncrementalLowest,
+    RollingStd,
+)
+
+
+def _make_ohlcv(n: int = 120, seed: int = 7):
+    """랜덤 워크 OHLCV (정수 호가 + 일부 보합 구간)."""
+    rng = np.random.default_rng(seed)
+    closes = 50000 + np.cumsum(rng.integers(-300, 301, n) // 50 * 50)
+    if n > 52:
+        closes[40:52] = closes[40]  # 보합 구간 — 표준편차 0, 하락폭 0
+    highs = closes + rng.integers(0, 400, n)
+    lows = closes - rng.integers(0, 400, n)
+    volumes = rng.integers(1000, 50000, n)
+    return (
+        pd.Series(closes, dtype=float),
+        pd.Series(volumes, dtype=float),
+        pd.Series(highs, dtype=float),
+        pd.Series(lows, dtype=float),
+    )
+
+
+class TestIncrementalIndicators:
+    def test_matches_calc_all_indicators_every_bar(self):
+        """봉마다 update() 결과가 전체 재계산과 동일."""
+        closes, volumes, highs, lows = _make_ohlcv()
+        inc = IncrementalIndicators()
+        for i in range(len(closes)):
+            got = inc.update(closes[i], volumes[i], highs[i], lows[i])
+            expected = calc_all_indicators(
+                closes.iloc[: i + 1], volumes.iloc[: i + 1],
+                highs=highs.iloc[: i + 1], lows=lows.iloc[: i + 1],
+            )
+            assert got == expected, f"bar {i}"
+
+    def test_seed_then_update(self):
+        """seed()로 이력 구성 후 update()해도 동일."""
+        closes, volumes, highs, lows = _make_ohlcv()
+        inc = IncrementalIndicators()
+        inc.seed(closes[:80], volumes[:80], highs[:80], lows[:80])
+        assert inc.count == 80
+        for i in range(80, len(closes)):
+            got = inc.update(closes[i], volumes[i], highs[i], lows[i])
+            expected = calc_all_indicators(
+                closes.iloc[: i + 1], volumes.iloc[: i + 1],
+                highs=highs.iloc[: i + 1], lows=lows.iloc[: i + 1],
+            )
+            assert got == expected
+
+    def test_without_highs_lows(self):
+        """highs/lows 없이 seed → 스토캐스틱 None."""
+        closes, volumes, _, _ = _make_ohlcv(40)
+        inc = IncrementalIndicators()
+        inc.seed(closes, volumes)
+        snap = inc.snapshot()
+        assert snap == calc_all_indicators(closes, volumes)
+        assert snap["stoch_k_5_3"] is None
+
+    def test_preview_does_not_commit(self):
+        """preview()는 상태를 바꾸지 않는다."""
+        closes, volumes, highs, lows = _make_ohlcv(60)
+        inc = IncrementalIndicators()
+        inc.seed(closes[:59], volumes[:59], highs[:59], lows[:59])
+        before = inc.snapshot()
+        preview = inc.preview(closes[59], volumes[59], highs[59], lows[59])
+        assert inc.snapshot() == before
+        assert inc.count == 59
+        assert preview == calc_all_indicators(closes, volumes, highs=highs, lows=lows)
+
+    @pytest.mark.parametrize("with_hl", [True, False])
+    def test_preview_rollback_every_bar(self, with_hl):
+        """봉마다 여러 번 preview해도 (재합산 주기·윈도우 경계 포함) 확정 상태가 그대로."""
+        closes, volumes, highs, lows = _make_ohlcv()
+        if not with_hl:
+            highs = lows = None
+        inc = IncrementalIndicators()
+        for i in range(len(closes)):
+            hl = (highs[i], lows[i]) if with_hl else ()
+            expected = calc_all_indicators(
+                closes.iloc[: i + 1], volumes.iloc[: i + 1],
+                highs=highs.iloc[: i + 1] if with_hl else None,
+                lows=lows.iloc[: i + 1] if with_hl else None,
+            )
+            inc.preview(closes[i] * 1.1, volumes[i], *(v * 1.1 for v in hl))
+            assert inc.preview(closes[i], volumes[i], *hl) == expected, f"bar {i}"
+            assert inc.count == i
+            assert inc.update(closes[i], volumes[i], *hl) == expected, f"bar {i}"
+
+
+class TestIncrementalSingle:
+    def test_atr(self):
+        closes, _, highs, lows = _make_ohlcv()
+        atr = IncrementalATR(14)
+        for i in range(len(closes)):
+            got = atr.update(highs[i], lows[i], closes[i])
+            assert got == calc_atr(highs.iloc[: i + 1], lows.iloc[: i + 1], closes.iloc[: i + 1], 14)
+
+    @pytest.mark.parametrize("period", [1, 5, 20])
+    def test_highest_lowest(self, period):
+        closes, _, _, _ = _make_ohlcv()
+        hi, lo = IncrementalHighest(period), IncrementalLowest(period)
+        for i in range(len(closes)):
+            assert hi.update(closes[i]) == calc_highest(closes.iloc[: i + 1], period)
+            assert lo.update(closes[i]) == calc_lowest(closes.iloc[: i + 1], period)
+
+    def test_rolling_std_large_level(self):
+        """가격 수준이 커도 상쇄 오차 없이 pandas와 일치."""
+        values = 1e7 + np.sin(np.arange(500)) * 0.5
+        rs = RollingStd(20)
+        expected = pd.Series(values).rolling(20).std().to_numpy()
+        for i, v in enumerate(values):
+            got = rs.update(float(v))
+            if i >= 19:
+                assert got == pytest.approx(expected[i], abs=1e-6)
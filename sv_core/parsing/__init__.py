@@ -1,7 +1,10 @@
 """sv_core.parsing — DSL 파서 공개 API."""
 
 from .parser import parse, parse_v2
-from .evaluator import evaluate, evaluate_v2, EvalV2Result, ActionResult, ConditionSnapshot
+from .evaluator import evaluate, evaluate_v2, EvalV2Result, ActionResult, ConditionSnapshot, EvalProfile, PAST_CONTEXT
+from .analysis import analyze, analyze_script, IndicatorRequirement, ScriptDependencies
+from .compiler import compile_script, compile_script_v2, CompiledScript, CompiledScriptV2
+from .vectorized import evaluate_series, SeriesSignals
 from .errors import DSLError, DSLSyntaxError, DSLTypeError, DSLNameError, DSLRuntimeError
 
 __all__ = [
@@ -12,6 +15,18 @@ __all__ = [
     "EvalV2Result",
     "ActionResult",
     "ConditionSnapshot",
+    "EvalProfile",
+    "PAST_CONTEXT",
+    "analyze",
+    "analyze_script",
+    "IndicatorRequirement",
+    "ScriptDependencies",
+    "compile_script",
+    "compile_script_v2",
+    "CompiledScript",
+    "CompiledScriptV2",
+    "evaluate_series",
+    "SeriesSignals",
     "DSLError",
     "DSLSyntaxError",
     "DSLTypeError",
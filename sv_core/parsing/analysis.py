@@ -0,0 +1,298 @@
+"""DSL 정적 의존성 분석.
+
+AST를 한 번 순회해 스크립트가 실제로 쓰는 (지표 함수, 파라미터, 타임프레임) 요구사항과
+필요한 최대 이력 봉 수를 구한다. 엔진/백테스트/클라우드는 이 결과로 활성 규칙에
+필요한 지표만 조회·계산한다.
+
+- 상수 인자(기간 = 20 → MA(기간))와 상수 산술(MA(기간 * 2))은 값으로 풀어낸다.
+- 인자가 정적으로 정해지지 않으면 dynamic=True — 호출자는 전체 지표 세트로 폴백한다.
+- "1d" 타임프레임은 기본 TF(None)와 같은 지표로 취급한다 (평가기: tf or "1d").
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from .ast_nodes import (
+    BinOp,
+    Comparison,
+    FieldRef,
+    FuncCall,
+    IndexAccess,
+    Node,
+    NumberLit,
+    PatternCall,
+    Script,
+    ScriptV2,
+    StringLit,
+    UnaryOp,
+)
+from .builtins import BUILTIN_FIELDS, BUILTIN_PATTERNS
+from .optimizer import pattern_expr
+from .parser import parse_v2
+
+
+# 지표 함수 → (indicators dict 키 접두사, 기본 파라미터)
+_INDICATOR_FUNCS: dict[str, tuple[str, tuple[int, ...]]] = {
+    "RSI": ("rsi", ()),
+    "MA": ("ma", ()),
+    "EMA": ("ema", ()),
+    "MACD": ("macd", ()),
+    "MACD_SIGNAL": ("macd_signal", ()),
+    "MACD_HIST": ("macd_hist", ()),
+    "볼린저_상단": ("bb_upper", ()),
+    "볼린저_하단": ("bb_lower", ()),
+    "평균거래량": ("avg_volume", ()),
+    "STOCH_K": ("stoch_k", (5, 3)),
+    "STOCH_D": ("stoch_d", (5, 3, 3)),
+    "ATR": ("atr", ()),
+    "최고가": ("highest", ()),
+    "최저가": ("lowest", ()),
+    "이격도": ("disparity", ()),
+}
+
+# 파라미터가 키에 들어가지 않는 지표 (MACD 12/26/9 고정)
+_MACD_FUNCS = {"MACD", "MACD_SIGNAL", "MACD_HIST"}
+
+# 두 번째 인자가 지표 파라미터가 아닌 윈도우 길이인 상태 함수
+_WINDOW_ARG_FUNCS = {"횟수", "강세다이버전스", "약세다이버전스"}
+
+# 평가마다 state가 전진하는 함수 (evaluator._STATEFUL_FUNCS와 같다)
+_STATEFUL_FUNCS = {"상향돌파", "하향돌파", "강세다이버전스", "약세다이버전스", "횟수", "연속"}
+
+
+@dataclass(frozen=True, slots=True)
+class IndicatorRequirement:
+    """지표 요구사항 1건. tf=None은 기본 TF (실시간: 일봉, 백테스트: 실행 TF)."""
+
+    func: str
+    params: tuple[int, ...] = ()
+    tf: str | None = None
+
+    @property
+    def key(self) -> str:
+        """indicators dict 키 (rsi_14, macd, stoch_d_5_3_3 등)."""
+        prefix = _INDICATOR_FUNCS[self.func][0]
+        if self.func in _MACD_FUNCS:
+            return prefix
+        return prefix + "".join(f"_{p}" for p in self.params)
+
+    @property
+    def lookback(self) -> int:
+        """값이 나오기 위한 최소 봉 수 — sv_core.indicators 계산 함수의 최소 길이와 같다."""
+        p = self.params
+        if self.func in _MACD_FUNCS:
+            return 26 + 9
+        if self.func in ("RSI", "ATR"):
+            return p[0] + 1
+        if self.func == "STOCH_K":
+            return p[0] + p[1] + 3  # calc_stochastic은 K/D를 함께 계산 (d=3 기본)
+        if self.func == "STOCH_D":
+            return p[0] + p[1] + p[2]
+        return p[0]
+
+
+@dataclass(frozen=True, slots=True)
+class ScriptDependencies:
+    """스크립트 정적 의존성.
+
+    indicators: 지표 요구사항 집합
+    fields: 참조하는 내장 필드 (상수 제외)
+    timeframes: 기본 TF 외에 필요한 타임프레임 (정렬)
+    max_index: expr[N]의 최대 N
+    depths: TF별 필요한 최대 봉 수 (지표 lookback + 감싼 expr[N]의 N)
+    dynamic: 정적으로 풀 수 없는 지표 인자가 있음 → 전체 지표 세트 필요
+    stateful: 평가마다 state가 전진함 (상태 함수 / expr[N]) → 평가 주기가 의미에 영향
+    """
+
+    indicators: frozenset[IndicatorRequirement] = frozenset()
+    fields: frozenset[str] = frozenset()
+    timeframes: tuple[str, ...] = ()
+    max_index: int = 0
+    depths: tuple[tuple[str | None, int], ...] = ()
+    dynamic: bool = False
+    stateful: bool = False
+
+    @property
+    def history_depth(self) -> int:
+        """모든 TF 중 최대 봉 수."""
+        return max((d for _, d in self.depths), default=0)
+
+    def keys(self, tf: str | None = None) -> set[str]:
+        """해당 TF에서 필요한 indicators dict 키."""
+        tf = normalize_tf(tf)
+        return {req.key for req in self.indicators if req.tf == tf}
+
+    def depth(self, tf: str | None = None) -> int:
+        """해당 TF에서 필요한 최대 봉 수. 지표를 쓰지 않으면 0."""
+        tf = normalize_tf(tf)
+        return next((d for t, d in self.depths if t == tf), 0)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON 직렬화용 (dsl_meta)."""
+        return {
+            "indicators": sorted(
+                (
+                    {"func": r.func, "params": list(r.params), "tf": r.tf, "key": r.key}
+                    for r in self.indicators
+                ),
+                key=lambda d: (d["tf"] or "", d["key"]),
+            ),
+            "fields": sorted(self.fields),
+            "timeframes": list(self.timeframes),
+            "max_index": self.max_index,
+            "history_depth": self.history_depth,
+            "dynamic": self.dynamic,
+            "stateful": self.stateful,
+        }
+
+
+def normalize_tf(tf: str | None) -> str | None:
+    """"1d"/빈 값 → None (기본 TF)."""
+    return None if tf in (None, "", "1d") else tf
+
+
+def analyze(ast: Script | ScriptV2) -> ScriptDependencies:
+    """AST → ScriptDependencies. 패턴 전개 전/후 AST 모두 받는다."""
+    consts: dict[str, Any] = {}
+    for const in getattr(ast, "consts", ()):
+        if isinstance(const.value, (NumberLit, StringLit)):
+            consts[const.name] = const.value.value
+
+    walker = _Walker(consts, {f.name: f.body for f in ast.custom_funcs})
+    for func_def in ast.custom_funcs:
+        walker.walk(func_def.body, 0)
+    if isinstance(ast, ScriptV2):
+        for rule in ast.rules:
+            walker.walk(rule.condition, 0)
+    else:
+        walker.walk(ast.buy_block.expr, 0)
+        walker.walk(ast.sell_block.expr, 0)
+    return walker.result()
+
+
+@lru_cache(maxsize=1024)
+def analyze_script(source: str) -> ScriptDependencies | None:
+    """DSL 소스 → ScriptDependencies (소스 단위 캐시). 파싱 실패 시 None."""
+    try:
+        return analyze(parse_v2(source))
+    except Exception:
+        return None
+
+
+class _Walker:
+    def __init__(self, consts: dict[str, Any], customs: dict[str, Node]):
+        self._consts = consts
+        self._customs = customs
+        self._expanding: set[str] = set()
+        self._indicators: set[IndicatorRequirement] = set()
+        self._fields: set[str] = set()
+        self._depths: dict[str | None, int] = {}
+        self._max_index = 0
+        self._dynamic = False
+        self._stateful = False
+
+    def result(self) -> ScriptDependencies:
+        return ScriptDependencies(
+            indicators=frozenset(self._indicators),
+            fields=frozenset(self._fields),
+            timeframes=tuple(sorted(tf for tf in self._depths if tf is not None)),
+            max_index=self._max_index,
+            depths=tuple(sorted(self._depths.items(), key=lambda kv: kv[0] or "")),
+            dynamic=self._dynamic,
+            stateful=self._stateful,
+        )
+
+    def walk(self, node: Node, offset: int) -> None:
+        """offset: 이 노드를 감싼 expr[N]들의 N 합."""
+        if isinstance(node, FieldRef):
+            if node.name not in self._consts and node.name in BUILTIN_FIELDS:
+                self._fields.add(node.name)
+        elif isinstance(node, (BinOp, Comparison)):
+            self.walk(node.left, offset)
+            self.walk(node.right, offset)
+        elif isinstance(node, UnaryOp):
+            self.walk(node.operand, offset)
+        elif isinstance(node, IndexAccess):
+            self._stateful = True
+            self._max_index = max(self._max_index, node.index)
+            self.walk(node.expr, offset + node.index)
+        elif isinstance(node, PatternCall):
+            self.walk(node.expr, offset)
+        elif isinstance(node, FuncCall):
+            self._call(node, offset)
+
+    def _call(self, node: FuncCall, offset: int) -> None:
+        name = node.name
+        if name in self._customs:
+            # 본문은 analyze()에서 따로 순회 — expr[N] 안의 호출만 오프셋을 얹어 다시 본다
+            if offset and name not in self._expanding:
+                self._expanding.add(name)
+                self.walk(self._customs[name], offset)
+                self._expanding.discard(name)
+            return
+        if name in BUILTIN_PATTERNS:
+            expr = pattern_expr(name)
+            if expr is not None:
+                self.walk(expr, offset)
+            return
+        if name in _INDICATOR_FUNCS:
+            self._indicator(node, offset)
+            return
+        if name in _STATEFUL_FUNCS:
+            self._stateful = True
+        args = node.args[:1] if name in _WINDOW_ARG_FUNCS else node.args
+        for arg in args:
+            self.walk(arg, offset)
+
+    def _indicator(self, node: FuncCall, offset: int) -> None:
+        params: list[int] = []
+        tf: str | None = None
+        for arg in node.args:
+            value = self._static(arg)
+            if isinstance(value, str):
+                tf = value
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                params.append(int(value))
+            else:
+                self._dynamic = True
+                self.walk(arg, offset)  # 인자 안의 필드/지표는 그대로 수집
+                return
+        defaults = _INDICATOR_FUNCS[node.name][1]
+        if node.name in _MACD_FUNCS:
+            params = []
+        elif len(params) < len(defaults):
+            params += defaults[len(params):]
+        elif not params:
+            self._dynamic = True  # 필수 인자 누락 — 평가 시 오류/None
+            return
+
+        req = IndicatorRequirement(node.name, tuple(params), normalize_tf(tf))
+        self._indicators.add(req)
+        depth = req.lookback + offset
+        if depth > self._depths.get(req.tf, 0):
+            self._depths[req.tf] = depth
+
+    def _static(self, node: Node) -> Any:
+        """정적으로 정해지는 인자 값. 못 풀면 None."""
+        if isinstance(node, (NumberLit, StringLit)):
+            return node.value
+        if isinstance(node, FieldRef):
+            return self._consts.get(node.name)
+        if isinstance(node, UnaryOp) and node.op == "-":
+            v = self._static(node.operand)
+            return -v if isinstance(v, (int, float)) else None
+        if isinstance(node, BinOp) and node.op in ("+", "-", "*", "/"):
+            left, right = self._static(node.left), self._static(node.right)
+            if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+                return None
+            if node.op == "+":
+                return left + right
+            if node.op == "-":
+                return left - right
+            if node.op == "*":
+                return left * right
+            return left / right if right != 0 else None
+        return None
@@ -9,9 +9,16 @@ from dataclasses import dataclass, field
 
 @dataclass(frozen=True, slots=True)
 class Node:
-    """AST 노드 기반 클래스. line/col은 소스 위치."""
+    """AST 노드 기반 클래스. line/col은 소스 위치.
+
+    _sid/_site/_text: keys 모듈이 채우는 구조 ID / 위치 ID / 표시 문자열 캐시.
+    비교·해시·repr에서 제외되고, replace()로 만든 노드는 다시 계산한다.
+    """
     line: int = 0
     col: int = 0
+    _sid: int = field(default=-1, init=False, compare=False, repr=False)
+    _site: int = field(default=-1, init=False, compare=False, repr=False)
+    _text: str | None = field(default=None, init=False, compare=False, repr=False)
 
 
 # ── 식 (Expression) 노드 ──
@@ -142,3 +149,16 @@ class ScriptV2(Node):
     custom_funcs: tuple[CustomFuncDef, ...] = ()
     consts: tuple[ConstDecl, ...] = ()
     rules: tuple[Rule, ...] = ()
+
+
+# ── 최적화 패스 노드 (파서는 생성하지 않음) ──
+
+@dataclass(frozen=True, slots=True)
+class PatternCall(Node):
+    """전개된 내장 패턴 함수 호출 (optimizer.expand_patterns 결과).
+
+    name: 패턴 이름 (details/state 키 표현에 사용)
+    expr: 미리 파싱된 패턴 정의 AST
+    """
+    name: str = ""
+    expr: Node = field(default_factory=Node)
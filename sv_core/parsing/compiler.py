@@ -0,0 +1,903 @@
+"""DSL 컴파일러 — AST를 미리 결합된 클로저 트리로 변환.
+
+evaluator.py의 트리 순회(노드마다 isinstance 분기)를 컴파일 시 한 번만 수행하고,
+평가 시에는 클로저 호출만 한다. 상향/하향돌파·횟수/연속 state 키는 노드 구조/위치 ID
+(keys 모듈)를 쓰고, details용 함수 repr은 처음 기록될 때 만들어 노드에 캐시한다.
+패턴 함수는 optimizer.expand_patterns로 먼저 전개한다.
+
+컴파일 시 최적화:
+- 상수 폴딩: 리터럴/v2 상수로만 이루어진 식은 미리 계산한 값을 반환한다.
+- 공통 부분식 제거: 상태가 없는 같은 구조의 식(RSI(14), MA(5) > MA(20) 등)이
+  스크립트에 2번 이상 나오면 평가 1회당 값 슬롯 하나를 공유한다.
+  상태 함수(돌파/다이버전스/횟수/연속)는 공유하지 않고 나온 위치마다 평가한다.
+  context 함수는 순수(같은 인자 → 같은 값)하다고 가정한다.
+
+이전 봉 참조(expr[N])는 평가기와 같은 state["index_history"] 링버퍼(또는 PAST_CONTEXT 훅)를
+쓰며, 버퍼 크기/채울 식은 index_targets로 컴파일 시 정한다.
+
+컴파일 결과의 dependencies는 analysis.analyze()의 정적 의존성(필요 지표/TF/이력 길이)이다.
+
+compile_script_v2(profile=)는 계측 클로저를 만든다 (노드/규칙/context 함수별 시간 → EvalProfile).
+계측하지 않는 컴파일 결과에는 계측 코드가 전혀 없다.
+
+null 전파, 커스텀 함수 스코프, 상태 함수(돌파/다이버전스/횟수/연속) 의미는
+evaluate() / evaluate_v2()와 동일하다. state dict도 같은 구조를 쓰므로
+두 경로를 섞어 써도 된다.
+"""
+
+from __future__ import annotations
+
+import operator
+from typing import Any, Callable
+
+from .ast_nodes import (
+    BinOp,
+    BoolLit,
+    Comparison,
+    CustomFuncDef,
+    FieldRef,
+    FuncCall,
+    IndexAccess,
+    Node,
+    NumberLit,
+    PatternCall,
+    Rule,
+    Script,
+    ScriptV2,
+    StringLit,
+    UnaryOp,
+)
+from .analysis import ScriptDependencies, analyze
+from .builtins import get_pattern_func
+from .evaluator import (
+    NO_DETAILS,
+    PAST_CONTEXT,
+    ConditionSnapshot,
+    EvalProfile,
+    EvalV2Result,
+    _STATEFUL_FUNCS,
+    _EvaluatorV2,
+    _index_buffer,
+    _index_lookup,
+    _past_context,
+    index_key,
+    index_targets,
+    profile_key,
+    profiled,
+    profiled_context,
+)
+from .keys import node_id, node_text, site_id
+from .optimizer import expand_patterns, pattern_expr
+from .state import CountWindow, ExtremaWindow
+
+
+_NULL = None
+_UNSET = object()  # 값 슬롯 미계산 표시
+_NOT_CONST = object()  # 상수 폴딩 불가 표시
+
+# 평가 클로저: rt → 값. v2 조건 클로저: (rt, details) → 값
+_Fn = Callable[["_Runtime"], Any]
+_CondFn = Callable[["_Runtime", "dict | None"], Any]
+
+_CMP_OPS: dict[str, Callable[[Any, Any], Any]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_ARITH_OPS: dict[str, Callable[[Any, Any], Any]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+}
+
+
+class _Runtime:
+    """1회 평가 동안의 실행 환경."""
+
+    __slots__ = ("ctx", "state", "cross_prev", "custom", "slots", "index_filled")
+
+    def __init__(
+        self, ctx: dict[str, Any], state: dict[str, Any], n_custom: int, n_slots: int,
+    ):
+        self.ctx = ctx
+        self.state = state
+        self.cross_prev = state["cross_prev"]
+        self.custom: list[Any] = [_NULL] * n_custom
+        self.slots: list[Any] = [_UNSET] * n_slots
+        self.index_filled: set[int] = set()  # 이번 평가에서 채운 expr[N] 버퍼 키
+
+
+# expr[N] 버퍼 채우기: (키, 채우기 클로저, 오프셋 평가 가능 여부)
+_IndexFill = tuple[int, Callable[["_Runtime"], Any], bool]
+
+
+def _fill_rest(rt: _Runtime, fills: list[_IndexFill]) -> None:
+    """평가기 fill_index_history와 동일 — 참조되지 않은 버퍼도 평가 1회당 한 칸."""
+    offset_mode = PAST_CONTEXT in rt.ctx
+    for key, fill, offsettable in fills:
+        if key in rt.index_filled or (offsettable and offset_mode):
+            continue
+        fill(rt)
+
+
+# ── 공개 API ──
+
+
+class CompiledScript:
+    """v1 Script 컴파일 결과. evaluate(ast, ...)와 같은 (매수, 매도) 반환."""
+
+    __slots__ = ("_customs", "_buy", "_sell", "_n_slots", "_index_fills", "dependencies")
+
+    def __init__(
+        self,
+        customs: list[tuple[int, _Fn]],
+        buy: _Fn,
+        sell: _Fn,
+        n_slots: int = 0,
+        index_fills: list[_IndexFill] | None = None,
+        dependencies: ScriptDependencies | None = None,
+    ):
+        self._customs = customs
+        self._buy = buy
+        self._sell = sell
+        self._n_slots = n_slots
+        self._index_fills = index_fills or []
+        self.dependencies = dependencies or ScriptDependencies()
+
+    def evaluate(
+        self,
+        context: dict[str, Any],
+        state: dict[str, Any] | None = None,
+    ) -> tuple[bool, bool]:
+        if state is None:
+            state = {}
+        if "cross_prev" not in state:
+            state["cross_prev"] = {}
+
+        rt = _Runtime(context, state, len(self._customs), self._n_slots)
+        for slot, fn in self._customs:
+            rt.custom[slot] = fn(rt)
+
+        buy = self._buy(rt)
+        sell = self._sell(rt)
+        if self._index_fills:
+            _fill_rest(rt, self._index_fills)
+        return (buy is not _NULL and bool(buy), sell is not _NULL and bool(sell))
+
+
+class CompiledScriptV2:
+    """v2 ScriptV2 컴파일 결과. evaluate_v2(ast, ...)와 같은 EvalV2Result 반환."""
+
+    __slots__ = (
+        "_consts", "_customs", "_rules", "_n_slots", "_index_fills", "_profile", "dependencies",
+    )
+
+    def __init__(
+        self,
+        consts: list[tuple[str, Any]],
+        customs: list[tuple[int, _Fn]],
+        rules: list[tuple[_CondFn, Rule]],
+        n_slots: int = 0,
+        index_fills: list[_IndexFill] | None = None,
+        dependencies: ScriptDependencies | None = None,
+        profile: EvalProfile | None = None,
+    ):
+        self._consts = consts
+        self._customs = customs
+        self._rules = rules
+        self._n_slots = n_slots
+        self._index_fills = index_fills or []
+        self._profile = profile
+        self.dependencies = dependencies or ScriptDependencies()
+
+    def evaluate(
+        self,
+        context: dict[str, Any],
+        state: dict[str, Any] | None = None,
+        *,
+        details: bool = True,
+    ) -> EvalV2Result:
+        """details=False: 조건별 세부 값(ConditionTracker용)을 기록하지 않는 경량 평가."""
+        if state is None:
+            state = {}
+        if "cross_prev" not in state:
+            state["cross_prev"] = {}
+
+        ctx = dict(context) if self._profile is None else profiled_context(context, self._profile)
+        for name, val in self._consts:
+            ctx[name] = val
+
+        rt = _Runtime(ctx, state, len(self._customs), self._n_slots)
+        for slot, fn in self._customs:
+            rt.custom[slot] = fn(rt)
+
+        snapshots: list[ConditionSnapshot] = []
+        triggered: list[tuple[int, Rule]] = []
+        for i, (cond, rule) in enumerate(self._rules):
+            captured = {} if details else None
+            val = cond(rt, captured)
+            result = None if val is _NULL else bool(val)
+            snapshots.append(ConditionSnapshot(
+                rule_index=i, result=result, details=NO_DETAILS if captured is None else captured,
+            ))
+            if result is True:
+                triggered.append((i, rule))
+        if self._index_fills:
+            _fill_rest(rt, self._index_fills)
+
+        action = _EvaluatorV2._resolve_priority(triggered)
+        return EvalV2Result(action=action, snapshots=snapshots)
+
+
+def compile_script(ast: Script) -> CompiledScript:
+    """v1 AST → CompiledScript."""
+    ast = expand_patterns(ast)
+    c = _Compiler(index_targets=index_targets(ast))
+    c.count_subexprs(ast.custom_funcs, [ast.buy_block.expr, ast.sell_block.expr])
+    customs = c.custom_defs(ast.custom_funcs)
+    buy, sell = c.expr(ast.buy_block.expr), c.expr(ast.sell_block.expr)
+    return CompiledScript(customs, buy, sell, c.n_slots, c.index_fills, analyze(ast))
+
+
+def compile_script_v2(ast: ScriptV2, *, profile: EvalProfile | None = None) -> CompiledScriptV2:
+    """v2 AST → CompiledScriptV2. profile이 있으면 평가 시간을 기록하는 계측 버전."""
+    ast = expand_patterns(ast)
+    consts = [(const.name, _const_value(const.value)) for const in ast.consts]
+    c = _Compiler(dict(consts), index_targets(ast), v2=True, profile=profile)
+    c.count_subexprs(ast.custom_funcs, [rule.condition for rule in ast.rules])
+    customs = c.custom_defs(ast.custom_funcs)
+    rules = []
+    for i, rule in enumerate(ast.rules):
+        cond = c.condition(rule.condition)
+        if profile is not None:
+            cond = profiled(profile, "rule", str(i), cond)
+        rules.append((cond, rule))
+    return CompiledScriptV2(
+        consts, customs, rules, c.n_slots, c.index_fills, analyze(ast), profile,
+    )
+
+
+def _const_value(node: Node) -> Any:
+    """_EvaluatorV2._eval_const_value와 동일 — 숫자/문자열 리터럴만 허용."""
+    if isinstance(node, (NumberLit, StringLit)):
+        return node.value
+    return _NULL
+
+
+def _null(rt: _Runtime) -> Any:
+    return _NULL
+
+
+def _null_cond(rt: _Runtime, details: dict | None) -> Any:
+    return _NULL
+
+
+# ── 컴파일러 ──
+
+
+class _Compiler:
+    def __init__(
+        self,
+        consts: dict[str, Any] | None = None,
+        index_targets: dict[str, tuple[Node, int, bool]] | None = None,
+        v2: bool = False,
+        profile: EvalProfile | None = None,
+    ) -> None:
+        # v2 상수 {이름: 값} — context보다 우선하므로 컴파일 시 값으로 고정
+        self._consts = consts or {}
+        self._v2 = v2
+        self._profile = profile
+        # expr[N]: 대상 식 / 키별 버퍼 채우기 클로저 (처음 나온 위치의 스코프로 컴파일)
+        self._index_targets = index_targets or {}
+        self._index_fills: dict[int, _IndexFill] = {}
+        # 현재 위치에서 보이는 커스텀 함수 → 슬롯 (선언 순서대로 추가)
+        self._custom_slots: dict[str, int] = {}
+        # 공통 부분식: 구조 키 → 등장 횟수 / 값 슬롯
+        self._subexpr_counts: dict[tuple, int] = {}
+        self._subexpr_slots: dict[tuple, int] = {}
+
+    @property
+    def n_slots(self) -> int:
+        return len(self._subexpr_slots)
+
+    @property
+    def index_fills(self) -> list[_IndexFill]:
+        return list(self._index_fills.values())
+
+    def custom_defs(self, defs: tuple[CustomFuncDef, ...]) -> list[tuple[int, _Fn]]:
+        """커스텀 함수는 선언 순서대로 평가 — 본문에서는 앞서 선언된 것만 보인다."""
+        result = []
+        for slot, func_def in enumerate(defs):
+            result.append((slot, self.expr(func_def.body)))
+            self._custom_slots[func_def.name] = slot
+        return result
+
+    # ── 상수 폴딩 / 공통 부분식 ──
+
+    def count_subexprs(self, defs: tuple[CustomFuncDef, ...], roots: list[Node]) -> None:
+        """컴파일 전 패스 — 공유 후보 식의 등장 횟수를 센다 (컴파일과 같은 스코프 순서)."""
+        for slot, func_def in enumerate(defs):
+            self._count_node(func_def.body)
+            self._custom_slots[func_def.name] = slot
+        for root in roots:
+            self._count_node(root)
+        self._custom_slots = {}
+
+    def _count_node(self, node: Node) -> None:
+        if self._is_shared_candidate(node):
+            key = self._subexpr_key(node)
+            if key is not None:
+                self._subexpr_counts[key] = self._subexpr_counts.get(key, 0) + 1
+        for child in _children(node):
+            self._count_node(child)
+
+    def _is_shared_candidate(self, node: Node) -> bool:
+        """슬롯을 둘 가치가 있는 식 — context 함수 호출과 복합식 (리터럴/필드/커스텀 제외)."""
+        if isinstance(node, FuncCall):
+            return node.name not in self._custom_slots
+        return isinstance(node, (BinOp, Comparison, UnaryOp, PatternCall))
+
+    def _subexpr_key(self, node: Node) -> tuple | None:
+        """위치(line/col)를 무시한 구조 키. 상태 함수가 포함되면 None (공유 불가)."""
+        if isinstance(node, (NumberLit, BoolLit, StringLit)):
+            return ("lit", type(node).__name__, node.value)
+        if isinstance(node, FieldRef):
+            return ("field", node.name)
+        if isinstance(node, PatternCall):
+            return self._subexpr_key(node.expr)
+        if isinstance(node, FuncCall):
+            slot = self._custom_slots.get(node.name)
+            if slot is not None:
+                return ("custom", slot)
+            if get_pattern_func(node.name) is not None:
+                expr = pattern_expr(node.name)
+                return self._subexpr_key(expr) if expr is not None else None
+            if node.name in _STATEFUL_FUNCS:
+                return None
+            arg_keys = tuple(self._subexpr_key(a) for a in node.args)
+            if any(k is None for k in arg_keys):
+                return None
+            return ("call", node.name, arg_keys)
+        if isinstance(node, (BinOp, Comparison)):
+            left = self._subexpr_key(node.left)
+            right = self._subexpr_key(node.right)
+            if left is None or right is None:
+                return None
+            return (type(node).__name__, node.op, left, right)
+        if isinstance(node, UnaryOp):
+            operand = self._subexpr_key(node.operand)
+            return None if operand is None else ("unary", node.op, operand)
+        return None
+
+    def _fold(self, node: Node) -> Any:
+        """상수식이면 값, 아니면 _NOT_CONST. 연산 오류는 런타임에 그대로 발생하도록 폴딩하지 않는다."""
+        if isinstance(node, (NumberLit, BoolLit, StringLit)):
+            return node.value
+        if isinstance(node, FieldRef):
+            return self._consts.get(node.name, _NOT_CONST)
+        if isinstance(node, (BinOp, Comparison, UnaryOp)):
+            children = [self._fold(c) for c in _children(node)]
+            if any(c is _NOT_CONST for c in children):
+                return _NOT_CONST
+            if any(c is _NULL for c in children):
+                return _NULL
+            try:
+                if isinstance(node, UnaryOp):
+                    return _unary_apply(node.op)(children[0])
+                if isinstance(node, Comparison):
+                    op = _CMP_OPS.get(node.op)
+                    return op(*children) if op is not None else _NULL
+                return _binop_apply(node.op)(*children)
+            except Exception:
+                return _NOT_CONST
+        return _NOT_CONST
+
+    # ── 표현식 (_Evaluator._eval 대응) ──
+
+    def expr(self, node: Node) -> _Fn:
+        const = self._fold(node)
+        if const is not _NOT_CONST:
+            return lambda rt: const
+
+        fn = self._expr(node)
+        if self._profile is not None:
+            fn = profiled(self._profile, *profile_key(node), fn)
+        if self._is_shared_candidate(node):
+            key = self._subexpr_key(node)
+            if key is not None and self._subexpr_counts.get(key, 0) >= 2:
+                slot = self._subexpr_slots.setdefault(key, len(self._subexpr_slots))
+                return _cached(slot, fn)
+        return fn
+
+    def _expr(self, node: Node) -> _Fn:
+        if isinstance(node, FieldRef):
+            name = node.name
+            return lambda rt: rt.ctx.get(name)
+
+        if isinstance(node, FuncCall):
+            return self._func_call(node)
+
+        if isinstance(node, Comparison):
+            return self._comparison(node)
+
+        if isinstance(node, BinOp):
+            return self._binop(node)
+
+        if isinstance(node, UnaryOp):
+            return self._unary(node)
+
+        if isinstance(node, PatternCall):
+            return self.expr(node.expr)
+
+        if isinstance(node, IndexAccess):
+            return self._index(node)
+
+        return _null
+
+    def _index(self, node: IndexAccess) -> _Fn:
+        """expr[N] — _Evaluator._eval_index 대응."""
+        key = index_key(node.expr)
+        target, depth, offsettable = self._index_targets.get(key, (node.expr, node.index, False))
+        fill = self._index_fill(key, target, depth, offsettable)
+        index = node.index
+
+        if not offsettable:
+            return lambda rt: _index_lookup(fill(rt), index)
+
+        current = self.expr(node.expr)
+
+        def index_access(rt: _Runtime) -> Any:
+            if PAST_CONTEXT not in rt.ctx:
+                return _index_lookup(fill(rt), index)
+            if index == 0:
+                return current(rt)
+            past = _past_context(rt.ctx, index)
+            if past is None:
+                return _NULL
+            # 상태 없는 식 — 새 슬롯으로 n봉 전 context에서 다시 계산
+            return current(_Runtime(past, rt.state, len(rt.custom), len(rt.slots)))
+
+        return index_access
+
+    def _index_fill(
+        self, key: int, target: Node, depth: int, offsettable: bool,
+    ) -> Callable[[_Runtime], Any]:
+        """키별 버퍼 채우기 클로저 — 평가 1회당 한 번만 target을 평가해 push."""
+        found = self._index_fills.get(key)
+        if found is not None:
+            return found[1]
+
+        if self._v2:
+            cond = self.condition(target)
+
+            def evaluate(rt: _Runtime) -> Any:
+                return cond(rt, None)  # 평가기처럼 조건 경로로 평가 (details 기록 없음)
+        else:
+            evaluate = self.expr(target)
+
+        def fill(rt: _Runtime) -> Any:
+            buf = _index_buffer(rt.state, key, depth)
+            if key not in rt.index_filled:
+                rt.index_filled.add(key)
+                buf.append(evaluate(rt))
+            return buf
+
+        self._index_fills[key] = (key, fill, offsettable)
+        return fill
+
+    def _func_call(self, node: FuncCall) -> _Fn:
+        name = node.name
+
+        # 1. 커스텀 함수
+        slot = self._custom_slots.get(name)
+        if slot is not None:
+            return lambda rt: rt.custom[slot]
+
+        # 2. 내장 패턴 함수 (돌파 인자 안 등 전개되지 않은 호출)
+        if get_pattern_func(name) is not None:
+            expr = pattern_expr(name)
+            return self.expr(expr) if expr is not None else _null
+
+        # 3. 상태 함수
+        if name in ("상향돌파", "하향돌파"):
+            return self._cross(node, above=name == "상향돌파")
+        if name in ("강세다이버전스", "약세다이버전스"):
+            return self._divergence(node, bullish=name == "강세다이버전스")
+
+        # 일반 내장 함수 — context callable. 함수가 없으면 인자도 평가하지 않는다.
+        consts = [self._fold(a) for a in node.args]
+        if all(c is not _NOT_CONST for c in consts):
+            return _const_args_call(name, consts)
+        args = [self.expr(a) for a in node.args]
+
+        def call(rt: _Runtime) -> Any:
+            func = rt.ctx.get(name)
+            if func is None or not callable(func):
+                return _NULL
+            vals = []
+            for arg in args:
+                val = arg(rt)
+                if val is _NULL:
+                    return _NULL
+                vals.append(val)
+            try:
+                return func(*vals)
+            except Exception:
+                return _NULL
+
+        return call
+
+    def _cross(self, node: FuncCall, *, above: bool) -> _Fn:
+        if len(node.args) != 2:
+            return _null
+        fa = self.expr(node.args[0])
+        fb = self.expr(node.args[1])
+        key = site_id(node)
+
+        def cross(rt: _Runtime) -> Any:
+            a = fa(rt)
+            b = fb(rt)
+            if a is _NULL or b is _NULL:
+                return _NULL
+            prev = rt.cross_prev.get(key)
+            rt.cross_prev[key] = (a, b)
+            if prev is None:
+                return False
+            prev_a, prev_b = prev
+            if prev_a is _NULL or prev_b is _NULL:
+                return False
+            if above:
+                return prev_a < prev_b and a >= b
+            return prev_a > prev_b and a <= b
+
+        return cross
+
+    def _divergence(self, node: FuncCall, *, bullish: bool) -> _Fn:
+        if len(node.args) < 1:
+            return _null
+        f_ind = self.expr(node.args[0])
+        f_lookback = self.expr(node.args[1]) if len(node.args) >= 2 else None
+        key = site_id(node)
+
+        def divergence(rt: _Runtime) -> Any:
+            indicator_val = f_ind(rt)
+            if indicator_val is _NULL:
+                return False
+
+            lookback = 20
+            if f_lookback is not None:
+                lb = f_lookback(rt)
+                if lb is not _NULL:
+                    lookback = int(lb)
+
+            price = rt.ctx.get("현재가")
+            if price is None:
+                return False
+
+            windows = rt.state.setdefault("divergence_hist", {})
+            window = windows.get(key)
+            if window is None:
+                window = windows[key] = ExtremaWindow()
+            window.push(float(price), float(indicator_val), lookback)
+            return window.detect(bullish=bullish)
+
+        return divergence
+
+    def _comparison(self, node: Comparison) -> _Fn:
+        fl = self.expr(node.left)
+        fr = self.expr(node.right)
+        op = _CMP_OPS.get(node.op)
+
+        def compare(rt: _Runtime) -> Any:
+            left = fl(rt)
+            right = fr(rt)
+            if left is _NULL or right is _NULL or op is None:
+                return _NULL
+            return op(left, right)
+
+        return compare
+
+    def _binop(self, node: BinOp) -> _Fn:
+        fl = self.expr(node.left)
+        fr = self.expr(node.right)
+        apply = _binop_apply(node.op)
+
+        # null 전파 (AND/OR 포함 — 단락 평가 없음, spec §7.4)
+        def binop(rt: _Runtime) -> Any:
+            left = fl(rt)
+            right = fr(rt)
+            if left is _NULL or right is _NULL:
+                return _NULL
+            return apply(left, right)
+
+        return binop
+
+    def _unary(self, node: UnaryOp) -> _Fn:
+        fo = self.expr(node.operand)
+        apply = _unary_apply(node.op)
+
+        def unary(rt: _Runtime) -> Any:
+            val = fo(rt)
+            if val is _NULL:
+                return _NULL
+            return apply(val)
+
+        return unary
+
+    # ── v2 조건 (_EvaluatorV2._eval_with_state_funcs 대응) ──
+
+    def condition(self, node: Node) -> _CondFn:
+        """조건 최상위 경로 — 횟수/연속 처리 + details 기록."""
+        fn = self._condition(node)
+        if self._profile is not None and _times_itself(node):
+            fn = profiled(self._profile, *profile_key(node), fn)
+        return fn
+
+    def _condition(self, node: Node) -> _CondFn:
+        if isinstance(node, FieldRef) and node.name in self._consts:
+            name = node.name
+            const = self._consts[name]
+
+            def const_ref(rt: _Runtime, details: dict | None) -> Any:
+                if const is not None and details is not None:
+                    details[name] = const
+                return const
+
+            return const_ref
+
+        if isinstance(node, FieldRef):
+            name = node.name
+
+            def field_ref(rt: _Runtime, details: dict | None) -> Any:
+                val = rt.ctx.get(name)
+                if val is not None and details is not None:
+                    details[name] = val
+                return val
+
+            return field_ref
+
+        if isinstance(node, (PatternCall, IndexAccess)):
+            fn = self.expr(node)
+            def pattern_call(rt: _Runtime, details: dict | None) -> Any:
+                val = fn(rt)
+                if val is not None and details is not None:
+                    details[node_text(node)] = val
+                return val
+
+            return pattern_call
+
+        if isinstance(node, FuncCall):
+            if node.name == "횟수":
+                return self._count(node)
+            if node.name == "연속":
+                return self._consecutive(node)
+
+            fn = self.expr(node)
+            def func_call(rt: _Runtime, details: dict | None) -> Any:
+                val = fn(rt)
+                if val is not None and details is not None:
+                    details[node_text(node)] = val
+                return val
+
+            return func_call
+
+        if isinstance(node, Comparison):
+            cl = self.condition(node.left)
+            cr = self.condition(node.right)
+            op = _CMP_OPS.get(node.op)
+
+            def compare(rt: _Runtime, details: dict | None) -> Any:
+                left = cl(rt, details)
+                right = cr(rt, details)
+                if left is _NULL or right is _NULL or op is None:
+                    return _NULL
+                return op(left, right)
+
+            return compare
+
+        if isinstance(node, BinOp):
+            return self._cond_binop(node)
+
+        if isinstance(node, UnaryOp):
+            co = self.condition(node.operand)
+            apply = _unary_apply(node.op)
+
+            def unary(rt: _Runtime, details: dict | None) -> Any:
+                val = co(rt, details)
+                if val is _NULL:
+                    return _NULL
+                return apply(val)
+
+            return unary
+
+        fn = self.expr(node)
+        return lambda rt, details: fn(rt)
+
+    def _cond_binop(self, node: BinOp) -> _CondFn:
+        cl = self.condition(node.left)
+        cr = self.condition(node.right)
+
+        if node.op in ("AND", "OR"):
+            apply = _binop_apply(node.op)
+
+            def logical(rt: _Runtime, details: dict | None) -> Any:
+                left = cl(rt, details)
+                right = cr(rt, details)
+                if left is _NULL or right is _NULL:
+                    return _NULL
+                return apply(left, right)
+
+            return logical
+
+        # 산술: 평가기는 양변을 조건 경로로 평가한 뒤 _Evaluator로 식 전체를 다시 평가한다.
+        # 상태 함수가 없으면 재평가 결과가 같으므로 한 번만 계산한다.
+        if not self._has_state_func(node):
+            apply = _binop_apply(node.op)
+
+            def arith(rt: _Runtime, details: dict | None) -> Any:
+                left = cl(rt, details)
+                right = cr(rt, details)
+                if left is _NULL or right is _NULL:
+                    return _NULL
+                return apply(left, right)
+
+            return arith
+
+        fn = self.expr(node)
+
+        def arith_reeval(rt: _Runtime, details: dict | None) -> Any:
+            left = cl(rt, details)
+            right = cr(rt, details)
+            if left is _NULL or right is _NULL:
+                return _NULL
+            return fn(rt)
+
+        return arith_reeval
+
+    def _has_state_func(self, node: Node) -> bool:
+        """평가 시 state를 갱신하는 호출이 포함되는지 (커스텀 함수는 캐시 값이므로 제외)."""
+        if isinstance(node, FuncCall):
+            if node.name in self._custom_slots:
+                return False
+            if get_pattern_func(node.name) is not None:
+                expr = pattern_expr(node.name)
+                return expr is not None and self._has_state_func(expr)
+            if node.name in _STATEFUL_FUNCS:
+                return True
+            return any(self._has_state_func(a) for a in node.args)
+        if isinstance(node, (BinOp, Comparison)):
+            return self._has_state_func(node.left) or self._has_state_func(node.right)
+        if isinstance(node, UnaryOp):
+            return self._has_state_func(node.operand)
+        if isinstance(node, PatternCall):
+            return self._has_state_func(node.expr)
+        return False
+
+    def _count(self, node: FuncCall) -> _CondFn:
+        """횟수(조건, 기간) — 기간 내 조건 True 봉 수."""
+        if len(node.args) != 2:
+            return _null_cond
+        cond_node = node.args[0]
+        f_cond = self.expr(cond_node)
+        f_period = self.expr(node.args[1])
+        key = node_id(cond_node)
+
+        def count(rt: _Runtime, details: dict | None) -> Any:
+            period_val = f_period(rt)
+            if period_val is _NULL:
+                return _NULL
+            period = int(period_val)
+
+            cond_result = f_cond(rt)
+            cond_bool = bool(cond_result) if cond_result is not _NULL else False
+
+            history = rt.state.setdefault("count_history", {})
+            window = history.get(key)
+            if window is None:
+                window = history[key] = CountWindow()
+            result = window.push(cond_bool, period)
+            if details is not None:
+                details[f"횟수({node_text(cond_node)}, {period})"] = result
+            return result
+
+        return count
+
+    def _consecutive(self, node: FuncCall) -> _CondFn:
+        """연속(조건) — 현재 연속 True 봉 수."""
+        if len(node.args) != 1:
+            return _null_cond
+        cond_node = node.args[0]
+        f_cond = self.expr(cond_node)
+        key = node_id(cond_node)
+
+        def consecutive(rt: _Runtime, details: dict | None) -> Any:
+            cond_result = f_cond(rt)
+            cond_bool = bool(cond_result) if cond_result is not _NULL else False
+
+            consec = rt.state.setdefault("consecutive", {})
+            result = consec[key] = consec.get(key, 0) + 1 if cond_bool else 0
+            if details is not None:
+                details[f"연속({node_text(cond_node)})"] = result
+            return result
+
+        return consecutive
+
+
+# ── 헬퍼 ──
+
+
+def _children(node: Node) -> tuple[Node, ...]:
+    if isinstance(node, FuncCall):
+        return node.args
+    if isinstance(node, (BinOp, Comparison)):
+        return (node.left, node.right)
+    if isinstance(node, UnaryOp):
+        return (node.operand,)
+    if isinstance(node, (PatternCall, IndexAccess)):
+        return (node.expr,)
+    return ()
+
+
+def _times_itself(node: Node) -> bool:
+    """조건 경로 클로저를 따로 계측할 노드 — 나머지는 expr() 클로저에 위임하므로 거기서 잰다."""
+    if isinstance(node, FuncCall):
+        return node.name in ("횟수", "연속")
+    return isinstance(node, (FieldRef, Comparison, BinOp, UnaryOp))
+
+
+def _cached(slot: int, fn: _Fn) -> _Fn:
+    """평가 1회 동안 값 슬롯에 결과를 저장하고 재사용."""
+
+    def cached(rt: _Runtime) -> Any:
+        val = rt.slots[slot]
+        if val is _UNSET:
+            val = rt.slots[slot] = fn(rt)
+        return val
+
+    return cached
+
+
+def _const_args_call(name: str, args: list[Any]) -> _Fn:
+    """인자가 모두 상수인 context 함수 호출 — 인자 평가/null 검사를 컴파일 시 끝낸다."""
+    if any(a is _NULL for a in args):
+        return _null
+    args_t = tuple(args)
+
+    def call(rt: _Runtime) -> Any:
+        func = rt.ctx.get(name)
+        if func is None or not callable(func):
+            return _NULL
+        try:
+            return func(*args_t)
+        except Exception:
+            return _NULL
+
+    return call
+
+
+def _div(left: Any, right: Any) -> Any:
+    if right == 0:
+        return _NULL  # 0 나누기 → null
+    return left / right
+
+
+def _binop_apply(op: str) -> Callable[[Any, Any], Any]:
+    if op == "AND":
+        return lambda a, b: bool(a) and bool(b)
+    if op == "OR":
+        return lambda a, b: bool(a) or bool(b)
+    if op == "/":
+        return _div
+    return _ARITH_OPS.get(op, lambda a, b: _NULL)
+
+
+def _unary_apply(op: str) -> Callable[[Any], Any]:
+    if op == "NOT":
+        return lambda v: not bool(v)
+    if op == "-":
+        return operator.neg
+    return lambda v: _NULL
@@ -1,12 +1,21 @@
 """DSL 평가기 — AST를 시세 컨텍스트에서 평가하여 (매수, 매도) boolean 반환.
 
 context: {"현재가": float, "거래량": int, "RSI": Callable, "MA": Callable, ...}
-state: {"cross_prev": {key: (prev_a, prev_b)}} — 엔진이 규칙별로 관리
+state: {"cross_prev": {key: (prev_a, prev_b)}, ...} — 엔진이 규칙별로 관리.
+  키는 노드 구조/위치 ID (keys.node_id/site_id) — 문자열 repr을 매번 만들지 않는다.
+
+이전 봉 참조(expr[N]):
+- 기본: state["index_history"]에 식별 키별 링버퍼(deque)를 두고 평가 1회당 한 번 채운다.
+  버퍼 크기는 스크립트가 그 식에 쓰는 최대 N + 1.
+- context[PAST_CONTEXT]가 있으면(백테스트) 상태가 없는 식은 n봉 전 context로 직접 평가한다.
 """
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
+from time import perf_counter
+from types import MappingProxyType
 from typing import Any, Callable
 
 from .ast_nodes import (
@@ -19,8 +28,10 @@ from .ast_nodes import (
     CustomFuncDef,
     FieldRef,
     FuncCall,
+    IndexAccess,
     Node,
     NumberLit,
+    PatternCall,
     Rule,
     Script,
     ScriptV2,
@@ -34,12 +45,20 @@ from .builtins import (
     BUILTIN_PATTERNS,
     get_pattern_func,
 )
-from .parser import parse as parse_script
+from .keys import node_id, node_text, site_id
+from .optimizer import pattern_expr
+from .state import CountWindow, ExtremaWindow
 
 
 # null 표현 (None = 결측치)
 _NULL = None
 
+# 평가할 때마다 state를 갱신하는 함수
+_STATEFUL_FUNCS = {"상향돌파", "하향돌파", "강세다이버전스", "약세다이버전스", "횟수", "연속"}
+
+# context 훅: n → n봉 전 시점에 덮어쓸 {필드/함수: 값} (없으면 None). 백테스트가 제공
+PAST_CONTEXT = "__past__"
+
 
 def evaluate(
     ast: Script,
@@ -55,7 +74,7 @@ def evaluate(
     if "cross_prev" not in state:
         state["cross_prev"] = {}
 
-    ev = _Evaluator(context, state)
+    ev = _Evaluator(context, state, index_targets(ast))
 
     # 커스텀 함수 선언 순서대로 평가 → 결과 캐시
     for func_def in ast.custom_funcs:
@@ -63,15 +82,116 @@ def evaluate(
 
     buy_result = ev.eval_block(ast.buy_block)
     sell_result = ev.eval_block(ast.sell_block)
+    ev.fill_index_history()
 
     return (buy_result, sell_result)
 
 
+# ── 이전 봉 참조 (expr[N]) ──
+
+
+def index_key(expr: Node) -> int:
+    """expr[N] 링버퍼 state 키 — 같은 식(구조 ID)은 N이 달라도 버퍼 하나를 공유."""
+    return node_id(expr)
+
+
+def index_targets(ast: Script | ScriptV2) -> dict[int, tuple[Node, int, bool]]:
+    """스크립트의 expr[N] 대상 → {키: (처음 나온 식, 최대 N, 오프셋 평가 가능 여부)}.
+
+    평가 순서(커스텀 함수 → 블록/규칙)대로 모은다. 오프셋 평가 가능 = 상태 함수와
+    커스텀 함수 참조가 없어 n봉 전 context만으로 다시 계산할 수 있는 식.
+    """
+    customs = {f.name for f in ast.custom_funcs}
+    targets: dict[int, tuple[Node, int, bool]] = {}
+
+    def walk(node: Node) -> None:
+        if isinstance(node, IndexAccess):
+            key = index_key(node.expr)
+            found = targets.get(key)
+            if found is None:
+                targets[key] = (node.expr, node.index, _offsettable(node.expr, customs))
+            elif node.index > found[1]:
+                targets[key] = (found[0], node.index, found[2])
+            walk(node.expr)
+        elif isinstance(node, FuncCall):
+            for arg in node.args:
+                walk(arg)
+        elif isinstance(node, (BinOp, Comparison)):
+            walk(node.left)
+            walk(node.right)
+        elif isinstance(node, UnaryOp):
+            walk(node.operand)
+        elif isinstance(node, PatternCall):
+            walk(node.expr)
+
+    for func_def in ast.custom_funcs:
+        walk(func_def.body)
+    if isinstance(ast, ScriptV2):
+        for rule in ast.rules:
+            walk(rule.condition)
+    else:
+        walk(ast.buy_block.expr)
+        walk(ast.sell_block.expr)
+    return targets
+
+
+def _offsettable(node: Node, customs: set[str]) -> bool:
+    if isinstance(node, FuncCall):
+        if node.name in customs or node.name in _STATEFUL_FUNCS:
+            return False
+        if get_pattern_func(node.name) is not None:
+            expr = pattern_expr(node.name)
+            return expr is not None and _offsettable(expr, customs)
+        return all(_offsettable(a, customs) for a in node.args)
+    if isinstance(node, PatternCall):
+        return _offsettable(node.expr, customs)
+    if isinstance(node, (BinOp, Comparison)):
+        return _offsettable(node.left, customs) and _offsettable(node.right, customs)
+    if isinstance(node, UnaryOp):
+        return _offsettable(node.operand, customs)
+    return not isinstance(node, IndexAccess)
+
+
+def _index_buffer(state: dict[str, Any], key: int, depth: int) -> deque:
+    """키의 링버퍼. 스크립트가 바뀌어 최대 N이 커졌으면 기존 값을 유지한 채 늘린다."""
+    hist = state.setdefault("index_history", {})
+    buf = hist.get(key)
+    if buf is None or buf.maxlen < depth + 1:
+        buf = hist[key] = deque(buf or (), maxlen=depth + 1)
+    return buf
+
+
+def _index_lookup(buf: deque, index: int) -> Any:
+    """N봉 전 값 (0 = 현재). 이력이 모자라면 null."""
+    if len(buf) <= index:
+        return _NULL
+    return buf[-(index + 1)]
+
+
+def _past_context(ctx: dict[str, Any], index: int) -> dict[str, Any] | None:
+    """PAST_CONTEXT 훅으로 n봉 전 context. 범위 밖이면 None."""
+    overlay = ctx[PAST_CONTEXT](index)
+    if overlay is None:
+        return None
+    past = dict(ctx)
+    past.update(overlay)
+    return past
+
+
 class _Evaluator:
-    def __init__(self, context: dict[str, Any], state: dict[str, Any]):
+    def __init__(
+        self,
+        context: dict[str, Any],
+        state: dict[str, Any],
+        index_targets: dict[int, tuple[Node, int, bool]] | None = None,
+    ):
         self._ctx = context
         self._state = state
         self._custom_cache: dict[str, Any] = {}  # 커스텀 함수 결과 캐시
+        # expr[N]: 대상 식 / 이번 평가에서 이미 채운 키 / 버퍼를 채울 때 쓰는 평가 함수
+        self._index_targets = index_targets or {}
+        self._index_filled: set[int] = set()
+        self._index_eval: Callable[[Node], Any] = self._eval
 
     def eval_custom_def(self, func_def: CustomFuncDef):
         """커스텀 함수를 평가하고 결과 캐시."""
@@ -111,8 +231,42 @@ class _Evaluator:
         if isinstance(node, UnaryOp):
             return self._eval_unary(node)
 
+        if isinstance(node, PatternCall):
+            return self._eval(node.expr)
+
+        if isinstance(node, IndexAccess):
+            return self._eval_index(node)
+
         return _NULL
 
+    def _eval_index(self, node: IndexAccess) -> Any:
+        """expr[N] — N봉 전 expr 값."""
+        key = index_key(node.expr)
+        target, depth, offsettable = self._index_targets.get(key, (node.expr, node.index, False))
+        if offsettable and PAST_CONTEXT in self._ctx:
+            if node.index == 0:
+                return self._eval(node.expr)
+            past = _past_context(self._ctx, node.index)
+            if past is None:
+                return _NULL
+            return _Evaluator(past, self._state)._eval(node.expr)
+        return _index_lookup(self._fill_index(key, target, depth), node.index)
+
+    def _fill_index(self, key: int, target: Node, depth: int) -> deque:
+        buf = _index_buffer(self._state, key, depth)
+        if key not in self._index_filled:
+            self._index_filled.add(key)
+            buf.append(self._index_eval(target))
+        return buf
+
+    def fill_index_history(self) -> None:
+        """이번 평가에서 참조되지 않은 버퍼도 채운다 — 버퍼는 평가 1회당 정확히 한 칸."""
+        offset_mode = PAST_CONTEXT in self._ctx
+        for key, (target, depth, offsettable) in self._index_targets.items():
+            if key in self._index_filled or (offsettable and offset_mode):
+                continue
+            self._fill_index(key, target, depth)
+
     def _resolve_field(self, name: str) -> Any:
         """내장 필드 resolve."""
         val = self._ctx.get(name)
@@ -125,10 +279,10 @@ class _Evaluator:
         if name in self._custom_cache:
             return self._custom_cache[name]
 
-        # 2. 내장 패턴 함수 — 정의를 인라인 파싱+평가
+        # 2. 내장 패턴 함수 — 미리 파싱된 정의를 인라인 평가
         pat = get_pattern_func(name)
         if pat is not None:
-            return self._eval_pattern(pat.definition)
+            return self._eval_pattern(name)
 
         # 3. 내장 함수
         if name == "상향돌파":
@@ -160,18 +314,12 @@ class _Evaluator:
         except Exception:
             return _NULL
 
-    def _eval_pattern(self, definition: str) -> Any:
-        """패턴 함수 정의를 파싱 + 평가.
-
-        패턴 정의는 순수 expression이므로 매수:/매도: 없이 파싱.
-        trick: 임시로 "매수: {def}\n매도: true" 래핑.
-        """
-        wrapped = f"매수: {definition}\n매도: true"
-        try:
-            ast = parse_script(wrapped)
-        except Exception:
+    def _eval_pattern(self, name: str) -> Any:
+        """패턴 함수 평가 — 정의는 optimizer 모듈 로드 시 한 번만 파싱된다."""
+        expr = pattern_expr(name)
+        if expr is None:
             return _NULL
-        return self._eval(ast.buy_block.expr)
+        return self._eval(expr)
 
     def _eval_cross_above(self, node: FuncCall) -> Any:
         """상향돌파(A, B): 직전 A < B 이고 현재 A >= B."""
@@ -215,10 +363,9 @@ class _Evaluator:
             return False
         return prev_a > prev_b and a <= b
 
-    def _cross_key(self, node: FuncCall) -> str:
-        """상향/하향돌파 state 키 — 함수명 + 인자 AST repr."""
-        arg_repr = "|".join(repr(a) for a in node.args)
-        return f"{node.name}:{arg_repr}"
+    def _cross_key(self, node: FuncCall) -> int:
+        """상향/하향돌파·다이버전스 state 키 — 함수명 + 인자 구조 + 인자 위치."""
+        return site_id(node)
 
     # ── 다이버전스 ──
 
@@ -228,7 +375,7 @@ class _Evaluator:
         강세: 가격 저점↓ + 지표 저점↑ (하락 모멘텀 소진)
         약세: 가격 고점↑ + 지표 고점↓ (상승 모멘텀 소진)
 
-        state["divergence_hist"]에 (price, indicator) 히스토리를 축적한다.
+        state["divergence_hist"]에 키별 (price, indicator) 윈도우(ExtremaWindow)를 축적한다.
         """
         if len(node.args) < 1:
             return _NULL
@@ -250,25 +397,17 @@ class _Evaluator:
         if price is None:
             return False
 
-        # 히스토리 축적
-        if "divergence_hist" not in self._state:
-            self._state["divergence_hist"] = {}
+        # 히스토리 축적 — 극값은 점이 들어올 때 확정 (평가 1회 O(1))
         key = self._cross_key(node)
-        hist = self._state["divergence_hist"].setdefault(key, [])
-        hist.append((float(price), float(indicator_val)))
-        # lookback 초과분 트리밍
-        if len(hist) > lookback:
-            self._state["divergence_hist"][key] = hist[-lookback:]
-            hist = self._state["divergence_hist"][key]
-
-        if len(hist) < 5:
-            return False  # 최소 5봉 필요
-
-        return self._detect_divergence(hist, bullish=bullish)
+        window = self._state.setdefault("divergence_hist", {}).get(key)
+        if window is None:
+            window = self._state["divergence_hist"][key] = ExtremaWindow()
+        window.push(float(price), float(indicator_val), lookback)
+        return window.detect(bullish=bullish)
 
     @staticmethod
     def _detect_divergence(hist: list[tuple[float, float]], *, bullish: bool) -> bool:
-        """히스토리에서 로컬 극값 2개를 찾아 다이버전스 판정."""
+        """히스토리에서 로컬 극값 2개를 찾아 다이버전스 판정 (전체 재탐색 — ExtremaWindow 기준 구현)."""
         prices = [h[0] for h in hist]
         indicators = [h[1] for h in hist]
         n = len(prices)
@@ -366,6 +505,10 @@ class ActionResult:
     expr_text: str = ""
 
 
+# 경량 평가(details=False)의 스냅샷 details — 규칙마다 dict를 만들지 않는 공유 읽기 전용 빈 매핑
+NO_DETAILS: dict = MappingProxyType({})  # type: ignore[assignment]
+
+
 @dataclass(slots=True)
 class ConditionSnapshot:
     """규칙별 조건 평가 결과."""
@@ -381,6 +524,77 @@ class EvalV2Result:
     snapshots: list[ConditionSnapshot] = field(default_factory=list)
 
 
+class EvalProfile:
+    """평가 프로파일 — (분류, 이름)별 호출 수와 누적 시간 (opt-in).
+
+    분류: "func" 내장 함수(context 호출 + 상태 함수), "rule" 규칙 조건(인덱스), "node" AST 노드 타입.
+    누적 시간은 하위 노드를 포함한다 (cProfile cumtime과 같은 의미).
+    evaluate_v2(profile=) / compile_script_v2(profile=)로 켠다 — 끄면 계측 코드 자체가 없다.
+    """
+
+    __slots__ = ("stats",)
+
+    def __init__(self) -> None:
+        self.stats: dict[tuple[str, str], list] = {}  # (분류, 이름) → [호출 수, 누적 초]
+
+    def add(self, kind: str, name: str, elapsed: float) -> None:
+        entry = self.stats.get((kind, name))
+        if entry is None:
+            self.stats[(kind, name)] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def merge(self, other: EvalProfile) -> None:
+        for (kind, name), (calls, total) in other.stats.items():
+            entry = self.stats.setdefault((kind, name), [0, 0.0])
+            entry[0] += calls
+            entry[1] += total
+
+    def report(self) -> dict[str, list[dict]]:
+        """분류별 [{name, calls, total_ms, avg_us}] — 누적 시간 내림차순."""
+        out: dict[str, list[dict]] = {"func": [], "rule": [], "node": []}
+        for (kind, name), (calls, total) in sorted(
+            self.stats.items(), key=lambda kv: kv[1][1], reverse=True,
+        ):
+            out.setdefault(kind, []).append({
+                "name": name, "calls": calls,
+                "total_ms": round(total * 1e3, 3),
+                "avg_us": round(total / calls * 1e6, 2),
+            })
+        return out
+
+
+def profiled(profile: EvalProfile, kind: str, name: str, fn: Callable) -> Callable:
+    """fn 호출마다 소요 시간을 profile에 기록하는 래퍼."""
+    add = profile.add
+
+    def timed(*args: Any) -> Any:
+        start = perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            add(kind, name, perf_counter() - start)
+
+    return timed
+
+
+def profile_key(node: Node) -> tuple[str, str]:
+    """노드 → (분류, 이름). 상태 함수(돌파/다이버전스/횟수/연속)는 내장 함수로 센다."""
+    if isinstance(node, FuncCall) and node.name in _STATEFUL_FUNCS:
+        return "func", node.name
+    return "node", type(node).__name__
+
+
+def profiled_context(context: dict[str, Any], profile: EvalProfile) -> dict[str, Any]:
+    """context 복사본 — 함수(지표 등)를 "func" 계측 래퍼로 감싼다."""
+    ctx = dict(context)
+    for name, val in context.items():
+        if callable(val) and name != PAST_CONTEXT:
+            ctx[name] = profiled(profile, "func", name, val)
+    return ctx
+
+
 class _EvaluatorV2:
     """v2 AST 평가기.
 
@@ -393,10 +607,14 @@ class _EvaluatorV2:
         ast: ScriptV2,
         context: dict[str, Any],
         state: dict[str, Any],
+        details: bool = True,
+        profile: EvalProfile | None = None,
     ):
         self._ast = ast
         self._ctx = context
         self._state = state
+        self._details = details
+        self._profile = profile
         self._snapshots: list[ConditionSnapshot] = []
 
         # 상수를 컨텍스트에 주입
@@ -404,8 +622,11 @@ class _EvaluatorV2:
             val = self._eval_const_value(const)
             self._ctx[const.name] = val
 
-        # 내부 _Evaluator — 표현식 평가 위임
-        self._ev = _Evaluator(self._ctx, self._state)
+        # 내부 _Evaluator — 표현식 평가 위임. expr[N] 버퍼는 조건 경로로 채운다 (횟수/연속 지원)
+        self._ev = _Evaluator(self._ctx, self._state, index_targets(ast))
+        self._ev._index_eval = lambda n: self._eval_with_state_funcs(n, None)
+        if profile is not None:
+            self._ev._eval = _profiled_eval(self._ev._eval, profile)
 
         # 커스텀 함수 평가
         for func_def in ast.custom_funcs:
@@ -423,9 +644,15 @@ class _EvaluatorV2:
     def evaluate(self) -> EvalV2Result:
         """모든 규칙 평가 → 우선순위에 따라 최대 1개 행동 선택."""
         triggered: list[tuple[int, Rule]] = []
+        profile = self._profile
 
         for i, rule in enumerate(self._ast.rules):
-            result, details = self._eval_condition(rule.condition)
+            if profile is None:
+                result, details = self._eval_condition(rule.condition)
+            else:
+                start = perf_counter()
+                result, details = self._eval_condition(rule.condition)
+                profile.add("rule", str(i), perf_counter() - start)
             self._snapshots.append(ConditionSnapshot(
                 rule_index=i,
                 result=result,
@@ -434,6 +661,8 @@ class _EvaluatorV2:
             if result is True:
                 triggered.append((i, rule))
 
+        self._ev.fill_index_history()
+
         # 우선순위: 전량매도 > 부분매도 > 매수
         action = self._resolve_priority(triggered)
         return EvalV2Result(action=action, snapshots=self._snapshots)
@@ -442,24 +671,33 @@ class _EvaluatorV2:
         """조건 평가 → (결과, 세부 필드값).
 
         상태 함수(횟수, 연속)를 가로채서 처리한 뒤 나머지는 _Evaluator에 위임.
+        경량 평가면 세부 필드값을 기록하지 않는다 (NO_DETAILS).
         """
-        details: dict = {}
+        details = {} if self._details else None
         result = self._eval_with_state_funcs(node, details)
+        if details is None:
+            details = NO_DETAILS
         if result is _NULL:
             return None, details
         return bool(result), details
 
-    def _eval_with_state_funcs(self, node: Node, details: dict) -> Any:
+    def _eval_with_state_funcs(self, node: Node, details: dict | None) -> Any:
         """상태 함수를 처리하면서 표현식 평가.
 
-        FieldRef / FuncCall 노드에서 details에 현재 값을 기록.
+        FieldRef / FuncCall 노드에서 details에 현재 값을 기록 (details가 None이면 생략).
         """
         if isinstance(node, FieldRef):
             val = self._ctx.get(node.name)
-            if val is not _NULL and val is not None:
+            if val is not _NULL and val is not None and details is not None:
                 details[node.name] = val
             return val
 
+        if isinstance(node, (PatternCall, IndexAccess)):
+            val = self._ev._eval(node)
+            if val is not _NULL and val is not None and details is not None:
+                details[self._node_repr(node)] = val
+            return val
+
         if isinstance(node, FuncCall):
             # 상태 함수 특수 처리
             if node.name == "횟수":
@@ -470,9 +708,8 @@ class _EvaluatorV2:
             # 일반 함수 — _Evaluator에 위임
             val = self._ev._eval(node)
             # 함수 호출 결과를 details에 기록
-            func_repr = self._func_repr(node)
-            if val is not _NULL and val is not None:
-                details[func_repr] = val
+            if val is not _NULL and val is not None and details is not None:
+                details[self._func_repr(node)] = val
             return val
 
         if isinstance(node, Comparison):
@@ -521,7 +758,7 @@ class _EvaluatorV2:
         # 그 외 (NumberLit, BoolLit, StringLit 등) — _Evaluator에 위임
         return self._ev._eval(node)
 
-    def _eval_count_func(self, node: FuncCall, details: dict) -> Any:
+    def _eval_count_func(self, node: FuncCall, details: dict | None) -> Any:
         """횟수(조건, 기간) — 기간 내 조건 True 봉 수."""
         if len(node.args) != 2:
             return _NULL
@@ -537,26 +774,19 @@ class _EvaluatorV2:
         cond_result = self._ev._eval(cond_node)
         cond_bool = bool(cond_result) if cond_result is not _NULL else False
 
-        # state key
-        key = f"count:{self._node_repr(cond_node)}"
+        # state key — 최근 기간 봉 링버퍼 + True 개수
+        key = node_id(cond_node)
         history = self._state.setdefault("count_history", {})
-        hist_list: list[bool] = history.setdefault(key, [])
-        hist_list.append(cond_bool)
+        window = history.get(key)
+        if window is None:
+            window = history[key] = CountWindow()
+        result = window.push(cond_bool, period)
 
-        # 윈도우 초과분 트리밍 (메모리 누수 방지)
-        if period > 0 and len(hist_list) > period:
-            history[key] = hist_list[-period:]
-            hist_list = history[key]
-
-        # 윈도우 내 True 수
-        window = hist_list[-period:] if period > 0 else []
-        result = sum(1 for v in window if v)
-
-        func_repr = f"횟수({self._node_repr(cond_node)}, {period})"
-        details[func_repr] = result
+        if details is not None:
+            details[f"횟수({self._node_repr(cond_node)}, {period})"] = result
         return result
 
-    def _eval_consecutive_func(self, node: FuncCall, details: dict) -> Any:
+    def _eval_consecutive_func(self, node: FuncCall, details: dict | None) -> Any:
         """연속(조건) — 현재 연속 True 봉 수."""
         if len(node.args) != 1:
             return _NULL
@@ -565,7 +795,7 @@ class _EvaluatorV2:
         cond_result = self._ev._eval(cond_node)
         cond_bool = bool(cond_result) if cond_result is not _NULL else False
 
-        key = f"consecutive:{self._node_repr(cond_node)}"
+        key = node_id(cond_node)
         consec = self._state.setdefault("consecutive", {})
 
         if cond_bool:
@@ -574,12 +804,12 @@ class _EvaluatorV2:
             consec[key] = 0
 
         result = consec[key]
-        func_repr = f"연속({self._node_repr(cond_node)})"
-        details[func_repr] = result
+        if details is not None:
+            details[f"연속({self._node_repr(cond_node)})"] = result
         return result
 
+    @staticmethod
     def _resolve_priority(
-        self,
         triggered: list[tuple[int, Rule]],
     ) -> ActionResult | None:
         """우선순위: 전량매도 > 부분매도 > 매수."""
@@ -611,50 +841,47 @@ class _EvaluatorV2:
     @staticmethod
     def _func_repr(node: FuncCall) -> str:
         """함수 호출의 문자열 표현."""
-        args = ", ".join(_EvaluatorV2._node_repr(a) for a in node.args)
-        return f"{node.name}({args})" if args else f"{node.name}()"
+        return node_text(node)
 
     @staticmethod
     def _node_repr(node: Node) -> str:
-        """AST 노드의 간략 문자열 표현 (state key 용)."""
-        if isinstance(node, NumberLit):
-            v = node.value
-            return str(int(v)) if v == int(v) else str(v)
-        if isinstance(node, BoolLit):
-            return "true" if node.value else "false"
-        if isinstance(node, StringLit):
-            return f'"{node.value}"'
-        if isinstance(node, FieldRef):
-            return node.name
-        if isinstance(node, FuncCall):
-            return _EvaluatorV2._func_repr(node)
-        if isinstance(node, Comparison):
-            l = _EvaluatorV2._node_repr(node.left)
-            r = _EvaluatorV2._node_repr(node.right)
-            return f"{l} {node.op} {r}"
-        if isinstance(node, BinOp):
-            l = _EvaluatorV2._node_repr(node.left)
-            r = _EvaluatorV2._node_repr(node.right)
-            return f"{l} {node.op} {r}"
-        if isinstance(node, UnaryOp):
-            o = _EvaluatorV2._node_repr(node.operand)
-            return f"{node.op} {o}"
-        return repr(node)
+        """AST 노드의 간략 문자열 표현 (details 키 — 노드에 캐시)."""
+        return node_text(node)
+
+
+def _profiled_eval(eval_node: Callable[[Node], Any], profile: EvalProfile) -> Callable[[Node], Any]:
+    """_Evaluator._eval 계측 — 노드 타입별 누적 시간 (재귀 호출도 인스턴스 속성을 거친다)."""
+    add = profile.add
+
+    def _eval(node: Node) -> Any:
+        start = perf_counter()
+        try:
+            return eval_node(node)
+        finally:
+            add(*profile_key(node), perf_counter() - start)
+
+    return _eval
 
 
 def evaluate_v2(
     ast: ScriptV2,
     context: dict[str, Any],
     state: dict[str, Any] | None = None,
+    *,
+    details: bool = True,
+    profile: EvalProfile | None = None,
 ) -> EvalV2Result:
     """v2 AST 평가 → EvalV2Result.
 
     모든 규칙을 평가(투명성)하고, 우선순위에 따라 최대 1개 행동 반환.
+    details=False면 조건별 세부 값을 기록하지 않는다 (스냅샷 details는 NO_DETAILS).
+    profile이 있으면 함수/규칙/노드 타입별 시간을 기록한다.
     """
     if state is None:
         state = {}
     if "cross_prev" not in state:
         state["cross_prev"] = {}
 
-    ev = _EvaluatorV2(ast, dict(context), state)
+    ctx = dict(context) if profile is None else profiled_context(context, profile)
+    ev = _EvaluatorV2(ast, ctx, state, details, profile)
     return ev.evaluate()
@@ -0,0 +1,161 @@
+"""AST 노드 키 — state 키용 구조 ID, details용 표시 문자열.
+
+- node_id: 위치(line/col)와 무관한 구조 ID. 같은 구조 → 같은 정수 (프로세스 내 intern).
+  횟수/연속/expr[N] state 키. 패턴 호출(PatternCall)은 같은 이름의 인자 없는 FuncCall과 같다
+  (패턴 전개 전/후 state 호환).
+- site_id: 상향/하향돌파·다이버전스 state 키 — 함수명 + 인자 구조 + 인자 위치 (위치별 state 유지).
+- node_text: ConditionTracker details 키 ("RSI(14)", "횟수(현재가 > MA(20), 5)" 등).
+
+모두 노드에 캐시된다 (parse 시 intern_ids()로 미리 채우고, 최적화로 새로 만든 노드는 처음 요청될 때).
+
+intern 표는 최근 사용 순 _MAX_INTERNED개로 제한한다 — 오래 안 쓴 구조는 빠지고, 같은 구조가
+다시 intern되면 새 ID를 받는다 (카운터는 계속 증가 → 빠진 ID와 충돌 없음, 노드 캐시는 유지).
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from collections import OrderedDict
+
+from .ast_nodes import (
+    BinOp,
+    BoolLit,
+    Comparison,
+    FieldRef,
+    FuncCall,
+    IndexAccess,
+    Node,
+    NumberLit,
+    PatternCall,
+    Script,
+    ScriptV2,
+    StringLit,
+    UnaryOp,
+)
+
+# site_id를 미리 계산할 함수 (상태를 호출 위치별로 두는 함수)
+_SITE_FUNCS = {"상향돌파", "하향돌파", "강세다이버전스", "약세다이버전스"}
+
+_MAX_INTERNED = 1 << 16  # intern 표 상한 (구조 수)
+
+_IDS: OrderedDict[tuple, int] = OrderedDict()
+_COUNTER = itertools.count()
+_LOCK = threading.Lock()
+
+
+def _intern(key: tuple) -> int:
+    with _LOCK:
+        sid = _IDS.get(key)
+        if sid is None:
+            sid = _IDS[key] = next(_COUNTER)
+            if len(_IDS) > _MAX_INTERNED:
+                _IDS.popitem(last=False)
+        else:
+            _IDS.move_to_end(key)
+        return sid
+
+
+def node_id(node: Node) -> int:
+    """구조 ID (캐시)."""
+    sid = node._sid
+    if sid < 0:
+        sid = _intern(_structure(node))
+        object.__setattr__(node, "_sid", sid)
+    return sid
+
+
+def site_id(node: FuncCall) -> int:
+    """위치 포함 호출 ID (캐시) — 같은 식이라도 소스 위치가 다르면 다른 state."""
+    sid = node._site
+    if sid < 0:
+        sid = _intern((
+            "site", node.name, tuple((a.line, a.col, node_id(a)) for a in node.args),
+        ))
+        object.__setattr__(node, "_site", sid)
+    return sid
+
+
+def node_text(node: Node) -> str:
+    """간략 문자열 표현 (캐시) — details 키."""
+    text = node._text
+    if text is None:
+        text = _format(node)
+        object.__setattr__(node, "_text", text)
+    return text
+
+
+def intern_ids(ast: Script | ScriptV2) -> None:
+    """스크립트 전체 식 노드의 구조 ID를 미리 계산 (파서가 호출)."""
+    roots: list[Node] = [f.body for f in ast.custom_funcs]
+    if isinstance(ast, ScriptV2):
+        roots += [r.condition for r in ast.rules]
+    else:
+        roots += [ast.buy_block.expr, ast.sell_block.expr]
+    for root in roots:
+        _intern_tree(root)
+
+
+def _intern_tree(node: Node) -> None:
+    if isinstance(node, FuncCall):
+        for arg in node.args:
+            _intern_tree(arg)
+        if node.name in _SITE_FUNCS:
+            site_id(node)
+    elif isinstance(node, (BinOp, Comparison)):
+        _intern_tree(node.left)
+        _intern_tree(node.right)
+    elif isinstance(node, UnaryOp):
+        _intern_tree(node.operand)
+    elif isinstance(node, (IndexAccess, PatternCall)):
+        _intern_tree(node.expr)
+    node_id(node)
+
+
+def _structure(node: Node) -> tuple:
+    """구조 키 — 자식은 ID로 (재귀 깊이만큼만 계산)."""
+    if isinstance(node, NumberLit):
+        return ("num", float(node.value))
+    if isinstance(node, BoolLit):
+        return ("bool", node.value)
+    if isinstance(node, StringLit):
+        return ("str", node.value)
+    if isinstance(node, FieldRef):
+        return ("field", node.name)
+    if isinstance(node, FuncCall):
+        return ("call", node.name, *(node_id(a) for a in node.args))
+    if isinstance(node, PatternCall):
+        return ("call", node.name)
+    if isinstance(node, IndexAccess):
+        return ("index", node_id(node.expr), node.index)
+    if isinstance(node, Comparison):
+        return ("cmp", node.op, node_id(node.left), node_id(node.right))
+    if isinstance(node, BinOp):
+        return ("bin", node.op, node_id(node.left), node_id(node.right))
+    if isinstance(node, UnaryOp):
+        return ("unary", node.op, node_id(node.operand))
+    return ("node", repr(node))
+
+
+def _format(node: Node) -> str:
+    if isinstance(node, NumberLit):
+        v = node.value
+        return str(int(v)) if v == int(v) else str(v)
+    if isinstance(node, BoolLit):
+        return "true" if node.value else "false"
+    if isinstance(node, StringLit):
+        return f'"{node.value}"'
+    if isinstance(node, FieldRef):
+        return node.name
+    if isinstance(node, FuncCall):
+        args = ", ".join(node_text(a) for a in node.args)
+        return f"{node.name}({args})"
+    if isinstance(node, PatternCall):
+        return f"{node.name}()"
+    if isinstance(node, IndexAccess):
+        return f"{node_text(node.expr)}[{node.index}]"
+    if isinstance(node, (Comparison, BinOp)):
+        return f"{node_text(node.left)} {node.op} {node_text(node.right)}"
+    if isinstance(node, UnaryOp):
+        return f"{node.op} {node_text(node.operand)}"
+    return repr(node)
@@ -1,17 +1,84 @@
 """DSL 렉서 — grammar.md §3 어휘 규칙 기반.
 
 최장 일치, 한국어 식별자, 키워드 판별, 주석 무시.
+
+tokenize()는 마스터 정규식 findall 한 번으로 소스 전체를 (공백, 토큰) 조각으로 자른다.
+_tokenize_chars()는 문자 단위 렉서 — 결과(토큰/줄/열/에러 위치)가 같다.
+잘못된 문자(닫히지 않은 문자열 포함), "3." 같은 숫자, 10진수가 아닌 유니코드 숫자 문자
+(², ½ 등)가 나오면 tokenize()가 이쪽으로 넘긴다.
 """
 
 from __future__ import annotations
 
+import re
+
 from .errors import DSLSyntaxError
 from .tokens import BOOL_LITERALS, KEYWORDS, Token, TokenType
 
+# 조각 = (앞 공백, 식별자, 숫자, 연산자, 줄바꿈, 문자열, 잘못된 문자) — 토큰 칸은 많아야 하나만 찬다.
+# 모두 비면 주석 또는 소스 끝. 순서 = 우선순위 (주석 `--`이 연산자 `-`보다 먼저,
+# 2문자 연산자가 1문자보다 먼저)
+_MASTER = re.compile(
+    r"""
+    ([ \t]*)
+    (?:
+        ([^\W\d]\w*)
+      | (\d+(?:\.\d*)?)
+      | --[^\r\n]*
+      | (>=|<=|==|!=|->|[-><+*/(),:=%\[\]\u2192])
+      | (\r\n?|\n)
+      | ("[^"\r\n]*")
+      | (.)
+      | \Z
+    )
+    """,
+    re.VERBOSE,
+)
+
 
 def tokenize(source: str) -> list[Token]:
     """소스 문자열을 Token 리스트로 변환."""
     tokens: list[Token] = []
+    append = tokens.append
+    new = tuple.__new__  # Token(...)의 __new__ 래퍼를 거치지 않는다
+    word_type = _WORD_TYPES.get
+    ident, number = TokenType.IDENT, TokenType.NUMBER
+    line = 1
+    col = 1
+
+    for blank, word, num, op, newline, string, bad in _MASTER.findall(source):
+        col += len(blank)
+        if word:
+            if not (word[0] == "_" or word[0].isalpha()):
+                return _tokenize_chars(source)  # ², ½ 등 숫자 문자로 시작
+            append(new(Token, (word_type(word, ident), word, line, col)))
+            col += len(word)
+        elif op:
+            append(new(Token, (_OPS[op], op, line, col)))
+            col += len(op)
+        elif num:
+            if num[-1] == ".":
+                return _tokenize_chars(source)  # "3." 에러 또는 "3.²"
+            append(new(Token, (number, num, line, col)))
+            col += len(num)
+        elif newline:
+            append(new(Token, (TokenType.NEWLINE, "\\n", line, col)))
+            line += 1
+            col = 1
+        elif string:
+            append(new(Token, (TokenType.STRING, string[1:-1], line, col)))
+            col += len(string)
+        elif bad:
+            return _tokenize_chars(source)  # 에러 위치는 문자 단위 렉서가 낸다
+        # 주석 — 문자 단위 렉서처럼 주석 길이는 열에 세지 않는다
+
+    append(new(Token, (TokenType.EOF, "", line, col)))
+    return tokens
+
+
+def _tokenize_chars(source: str) -> list[Token]:
+    """문자 단위 렉서 — tokenize()와 같은 결과 (유니코드 숫자 문자 처리 포함)."""
+    tokens: list[Token] = []
     pos = 0
     line = 1
     col = 1
@@ -167,6 +234,14 @@ _ONE_CHAR_OPS: dict[str, TokenType] = {
 }
 
 
+_OPS: dict[str, TokenType] = {**_TWO_CHAR_OPS, **_ONE_CHAR_OPS, "\u2192": TokenType.ARROW}
+
+# 식별자 모양 단어 중 키워드/bool 리터럴 (나머지는 IDENT)
+_WORD_TYPES: dict[str, TokenType] = {
+    **KEYWORDS, **{word: TokenType.BOOL_LIT for word in BOOL_LITERALS},
+}
+
+
 def _is_ident_start(ch: str) -> bool:
     """식별자 시작 문자: 유니코드 문자 또는 _."""
     return ch == "_" or ch.isalpha()
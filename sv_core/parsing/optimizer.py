@@ -0,0 +1,102 @@
+"""AST 최적화 패스.
+
+expand_patterns: 내장 패턴 함수 호출(골든크로스() 등)을 미리 파싱해 둔 정의 AST로
+전개한다. 평가 시 패턴 정의를 다시 렉싱/파싱하지 않는다.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+
+from .ast_nodes import (
+    BinOp,
+    Comparison,
+    FuncCall,
+    IndexAccess,
+    Node,
+    PatternCall,
+    Script,
+    ScriptV2,
+    UnaryOp,
+)
+from .builtins import BUILTIN_PATTERNS
+from .parser import parse as _parse
+
+
+# 인자 AST repr이 state 키가 되는 함수 — 인자 안은 전개하지 않는다
+_REPR_KEYED_FUNCS = {"상향돌파", "하향돌파", "강세다이버전스", "약세다이버전스"}
+
+
+def _parse_pattern(definition: str) -> Node | None:
+    """패턴 정의 → 식 AST. 파싱 실패 시 None.
+
+    평가기가 예전부터 쓰던 "매수: {정의}" 래핑으로 파싱해야 노드 위치(line/col)가 같아
+    상향/하향돌파 state 키(인자 repr)가 그대로 유지된다.
+    """
+    try:
+        ast = _parse(f"매수: {definition}\n매도: true")
+    except Exception:
+        return None
+    return ast.buy_block.expr
+
+
+# 모듈 로드 시 한 번만 파싱
+_PATTERN_EXPRS: dict[str, Node | None] = {
+    name: _parse_pattern(spec.definition) for name, spec in BUILTIN_PATTERNS.items()
+}
+
+
+def pattern_expr(name: str) -> Node | None:
+    """미리 파싱된 패턴 정의 AST. 패턴이 아니거나 정의 파싱 실패 시 None."""
+    return _PATTERN_EXPRS.get(name)
+
+
+def expand_patterns(ast: Script | ScriptV2) -> Script | ScriptV2:
+    """패턴 함수 호출을 PatternCall(이름, 정의 AST)로 치환한 새 AST 반환.
+
+    커스텀 함수가 패턴과 같은 이름이면 커스텀이 우선한다 (평가기와 같은 스코프 —
+    커스텀 함수 본문에서는 앞서 선언된 것만 보인다).
+    """
+    visible: set[str] = set()
+    custom_funcs = []
+    for func_def in ast.custom_funcs:
+        custom_funcs.append(replace(func_def, body=_expand(func_def.body, visible)))
+        visible.add(func_def.name)
+
+    if isinstance(ast, ScriptV2):
+        rules = tuple(
+            replace(rule, condition=_expand(rule.condition, visible)) for rule in ast.rules
+        )
+        return replace(ast, custom_funcs=tuple(custom_funcs), rules=rules)
+
+    return replace(
+        ast,
+        custom_funcs=tuple(custom_funcs),
+        buy_block=replace(ast.buy_block, expr=_expand(ast.buy_block.expr, visible)),
+        sell_block=replace(ast.sell_block, expr=_expand(ast.sell_block.expr, visible)),
+    )
+
+
+def _expand(node: Node, customs: set[str]) -> Node:
+    if isinstance(node, FuncCall):
+        if node.name not in customs and node.name in BUILTIN_PATTERNS:
+            expr = pattern_expr(node.name)
+            if expr is None:
+                return node  # 평가기에서 null 처리
+            return PatternCall(
+                name=node.name, expr=_expand(expr, customs), line=node.line, col=node.col,
+            )
+        if node.name in _REPR_KEYED_FUNCS or not node.args:
+            return node
+        return replace(node, args=tuple(_expand(a, customs) for a in node.args))
+
+    if isinstance(node, (BinOp, Comparison)):
+        return replace(node, left=_expand(node.left, customs), right=_expand(node.right, customs))
+
+    if isinstance(node, UnaryOp):
+        return replace(node, operand=_expand(node.operand, customs))
+
+    if isinstance(node, IndexAccess):
+        return replace(node, expr=_expand(node.expr, customs))
+
+    return node
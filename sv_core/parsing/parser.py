@@ -5,6 +5,8 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 from .ast_nodes import (
     Action,
     BinOp,
@@ -34,8 +36,12 @@ from .builtins import (
     get_pattern_func,
 )
 from .errors import DSLNameError, DSLSyntaxError, DSLTypeError
+from .keys import intern_ids
 from .tokens import Token, TokenType, KEYWORDS, BOOL_LITERALS
 
+# parse()/parse_v2() 캐시 크기 (스크립트 수)
+PARSE_CACHE_SIZE = 1024
+
 
 # ── 타입 추론 ──
 
@@ -788,17 +794,24 @@ class Parser:
 
 def parse(source: str) -> Script:
     """DSL 소스 → Script AST. 문법+타입 검증 포함."""
-    from .lexer import tokenize
-
-    tokens = tokenize(source)
-    parser = Parser(tokens)
-    return parser.parse()
+    return _parse_cached(source, False)
 
 
 def parse_v2(source: str) -> ScriptV2:
     """DSL 소스 → ScriptV2 AST. v2 문법 + v1 호환."""
+    return _parse_cached(source, True)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(source: str, v2: bool) -> Script | ScriptV2:
+    """프로세스 전역 파싱 캐시 — (소스, 문법) 단위 LRU.
+
+    AST는 불변이므로 엔진/백테스트/규칙 API/AI 검증이 같은 스크립트의 AST를 공유한다.
+    파싱 에러는 캐시하지 않는다 (매번 다시 파싱해 같은 에러를 낸다).
+    """
     from .lexer import tokenize
 
-    tokens = tokenize(source)
-    parser = Parser(tokens)
-    return parser.parse_v2()
+    parser = Parser(tokenize(source))
+    ast = parser.parse_v2() if v2 else parser.parse()
+    intern_ids(ast)
+    return ast
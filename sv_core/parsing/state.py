@@ -0,0 +1,87 @@
+"""상태 함수 state 자료구조 — 평가 1회당 O(1) 갱신.
+
+- CountWindow: 횟수(조건, 기간)의 최근 기간 봉 True/False 링버퍼 + True 개수
+- ExtremaWindow: 다이버전스의 (가격, 지표) 윈도우 — 로컬 극값을 점이 들어올 때 확정해 둔다
+
+둘 다 기존 리스트 구현(매 평가 슬라이스 후 재합산/재탐색)과 결과가 같다.
+트리 순회 평가기와 컴파일러가 같은 state 객체를 쓴다.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class CountWindow:
+    """횟수 이력. 기간이 양수면 최근 기간 봉만 남긴다 (기간이 바뀌어도 리스트 구현과 동일)."""
+
+    values: deque = field(default_factory=deque)
+    true_count: int = 0
+
+    def push(self, value: bool, period: int) -> int:
+        """새 봉 조건 값 추가 → 최근 period 봉 중 True 수 (period <= 0이면 0)."""
+        self.values.append(value)
+        self.true_count += value
+        if period <= 0:
+            return 0
+        while len(self.values) > period:
+            self.true_count -= self.values.popleft()
+        return self.true_count
+
+
+@dataclass(slots=True)
+class ExtremaWindow:
+    """다이버전스 (가격, 지표) 윈도우.
+
+    점은 절대 번호 [start, end)로만 관리하고, 양옆 점이 모두 들어온 순간 확정되는
+    로컬 저점/고점만 (번호, 가격, 지표)로 보관한다. 윈도우 맨 앞 점은 극값이 될 수 없으므로
+    번호 <= start인 극값은 버린다.
+    """
+
+    start: int = 0
+    end: int = 0
+    prev: tuple[float, float] | None = None  # end-2번째 점
+    last: tuple[float, float] | None = None  # end-1번째 점
+    lows: deque = field(default_factory=deque)
+    highs: deque = field(default_factory=deque)
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def push(self, price: float, indicator: float, lookback: int) -> None:
+        """점 추가 후 hist[-lookback:] 트리밍과 같은 규칙으로 윈도우를 줄인다."""
+        if len(self) >= 2:
+            mid = self.last[0]
+            if mid < self.prev[0] and mid < price:
+                self.lows.append((self.end - 1, *self.last))
+            elif mid > self.prev[0] and mid > price:
+                self.highs.append((self.end - 1, *self.last))
+        self.prev, self.last = self.last, (price, indicator)
+        self.end += 1
+
+        n = len(self)
+        if n > lookback:
+            if lookback > 0:
+                keep = lookback
+            elif lookback == 0:
+                keep = n
+            else:
+                keep = max(n + lookback, 0)
+            self.start = self.end - keep
+        for extrema in (self.lows, self.highs):
+            while extrema and extrema[0][0] <= self.start:
+                extrema.popleft()
+
+    def detect(self, *, bullish: bool) -> bool:
+        """최근 극값 2개로 판정 — _Evaluator._detect_divergence(윈도우)와 동일."""
+        if len(self) < 5:
+            return False
+        extrema = self.lows if bullish else self.highs
+        if len(extrema) < 2:
+            return False
+        (_, p1, i1), (_, p2, i2) = extrema[-2], extrema[-1]
+        if bullish:
+            return p2 < p1 and i2 > i1
+        return p2 > p1 and i2 < i1
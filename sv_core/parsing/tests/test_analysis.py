@@ -0,0 +1,76 @@
+"""DSL 정적 의존성 분석 단위 테스트."""
+
+from sv_core.parsing import (
+    IndicatorRequirement,
+    analyze,
+    analyze_script,
+    compile_script_v2,
+    parse,
+    parse_v2,
+)
+from sv_core.parsing.optimizer import expand_patterns
+
+
+class TestAnalyze:
+    def test_requirements_and_depth(self):
+        deps = analyze(parse_v2(
+            "기간 = 10\n분봉 = \"5m\"\n"
+            "MA(기간 * 2, 분봉)[3] > RSI(14) AND 횟수(STOCH_D() > 20, 5) >= 1 → 매수 100%\n"
+            "MACD_HIST(\"15m\") > 0 AND 수익률 > 기간 → 매도 전량"
+        ))
+        assert deps.indicators == {
+            IndicatorRequirement("MA", (20,), "5m"),
+            IndicatorRequirement("RSI", (14,), None),
+            IndicatorRequirement("STOCH_D", (5, 3, 3), None),
+            IndicatorRequirement("MACD_HIST", (), "15m"),
+        }
+        assert deps.keys() == {"rsi_14", "stoch_d_5_3_3"}
+        assert deps.keys("5m") == {"ma_20"}
+        assert deps.timeframes == ("15m", "5m")
+        assert deps.fields == {"수익률"}
+        assert deps.max_index == 3
+        assert deps.depth() == 15  # RSI(14) 15봉, STOCH_D 11봉
+        assert deps.depth("5m") == 23  # MA(20) + [3]
+        assert deps.depth("15m") == 35
+        assert deps.history_depth == 35
+        assert not deps.dynamic
+
+    def test_patterns_and_customs(self):
+        """패턴/커스텀 함수 본문까지 순회, expr[N]으로 감싼 커스텀 호출은 오프셋 반영."""
+        source = "과열 = 볼린저_상단(20, \"1d\") < 현재가\n과열[5] OR 골든크로스 → 매수 100%\nRSI과매수 → 매도 전량"
+        deps = analyze(parse_v2(source))
+        assert deps.keys() == {"bb_upper_20", "ma_5", "ma_20", "rsi_14"}
+        assert deps.timeframes == ()
+        assert deps.depth() == 25
+        assert analyze(expand_patterns(parse_v2(source))) == deps
+
+    def test_v1_script(self):
+        deps = analyze(parse("매수: 상향돌파(MACD(), MACD_SIGNAL())\n매도: 평균거래량(20) > 거래량"))
+        assert deps.keys() == {"macd", "macd_signal", "avg_volume_20"}
+        assert deps.fields == {"거래량"}
+
+    def test_dynamic_argument(self):
+        """인자가 필드 값이면 정적으로 정할 수 없다 → dynamic."""
+        deps = analyze(parse_v2("RSI(보유일) > 50 AND MA(5) > 0 → 매수 100%"))
+        assert deps.dynamic
+        assert deps.keys() == {"ma_5"}
+        assert "보유일" in deps.fields
+
+    def test_analyze_script_cached(self):
+        source = "RSI(9) < 30 → 매수 100%"
+        assert analyze_script(source) is analyze_script(source)
+        assert analyze_script("RSI(9) <") is None
+
+    def test_compiled_dependencies(self):
+        compiled = compile_script_v2(parse_v2("EMA(12, \"1m\") > EMA(26, \"1m\") → 매수 100%"))
+        assert compiled.dependencies.keys("1m") == {"ema_12", "ema_26"}
+        assert compiled.dependencies.to_dict()["timeframes"] == ["1m"]
+
+    def test_stateful(self):
+        """상태 함수/expr[N]/상태 함수를 쓰는 패턴은 stateful."""
+        assert not analyze_script("RSI(14) < 30 AND 현재가 > MA(20) → 매수 100%").stateful
+        assert not analyze_script("RSI과매도 → 매수 100%").stateful
+        assert analyze_script("현재가[1] < 현재가 → 매수 100%").stateful
+        assert analyze_script("연속(현재가 > MA(5)) >= 3 → 매수 100%").stateful
+        assert analyze_script("골든크로스 → 매수 100%").stateful
+        assert analyze_script("돌파 = 상향돌파(현재가, MA(20))\n돌파 → 매수 100%").stateful
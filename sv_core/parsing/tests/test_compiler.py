@@ -0,0 +1,211 @@
+"""DSL 컴파일러 단위 테스트 — 트리 순회 평가기와 결과/상태 일치 검증."""
+
+import copy
+import math
+
+import pytest
+
+from sv_core.parsing import (
+    PAST_CONTEXT,
+    EvalProfile,
+    compile_script,
+    compile_script_v2,
+    evaluate,
+    evaluate_v2,
+    parse,
+    parse_v2,
+)
+from sv_core.parsing.ast_nodes import FieldRef
+from sv_core.parsing.evaluator import NO_DETAILS, index_key
+
+
+def _ctx(step: int) -> dict:
+    """사이클마다 값이 변하는 컨텍스트 (돌파/다이버전스/횟수가 실제로 발생하도록)."""
+    price = 50000 + 3000 * math.sin(step / 3) - 40 * step
+    rsi = 50 + 25 * math.sin(step / 2)
+    return {
+        "현재가": price, "거래량": 1000 + step * 10, "수익률": (step % 9) - 4,
+        "보유수량": step % 2, "고점 대비": -(step % 5), "등락률": (step % 7) - 3,
+        "장시작후": step, "시간": 900 + step, "요일": 1,
+        "RSI": lambda period, tf=None: rsi if period == 14 else 100 - rsi,
+        "MA": lambda period, tf=None: price + (period - 10) * 30 * math.cos(step / 4),
+        "EMA": lambda period, tf=None: price - period,
+        "MACD": lambda tf=None: math.sin(step / 2),
+        "MACD_SIGNAL": lambda tf=None: math.sin((step - 1) / 2),
+        "MACD_HIST": lambda tf=None: math.sin(step / 2) - math.sin((step - 1) / 2),
+        "볼린저_상단": lambda period, tf=None: 52000,
+        "볼린저_하단": lambda period, tf=None: 48000,
+        "평균거래량": lambda period, tf=None: None if step % 6 == 0 else 900,
+    }
+
+
+V1_SCRIPTS = [
+    "매수: 현재가 > 40000 AND true\n매도: 현재가 / 0 > 1",
+    "매수: 현재가 + 10000 > 55000 OR NOT false\n매도: -수익률 > 2",
+    "매수: 골든크로스() AND RSI과매도()\n매도: 데드크로스() OR RSI과매수()",
+    "매수: 상향돌파(RSI(14), 50)\n매도: 하향돌파(MA(5), MA(20))",
+    "매수: 거래량 > 평균거래량(20) * 1.2\n매도: 볼린저상단돌파()",
+    "과매도() = RSI(14) < 35\n매수: 과매도() AND 상향돌파(현재가, MA(20))\n매도: NOT 과매도()",
+    "매수: 강세다이버전스(RSI(14), 10)\n매도: 약세다이버전스(MACD_HIST())",
+    "매수: MACD골든크로스()\n매도: MACD데드크로스()",
+]
+
+V2_SCRIPTS = [
+    "현재가 > 40000 AND 보유수량 == 0 -> 매수 100%\n수익률 >= 3 -> 매도 50%\n수익률 <= -3 -> 매도 전량",
+    "골든크로스 AND RSI(14) >= 50 AND 보유수량 == 0 → 매수 100%\n데드크로스 AND 보유수량 > 0 → 매도 전량",
+    "기간 = 20\n강세다이버전스(MACD_HIST(), 기간) AND RSI(14) < 50 → 매수 100%\n약세다이버전스(MACD_HIST(), 기간) → 매도 전량",
+    "횟수(RSI(14) < 40, 5) >= 2 → 매수 100%\n연속(현재가 < MA(20)) >= 3 → 매도 전량",
+    "배수 = 1.5\n상향돌파(현재가, 볼린저_상단(20)) AND 거래량 > 평균거래량(20) * 배수 → 매수 100%\n고점 대비 <= -2 → 매도 전량",
+    "단기 = 12\n장기 = 26\n상향돌파(EMA(단기), EMA(장기)) → 매수 100%\n하향돌파(EMA(단기), EMA(장기)) → 매도 전량",
+    "횟수(RSI(14) < 40, 5) + 1 >= 2 → 매수 100%\n연속(현재가 < MA(20)) * 2 >= 4 → 매도 전량",
+    "과열 = RSI(14) > 60 AND 등락률 > 0\n과열 AND 보유수량 > 0 → 매도 전량\nNOT 과열 → 매수 50%",
+    "매수: RSI과매도() OR 볼린저하단돌파()\n매도: RSI과매수()",
+    # 공통 부분식 + 같은 돌파 식 여러 번 (위치별 state 유지)
+    "RSI(14) < 45 AND MA(5) > MA(20) → 매수 100%\nRSI(14) > 55 OR MA(5) < MA(20) → 매도 50%\n"
+    "상향돌파(MA(5), MA(20)) AND 상향돌파(MA(5), MA(20)) → 매도 전량\nRSI과매도 AND RSI(14) <= 30 → 매수 50%",
+    "기간 = 20\n배수 = 2\nRSI(기간 - 6) * 배수 > 기간 * 5 AND 10 / 0 == 1 → 매수 100%\n-기간 < 0 → 매도 전량",
+    # 이전 봉 참조 — 버퍼 공유 / 상태 함수 / 커스텀 함수 안
+    "현재가 > 현재가[1] AND RSI(14)[3] < RSI(14) → 매수 100%\n상향돌파(현재가, MA(20))[1] OR 골든크로스[2] → 매도 전량",
+    "과열 = RSI(14)[2] > 50\n과열 AND 횟수(현재가 > MA(20), 5)[1] >= 1 → 매수 100%\n현재가[5] - 현재가 > 100 → 매도 전량",
+]
+
+
+class TestCompiledV1:
+    @pytest.mark.parametrize("source", V1_SCRIPTS)
+    def test_matches_evaluator(self, source):
+        ast = parse(source)
+        compiled = compile_script(ast)
+        ref_state: dict = {}
+        got_state: dict = {}
+        for step in range(40):
+            expected = evaluate(ast, _ctx(step), ref_state)
+            assert compiled.evaluate(_ctx(step), got_state) == expected, f"step {step}"
+            assert got_state == ref_state
+
+    def test_index_access(self):
+        source = "매수: 현재가 > 현재가[2] AND 평균거래량(20)[1] > 0\n매도: 하향돌파(MA(5), MA(20))[1]"
+        ast = parse(source)
+        compiled = compile_script(ast)
+        ref_state: dict = {}
+        got_state: dict = {}
+        for step in range(20):
+            assert compiled.evaluate(_ctx(step), got_state) == evaluate(ast, _ctx(step), ref_state)
+        assert got_state == ref_state
+        assert len(got_state["index_history"][index_key(FieldRef(name="현재가"))]) == 3
+
+    def test_null_block_is_false(self):
+        compiled = compile_script(parse("매수: 현재가 > 1\n매도: true"))
+        assert compiled.evaluate({"현재가": None}) == (False, True)
+
+
+class TestCompiledV2:
+    @pytest.mark.parametrize("source", V2_SCRIPTS)
+    def test_matches_evaluator(self, source):
+        ast = parse_v2(source)
+        compiled = compile_script_v2(ast)
+        ref_state: dict = {}
+        got_state: dict = {}
+        for step in range(40):
+            expected = evaluate_v2(ast, _ctx(step), ref_state)
+            got = compiled.evaluate(_ctx(step), got_state)
+            assert got == expected, f"step {step}"
+            assert got_state == ref_state
+
+    @pytest.mark.parametrize("source", V2_SCRIPTS)
+    def test_lean_matches_detailed(self, source):
+        """details=False — 행동/결과/state는 같고 스냅샷 details는 공유 빈 매핑."""
+        ast = parse_v2(source)
+        compiled = compile_script_v2(ast)
+        states: list[dict] = [{}, {}, {}]
+        for step in range(40):
+            full = compiled.evaluate(_ctx(step), states[0])
+            lean = compiled.evaluate(_ctx(step), states[1], details=False)
+            tree = evaluate_v2(ast, _ctx(step), states[2], details=False)
+            assert lean.action == full.action == tree.action, f"step {step}"
+            assert [s.result for s in lean.snapshots] == [s.result for s in full.snapshots]
+            assert all(s.details is NO_DETAILS for s in lean.snapshots + tree.snapshots)
+            assert lean == tree
+        assert states[0] == states[1] == states[2]
+
+    @pytest.mark.parametrize("source", V2_SCRIPTS)
+    def test_profiled_matches_plain(self, source):
+        """계측 컴파일본 — 결과/state는 같고 내장 함수·규칙·노드 타입별로 누적."""
+        ast = parse_v2(source)
+        profile = EvalProfile()
+        plain, timed = compile_script_v2(ast), compile_script_v2(ast, profile=profile)
+        states: list[dict] = [{}, {}, {}]
+        for step in range(40):
+            a = plain.evaluate(_ctx(step), states[0])
+            b = timed.evaluate(_ctx(step), states[1])
+            c = evaluate_v2(ast, _ctx(step), states[2], profile=profile)
+            assert a == b == c, f"step {step}"
+        assert states[0] == states[1] == states[2]
+        report = profile.report()
+        rules = {e["name"]: e["calls"] for e in report["rule"]}
+        assert rules == {str(i): 80 for i in range(len(ast.rules))}
+        assert report["node"] and all(e["total_ms"] >= 0 for e in report["node"])
+
+    def test_profile_counts_builtin_calls(self):
+        profile = EvalProfile()
+        compiled = compile_script_v2(
+            parse_v2("RSI(14) < 50 AND 현재가 > MA(20) → 매수 100%"), profile=profile,
+        )
+        for step in range(5):
+            compiled.evaluate(_ctx(step))
+        funcs = {e["name"]: e["calls"] for e in profile.report()["func"]}
+        assert funcs["RSI"] == 5 and funcs["MA"] == 5
+
+    def test_common_subexpr_evaluated_once(self):
+        """같은 순수 함수 호출은 평가 1회에 한 번만 호출된다."""
+        calls: list = []
+        ctx = _ctx(3)
+        ctx["RSI"] = lambda period, tf=None: calls.append(period) or 40
+        compiled = compile_script_v2(parse_v2(
+            "RSI(14) < 50 AND 현재가 > 0 → 매수 100%\n"
+            "RSI(14) > 70 → 매도 전량\n"
+            "RSI과매도 OR RSI(14) < 45 → 매수 50%"
+        ))
+        result = compiled.evaluate(ctx)
+        assert calls == [14]
+        assert result.snapshots[2].details == {"RSI과매도()": False, "RSI(14)": 40}
+        compiled.evaluate(ctx)
+        assert calls == [14, 14]  # 슬롯은 평가마다 초기화
+
+    def test_constants_folded(self):
+        """상수 인자는 컴파일 시 고정 — details에는 상수 값 기록 유지."""
+        calls: list = []
+        ctx = _ctx(3)
+        ctx["MA"] = lambda period, tf=None: calls.append(period) or 100
+        compiled = compile_script_v2(parse_v2("기간 = 10\nMA(기간 * 2) > 기간 → 매수 100%"))
+        result = compiled.evaluate(ctx)
+        assert calls == [20.0]
+        assert result.snapshots[0].details == {"MA(기간 * 2)": 100, "기간": 10.0}
+
+    def test_past_context_matches_buffer(self):
+        """PAST_CONTEXT 오프셋 평가 = 링버퍼 평가 (이력이 찬 뒤), 평가기와도 동일."""
+        source = V2_SCRIPTS[-2]
+        ast = parse_v2(source)
+        compiled = compile_script_v2(ast)
+
+        def hooked(step: int) -> dict:
+            ctx = _ctx(step)
+            ctx[PAST_CONTEXT] = lambda n: _ctx(step - n) if step >= n else None
+            return ctx
+
+        states: list[dict] = [{}, {}, {}]
+        for step in range(20):
+            ref = evaluate_v2(ast, hooked(step), states[0])
+            got = compiled.evaluate(hooked(step), states[1])
+            buffered = compiled.evaluate(_ctx(step), states[2])
+            assert got == ref
+            if step >= 3:
+                assert got.snapshots[0] == buffered.snapshots[0]
+        assert states[0] == states[1]
+
+    def test_context_not_mutated(self):
+        """상수 주입은 복사본에만 — 호출자 context는 그대로."""
+        compiled = compile_script_v2(parse_v2("기간 = 20\nRSI(기간) > 10 → 매수 100%"))
+        ctx = _ctx(0)
+        before = copy.copy(ctx)
+        compiled.evaluate(ctx)
+        assert ctx == before
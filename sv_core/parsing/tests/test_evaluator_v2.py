@@ -3,7 +3,8 @@
 import pytest
 
 from sv_core.parsing import parse_v2, evaluate_v2, EvalV2Result, ActionResult, ConditionSnapshot
-from sv_core.parsing.evaluator import _Evaluator
+from sv_core.parsing.ast_nodes import FuncCall, NumberLit
+from sv_core.parsing.evaluator import _Evaluator, index_key
 
 
 def _ctx(**overrides):
@@ -377,3 +378,46 @@ class TestEvalV2Divergence:
         assert result is not None
         assert result.action is not None
         assert result.action.side == "매수"
+
+
+class TestEvalV2IndexAccess:
+    def test_previous_bar_value(self):
+        """현재가[1]: 1봉 전 값. 이력이 모자라면 null."""
+        ast = parse_v2("현재가 > 현재가[1] → 매수 100%")
+        state = {}
+        r1 = evaluate_v2(ast, _ctx(현재가=100), state)
+        assert r1.snapshots[0].result is None
+        r2 = evaluate_v2(ast, _ctx(현재가=110), state)
+        assert r2.action is not None
+        assert r2.snapshots[0].details == {"현재가": 110, "현재가[1]": 100}
+        assert evaluate_v2(ast, _ctx(현재가=105), state).action is None
+
+    def test_buffer_capped_by_max_index(self):
+        """같은 식은 버퍼 하나 공유, 크기 = 최대 인덱스 + 1."""
+        ast = parse_v2("RSI(14)[3] < RSI(14)[1] → 매수 100%")
+        state = {}
+        for v in range(10):
+            result = evaluate_v2(ast, _ctx(RSI=lambda p, tf=None, _v=v: _v), state)
+        buf = state["index_history"][index_key(FuncCall(name="RSI", args=(NumberLit(value=14),)))]
+        assert list(buf) == [6, 7, 8, 9]
+        assert result.snapshots[0].details == {"RSI(14)[3]": 6, "RSI(14)[1]": 8}
+
+    def test_filled_once_per_cycle_even_if_unreferenced(self):
+        """null 등으로 식이 참조되지 않은 사이클에도 버퍼는 한 칸씩 채운다."""
+        ast = parse_v2("평균거래량(MA(5)[2]) > 0 → 매수 100%")
+        state = {}
+        for _ in range(3):
+            evaluate_v2(ast, _ctx(평균거래량=None, MA=lambda p, tf=None: 7), state)
+        assert list(state["index_history"][index_key(FuncCall(name="MA", args=(NumberLit(value=5),)))]) == [7, 7, 7]
+
+    def test_past_context_hook(self):
+        """PAST_CONTEXT 훅이 있으면 상태 없는 식은 n봉 전 context로 바로 평가."""
+        from sv_core.parsing import PAST_CONTEXT
+
+        prices = [100, 105, 103]
+        ctx = _ctx(현재가=prices[2])
+        ctx[PAST_CONTEXT] = lambda n: {"현재가": prices[2 - n]} if n <= 2 else None
+        state = {}
+        result = evaluate_v2(parse_v2("현재가[2] < 현재가[1] → 매수 100%"), ctx, state)
+        assert result.snapshots[0].details == {"현재가[2]": 100, "현재가[1]": 105}
+        assert "index_history" not in state
@@ -0,0 +1,57 @@
+"""노드 키 (구조 ID / 위치 ID / 표시 문자열) 단위 테스트."""
+
+from unittest.mock import patch
+
+from sv_core.parsing import evaluate_v2, keys, parse_v2
+from sv_core.parsing.ast_nodes import FuncCall, NumberLit
+from sv_core.parsing.keys import node_id, node_text, site_id
+
+
+def _conditions(source: str) -> list:
+    return [rule.condition for rule in parse_v2(source).rules]
+
+
+class TestNodeKeys:
+    def test_structural_id_ignores_position(self):
+        a, b = _conditions("RSI(14) > 30 → 매수 100%\n  RSI(14)   > 30 → 매도 전량")
+        assert a != b  # 위치가 다른 노드
+        assert node_id(a) == node_id(b)
+        assert node_id(a.left) == node_id(FuncCall(name="RSI", args=(NumberLit(value=14),)))
+
+    def test_structure_not_text(self):
+        """표시 문자열이 같아도 구조가 다르면 다른 state (괄호 우선순위)."""
+        a, b = _conditions("(현재가 + 1) * 2 > 0 → 매수 100%\n현재가 + 1 * 2 > 0 → 매도 전량")
+        assert node_text(a) == node_text(b)
+        assert node_id(a) != node_id(b)
+
+    def test_site_id_per_position(self):
+        a, b = _conditions(
+            "상향돌파(MA(5), MA(20)) → 매수 100%\n상향돌파(MA(5), MA(20)) → 매도 전량"
+        )
+        assert node_id(a) == node_id(b)
+        assert site_id(a) != site_id(b)
+
+    def test_precomputed_at_parse(self):
+        cond = _conditions("횟수(상향돌파(현재가, MA(20)), 5) >= 1 → 매수 100%")[0]
+        cross = cond.left.args[0]
+        assert cond._sid >= 0 and cross._site >= 0
+        assert cond._text is None  # 표시 문자열은 details 기록 시에만
+
+    def test_text_on_details(self):
+        ast = parse_v2("횟수(현재가 > MA(20), 5) >= 1 → 매수 100%")
+        ctx = {"현재가": 100, "MA": lambda p, tf=None: 90}
+        result = evaluate_v2(ast, ctx, {})
+        assert result.snapshots[0].details == {"횟수(현재가 > MA(20), 5)": 1}
+        assert ast.rules[0].condition.left.args[0]._text == "현재가 > MA(20)"
+
+    def test_intern_table_bounded(self):
+        """intern 표는 최근 사용 순으로 제한 — 빠진 구조는 새 ID (기존 ID 재사용 없음)."""
+        with patch.object(keys, "_MAX_INTERNED", 8), patch.object(keys, "_IDS", keys.OrderedDict()):
+            kept = node_id(NumberLit(value=-1))
+            first = node_id(NumberLit(value=0))
+            for i in range(1, 20):
+                node_id(NumberLit(value=i))
+                assert node_id(NumberLit(value=-1)) == kept  # 계속 쓰는 구조는 유지
+            assert len(keys._IDS) == 8
+            again = node_id(NumberLit(value=0))
+            assert again != first and again > kept
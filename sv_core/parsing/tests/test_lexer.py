@@ -1,8 +1,10 @@
 """렉서 단위 테스트."""
 
+import random
+
 import pytest
 
-from sv_core.parsing.lexer import tokenize
+from sv_core.parsing.lexer import _tokenize_chars, tokenize
 from sv_core.parsing.tokens import TokenType
 from sv_core.parsing.errors import DSLSyntaxError
 
@@ -112,3 +114,43 @@ class TestFullScript:
         assert all(t.value != "--" for t in tokens)
         # EOF로 끝나는지
         assert tokens[-1].type == TokenType.EOF
+
+
+class TestRegexLexer:
+    """정규식 렉서 = 문자 단위 렉서 (토큰/줄/열/에러 위치)."""
+
+    _PIECES = list("aZ_가현 \t\n\r0123456789.\"-><=!+*/(),:%[]→²½$") + [
+        "--", "->", "RSI", "매수", "전량", "true", "AND",
+    ]
+
+    @staticmethod
+    def _run(fn, source: str):
+        try:
+            return fn(source)
+        except DSLSyntaxError as e:
+            return (e.message, e.line, e.col)
+
+    def test_matches_char_lexer(self):
+        rng = random.Random(1)
+        for _ in range(20000):
+            source = "".join(rng.choice(self._PIECES) for _ in range(rng.randint(0, 30)))
+            assert self._run(tokenize, source) == self._run(_tokenize_chars, source), repr(source)
+
+    def test_comment_column(self):
+        """주석은 열을 세지 않는다 — 뒤따르는 NEWLINE/EOF 열이 주석 시작 열."""
+        tokens = tokenize("a -- 메모\r\nb -- 끝")
+        assert [(t.type, t.line, t.col) for t in tokens if t.type != TokenType.IDENT] == [
+            (TokenType.NEWLINE, 1, 3), (TokenType.EOF, 2, 3),
+        ]
+
+    def test_unicode_digit_falls_back(self):
+        """², ½ 처럼 10진수가 아닌 숫자 문자는 문자 단위 렉서 규칙을 따른다."""
+        assert tokenize("1² ²x") == _tokenize_chars("1² ²x")
+        assert _values("1²") == ["1²"]
+        with pytest.raises(DSLSyntaxError, match="예상치 못한 문자: '½'"):
+            tokenize("a ½")
+
+    def test_unclosed_string_position(self):
+        with pytest.raises(DSLSyntaxError, match="닫히지 않은 문자열") as exc:
+            tokenize('MA(20, "5m\n)')
+        assert (exc.value.line, exc.value.col) == (1, 8)
@@ -0,0 +1,82 @@
+"""AST 최적화 패스 단위 테스트."""
+
+import pytest
+
+from sv_core.parsing import compile_script, compile_script_v2, evaluate, evaluate_v2, parse, parse_v2
+from sv_core.parsing.ast_nodes import FuncCall, PatternCall
+from sv_core.parsing.keys import node_id
+from sv_core.parsing.optimizer import expand_patterns, pattern_expr
+
+
+def _ctx(ma5: float, ma20: float, rsi: float = 50) -> dict:
+    return {
+        "현재가": 50000, "거래량": 1000, "수익률": 0, "보유수량": 0,
+        "RSI": lambda period, tf=None: rsi,
+        "MA": lambda period, tf=None: ma5 if period == 5 else ma20,
+        "MACD": lambda tf=None: 0,
+        "MACD_SIGNAL": lambda tf=None: 0,
+        "볼린저_상단": lambda period, tf=None: 55000,
+        "볼린저_하단": lambda period, tf=None: 45000,
+    }
+
+
+class TestExpandPatterns:
+    def test_v1_pattern_expanded(self):
+        ast = expand_patterns(parse("매수: 골든크로스() AND RSI과매도()\n매도: false"))
+        expr = ast.buy_block.expr
+        assert isinstance(expr.left, PatternCall) and expr.left.name == "골든크로스"
+        assert expr.left.expr == pattern_expr("골든크로스")
+        assert isinstance(expr.right, PatternCall)
+
+    def test_v2_pattern_expanded(self):
+        ast = expand_patterns(parse_v2("골든크로스 → 매수 100%"))
+        assert isinstance(ast.rules[0].condition, PatternCall)
+
+    def test_custom_shadows_pattern(self):
+        """커스텀 함수가 패턴과 같은 이름이면 전개하지 않는다."""
+        ast = expand_patterns(parse("골든크로스() = RSI(14) < 30\n매수: 골든크로스()\n매도: false"))
+        assert isinstance(ast.buy_block.expr, FuncCall)
+
+    def test_cross_state_keys_stable(self):
+        """전개 전/후, 트리 순회/컴파일 경로 모두 같은 상향돌파 state 키 사용."""
+        source = "매수: 골든크로스()\n매도: 데드크로스()"
+        ast = parse(source)
+        states = [{}, {}, {}]
+        runs = [
+            lambda c, s: evaluate(ast, c, s),
+            lambda c, s: evaluate(expand_patterns(ast), c, s),
+            lambda c, s: compile_script(ast).evaluate(c, s),
+        ]
+        for ma5, ma20 in [(100, 110), (120, 110), (100, 110)]:
+            results = [run(_ctx(ma5, ma20), st) for run, st in zip(runs, states)]
+            assert results[0] == results[1] == results[2]
+        assert states[0] == states[1] == states[2]
+        assert results[0] == (False, True)
+
+    def test_evaluation_does_not_parse(self, monkeypatch):
+        """패턴 평가 시 렉서/파서를 호출하지 않는다."""
+        ast = parse("매수: 골든크로스() AND NOT RSI과매수()\n매도: 볼린저하단돌파()")
+        compiled = compile_script(ast)
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("평가 중 파싱 호출")
+
+        monkeypatch.setattr("sv_core.parsing.lexer.tokenize", _fail)
+        state: dict = {}
+        evaluate(ast, _ctx(100, 110), state)
+        assert evaluate(ast, _ctx(120, 110), state) == (True, False)
+        assert compiled.evaluate(_ctx(100, 110)) == (False, False)
+
+    def test_v2_details_and_count_key(self):
+        """details와 횟수 state 키는 패턴 이름 기준 (전개 전 호출과 같은 구조 ID)."""
+        ast = parse_v2("횟수(골든크로스, 5) >= 1 → 매수 100%\nRSI과매도 → 매도 전량")
+        state_ref: dict = {}
+        state_new: dict = {}
+        compiled = compile_script_v2(ast)
+        for ma5, ma20, rsi in [(100, 110, 50), (120, 110, 20)]:
+            expected = evaluate_v2(ast, _ctx(ma5, ma20, rsi), state_ref)
+            got = compiled.evaluate(_ctx(ma5, ma20, rsi), state_new)
+            assert got == expected
+        assert node_id(FuncCall(name="골든크로스")) in state_new["count_history"]
+        assert got.snapshots[1].details["RSI과매도()"] is True
+        assert state_new == state_ref
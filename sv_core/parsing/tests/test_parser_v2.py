@@ -275,3 +275,27 @@ class TestV1Compat:
         sell_rule = ast.rules[1]
         assert sell_rule.action.side == "매도"
         assert sell_rule.action.qty_type == "all"
+
+
+class TestParseCache:
+    """프로세스 전역 파싱 캐시."""
+
+    def test_same_source_shares_ast(self):
+        source = "RSI(14) < 31.5 → 매수 100%\nRSI(14) > 68.5 → 매도 전량"
+        assert parse_v2(source) is parse_v2(source)
+        assert parse_v2(source) is not parse_v2(source + "\n")
+
+    def test_grammar_in_key(self):
+        from sv_core.parsing.parser import parse
+        source = "매수: RSI(14) < 29.5\n매도: RSI(14) > 70.5"
+        assert isinstance(parse(source), type(parse(source)))
+        assert parse(source) is not parse_v2(source)
+        assert isinstance(parse_v2(source), ScriptV2)
+
+    def test_errors_not_cached(self):
+        from sv_core.parsing.parser import _parse_cached
+        before = _parse_cached.cache_info().currsize
+        for _ in range(2):
+            with pytest.raises(DSLSyntaxError):
+                parse_v2("RSI(14) < → 매수 100%")
+        assert _parse_cached.cache_info().currsize == before
@@ -0,0 +1,61 @@
+"""상태 함수 state 자료구조 — 기존 리스트 구현과 결과 일치 검증."""
+
+import random
+
+from sv_core.parsing.evaluator import _Evaluator
+from sv_core.parsing.state import CountWindow, ExtremaWindow
+
+
+def _list_count(hist: list[bool], value: bool, period: int) -> tuple[list[bool], int]:
+    """이전 구현: append → 기간 초과분 트리밍 → 윈도우 재합산."""
+    hist = hist + [value]
+    if period > 0 and len(hist) > period:
+        hist = hist[-period:]
+    window = hist[-period:] if period > 0 else []
+    return hist, sum(1 for v in window if v)
+
+
+def _list_divergence(hist: list, point: tuple, lookback: int, bullish: bool) -> tuple[list, bool]:
+    """이전 구현: append → hist[-lookback:] → 5봉 미만 False → 전체 재탐색."""
+    hist = hist + [point]
+    if len(hist) > lookback:
+        hist = hist[-lookback:]
+    if len(hist) < 5:
+        return hist, False
+    return hist, _Evaluator._detect_divergence(hist, bullish=bullish)
+
+
+class TestCountWindow:
+    def test_matches_list(self):
+        rng = random.Random(3)
+        window, hist = CountWindow(), []
+        for step in range(2000):
+            period = rng.choice([5, 5, 5, 3, 12, 0, -1]) if step % 50 > 40 else 7
+            value = rng.random() < 0.4
+            hist, expected = _list_count(hist, value, period)
+            assert window.push(value, period) == expected
+            if period > 0:
+                assert list(window.values) == hist
+
+
+class TestExtremaWindow:
+    def test_matches_rescan(self):
+        rng = random.Random(5)
+        for bullish in (True, False):
+            window, hist = ExtremaWindow(), []
+            price = 1000.0
+            for step in range(3000):
+                lookback = rng.choice([20, 20, 8, 3, 0, -2, 40]) if step % 100 > 90 else 20
+                price += rng.choice([-3, -1, 0, 1, 2])  # 같은 값(비엄격 극값)도 섞는다
+                point = (price, rng.uniform(-1, 1))
+                hist, expected = _list_divergence(hist, point, lookback, bullish)
+                window.push(*point, lookback)
+                assert window.detect(bullish=bullish) == expected, step
+                assert len(window) == len(hist)
+
+    def test_constant_memory(self):
+        window = ExtremaWindow()
+        for i in range(10_000):
+            window.push(float(i % 7), 0.0, 20)
+        assert len(window) == 20
+        assert len(window.lows) <= 10 and len(window.highs) <= 10
@@ -0,0 +1,170 @@
+"""전체 시계열 벡터화 평가 단위 테스트 — 바 단위 compile_script_v2 평가와 행동 일치 검증."""
+
+import math
+
+import numpy as np
+import pytest
+
+from sv_core.parsing import (
+    PAST_CONTEXT,
+    compile_script_v2,
+    evaluate_series,
+    parse_v2,
+)
+
+N = 120
+START = 5
+
+
+def _columns() -> dict[str, np.ndarray]:
+    step = np.arange(N)
+    return {
+        "현재가": 50000 + 3000 * np.sin(step / 3) - 40 * step,
+        "거래량": 1000.0 + (step * 37) % 400,
+    }
+
+
+def _funcs(cols: dict[str, np.ndarray]) -> dict:
+    price = cols["현재가"]
+    step = np.arange(N)
+
+    def ma(period, tf=None):
+        out = np.full(N, np.nan)
+        p = int(period)
+        csum = np.cumsum(price)
+        out[p - 1:] = (csum[p - 1:] - np.concatenate(([0.0], csum[:-p]))) / p
+        return out
+
+    def avg_volume(period, tf=None):
+        out = np.full(N, 900.0)
+        out[::6] = np.nan  # 중간중간 데이터 부족
+        return out
+
+    return {
+        "RSI": lambda period, tf=None: 50 + 25 * np.sin(step / 2) * (1 if period == 14 else -1),
+        "MA": ma,
+        "EMA": lambda period, tf=None: price - period,
+        "MACD": lambda tf=None: np.sin(step / 2),
+        "MACD_SIGNAL": lambda tf=None: np.sin((step - 1) / 2),
+        "볼린저_상단": lambda period, tf=None: np.full(N, 52000.0),
+        "볼린저_하단": lambda period, tf=None: np.full(N, 48000.0),
+        "평균거래량": avg_volume,
+    }
+
+
+def _scalar(value: float):
+    return None if math.isnan(value) else float(value)
+
+
+def _context(cols: dict, series: dict, t: int) -> dict:
+    """바 t의 스칼라 context — 지표 함수는 같은 배열의 t번째 값."""
+    def at(j: int) -> dict:
+        ctx = {name: _scalar(col[j]) for name, col in cols.items()}
+        ctx["수익률"] = (j % 9) - 4
+        ctx["보유수량"] = j % 2
+        for name, func in series.items():
+            ctx[name] = (lambda f: lambda *a: (
+                None if (v := f(*a)) is None else _scalar(v[j])
+            ))(func)
+        return ctx
+
+    ctx = at(t)
+    ctx[PAST_CONTEXT] = lambda n: at(t - n) if t >= n else None
+    return ctx
+
+
+def _run_scalar(source: str) -> list:
+    cols = _columns()
+    series = _funcs(cols)
+    compiled = compile_script_v2(parse_v2(source))
+    state: dict = {}
+    return [
+        compiled.evaluate(_context(cols, series, t), state).action if t >= START else None
+        for t in range(N)
+    ]
+
+
+def _run_series(source: str):
+    cols = _columns()
+    series = _funcs(cols)
+    plan = evaluate_series(
+        parse_v2(source), cols, series, start=START, scalar_fields=("수익률", "보유수량"),
+    )
+    rest = compile_script_v2(plan.remainder) if plan.remainder is not None else None
+    state: dict = {}
+    actions = []
+    for t in range(N):
+        if t >= START and plan.needs_scalar(t):
+            actions.append(plan.action_at(t, rest.evaluate(_context(cols, series, t), state)))
+        else:
+            actions.append(plan.action_at(t))
+    return plan, actions
+
+
+VECTORIZED = [
+    "골든크로스 AND RSI(14) >= 50 → 매수 100%\n데드크로스 → 매도 전량",
+    "횟수(RSI(14) < 40, 5) >= 2 → 매수 100%\n연속(현재가 < MA(20)) >= 3 → 매도 전량",
+    "배수 = 1.5\n상향돌파(현재가, 볼린저_상단(20)) AND 거래량 > 평균거래량(20) * 배수 → 매수 100%\n"
+    "하향돌파(현재가, MA(10)) → 매도 50%",
+    "단기 = 12\n장기 = 26\n상향돌파(EMA(단기), EMA(장기)) → 매수 100%\n하향돌파(MA(5), MA(20)) → 매도 전량",
+    "과열 = RSI(14) > 60 AND 현재가 > MA(5)\n과열 → 매도 전량\nNOT 과열 → 매수 50%",
+    "기간 = 20\nRSI(기간 - 6) * 2 > 기간 * 5 AND 10 / 0 == 1 → 매수 100%\n-기간 < 0 AND RSI(9) > 60 → 매도 전량",
+    "현재가 > 현재가[1] AND RSI(14)[3] < RSI(14) → 매수 100%\n상향돌파(현재가, MA(20))[1] OR 골든크로스[2] → 매도 전량",
+    "과열 = RSI(14)[2] > 50\n과열 AND 횟수(현재가 > MA(20), 5)[1] >= 1 → 매수 100%\n현재가[5] - 현재가 > 100 → 매도 전량",
+]
+
+PARTIAL = [
+    # 포지션 필드 — 해당 AND 항만 스칼라
+    "현재가 > MA(20) AND 보유수량 == 0 → 매수 100%\n수익률 >= 3 → 매도 50%\n수익률 <= -3 → 매도 전량",
+    # v1 매수 블록 → 보유수량 == 0 조건이 붙는다
+    "매수: RSI과매도() OR 볼린저하단돌파()\n매도: RSI과매수()",
+    # 다이버전스
+    "기간 = 20\n강세다이버전스(MACD(), 기간) AND RSI(14) < 50 → 매수 100%\n약세다이버전스(MACD(), 기간) → 매도 전량",
+    # 조건 경로 산술 안의 상태 함수
+    "횟수(RSI(14) < 40, 5) + 1 >= 2 → 매수 100%\n연속(현재가 < MA(20)) * 2 >= 4 → 매도 전량",
+    # 같은 돌파/횟수 식을 여러 위치에서 — 전체 스칼라
+    "골든크로스 AND RSI(14) < 60 → 매수 100%\n골든크로스 AND 횟수(RSI(14) < 40, 5) >= 1 → 매도 50%",
+]
+
+
+class TestEvaluateSeries:
+    @pytest.mark.parametrize("source", VECTORIZED)
+    def test_vectorized_matches_scalar(self, source):
+        plan, actions = _run_series(source)
+        assert plan.vectorized
+        assert actions == _run_scalar(source)
+
+    @pytest.mark.parametrize("source", PARTIAL)
+    def test_remainder_matches_scalar(self, source):
+        plan, actions = _run_series(source)
+        assert not plan.vectorized
+        assert actions == _run_scalar(source)
+
+    def test_remainder_only_unvectorizable_terms(self):
+        plan, _ = _run_series(PARTIAL[0])
+        assert plan.remainder_rules == [0, 1, 2]
+        assert not plan.remainder_stateful
+        assert plan.remainder.rules[0].condition.left.name == "보유수량"  # 현재가 > MA(20)은 벡터화
+        assert plan.masks[0][START:].sum() < N - START
+
+    def test_shared_state_falls_back(self):
+        plan, _ = _run_series(PARTIAL[-1])
+        assert plan.remainder is not None and plan.remainder_stateful
+        assert plan.remainder_rules == [0, 1]
+
+    def test_stateful_builtins(self):
+        """돌파는 null 바를 건너뛰고 직전 유효 값과 비교, 횟수/연속은 start부터 이력."""
+        price = np.array([1, 3, 1, np.nan, 3, 0, 2, 2, 2], dtype=float)
+        plan = evaluate_series(
+            parse_v2(
+                "상향돌파(현재가, 2) → 매수 100%\n"
+                "횟수(현재가 >= 2, 3) >= 2 → 매수 50%\n"
+                "연속(현재가 >= 2) >= 2 → 매도 전량"
+            ),
+            {"현재가": price}, {}, start=1,
+        )
+        assert plan.masks[0].tolist() == [False, False, False, False, True, False, True, False, False]
+        assert plan.masks[1].tolist() == [False, False, False, False, False, False, True, True, True]
+        assert plan.masks[2].tolist() == [False, False, False, False, False, False, False, True, True]
+        assert plan.action_at(7).rule_index == 2
+        assert plan.action_at(0) is None
@@ -1,7 +1,7 @@
 """DSL 토큰 정의 — grammar.md §3 어휘 규칙 기반."""
 
-from dataclasses import dataclass
 from enum import Enum, auto
+from typing import NamedTuple
 
 
 class TokenType(Enum):
@@ -74,8 +74,8 @@ BOOL_LITERALS: dict[str, bool] = {
 }
 
 
-@dataclass(frozen=True, slots=True)
-class Token:
+class Token(NamedTuple):
+    """토큰 — 스크립트 크기만큼 만들어지므로 생성 비용이 싼 NamedTuple (불변)."""
     type: TokenType
     value: str
     line: int
@@ -0,0 +1,565 @@
+"""DSL 전체 시계열 평가 — 백테스트/스크리닝용 벡터화 경로.
+
+바마다 context dict를 만들어 evaluate_v2()를 부르는 대신, 필드/지표를 길이 n의 배열로 받아
+규칙 조건을 numpy 배열 연산으로 한 번에 계산한다. 값은 float64 배열, null은 NaN,
+불리언은 1.0/0.0으로 표현한다.
+
+상태 함수도 evaluate_v2()와 같은 의미로 벡터화한다.
+- 상향돌파/하향돌파: 직전(두 값이 모두 있던 마지막 평가 바) 값과 비교 — 시프트 배열
+- 횟수: 평가 구간 내 rolling 합
+- 연속: 런 길이
+- expr[N]: 상태 없는 식은 N봉 전 값(PAST_CONTEXT와 동일), 그 외는 평가 구간 안에서 시프트
+
+벡터화할 수 없는 항(다이버전스, 바마다 정해지는 포지션 필드, 비정적 지표 인자 등)은
+규칙 조건의 최상위 AND 항 단위로 떼어 remainder 스크립트로 돌려준다. 호출자는 그 부분만
+바 단위 스칼라 경로(compile_script_v2)로 평가한다. 같은 state 키를 여러 위치에서 갱신하는
+스크립트(같은 패턴 돌파 식 재사용 등)는 평가 순서에 의존하므로 전체를 스칼라 경로로 넘긴다.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Mapping
+
+import numpy as np
+
+from .ast_nodes import (
+    BinOp,
+    BoolLit,
+    Comparison,
+    FieldRef,
+    FuncCall,
+    IndexAccess,
+    Node,
+    NumberLit,
+    PatternCall,
+    Rule,
+    ScriptV2,
+    StringLit,
+    UnaryOp,
+)
+from .builtins import get_pattern_func
+from .evaluator import (
+    _STATEFUL_FUNCS,
+    ActionResult,
+    EvalV2Result,
+    _EvaluatorV2,
+    index_key,
+    index_targets,
+)
+from .keys import node_id, site_id
+from .optimizer import pattern_expr
+
+
+class _Unsupported(Exception):
+    """벡터화할 수 없는 식 — 스칼라 경로로 넘긴다."""
+
+
+_NULL = None
+
+
+@dataclass(slots=True)
+class SeriesSignals:
+    """evaluate_series 결과.
+
+    masks[i]: 규칙 i의 벡터화된 AND 항이 모두 True인 바 (bool 배열, start 이전은 False).
+    remainder: 벡터화하지 못한 AND 항만 남긴 스크립트 (없으면 None).
+        remainder_rules[j] = remainder 규칙 j의 원래 규칙 인덱스.
+    remainder_stateful: remainder에 상태(돌파/횟수/연속/expr[N] 등)가 있어 매 바 평가해야 함.
+    """
+
+    rules: tuple[Rule, ...]
+    masks: list[np.ndarray]
+    start: int = 0
+    remainder: ScriptV2 | None = None
+    remainder_rules: list[int] = field(default_factory=list)
+    remainder_stateful: bool = False
+    _actions: list[ActionResult | None] = field(init=False, default_factory=list)
+    _vector_action: np.ndarray | None = field(init=False, default=None)
+    _need_scalar: np.ndarray | None = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        self._actions = [
+            _EvaluatorV2._resolve_priority([(i, rule)]) for i, rule in enumerate(self.rules)
+        ]
+        pending = set(self.remainder_rules)
+        vector_only = [i for i in range(len(self.rules)) if i not in pending]
+        self._vector_action = self._priority_index(vector_only)
+        need = np.zeros(len(self.masks[0]) if self.masks else 0, dtype=bool)
+        for i in pending:
+            need |= self.masks[i]
+        self._need_scalar = need
+
+    @property
+    def vectorized(self) -> bool:
+        """모든 규칙이 배열 연산만으로 결정됨."""
+        return self.remainder is None
+
+    def signals(self) -> list[np.ndarray]:
+        """규칙별 발동 여부 배열. remainder가 있으면 해당 규칙은 후보(mask)일 뿐이다."""
+        return self.masks
+
+    def needs_scalar(self, t: int) -> bool:
+        """바 t에서 remainder를 스칼라로 평가해야 하는지."""
+        if self.remainder is None:
+            return False
+        return self.remainder_stateful or bool(self._need_scalar[t])
+
+    def action_at(self, t: int, remainder: EvalV2Result | None = None) -> ActionResult | None:
+        """바 t의 행동. remainder 평가 결과가 있으면 합쳐서 우선순위를 정한다."""
+        if remainder is None:
+            idx = int(self._vector_action[t])
+            return self._actions[idx] if idx >= 0 else None
+
+        passed = {
+            self.remainder_rules[snap.rule_index]
+            for snap in remainder.snapshots
+            if snap.result is True
+        }
+        pending = set(self.remainder_rules)
+        triggered = [
+            (i, rule) for i, rule in enumerate(self.rules)
+            if self.masks[i][t] and (i not in pending or i in passed)
+        ]
+        return _EvaluatorV2._resolve_priority(triggered)
+
+    def _priority_index(self, indices: list[int]) -> np.ndarray:
+        """규칙 인덱스 배열 — 우선순위(전량매도 > 부분매도 > 매수, 같은 등급은 앞 규칙)."""
+        n = len(self.masks[0]) if self.masks else 0
+        out = np.full(n, -1, dtype=np.int64)
+        for rank in (_BUY, _PARTIAL_SELL, _FULL_SELL):  # 낮은 등급부터 덮어쓴다
+            for i in sorted(indices, reverse=True):
+                if _rank(self.rules[i]) == rank:
+                    out[self.masks[i]] = i
+        return out
+
+
+_BUY, _PARTIAL_SELL, _FULL_SELL = 1, 2, 3
+
+
+def _rank(rule: Rule) -> int:
+    act = rule.action
+    if act.side == "매도":
+        return _FULL_SELL if act.qty_type == "all" else _PARTIAL_SELL
+    return _BUY if act.side == "매수" else 0
+
+
+def evaluate_series(
+    ast: ScriptV2,
+    columns: Mapping[str, np.ndarray],
+    funcs: Mapping[str, Callable[..., Any]],
+    *,
+    start: int = 0,
+    scalar_fields: Iterable[str] = (),
+) -> SeriesSignals:
+    """ScriptV2를 전체 시계열로 평가한다.
+
+    Args:
+        columns: 필드명 → 길이 n 배열 (현재가, 거래량 등). 전체 이력이어야 한다 —
+            상태 없는 expr[N]은 start 이전 바도 읽는다 (PAST_CONTEXT와 동일).
+        funcs: 지표 함수명 → 정적 인자로 호출하면 길이 n 배열(또는 None)을 돌려주는 함수.
+        start: 첫 평가 바. 상태 함수 이력은 이 바부터 쌓인다 (바 루프의 워밍업 skip과 동일).
+        scalar_fields: 바마다 따로 정해지는 필드 (수익률, 보유수량 등) — 참조하는 항은 remainder로.
+    """
+    n = len(next(iter(columns.values()))) if columns else 0
+    ev = _SeriesEvaluator(ast, columns, funcs, n, start, frozenset(scalar_fields))
+
+    if _has_shared_state(ast, ev.targets):
+        masks = [ev.before_start(np.ones(n, dtype=bool)) for _ in ast.rules]
+        return SeriesSignals(
+            ast.rules, masks, start, ast, list(range(len(ast.rules))), remainder_stateful=True,
+        )
+
+    ev.eval_customs()
+    masks: list[np.ndarray] = []
+    rest_rules: list[Rule] = []
+    rest_index: list[int] = []
+    for i, rule in enumerate(ast.rules):
+        mask = np.ones(n, dtype=bool)
+        rest: list[Node] = []
+        for term in _conjuncts(rule.condition):
+            try:
+                mask &= _truthy(ev.eval(term, cond=True))
+            except _Unsupported:
+                rest.append(term)
+        masks.append(ev.before_start(mask))
+        if rest:
+            rest_rules.append(Rule(condition=_and_chain(rest), action=rule.action))
+            rest_index.append(i)
+
+    remainder = None
+    if rest_rules:
+        remainder = ScriptV2(
+            custom_funcs=ast.custom_funcs, consts=ast.consts, rules=tuple(rest_rules),
+        )
+    return SeriesSignals(
+        ast.rules, masks, start, remainder, rest_index,
+        remainder_stateful=remainder is not None and _is_stateful(remainder),
+    )
+
+
+# ── 평가기 ──
+
+
+class _SeriesEvaluator:
+    def __init__(
+        self,
+        ast: ScriptV2,
+        columns: Mapping[str, np.ndarray],
+        funcs: Mapping[str, Callable[..., Any]],
+        n: int,
+        start: int,
+        scalar_fields: frozenset[str],
+    ):
+        self._ast = ast
+        self._columns = columns
+        self._funcs = funcs
+        self._n = n
+        self._start = max(start, 0)
+        self._scalar_fields = scalar_fields
+        self._consts: dict[str, Any] = {
+            c.name: c.value.value if isinstance(c.value, (NumberLit, StringLit)) else _NULL
+            for c in ast.consts
+        }
+        # 커스텀 함수 값 (None = 벡터화 불가)
+        self._customs: dict[str, np.ndarray | None] = {}
+        self.targets = index_targets(ast)
+        self._target_values: dict[int, np.ndarray] = {}
+
+    def eval_customs(self) -> None:
+        """선언 순서대로 — 본문에서는 앞서 선언된 커스텀만 보인다."""
+        for func_def in self._ast.custom_funcs:
+            try:
+                self._customs[func_def.name] = self.eval(func_def.body, cond=False)
+            except _Unsupported:
+                self._customs[func_def.name] = None
+
+    def before_start(self, mask: np.ndarray) -> np.ndarray:
+        mask[: self._start] = False
+        return mask
+
+    def _null(self) -> np.ndarray:
+        return np.full(self._n, np.nan)
+
+    def eval(self, node: Node, cond: bool) -> np.ndarray:
+        """cond=True: 조건 경로 (횟수/연속 처리), False: 일반 식 경로 — evaluate_v2와 같은 구분."""
+        if isinstance(node, NumberLit):
+            return np.full(self._n, float(node.value))
+        if isinstance(node, BoolLit):
+            return np.full(self._n, 1.0 if node.value else 0.0)
+        if isinstance(node, FieldRef):
+            return self._field(node.name)
+        if isinstance(node, PatternCall):
+            return self.eval(node.expr, cond=False)
+        if isinstance(node, IndexAccess):
+            return self._index(node)
+        if isinstance(node, FuncCall):
+            if cond and node.name == "횟수":
+                return self._count(node)
+            if cond and node.name == "연속":
+                return self._consecutive(node)
+            return self._call(node)
+        if isinstance(node, Comparison):
+            return _compare(node.op, self.eval(node.left, cond), self.eval(node.right, cond))
+        if isinstance(node, BinOp):
+            if node.op in ("AND", "OR"):
+                return _logical(node.op, self.eval(node.left, cond), self.eval(node.right, cond))
+            # 산술은 조건 경로에서도 일반 식 경로로 평가된다. 단 조건 경로는 자식을 한 번 더
+            # 평가하므로(상태 함수 state 이중 갱신) 상태 함수가 있으면 스칼라 경로로
+            if cond and _stateful(node, index=False):
+                raise _Unsupported
+            return _arith(node.op, self.eval(node.left, False), self.eval(node.right, False))
+        if isinstance(node, UnaryOp):
+            val = self.eval(node.operand, cond)
+            if node.op == "NOT":
+                return np.where(np.isnan(val), np.nan, (val == 0).astype(float))
+            if node.op == "-":
+                return -val
+            return self._null()
+        if isinstance(node, StringLit):
+            raise _Unsupported
+        return self._null()
+
+    def _field(self, name: str) -> np.ndarray:
+        if name in self._consts:
+            val = self._consts[name]
+            if val is _NULL:
+                return self._null()
+            if isinstance(val, str):
+                raise _Unsupported
+            return np.full(self._n, float(val))
+        if name in self._scalar_fields or name in self._funcs:
+            raise _Unsupported
+        col = self._columns.get(name)
+        if col is None:
+            return self._null()
+        return np.asarray(col, dtype=float)
+
+    def _call(self, node: FuncCall) -> np.ndarray:
+        name = node.name
+        if name in self._customs:
+            val = self._customs[name]
+            if val is None:
+                raise _Unsupported
+            return val
+        if get_pattern_func(name) is not None:
+            expr = pattern_expr(name)
+            return self._null() if expr is None else self.eval(expr, cond=False)
+        if name == "상향돌파":
+            return self._cross(node, above=True)
+        if name == "하향돌파":
+            return self._cross(node, above=False)
+        if name in ("횟수", "연속"):
+            return self._null()  # 일반 식 경로에서는 context 조회 → null (evaluate_v2와 동일)
+        if name in _STATEFUL_FUNCS:
+            raise _Unsupported  # 다이버전스
+
+        func = self._funcs.get(name)
+        if func is None:
+            if name in self._scalar_fields:
+                raise _Unsupported
+            return self._null()
+        args = []
+        for arg in node.args:
+            val = self._static(arg)
+            if val is _NULL:
+                return self._null()
+            args.append(val)
+        try:
+            out = func(*args)
+        except Exception:
+            return self._null()
+        if out is None:
+            return self._null()
+        return np.asarray(out, dtype=float)
+
+    def _static(self, node: Node) -> Any:
+        """바와 무관한 인자 값 (리터럴/상수/상수 산술). 아니면 _Unsupported."""
+        if isinstance(node, (NumberLit, StringLit, BoolLit)):
+            return node.value
+        if isinstance(node, FieldRef) and node.name in self._consts:
+            return self._consts[node.name]
+        if isinstance(node, UnaryOp) and node.op == "-":
+            val = self._static(node.operand)
+            return _NULL if val is _NULL else -val
+        if isinstance(node, BinOp) and node.op in ("+", "-", "*", "/"):
+            left, right = self._static(node.left), self._static(node.right)
+            if left is _NULL or right is _NULL:
+                return _NULL
+            if node.op == "+":
+                return left + right
+            if node.op == "-":
+                return left - right
+            if node.op == "*":
+                return left * right
+            return _NULL if right == 0 else left / right
+        raise _Unsupported
+
+    # ── 상태 함수 ──
+
+    def _cross(self, node: FuncCall, *, above: bool) -> np.ndarray:
+        """직전 값 = 두 인자가 모두 있던 마지막 평가 바 (null 바는 state를 갱신하지 않는다)."""
+        if len(node.args) != 2:
+            return self._null()
+        a = self.eval(node.args[0], cond=False)
+        b = self.eval(node.args[1], cond=False)
+        valid = ~(np.isnan(a) | np.isnan(b))
+        valid[: self._start] = False
+
+        idx = np.arange(self._n)
+        last = np.maximum.accumulate(np.where(valid, idx, -1))
+        prev = np.concatenate(([-1], last[:-1])) if self._n else last
+        has_prev = prev >= 0
+        pa, pb = a[prev.clip(0)], b[prev.clip(0)]
+        with np.errstate(invalid="ignore"):
+            if above:
+                hit = has_prev & (pa < pb) & (a >= b)
+            else:
+                hit = has_prev & (pa > pb) & (a <= b)
+        return self._from_start(np.where(valid, hit.astype(float), np.nan))
+
+    def _count(self, node: FuncCall) -> np.ndarray:
+        """횟수(조건, 기간) — 평가 구간 안 최근 기간 봉 중 True 수."""
+        if len(node.args) != 2:
+            return self._null()
+        period = self._static(node.args[1])
+        if period is _NULL:
+            return self._null()
+        period = int(period)
+        truth = self._history_truth(node.args[0])
+        if period <= 0:
+            return self._from_start(np.zeros(self._n))
+        total = np.cumsum(truth, dtype=np.int64)
+        shifted = np.concatenate((np.zeros(min(period, self._n), dtype=np.int64), total[:-period]))
+        return self._from_start((total - shifted).astype(float))
+
+    def _consecutive(self, node: FuncCall) -> np.ndarray:
+        """연속(조건) — 현재까지 연속 True 봉 수."""
+        if len(node.args) != 1:
+            return self._null()
+        truth = self._history_truth(node.args[0])
+        idx = np.arange(self._n)
+        last_false = np.maximum.accumulate(np.where(truth, -1, idx))
+        return self._from_start((idx - last_false).astype(float))
+
+    def _history_truth(self, cond: Node) -> np.ndarray:
+        """상태 함수 이력용 조건 값 — null은 False, 평가 전 바는 이력에 없다."""
+        truth = _truthy(self.eval(cond, cond=False))
+        truth[: self._start] = False
+        return truth
+
+    def _index(self, node: IndexAccess) -> np.ndarray:
+        key = index_key(node.expr)
+        target, _depth, offsettable = self.targets.get(key, (node.expr, node.index, False))
+        if offsettable:
+            # N봉 전 context로 다시 계산한 값 = 배열 시프트
+            return _shift(self.eval(node.expr, cond=False), node.index)
+        values = self._target_values.get(key)
+        if values is None:
+            values = self._target_values[key] = self._from_start(self.eval(target, cond=True))
+        return _shift(values, node.index)
+
+    def _from_start(self, values: np.ndarray) -> np.ndarray:
+        """평가하지 않은 바(start 이전)는 null."""
+        values = np.array(values, dtype=float)
+        values[: self._start] = np.nan
+        return values
+
+
+# ── 배열 연산 (null = NaN) ──
+
+
+def _truthy(values: np.ndarray) -> np.ndarray:
+    return ~np.isnan(values) & (values != 0)
+
+
+def _shift(values: np.ndarray, n: int) -> np.ndarray:
+    if n == 0:
+        return values
+    out = np.full(len(values), np.nan)
+    if n < len(values):
+        out[n:] = values[:-n]
+    return out
+
+
+def _compare(op: str, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    null = np.isnan(left) | np.isnan(right)
+    with np.errstate(invalid="ignore"):
+        if op == ">":
+            res = left > right
+        elif op == ">=":
+            res = left >= right
+        elif op == "<":
+            res = left < right
+        elif op == "<=":
+            res = left <= right
+        elif op == "==":
+            res = left == right
+        elif op == "!=":
+            res = left != right
+        else:
+            return np.full(len(left), np.nan)
+    return np.where(null, np.nan, res.astype(float))
+
+
+def _logical(op: str, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    null = np.isnan(left) | np.isnan(right)
+    lt, rt = left != 0, right != 0
+    res = (lt & rt) if op == "AND" else (lt | rt)
+    return np.where(null, np.nan, res.astype(float))
+
+
+def _arith(op: str, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if op == "+":
+            return left + right
+        if op == "-":
+            return left - right
+        if op == "*":
+            return left * right
+        if op == "/":
+            return np.where(right == 0, np.nan, left / right)
+    return np.full(len(left), np.nan)
+
+
+# ── 구조 분석 ──
+
+
+def _conjuncts(node: Node) -> list[Node]:
+    """최상위 AND 체인 → 항 목록. 규칙은 모든 항이 True(null 아님)일 때만 발동한다."""
+    if isinstance(node, BinOp) and node.op == "AND":
+        return _conjuncts(node.left) + _conjuncts(node.right)
+    return [node]
+
+
+def _and_chain(terms: list[Node]) -> Node:
+    node = terms[0]
+    for term in terms[1:]:
+        node = BinOp(op="AND", left=node, right=term, line=node.line, col=node.col)
+    return node
+
+
+def _state_keys(node: Node, customs: set[str], keys: Counter) -> None:
+    """평가 1회에 갱신되는 state 키 수집 (evaluate_v2의 키 규칙과 동일)."""
+    if isinstance(node, FuncCall):
+        if node.name in customs:
+            return
+        if get_pattern_func(node.name) is not None:
+            expr = pattern_expr(node.name)
+            if expr is not None:
+                _state_keys(expr, customs, keys)
+            return
+        if node.name in ("상향돌파", "하향돌파", "강세다이버전스", "약세다이버전스"):
+            keys[("site", site_id(node))] += 1
+        elif node.name == "횟수" and node.args:
+            keys[("count", node_id(node.args[0]))] += 1
+        elif node.name == "연속" and node.args:
+            keys[("consecutive", node_id(node.args[0]))] += 1
+        for arg in node.args:
+            _state_keys(arg, customs, keys)
+    elif isinstance(node, PatternCall):
+        _state_keys(node.expr, customs, keys)
+    elif isinstance(node, IndexAccess):
+        return  # 버퍼 대상 식은 따로 (평가 1회에 한 번 채운다)
+    elif isinstance(node, (BinOp, Comparison)):
+        _state_keys(node.left, customs, keys)
+        _state_keys(node.right, customs, keys)
+    elif isinstance(node, UnaryOp):
+        _state_keys(node.operand, customs, keys)
+
+
+def _has_shared_state(ast: ScriptV2, targets: dict[int, tuple[Node, int, bool]]) -> bool:
+    """같은 state 키를 두 곳 이상에서 갱신 — 평가 순서에 의존하므로 벡터화하지 않는다."""
+    customs = {f.name for f in ast.custom_funcs}
+    keys: Counter = Counter()
+    roots = [f.body for f in ast.custom_funcs] + [r.condition for r in ast.rules]
+    roots += [target for target, _, offsettable in targets.values() if not offsettable]
+    for root in roots:
+        _state_keys(root, customs, keys)
+    return any(count > 1 for count in keys.values())
+
+
+def _stateful(node: Node, *, index: bool = True) -> bool:
+    """식 평가가 state를 남기는지 (상태 함수, index=True면 expr[N] 버퍼 포함)."""
+    if isinstance(node, IndexAccess):
+        return index  # 버퍼는 평가 1회에 한 번만 채워진다
+    if isinstance(node, FuncCall):
+        if node.name in _STATEFUL_FUNCS:
+            return True
+        if get_pattern_func(node.name) is not None:
+            expr = pattern_expr(node.name)
+            return expr is not None and _stateful(expr, index=index)
+        return any(_stateful(a, index=index) for a in node.args)
+    if isinstance(node, PatternCall):
+        return _stateful(node.expr, index=index)
+    if isinstance(node, (BinOp, Comparison)):
+        return _stateful(node.left, index=index) or _stateful(node.right, index=index)
+    if isinstance(node, UnaryOp):
+        return _stateful(node.operand, index=index)
+    return False
+
+
+def _is_stateful(ast: ScriptV2) -> bool:
+    roots = [f.body for f in ast.custom_funcs] + [r.condition for r in ast.rules]
+    return any(_stateful(root) for root in roots)